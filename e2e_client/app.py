@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn
@@ -9,15 +10,27 @@ from fastapi.staticfiles import StaticFiles  # type: ignore[import-not-found]
 
 from .config import load_settings
 from .routes import router, templates
+from .upstream import backend_http_pool, backend_sse_fanout
 from server.i18n import SUPPORTED_LANGUAGES, get_language, get_translator
 
 
 def create_app() -> FastAPI:
     settings = load_settings()
+    backend_http_pool.configure(settings)
+    backend_sse_fanout.configure(settings)
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        try:
+            yield
+        finally:
+            await backend_http_pool.aclose()
+
     app = FastAPI(
         title="Skill Runner Built-in E2E Example Client",
         description="Independent UI client for E2E validation against management/jobs APIs.",
         version="0.1.0",
+        lifespan=lifespan,
     )
     app.state.settings = settings
     app.include_router(router)
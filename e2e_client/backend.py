@@ -6,6 +6,8 @@ from typing import Any, Literal
 
 import httpx
 
+from .upstream import BackendHttpPool, SseFanout, backend_http_pool, backend_sse_fanout
+
 RunSource = Literal["installed", "temp"]
 RUN_SOURCE_INSTALLED: RunSource = "installed"
 RUN_SOURCE_TEMP: RunSource = "temp"
@@ -210,8 +212,16 @@ class BackendClient:
 
 
 class HttpBackendClient(BackendClient):
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        http_pool: BackendHttpPool | None = None,
+        sse_fanout: SseFanout | None = None,
+    ):
         self._base_url = base_url.rstrip("/")
+        self._http_pool = http_pool or backend_http_pool
+        self._sse_fanout = sse_fanout or backend_sse_fanout
 
     async def list_management_engines(self) -> dict[str, Any]:
         return await self._request_json("GET", "/v1/management/engines")
@@ -345,13 +355,12 @@ class HttpBackendClient(BackendClient):
         if normalized_provider:
             data["provider_id"] = normalized_provider
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
-                    method="POST",
-                    url=url,
-                    data=data if data else None,
-                    files=multipart_files,
-                )
+            response = await self._http_pool.client().request(
+                method="POST",
+                url=url,
+                data=data if data else None,
+                files=multipart_files,
+            )
         except (httpx.RequestError, httpx.TimeoutException) as exc:
             raise _backend_unreachable_error(exc) from exc
         if response.status_code >= 400:
@@ -454,20 +463,14 @@ class HttpBackendClient(BackendClient):
         run_source: RunSource = RUN_SOURCE_INSTALLED,
         cursor: int = 0,
     ) -> AsyncIterator[bytes]:
-        params = {"cursor": cursor}
         path = f"{self._run_base_path(request_id, run_source=run_source)}/events"
-        url = f"{self._base_url}{path}"
-        try:
-            async with httpx.AsyncClient(timeout=None) as client:
-                async with client.stream("GET", url, params=params) as response:
-                    if response.status_code >= 400:
-                        detail = await _extract_error_detail(response)
-                        raise BackendApiError(response.status_code, detail)
-                    async for chunk in response.aiter_bytes():
-                        if chunk:
-                            yield chunk
-        except (httpx.RequestError, httpx.TimeoutException) as exc:
-            raise _backend_unreachable_error(exc) from exc
+        async for chunk in self._sse_fanout.subscribe(
+            f"{self._base_url}{path}",
+            cursor=cursor,
+            opener=lambda start_cursor: self._stream_bytes(path, cursor=start_cursor),
+            refresh_snapshot=lambda: self.get_run_state(request_id, run_source=run_source),
+        ):
+            yield chunk
 
     async def get_run_event_history(
         self,
@@ -501,20 +504,14 @@ class HttpBackendClient(BackendClient):
         run_source: RunSource = RUN_SOURCE_INSTALLED,
         cursor: int = 0,
     ) -> AsyncIterator[bytes]:
-        params = {"cursor": cursor}
         path = f"{self._run_base_path(request_id, run_source=run_source)}/chat"
-        url = f"{self._base_url}{path}"
-        try:
-            async with httpx.AsyncClient(timeout=None) as client:
-                async with client.stream("GET", url, params=params) as response:
-                    if response.status_code >= 400:
-                        detail = await _extract_error_detail(response)
-                        raise BackendApiError(response.status_code, detail)
-                    async for chunk in response.aiter_bytes():
-                        if chunk:
-                            yield chunk
-        except (httpx.RequestError, httpx.TimeoutException) as exc:
-            raise _backend_unreachable_error(exc) from exc
+        async for chunk in self._sse_fanout.subscribe(
+            f"{self._base_url}{path}",
+            cursor=cursor,
+            opener=lambda start_cursor: self._stream_bytes(path, cursor=start_cursor),
+            refresh_snapshot=lambda: self.get_run_state(request_id, run_source=run_source),
+        ):
+            yield chunk
 
     async def get_run_chat_history(
         self,
@@ -575,14 +572,13 @@ class HttpBackendClient(BackendClient):
     ) -> dict[str, Any]:
         url = f"{self._base_url}{path}"
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    json=json_payload,
-                    files=files,
-                    params=params,
-                )
+            response = await self._http_pool.client().request(
+                method=method,
+                url=url,
+                json=json_payload,
+                files=files,
+                params=params,
+            )
         except (httpx.RequestError, httpx.TimeoutException) as exc:
             raise _backend_unreachable_error(exc) from exc
         if response.status_code >= 400:
@@ -600,11 +596,10 @@ class HttpBackendClient(BackendClient):
     ) -> bytes:
         url = f"{self._base_url}{path}"
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                )
+            response = await self._http_pool.client().request(
+                method=method,
+                url=url,
+            )
         except (httpx.RequestError, httpx.TimeoutException) as exc:
             raise _backend_unreachable_error(exc) from exc
         if response.status_code >= 400:
@@ -612,6 +607,24 @@ class HttpBackendClient(BackendClient):
             raise BackendApiError(response.status_code, detail)
         return response.content
 
+    async def _stream_bytes(self, path: str, *, cursor: int) -> AsyncIterator[bytes]:
+        url = f"{self._base_url}{path}"
+        try:
+            async with self._http_pool.client().stream(
+                "GET",
+                url,
+                params={"cursor": cursor},
+                timeout=None,
+            ) as response:
+                if response.status_code >= 400:
+                    detail = await _extract_error_detail(response)
+                    raise BackendApiError(response.status_code, detail)
+                async for chunk in response.aiter_bytes():
+                    if chunk:
+                        yield chunk
+        except (httpx.RequestError, httpx.TimeoutException) as exc:
+            raise _backend_unreachable_error(exc) from exc
+
 
 def _backend_unreachable_error(exc: Exception) -> BackendApiError:
     _ = exc
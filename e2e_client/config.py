@@ -10,6 +10,11 @@ PORT_ENV = "SKILL_RUNNER_E2E_CLIENT_PORT"
 BACKEND_BASE_URL_ENV = "SKILL_RUNNER_E2E_CLIENT_BACKEND_BASE_URL"
 HOST_ENV = "SKILL_RUNNER_E2E_CLIENT_HOST"
 FIXTURES_SKILLS_DIR_ENV = "SKILL_RUNNER_E2E_CLIENT_FIXTURES_SKILLS_DIR"
+BACKEND_MAX_CONNECTIONS_ENV = "SKILL_RUNNER_E2E_CLIENT_BACKEND_MAX_CONNECTIONS"
+BACKEND_MAX_KEEPALIVE_ENV = "SKILL_RUNNER_E2E_CLIENT_BACKEND_MAX_KEEPALIVE"
+BACKEND_KEEPALIVE_EXPIRY_ENV = "SKILL_RUNNER_E2E_CLIENT_BACKEND_KEEPALIVE_EXPIRY_SEC"
+BACKEND_HTTP2_ENV = "SKILL_RUNNER_E2E_CLIENT_BACKEND_HTTP2"
+SSE_REPLAY_BUFFER_ENV = "SKILL_RUNNER_E2E_CLIENT_SSE_REPLAY_BUFFER"
 
 
 @dataclass(frozen=True)
@@ -18,6 +23,11 @@ class E2EClientSettings:
     port: int
     backend_base_url: str
     fixtures_skills_dir: Path
+    backend_max_connections: int = 100
+    backend_max_keepalive: int = 20
+    backend_keepalive_expiry_sec: float = 30.0
+    backend_http2: bool = True
+    sse_replay_buffer: int = 2000
 
 
 def load_settings() -> E2EClientSettings:
@@ -42,6 +52,13 @@ def load_settings() -> E2EClientSettings:
         port=port,
         backend_base_url=backend_base_url.rstrip("/"),
         fixtures_skills_dir=fixtures_skills_dir,
+        backend_max_connections=_parse_positive_int(os.environ.get(BACKEND_MAX_CONNECTIONS_ENV), default=100),
+        backend_max_keepalive=_parse_positive_int(os.environ.get(BACKEND_MAX_KEEPALIVE_ENV), default=20),
+        backend_keepalive_expiry_sec=float(
+            _parse_positive_int(os.environ.get(BACKEND_KEEPALIVE_EXPIRY_ENV), default=30)
+        ),
+        backend_http2=_parse_bool(os.environ.get(BACKEND_HTTP2_ENV), default=True),
+        sse_replay_buffer=_parse_positive_int(os.environ.get(SSE_REPLAY_BUFFER_ENV), default=2000),
     )
 
 
@@ -58,3 +75,24 @@ def _parse_port(raw: str | None, *, default: int) -> int:
     if value < 1 or value > 65535:
         return default
     return value
+
+
+def _parse_positive_int(raw: str | None, *, default: int) -> int:
+    if raw is None:
+        return default
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _parse_bool(raw: str | None, *, default: bool) -> bool:
+    if raw is None:
+        return default
+    text = raw.strip().lower()
+    if text in {"1", "true", "yes", "on"}:
+        return True
+    if text in {"0", "false", "no", "off"}:
+        return False
+    return default
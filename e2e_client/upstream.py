@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from .config import E2EClientSettings
+
+DEFAULT_REQUEST_TIMEOUT_SEC = 30.0
+_SUBSCRIBER_QUEUE_SLACK = 256
+_SNAPSHOT_STATE_FIELDS = ("status", "pending_interaction_id", "pending_auth_session_id")
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class BackendHttpPool:
+    """
+    Process-wide pooled `httpx.AsyncClient` for backend calls.
+
+    Connections are kept alive across requests within the configured limits;
+    HTTP/2 is enabled when requested and the `h2` package is installed. The
+    client is bound to the event loop it was created on and is recreated if
+    the loop changes (e.g. between test event loops). A client replaced by
+    `configure` keeps serving its in-flight requests and is closed by
+    `aclose` at shutdown.
+    """
+
+    def __init__(self, *, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self._transport = transport
+        self._limits = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+        self._http2 = False
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._retired: list[tuple[httpx.AsyncClient, asyncio.AbstractEventLoop | None]] = []
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    def configure(self, settings: E2EClientSettings) -> None:
+        self._limits = httpx.Limits(
+            max_connections=settings.backend_max_connections,
+            max_keepalive_connections=min(settings.backend_max_keepalive, settings.backend_max_connections),
+            keepalive_expiry=settings.backend_keepalive_expiry_sec,
+        )
+        self._http2 = bool(settings.backend_http2) and _http2_available()
+        # Picked up by the next client() call; in-flight requests keep the old client.
+        self._retire_client()
+
+    def _retire_client(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            self._retired.append((self._client, self._loop))
+        self._client = None
+        self._loop = None
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._retire_client()
+            self._client = httpx.AsyncClient(
+                timeout=DEFAULT_REQUEST_TIMEOUT_SEC,
+                limits=self._limits,
+                http2=self._http2,
+                transport=self._transport,
+            )
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        self._retire_client()
+        retired, self._retired = self._retired, []
+        loop = asyncio.get_running_loop()
+        for client, client_loop in retired:
+            # Clients of another (finished) event loop cannot be closed from this one.
+            if client_loop is loop and not client.is_closed:
+                await client.aclose()
+
+
+@dataclass(frozen=True)
+class SseFrame:
+    raw: bytes
+    event: str
+    data: Any = None
+
+    @property
+    def seq(self) -> int | None:
+        if isinstance(self.data, dict):
+            seq = self.data.get("seq")
+            if isinstance(seq, int):
+                return seq
+        return None
+
+
+def parse_sse_frame(raw: bytes) -> SseFrame:
+    event = "message"
+    data_lines: list[str] = []
+    for line in raw.decode("utf-8", errors="replace").splitlines():
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].lstrip())
+    data: Any = None
+    if data_lines:
+        try:
+            data = json.loads("\n".join(data_lines))
+        except json.JSONDecodeError:
+            data = None
+    return SseFrame(raw=raw + b"\n\n", event=event, data=data)
+
+
+async def iter_sse_frames(chunks: AsyncIterator[bytes]) -> AsyncIterator[SseFrame]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk.replace(b"\r\n", b"\n")
+        while b"\n\n" in buffer:
+            raw, buffer = buffer.split(b"\n\n", 1)
+            if raw.strip():
+                yield parse_sse_frame(raw)
+    if buffer.strip():
+        yield parse_sse_frame(buffer.rstrip(b"\n"))
+
+
+def _format_frame(event: str, payload: Any) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+_END = object()
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    cursor: int
+    last_seq: int
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    error: BaseException | None = None
+    closed: bool = False
+
+
+class _SharedSseStream:
+    def __init__(
+        self,
+        *,
+        key: str,
+        start_cursor: int,
+        opener: Callable[[int], AsyncIterator[bytes]],
+        replay_limit: int,
+        on_finished: Callable[["_SharedSseStream"], None],
+    ) -> None:
+        self.key = key
+        self.start_cursor = start_cursor
+        self._opener = opener
+        self._buffer: deque[SseFrame] = deque(maxlen=max(1, replay_limit))
+        self._evicted_through = start_cursor
+        self._snapshot: dict[str, Any] | None = None
+        self._snapshot_seq = start_cursor
+        self._last_seq = start_cursor
+        self._subscribers: set[_Subscriber] = set()
+        self._queue_limit = max(1, replay_limit) + _SUBSCRIBER_QUEUE_SLACK
+        self._on_finished = on_finished
+        self._task: asyncio.Task[None] | None = None
+        self.done = False
+        self.closing = False
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._pump())
+
+    def covers(self, cursor: int) -> bool:
+        return not self.done and not self.closing and cursor >= self._evicted_through
+
+    @property
+    def snapshot_stale(self) -> bool:
+        """True once events arrived after the upstream snapshot, so its state may be outdated."""
+        return self._snapshot is not None and self._last_seq > self._snapshot_seq
+
+    def refresh_snapshot(self, state: dict[str, Any], *, as_of_seq: int) -> None:
+        if self._snapshot is None:
+            return
+        snapshot = dict(self._snapshot)
+        for name in _SNAPSHOT_STATE_FIELDS:
+            value = state.get(name)
+            if value is None:
+                if name != "status":
+                    snapshot.pop(name, None)
+            else:
+                snapshot[name] = value
+        self._snapshot = snapshot
+        self._snapshot_seq = max(self._snapshot_seq, as_of_seq)
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def attach(self, cursor: int) -> _Subscriber:
+        subscriber = _Subscriber(cursor=cursor, last_seq=cursor)
+        if self._snapshot is not None:
+            subscriber.queue.put_nowait(self._snapshot_for(subscriber))
+        for frame in self._buffer:
+            seq = frame.seq
+            if seq is not None and seq > subscriber.last_seq:
+                subscriber.queue.put_nowait(frame.raw)
+                subscriber.last_seq = seq
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def detach(self, subscriber: _Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        if not self._subscribers and not self.done and self._task is not None:
+            # `done` flips only when the pump's `finally` runs; until then the
+            # stream must not take new viewers.
+            self.closing = True
+            self._task.cancel()
+
+    def _snapshot_for(self, subscriber: _Subscriber) -> bytes:
+        payload = dict(self._snapshot or {})
+        payload["cursor"] = subscriber.cursor
+        return _format_frame("snapshot", payload)
+
+    async def _pump(self) -> None:
+        error: BaseException | None = None
+        try:
+            async for frame in iter_sse_frames(self._opener(self.start_cursor)):
+                self._dispatch(frame)
+        except asyncio.CancelledError:
+            pass
+        except (httpx.HTTPError, RuntimeError, ValueError) as exc:
+            # BackendApiError is a RuntimeError; viewers re-raise it.
+            error = exc
+        finally:
+            self.done = True
+            for subscriber in list(self._subscribers):
+                self._close(subscriber, error)
+            self._on_finished(self)
+
+    def _dispatch(self, frame: SseFrame) -> None:
+        if frame.event == "snapshot" and isinstance(frame.data, dict):
+            self._snapshot = frame.data
+            self._snapshot_seq = self._last_seq
+            for subscriber in list(self._subscribers):
+                self._send(subscriber, self._snapshot_for(subscriber))
+            return
+        seq = frame.seq
+        if seq is None:
+            for subscriber in list(self._subscribers):
+                self._send(subscriber, frame.raw)
+            return
+        self._last_seq = max(self._last_seq, seq)
+        if len(self._buffer) == self._buffer.maxlen:
+            evicted_seq = self._buffer[0].seq
+            if evicted_seq is not None:
+                self._evicted_through = max(self._evicted_through, evicted_seq)
+        self._buffer.append(frame)
+        for subscriber in list(self._subscribers):
+            if seq > subscriber.last_seq:
+                self._send(subscriber, frame.raw)
+                subscriber.last_seq = seq
+
+    def _send(self, subscriber: _Subscriber, payload: bytes) -> None:
+        if subscriber.closed:
+            return
+        if subscriber.queue.qsize() >= self._queue_limit:
+            # Slow viewer: end its stream; the browser reconnects with its cursor.
+            self._subscribers.discard(subscriber)
+            self._close(subscriber, None)
+            return
+        subscriber.queue.put_nowait(payload)
+
+    def _close(self, subscriber: _Subscriber, error: BaseException | None) -> None:
+        if subscriber.closed:
+            return
+        subscriber.closed = True
+        subscriber.error = error
+        subscriber.queue.put_nowait(_END)
+
+
+class SseFanout:
+    """
+    Share one upstream SSE connection per run stream among all viewers.
+
+    The first viewer opens the upstream stream at its cursor. Later viewers
+    attach to it and get the snapshot (with their own cursor) plus every
+    buffered `chat_event` after their cursor, then live frames. When events
+    arrived after the upstream snapshot, its status and pending ids are first
+    refreshed through `refresh_snapshot`. A viewer whose cursor is older than
+    what the shared stream can replay gets a private upstream stream instead.
+    The upstream is closed when the last viewer leaves or the backend ends
+    the stream; a viewer arriving while it closes starts a new one.
+    """
+
+    def __init__(self, *, replay_limit: int = 2000) -> None:
+        self._replay_limit = replay_limit
+        self._streams: dict[str, _SharedSseStream] = {}
+
+    def configure(self, settings: E2EClientSettings) -> None:
+        self._replay_limit = settings.sse_replay_buffer
+
+    def active_streams(self) -> dict[str, int]:
+        return {key: stream.subscriber_count for key, stream in self._streams.items()}
+
+    async def subscribe(
+        self,
+        key: str,
+        *,
+        cursor: int,
+        opener: Callable[[int], AsyncIterator[bytes]],
+        refresh_snapshot: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+    ) -> AsyncIterator[bytes]:
+        cursor = max(0, int(cursor))
+        stream = self._streams.get(key)
+        if stream is not None and stream.closing:
+            stream = None
+        if stream is not None and not stream.covers(cursor):
+            async for chunk in opener(cursor):
+                yield chunk
+            return
+        if stream is None:
+            stream = _SharedSseStream(
+                key=key,
+                start_cursor=cursor,
+                opener=opener,
+                replay_limit=self._replay_limit,
+                on_finished=self._forget,
+            )
+            self._streams[key] = stream
+            stream.start()
+        elif refresh_snapshot is not None and stream.snapshot_stale:
+            as_of_seq = stream.last_seq
+            try:
+                state = await refresh_snapshot()
+            except (httpx.HTTPError, RuntimeError, ValueError):
+                state = None
+            if isinstance(state, dict):
+                stream.refresh_snapshot(state, as_of_seq=as_of_seq)
+            if stream.closing or stream.done:
+                async for chunk in self.subscribe(
+                    key, cursor=cursor, opener=opener, refresh_snapshot=refresh_snapshot
+                ):
+                    yield chunk
+                return
+        subscriber = stream.attach(cursor)
+        try:
+            while True:
+                item = await subscriber.queue.get()
+                if item is _END:
+                    if subscriber.error is not None:
+                        raise subscriber.error
+                    return
+                yield item
+        finally:
+            stream.detach(subscriber)
+
+    def _forget(self, stream: _SharedSseStream) -> None:
+        if self._streams.get(stream.key) is stream:
+            del self._streams[stream.key]
+
+
+backend_http_pool = BackendHttpPool()
+backend_sse_fanout = SseFanout()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from server.config import config
+from server.services.orchestration.run_protocol_reindex_service import (
+    ProtocolReindexBusyError,
+    ProtocolReindexOptions,
+    ProtocolReindexValidationError,
+    close_sqlite_handles,
+    run_protocol_reindex_service,
+)
+from server.services.orchestration.runtime_observability_ports import install_runtime_observability_ports
+from server.services.orchestration.runtime_protocol_ports import install_runtime_protocol_ports
+
+
+def _print_progress(result: dict[str, Any], state: dict[str, Any]) -> None:
+    if result.get("skipped"):
+        status = "skip"
+    elif not result.get("success"):
+        status = "FAIL"
+    elif "changed" in result:
+        status = "diff" if result["changed"] else "same"
+    else:
+        status = "ok"
+    print(
+        f"[{state.get('done')}/{state.get('total')}] {status:<4} {result.get('request_id')} "
+        f"{result.get('reason')}",
+        flush=True,
+    )
+    if result.get("changed"):
+        for attempt, diff in (result.get("diff") or {}).items():
+            streams = diff.get("streams") or {}
+            summary = ", ".join(
+                f"{name} {item.get('stored')}->{item.get('rebuilt')} changed={item.get('changed_rows')}"
+                for name, item in streams.items()
+            )
+            print(f"    attempt {attempt}: {summary}; metrics_changed={diff.get('metrics_changed')}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Strictly replay protocol history (events / FCMP / diagnostics / metrics) "
+            "of many terminal runs from their io_chunks journals."
+        )
+    )
+    parser.add_argument(
+        "--request-id",
+        action="append",
+        default=[],
+        help="Reindex only this request (repeatable). Default: every terminal run.",
+    )
+    parser.add_argument(
+        "--engine",
+        action="append",
+        default=[],
+        help="Only runs of this engine (repeatable).",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many selected runs.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(config.SYSTEM.PROTOCOL_REINDEX_WORKERS),
+        help="Worker processes; 0 replays in this process.",
+    )
+    parser.add_argument(
+        "--max-runs-per-sec",
+        type=float,
+        default=float(config.SYSTEM.PROTOCOL_REINDEX_MAX_RUNS_PER_SEC),
+        help="Submission rate limit; 0 disables throttling.",
+    )
+    parser.add_argument(
+        "--nice",
+        type=int,
+        default=int(config.SYSTEM.PROTOCOL_REINDEX_WORKER_NICE),
+        help="Niceness increment applied to worker processes.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Replay without backing up or writing; report per-attempt diffs.",
+    )
+    parser.add_argument(
+        "--job-id",
+        default=None,
+        help="Resume this job (its original selection and options are kept).",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary.")
+    args = parser.parse_args()
+
+    install_runtime_protocol_ports()
+    install_runtime_observability_ports()
+    options = ProtocolReindexOptions(
+        request_ids=tuple(args.request_id),
+        engines=tuple(args.engine),
+        limit=args.limit,
+        workers=max(0, args.workers),
+        dry_run=args.dry_run,
+        max_runs_per_sec=max(0.0, args.max_runs_per_sec),
+        worker_nice=max(0, args.nice),
+    )
+
+    async def _run() -> dict[str, Any]:
+        try:
+            return await run_protocol_reindex_service.run_job(
+                options,
+                job_id=args.job_id,
+                on_progress=None if args.quiet else _print_progress,
+            )
+        finally:
+            await close_sqlite_handles()
+
+    try:
+        state = asyncio.run(_run())
+    except (ProtocolReindexBusyError, ProtocolReindexValidationError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("Interrupted; re-run with --job-id to resume.", file=sys.stderr)
+        return 130
+    print(json.dumps({key: value for key, value in state.items() if key != "options"}, ensure_ascii=False, indent=2))
+    print(f"Job directory: {run_protocol_reindex_service.job_dir(str(state.get('job_id')))}")
+    return 0 if state.get("status") == "succeeded" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -43,6 +43,12 @@
       metaEl.className = options.metaClass || "preview-meta";
       metaEl.textContent = `${safeText((preview && preview.meta) || "text")} · ${formatLabelByType(detectedFormat, formatLabels)}`;
       targetEl.appendChild(metaEl);
+      if (preview && preview.window && preview.window.truncated) {
+        const partialEl = document.createElement("div");
+        partialEl.className = options.metaClass || "preview-meta";
+        partialEl.textContent = i18n.filePartialPreview || "Partial preview";
+        targetEl.appendChild(partialEl);
+      }
 
       const renderedHtml = safeText(preview && preview.rendered_html).trim();
       if (renderedHtml) {
@@ -85,6 +85,26 @@ _C.SYSTEM.PROCESS_SUPERVISOR_ENABLED = _env_bool("PROCESS_SUPERVISOR_ENABLED", T
 _C.SYSTEM.PROCESS_SWEEP_INTERVAL_SEC = int(os.environ.get("PROCESS_SWEEP_INTERVAL_SEC", "15"))
 _C.SYSTEM.PROCESS_TERMINATE_GRACE_SEC = int(os.environ.get("PROCESS_TERMINATE_GRACE_SEC", "3"))
 _C.SYSTEM.PROCESS_KILL_GRACE_SEC = int(os.environ.get("PROCESS_KILL_GRACE_SEC", "3"))
+# Multi-worker mode: number of uvicorn worker processes sharing DATA_DIR.
+# Workers coordinate through the run store (heartbeat rows, run leases) and
+# relay live events to each other over Unix sockets in WORKER_IPC_DIR.
+_C.SYSTEM.WORKERS = _env_bounded_positive_int("SKILL_RUNNER_WORKERS", 1, 64)
+_C.SYSTEM.WORKER_HEARTBEAT_INTERVAL_SEC = _env_bounded_positive_int(
+    "SKILL_RUNNER_WORKER_HEARTBEAT_INTERVAL_SEC",
+    5,
+    300,
+)
+_C.SYSTEM.WORKER_LEASE_TTL_SEC = _env_bounded_positive_int("SKILL_RUNNER_WORKER_LEASE_TTL_SEC", 30, 3600)
+_C.SYSTEM.WORKER_IPC_DIR = os.environ.get(
+    "SKILL_RUNNER_WORKER_IPC_DIR",
+    os.path.join(_C.SYSTEM.DATA_DIR, "workers"),
+)
+# Attempt parser executor: run engine live stream parser sessions (NDJSON
+# parsing and semantic extraction) in dedicated processes instead of on the
+# event loop that serves HTTP. Emissions come back over a pipe; canonical
+# FCMP/RASP publishing and persistence stay in the server process.
+_C.SYSTEM.ATTEMPT_PARSER_EXECUTOR_ENABLED = _env_bool("SKILL_RUNNER_ATTEMPT_PARSER_EXECUTOR", False)
+_C.SYSTEM.ATTEMPT_PARSER_PROCESSES = _env_bounded_positive_int("SKILL_RUNNER_ATTEMPT_PARSER_PROCESSES", 2, 32)
 _C.SYSTEM.LOCAL_RUNTIME_LEASE_TTL_SEC = int(
     os.environ.get("SKILL_RUNNER_LOCAL_RUNTIME_LEASE_TTL_SEC", "60")
 )
@@ -131,6 +151,28 @@ _C.SYSTEM.RUNS_DIR = os.path.join(_C.SYSTEM.DATA_DIR, "runs")
 _C.SYSTEM.WORKSPACES_DIR = os.path.join(_C.SYSTEM.DATA_DIR, "workspaces")
 _C.SYSTEM.REQUESTS_DIR = os.path.join(_C.SYSTEM.DATA_DIR, "requests")
 _C.SYSTEM.TMP_UPLOADS_DIR = os.path.join(_C.SYSTEM.DATA_DIR, "tmp_uploads")
+_C.SYSTEM.UPLOAD_MAX_BYTES = int(os.environ.get("SKILL_RUNNER_UPLOAD_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+_C.SYSTEM.UPLOAD_MAX_EXTRACTED_BYTES = int(
+    os.environ.get("SKILL_RUNNER_UPLOAD_MAX_EXTRACTED_BYTES", str(8 * 1024 * 1024 * 1024))
+)
+_C.SYSTEM.UPLOAD_MAX_ZIP_MEMBERS = int(os.environ.get("SKILL_RUNNER_UPLOAD_MAX_ZIP_MEMBERS", "20000"))
+_C.SYSTEM.UPLOAD_MAX_COMPRESSION_RATIO = float(os.environ.get("SKILL_RUNNER_UPLOAD_MAX_COMPRESSION_RATIO", "200"))
+_C.SYSTEM.UPLOAD_SPOOL_CHUNK_BYTES = int(os.environ.get("SKILL_RUNNER_UPLOAD_SPOOL_CHUNK_BYTES", str(1024 * 1024)))
+_C.SYSTEM.CONTENT_STORE_DIR = os.path.join(_C.SYSTEM.DATA_DIR, "cas")
+_C.SYSTEM.CONTENT_STORE_ENABLED = _env_bool("SKILL_RUNNER_CONTENT_STORE_ENABLED", False)
+_C.SYSTEM.CONTENT_STORE_MIN_FILE_BYTES = int(os.environ.get("SKILL_RUNNER_CONTENT_STORE_MIN_FILE_BYTES", "4096"))
+_C.SYSTEM.FS_SNAPSHOT_HASH_WORKERS = _env_bounded_positive_int("SKILL_RUNNER_FS_SNAPSHOT_HASH_WORKERS", 4, 64)
+_C.SYSTEM.RUN_STATE_CACHE_MAX_ENTRIES = _env_bounded_positive_int(
+    "SKILL_RUNNER_RUN_STATE_CACHE_MAX_ENTRIES",
+    4096,
+    1_000_000,
+)
+_C.SYSTEM.PROTOCOL_REINDEX_DIR = os.path.join(_C.SYSTEM.DATA_DIR, "protocol_reindex")
+_C.SYSTEM.PROTOCOL_REINDEX_WORKERS = _env_bounded_positive_int("SKILL_RUNNER_PROTOCOL_REINDEX_WORKERS", 2, 32)
+_C.SYSTEM.PROTOCOL_REINDEX_MAX_RUNS_PER_SEC = float(
+    os.environ.get("SKILL_RUNNER_PROTOCOL_REINDEX_MAX_RUNS_PER_SEC", "5")
+)
+_C.SYSTEM.PROTOCOL_REINDEX_WORKER_NICE = int(os.environ.get("SKILL_RUNNER_PROTOCOL_REINDEX_WORKER_NICE", "10"))
 _C.SYSTEM.INTERACTION_FILES = CN()
 _C.SYSTEM.INTERACTION_FILES.MAX_FILES = _env_bounded_positive_int(
     "SKILL_RUNNER_INTERACTION_FILES_MAX_FILES",
@@ -262,6 +304,12 @@ _C.SYSTEM.TEMP_SKILL_PACKAGE_CACHE_TTL_DAYS = int(
 
 _C.SYSTEM.RUN_RETENTION_DAYS = 7
 _C.SYSTEM.RUN_CLEANUP_INTERVAL_HOURS = 12
+# Result cache eviction reclaims run directories, so it is off until a limit is set.
+_C.SYSTEM.RESULT_CACHE_MAX_BYTES = int(os.environ.get("SKILL_RUNNER_RESULT_CACHE_MAX_BYTES", "0"))
+_C.SYSTEM.RESULT_CACHE_TTL_HOURS = float(os.environ.get("SKILL_RUNNER_RESULT_CACHE_TTL_HOURS", "0"))
+_C.SYSTEM.RESULT_CACHE_EVICTION_INTERVAL_MINUTES = int(
+    os.environ.get("SKILL_RUNNER_RESULT_CACHE_EVICTION_INTERVAL_MINUTES", "15")
+)
 
 _C.SYSTEM.CONCURRENCY = CN()
 _C.SYSTEM.CONCURRENCY.MAX_CONCURRENT_HARD_CAP = 16
@@ -274,6 +322,19 @@ _C.SYSTEM.CONCURRENCY.ESTIMATED_FD_PER_RUN = 64
 _C.SYSTEM.CONCURRENCY.PID_RESERVE = 128
 _C.SYSTEM.CONCURRENCY.ESTIMATED_PID_PER_RUN = 1
 _C.SYSTEM.CONCURRENCY.FALLBACK_MAX_CONCURRENT = 2
+_C.SYSTEM.CONCURRENCY.ADAPTIVE_ENABLED = False
+_C.SYSTEM.CONCURRENCY.ADAPTIVE_INTERVAL_SEC = 10.0
+_C.SYSTEM.CONCURRENCY.MIN_CONCURRENT = 1
+# Per-pool budgets nested under the global slot gate. Entries are
+# "<pool>=<limit>" with pool "engine", "engine/provider" or
+# "engine/provider/model"; unlisted pools are only bound by the global gate.
+_C.SYSTEM.CONCURRENCY.ENGINE_LIMITS = ()
+_C.SYSTEM.CONCURRENCY.PROVIDER_LIMITS = ()
+_C.SYSTEM.CONCURRENCY.MODEL_LIMITS = ()
+# Token-bucket start rates: "<engine>/<provider>=<starts_per_min>[:<burst>]".
+_C.SYSTEM.CONCURRENCY.PROVIDER_START_RATES = ()
+_C.SYSTEM.CONCURRENCY.RATE_LIMIT_BACKOFF_BASE_SEC = 15.0
+_C.SYSTEM.CONCURRENCY.RATE_LIMIT_BACKOFF_MAX_SEC = 600.0
 
 _C.SYSTEM.UI_BASIC_AUTH_ENABLED = _env_bool("UI_BASIC_AUTH_ENABLED", False)
 _C.SYSTEM.UI_BASIC_AUTH_USERNAME = os.environ.get("UI_BASIC_AUTH_USERNAME", "")
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Iterable
 from tempfile import NamedTemporaryFile
 
+from server.engines.common.trust_document import BatchedTrustDocument
+
 _PATH_RESOLVE_EXCEPTIONS = (
     OSError,
     RuntimeError,
@@ -27,6 +29,9 @@ _FILE_LOCK_EXCEPTIONS = (
 
 
 class ClaudeTrustFolderStrategy:
+    # Claude keys trust per project directory; parents are not inherited.
+    inherits_parent_trust = False
+
     def __init__(
         self,
         config_path: Path,
@@ -39,11 +44,15 @@ class ClaudeTrustFolderStrategy:
         self.managed_roots = tuple(Path(root).resolve() for root in roots)
         self._thread_locks: dict[str, threading.Lock] = {}
         self._locks_guard = threading.Lock()
+        self._document = BatchedTrustDocument(
+            self.config_path,
+            load=self._load_or_repair_global_config_unlocked,
+            dump=lambda payload: self._write_json_atomically(self.config_path, payload),
+            file_lock=self._locked_file,
+        )
 
     def register(self, normalized_path: str) -> None:
-        self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._locked_file(self.config_path):
-            payload = self._load_or_repair_global_config_unlocked()
+        def _mark_trusted(payload: dict[str, object]) -> bool:
             projects = payload.get("projects")
             if not isinstance(projects, dict):
                 projects = {}
@@ -52,20 +61,25 @@ class ClaudeTrustFolderStrategy:
             if not isinstance(existing, dict):
                 existing = {}
                 projects[normalized_path] = existing
+            elif existing.get("hasTrustDialogAccepted") is True:
+                return False
             existing["hasTrustDialogAccepted"] = True
-            self._write_json_atomically(self.config_path, payload)
+            return True
+
+        self._document.apply(_mark_trusted)
 
     def remove(self, normalized_path: str) -> None:
         if not self.config_path.exists():
             return
-        with self._locked_file(self.config_path):
-            payload = self._load_or_repair_global_config_unlocked()
+
+        def _drop(payload: dict[str, object]) -> bool:
             projects = payload.get("projects")
-            if not isinstance(projects, dict):
-                return
-            if normalized_path in projects:
+            if isinstance(projects, dict) and normalized_path in projects:
                 del projects[normalized_path]
-                self._write_json_atomically(self.config_path, payload)
+                return True
+            return False
+
+        self._document.apply(_drop)
 
     def bootstrap_parent_trust(self, normalized_parent_path: str) -> None:
         _ = normalized_parent_path
@@ -73,21 +87,21 @@ class ClaudeTrustFolderStrategy:
     def cleanup_stale(self, active_normalized_paths: set[str]) -> None:
         if not self.config_path.exists():
             return
-        with self._locked_file(self.config_path):
-            payload = self._load_or_repair_global_config_unlocked()
+
+        def _drop_stale(payload: dict[str, object]) -> bool:
             projects = payload.get("projects")
             if not isinstance(projects, dict):
-                return
+                return False
             stale = [
                 key
                 for key in list(projects.keys())
                 if self._is_run_child_path(key) and key not in active_normalized_paths
             ]
-            if not stale:
-                return
             for key in stale:
                 del projects[key]
-            self._write_json_atomically(self.config_path, payload)
+            return bool(stale)
+
+        self._document.apply(_drop_stale)
 
     def _is_run_child_path(self, raw_path: str) -> bool:
         try:
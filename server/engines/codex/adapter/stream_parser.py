@@ -18,11 +18,10 @@ from server.runtime.adapter.common.parser_auth_signal_matcher import (
     detect_auth_signal_from_patterns,
 )
 from server.runtime.protocol.parse_utils import (
-    collect_json_parse_errors,
+    PreparedRuntimeStreams,
     dedup_assistant_messages,
     find_session_id,
-    stream_lines_with_offsets,
-    strip_runtime_script_envelope,
+    prepare_runtime_streams,
 )
 from server.runtime.protocol.engine_error_governance import (
     classify_engine_error_payload,
@@ -176,10 +175,16 @@ class CodexStreamParser:
         stderr_raw: bytes,
         pty_raw: bytes = b"",
     ) -> dict[str, object]:
-        stdout_rows = strip_runtime_script_envelope(stream_lines_with_offsets("stdout", stdout_raw))
-        pty_rows = strip_runtime_script_envelope(stream_lines_with_offsets("pty", pty_raw))
-        records_all, raw_rows = collect_json_parse_errors(stdout_rows)
-        pty_records_all, pty_raw_rows = collect_json_parse_errors(pty_rows)
+        return self.parse_prepared_runtime_stream(
+            prepare_runtime_streams(stdout_raw=stdout_raw, stderr_raw=stderr_raw, pty_raw=pty_raw)
+        )
+
+    def parse_prepared_runtime_stream(self, prepared: PreparedRuntimeStreams) -> dict[str, object]:
+        stdout_raw = prepared.stdout.raw
+        stderr_raw = prepared.stderr_raw
+        pty_raw = prepared.pty.raw
+        records_all, raw_rows = prepared.stdout.records, list(prepared.stdout.error_rows)
+        pty_records_all, pty_raw_rows = prepared.pty.records, list(prepared.pty.error_rows)
         records = self._slice_latest_turn_rows(records_all)
         pty_records = self._slice_latest_turn_rows(pty_records_all)
 
@@ -461,6 +466,7 @@ class _CodexLiveSession(NdjsonLiveStreamParserSession):
         super().__init__(
             accepted_streams={"stdout", "pty"},
             overflow_exemption_probe=parser.classify_ndjson_overflow_exemption,
+            prepared_stream_parser=parser.parse_prepared_runtime_stream,
         )
         self._parser = parser
         (
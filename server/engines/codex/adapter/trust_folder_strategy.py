@@ -10,6 +10,8 @@ from tempfile import NamedTemporaryFile
 import tomlkit
 from tomlkit.exceptions import TOMLKitError
 
+from server.engines.common.trust_document import BatchedTrustDocument
+
 _PATH_RESOLVE_EXCEPTIONS = (
     OSError,
     RuntimeError,
@@ -29,6 +31,9 @@ _FILE_LOCK_EXCEPTIONS = (
 
 
 class CodexTrustFolderStrategy:
+    # Codex trusts exact project paths; a trusted parent does not cover run dirs.
+    inherits_parent_trust = False
+
     def __init__(
         self,
         config_path: Path,
@@ -41,13 +46,15 @@ class CodexTrustFolderStrategy:
         self.managed_roots = tuple(Path(root).resolve() for root in roots)
         self._thread_locks: dict[str, threading.Lock] = {}
         self._locks_guard = threading.Lock()
+        self._document = BatchedTrustDocument(
+            self.config_path,
+            load=lambda: self._load_toml(self.config_path),
+            dump=lambda doc: self._write_toml(self.config_path, doc),
+            file_lock=self._locked_file,
+        )
 
     def register(self, normalized_path: str) -> None:
-        self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.config_path.exists():
-            self.config_path.write_text("", encoding="utf-8")
-        with self._locked_file(self.config_path):
-            doc = self._load_toml(self.config_path)
+        def _mark_trusted(doc: tomlkit.TOMLDocument) -> bool:
             projects = doc.get("projects")
             if not isinstance(projects, dict):
                 projects = tomlkit.table()
@@ -56,18 +63,25 @@ class CodexTrustFolderStrategy:
             if not isinstance(existing, dict):
                 existing = tomlkit.table()
                 projects[normalized_path] = existing
+            elif existing.get("trust_level") == "trusted":
+                return False
             existing["trust_level"] = "trusted"
-            self._write_toml(self.config_path, doc)
+            return True
+
+        self._document.apply(_mark_trusted)
 
     def remove(self, normalized_path: str) -> None:
         if not self.config_path.exists():
             return
-        with self._locked_file(self.config_path):
-            doc = self._load_toml(self.config_path)
+
+        def _drop(doc: tomlkit.TOMLDocument) -> bool:
             projects = doc.get("projects")
             if isinstance(projects, dict) and normalized_path in projects:
                 del projects[normalized_path]
-                self._write_toml(self.config_path, doc)
+                return True
+            return False
+
+        self._document.apply(_drop)
 
     def bootstrap_parent_trust(self, normalized_parent_path: str) -> None:
         self.register(normalized_parent_path)
@@ -75,21 +89,21 @@ class CodexTrustFolderStrategy:
     def cleanup_stale(self, active_normalized_paths: set[str]) -> None:
         if not self.config_path.exists():
             return
-        with self._locked_file(self.config_path):
-            doc = self._load_toml(self.config_path)
+
+        def _drop_stale(doc: tomlkit.TOMLDocument) -> bool:
             projects = doc.get("projects")
             if not isinstance(projects, dict):
-                return
+                return False
             stale = [
                 key
                 for key in list(projects.keys())
                 if isinstance(key, str) and self._is_run_child_path(key) and key not in active_normalized_paths
             ]
-            if not stale:
-                return
             for key in stale:
                 del projects[key]
-            self._write_toml(self.config_path, doc)
+            return bool(stale)
+
+        self._document.apply(_drop_stale)
 
     def _is_run_child_path(self, raw_path: str) -> bool:
         try:
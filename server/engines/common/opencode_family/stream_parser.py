@@ -22,11 +22,10 @@ from server.runtime.adapter.types import (
     RuntimeTurnMarker,
 )
 from server.runtime.protocol.parse_utils import (
-    collect_json_parse_errors,
+    PreparedRuntimeStreams,
     dedup_assistant_messages,
     find_session_id,
-    stream_lines_with_offsets,
-    strip_runtime_script_envelope,
+    prepare_runtime_streams,
 )
 
 ErrorExtractor = Callable[[dict[str, Any]], dict[str, Any] | None]
@@ -260,10 +259,16 @@ class OpenCodeFamilyStreamParserCore:
         stderr_raw: bytes,
         pty_raw: bytes = b"",
     ) -> RuntimeStreamParseResult:
-        stdout_rows = strip_runtime_script_envelope(stream_lines_with_offsets("stdout", stdout_raw))
-        pty_rows = strip_runtime_script_envelope(stream_lines_with_offsets("pty", pty_raw))
-        all_records, raw_rows = collect_json_parse_errors(stdout_rows)
-        all_pty_records, pty_raw_rows = collect_json_parse_errors(pty_rows)
+        return self.parse_prepared_runtime_stream(
+            prepare_runtime_streams(stdout_raw=stdout_raw, stderr_raw=stderr_raw, pty_raw=pty_raw)
+        )
+
+    def parse_prepared_runtime_stream(self, prepared: PreparedRuntimeStreams) -> RuntimeStreamParseResult:
+        stdout_raw = prepared.stdout.raw
+        stderr_raw = prepared.stderr_raw
+        pty_raw = prepared.pty.raw
+        all_records, raw_rows = prepared.stdout.records, list(prepared.stdout.error_rows)
+        all_pty_records, pty_raw_rows = prepared.pty.records, list(prepared.pty.error_rows)
         records = self.slice_latest_step_rows(all_records)
         pty_records = self.slice_latest_step_rows(all_pty_records)
 
@@ -475,6 +480,7 @@ class _OpenCodeFamilyLiveSession(NdjsonLiveStreamParserSession):
         super().__init__(
             accepted_streams={"stdout", "pty"},
             overflow_exemption_probe=core.classify_ndjson_overflow_exemption,
+            prepared_stream_parser=core.parse_prepared_runtime_stream,
         )
         self._core = core
         self._last_text: str | None = None
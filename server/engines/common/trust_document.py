@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Generic, TypeVar
+
+DocT = TypeVar("DocT")
+
+TrustMutation = Callable[[DocT], bool]
+
+
+@dataclass(frozen=True)
+class _FileIdentity:
+    mtime_ns: int
+    size: int
+    inode: int
+
+
+@dataclass
+class TrustDocumentStats:
+    operations: int = 0
+    flushes: int = 0
+    writes: int = 0
+    parses: int = 0
+
+
+class BatchedTrustDocument(Generic[DocT]):
+    """
+    Group-committed read-modify-write of one engine trust file.
+
+    Callers enqueue a mutation (`doc -> changed`) and block until it is
+    persisted. The first caller to get the flush lock drains every queued
+    mutation and applies them under a single file lock with at most one
+    rewrite; callers whose mutation was part of that batch return without
+    touching the file. The parsed document is kept between flushes and
+    reused while the file's mtime/size/inode are unchanged, so engines
+    editing their own config still invalidate it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        load: Callable[[], DocT],
+        dump: Callable[[DocT], None],
+        file_lock: Callable[[Path], AbstractContextManager[object]],
+    ) -> None:
+        self.path = path
+        self._load = load
+        self._dump = dump
+        self._file_lock = file_lock
+        self._queue_guard = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: list[tuple[int, TrustMutation[DocT]]] = []
+        self._next_ticket = 0
+        self._applied_ticket = 0
+        self._cached: DocT | None = None
+        self._cached_identity: _FileIdentity | None = None
+        self.stats = TrustDocumentStats()
+
+    def apply(self, mutation: TrustMutation[DocT]) -> None:
+        with self._queue_guard:
+            self._next_ticket += 1
+            ticket = self._next_ticket
+            self._pending.append((ticket, mutation))
+            self.stats.operations += 1
+        with self._flush_lock:
+            if self._applied_ticket >= ticket:
+                return
+            with self._queue_guard:
+                batch = self._pending
+                self._pending = []
+            try:
+                self._flush(batch)
+            except BaseException:
+                # Other waiters still own their mutations; hand them back so the
+                # next leader retries them. The failing caller's own op is dropped.
+                retry = [item for item in batch if item[0] != ticket]
+                with self._queue_guard:
+                    self._pending[:0] = retry
+                raise
+            self._applied_ticket = max(self._applied_ticket, batch[-1][0])
+
+    def invalidate(self) -> None:
+        with self._flush_lock:
+            self._cached = None
+            self._cached_identity = None
+
+    def _flush(self, batch: list[tuple[int, TrustMutation[DocT]]]) -> None:
+        self.stats.flushes += 1
+        with self._file_lock(self.path):
+            doc = self._load_cached()
+            changed = False
+            try:
+                for _ticket, mutation in batch:
+                    changed = bool(mutation(doc)) or changed
+                if changed:
+                    self._dump(doc)
+                    self.stats.writes += 1
+            except BaseException:
+                self._cached = None
+                self._cached_identity = None
+                raise
+            self._cached = doc
+            self._cached_identity = self._identity()
+
+    def _load_cached(self) -> DocT:
+        identity = self._identity()
+        if self._cached is not None and identity is not None and identity == self._cached_identity:
+            return self._cached
+        doc = self._load()
+        self.stats.parses += 1
+        return doc
+
+    def _identity(self) -> _FileIdentity | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return _FileIdentity(mtime_ns=stat.st_mtime_ns, size=stat.st_size, inode=stat.st_ino)
@@ -11,6 +11,8 @@ from server.engines.codex.adapter.trust_folder_strategy import CodexTrustFolderS
 
 
 class TrustFolderStrategy(Protocol):
+    inherits_parent_trust: bool
+
     def register(self, normalized_path: str) -> None:
         ...
 
@@ -25,6 +27,8 @@ class TrustFolderStrategy(Protocol):
 
 
 class _NoopTrustFolderStrategy:
+    inherits_parent_trust = False
+
     def register(self, normalized_path: str) -> None:
         _ = normalized_path
 
@@ -416,6 +416,10 @@ class _GeminiLiveSession:
         self._stdout = bytearray()
         self._stderr = bytearray()
         self._pty = bytearray()
+        self._runtime_parse_result: RuntimeStreamParseResult | None = None
+
+    def runtime_parse_result(self) -> RuntimeStreamParseResult | None:
+        return self._runtime_parse_result
 
     def feed(
         self,
@@ -449,6 +453,7 @@ class _GeminiLiveSession:
             stderr_raw=bytes(self._stderr),
             pty_raw=bytes(self._pty),
         )
+        self._runtime_parse_result = parsed
         emissions: list[LiveParserEmission] = []
         session_id = parsed.get("session_id")
         parsed_turn_complete_data = (
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Iterable
 from tempfile import NamedTemporaryFile
 
+from server.engines.common.trust_document import BatchedTrustDocument
+
 _PATH_RESOLVE_EXCEPTIONS = (
     OSError,
     RuntimeError,
@@ -27,6 +29,9 @@ _FILE_LOCK_EXCEPTIONS = (
 
 
 class GeminiTrustFolderStrategy:
+    # `TRUST_FOLDER` on a parent also trusts every folder below it.
+    inherits_parent_trust = True
+
     def __init__(
         self,
         trusted_folders_path: Path,
@@ -39,22 +44,33 @@ class GeminiTrustFolderStrategy:
         self.managed_roots = tuple(Path(root).resolve() for root in roots)
         self._thread_locks: dict[str, threading.Lock] = {}
         self._locks_guard = threading.Lock()
+        self._document = BatchedTrustDocument(
+            self.trusted_folders_path,
+            load=self._load_or_repair_trusted_folders_unlocked,
+            dump=lambda payload: self._write_json_atomically(self.trusted_folders_path, payload),
+            file_lock=self._locked_file,
+        )
 
     def register(self, normalized_path: str) -> None:
-        self.trusted_folders_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._locked_file(self.trusted_folders_path):
-            payload = self._load_or_repair_trusted_folders_unlocked()
+        def _mark_trusted(payload: dict[str, str]) -> bool:
+            if payload.get(normalized_path) == "TRUST_FOLDER":
+                return False
             payload[normalized_path] = "TRUST_FOLDER"
-            self._write_json_atomically(self.trusted_folders_path, payload)
+            return True
+
+        self._document.apply(_mark_trusted)
 
     def remove(self, normalized_path: str) -> None:
         if not self.trusted_folders_path.exists():
             return
-        with self._locked_file(self.trusted_folders_path):
-            payload = self._load_or_repair_trusted_folders_unlocked()
+
+        def _drop(payload: dict[str, str]) -> bool:
             if normalized_path in payload:
                 del payload[normalized_path]
-                self._write_json_atomically(self.trusted_folders_path, payload)
+                return True
+            return False
+
+        self._document.apply(_drop)
 
     def bootstrap_parent_trust(self, normalized_parent_path: str) -> None:
         self.register(normalized_parent_path)
@@ -62,18 +78,18 @@ class GeminiTrustFolderStrategy:
     def cleanup_stale(self, active_normalized_paths: set[str]) -> None:
         if not self.trusted_folders_path.exists():
             return
-        with self._locked_file(self.trusted_folders_path):
-            payload = self._load_or_repair_trusted_folders_unlocked()
+
+        def _drop_stale(payload: dict[str, str]) -> bool:
             stale = [
                 key
                 for key in list(payload.keys())
                 if self._is_run_child_path(key) and key not in active_normalized_paths
             ]
-            if not stale:
-                return
             for key in stale:
                 del payload[key]
-            self._write_json_atomically(self.trusted_folders_path, payload)
+            return bool(stale)
+
+        self._document.apply(_drop_stale)
 
     def _is_run_child_path(self, raw_path: str) -> bool:
         try:
@@ -21,11 +21,10 @@ from server.runtime.adapter.types import (
     RuntimeTurnMarker,
 )
 from server.runtime.protocol.parse_utils import (
-    collect_json_parse_errors,
+    PreparedRuntimeStreams,
     dedup_assistant_messages,
     find_session_id,
-    stream_lines_with_offsets,
-    strip_runtime_script_envelope,
+    prepare_runtime_streams,
 )
 
 if TYPE_CHECKING:
@@ -328,10 +327,16 @@ class QwenStreamParser:
         stderr_raw: bytes,
         pty_raw: bytes = b"",
     ) -> RuntimeStreamParseResult:
-        stdout_rows = strip_runtime_script_envelope(stream_lines_with_offsets("stdout", stdout_raw))
-        pty_rows = strip_runtime_script_envelope(stream_lines_with_offsets("pty", pty_raw))
-        records, raw_rows = collect_json_parse_errors(stdout_rows)
-        pty_records, pty_raw_rows = collect_json_parse_errors(pty_rows)
+        return self.parse_prepared_runtime_stream(
+            prepare_runtime_streams(stdout_raw=stdout_raw, stderr_raw=stderr_raw, pty_raw=pty_raw)
+        )
+
+    def parse_prepared_runtime_stream(self, prepared: PreparedRuntimeStreams) -> RuntimeStreamParseResult:
+        stdout_raw = prepared.stdout.raw
+        stderr_raw = prepared.stderr_raw
+        pty_raw = prepared.pty.raw
+        records, raw_rows = prepared.stdout.records, list(prepared.stdout.error_rows)
+        pty_records, pty_raw_rows = prepared.pty.records, list(prepared.pty.error_rows)
 
         assistant_messages: list[RuntimeAssistantMessage] = []
         process_events: list[RuntimeProcessEvent] = []
@@ -575,6 +580,7 @@ class _QwenLiveSession(NdjsonLiveStreamParserSession):
         super().__init__(
             accepted_streams={"stdout", "pty"},
             overflow_exemption_probe=parser.classify_ndjson_overflow_exemption,
+            prepared_stream_parser=parser.parse_prepared_runtime_stream,
         )
         self._parser = parser
         self._turn_start_emitted = False
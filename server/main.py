@@ -3,6 +3,8 @@ import asyncio
 import logging
 import os
 import signal
+import sqlite3
+import time
 from pathlib import Path
 from .config import config
 
@@ -68,9 +70,68 @@ from .version import get_backend_version
 
 logger = logging.getLogger(__name__)
 
+
+# A failed warm-up step leaves its lazy path in place, so startup logs it and
+# moves on to the next step instead of abandoning the rest of the path.
+_STARTUP_BACKGROUND_ERRORS = (
+    AttributeError,
+    LookupError,
+    OSError,
+    RuntimeError,
+    TypeError,
+    ValueError,
+    sqlite3.Error,
+)
+
+
+async def _run_startup_background_path() -> None:
+    """Warm-up work that requests do not need before the server accepts traffic.
+
+    The critical path in `lifespan` covers directories, SQLite, concurrency,
+    orphan reaping and run recovery. Engine CLI version probes, skill package
+    hashing, the run state cache warm-up and spawning the attempt parser
+    executor each fall back to a lazy path on first use, so they run here
+    after startup instead of delaying it.
+    """
+    from .services.engine_management.engine_status_cache_service import engine_status_cache_service
+    from .services.orchestration.attempt_parser_executor import attempt_parser_executor
+    from .services.orchestration.run_store import run_store
+    from .services.skill.skill_package_identity_service import skill_package_identity_service
+
+    started = time.perf_counter()
+    try:
+        warmed = await run_store.warm_run_state_cache()
+        logger.info("Run state cache warmed with %s active runs", warmed)
+    except _STARTUP_BACKGROUND_ERRORS:
+        logger.warning("Run state cache warm-up failed; reads fall back to SQLite", exc_info=True)
+    try:
+        await engine_status_cache_service.refresh_all()
+    except _STARTUP_BACKGROUND_ERRORS as exc:
+        logger.warning(
+            "Engine version cache refresh failed during startup; continuing with existing cache",
+            extra={
+                "component": "main",
+                "action": "startup_engine_status_refresh",
+                "error_type": type(exc).__name__,
+                "fallback": "keep_existing_engine_status_cache",
+            },
+            exc_info=True,
+        )
+    try:
+        await skill_package_identity_service.refresh_all()
+    except _STARTUP_BACKGROUND_ERRORS:
+        logger.warning("Skill package hash warm-up failed; hashes are computed on first use", exc_info=True)
+    try:
+        await asyncio.to_thread(attempt_parser_executor.start)
+    except _STARTUP_BACKGROUND_ERRORS:
+        logger.warning("Attempt parser executor failed to start; spawning on first attempt", exc_info=True)
+    logger.info("Startup background path finished in %.0f ms", (time.perf_counter() - started) * 1000)
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     setup_logging()
+    startup_started = time.perf_counter()
     from .services.engine_management.agent_cli_manager import AgentCliManager
     from .services.engine_management.engine_status_cache_service import engine_status_cache_service
     from .services.platform.cache_manager import cache_manager
@@ -81,7 +142,9 @@ async def lifespan(_app: FastAPI):
     from .services.platform.process_supervisor import process_supervisor
     from .services.ui.ui_auth import validate_ui_basic_auth_config
     from .services.orchestration.job_orchestrator import job_orchestrator
-    from .services.skill.skill_package_identity_service import skill_package_identity_service
+    from .services.orchestration.run_dispatch_queue import run_dispatch_queue
+    from .services.orchestration.worker_coordinator import worker_coordinator
+    from .services.orchestration.attempt_parser_executor import attempt_parser_executor
     from .services.engine_management.engine_model_catalog_lifecycle import (
         engine_model_catalog_lifecycle,
     )
@@ -114,19 +177,6 @@ async def lifespan(_app: FastAPI):
             },
             exc_info=True,
         )
-    try:
-        await engine_status_cache_service.refresh_all()
-    except (OSError, RuntimeError, ValueError, TypeError) as exc:
-        logger.warning(
-            "Engine version cache refresh failed during startup; continuing with existing cache",
-            extra={
-                "component": "main",
-                "action": "startup_engine_status_refresh",
-                "error_type": type(exc).__name__,
-                "fallback": "keep_existing_engine_status_cache",
-            },
-            exc_info=True,
-        )
     engine_model_catalog_lifecycle.start()
     if bool(config.SYSTEM.ENGINE_MODELS_CATALOG_STARTUP_PROBE):
         for engine in engine_model_catalog_lifecycle.runtime_probe_engines():
@@ -159,13 +209,20 @@ async def lifespan(_app: FastAPI):
 
     validate_ui_basic_auth_config()
     process_supervisor.start()
+    # Multi-worker mode: register before touching shared state so peers' runs,
+    # processes and dispatch claims are recognised as live.
+    recovery_leader = await worker_coordinator.start(
+        on_cancel=job_orchestrator.cancel_local_run_process,
+        on_runs_lost=job_orchestrator.recover_lost_runs,
+        on_dispatch_wakeup=run_dispatch_queue.notify,
+    )
     try:
-        await process_supervisor.reap_orphan_leases_on_startup()
+        await process_supervisor.reap_orphan_leases_on_startup(keep_worker_ids=worker_coordinator.live_peer_ids)
     except (OSError, RuntimeError, ValueError):
         logger.warning("Startup orphan process reap failed", exc_info=True)
     concurrency_manager.start()
+    concurrency_manager.start_adaptive()
     cache_manager.start()
-    await skill_package_identity_service.refresh_all()
     engine_status_cache_service.start()
     run_cleanup_manager.start()
     zotero_bridge_bundle_auto_update_manager.start()
@@ -188,13 +245,26 @@ async def lifespan(_app: FastAPI):
         asyncio.create_task(_delayed_shutdown())
 
     await local_runtime_lease_service.start(_shutdown_for_local_lease)
-    await job_orchestrator.recover_incomplete_runs_on_startup()
+    if recovery_leader:
+        await job_orchestrator.recover_incomplete_runs_on_startup()
+    else:
+        logger.info("Joining a running worker fleet; startup run recovery left to the heartbeat sweep")
+    await run_dispatch_queue.start(job_orchestrator.run_job)
+    logger.info("Startup critical path finished in %.0f ms", (time.perf_counter() - startup_started) * 1000)
+    background_startup = asyncio.create_task(_run_startup_background_path())
     try:
         yield
     finally:
+        if not background_startup.done():
+            background_startup.cancel()
+        await asyncio.gather(background_startup, return_exceptions=True)
+        await run_dispatch_queue.stop()
+        await attempt_parser_executor.stop()
+        await worker_coordinator.stop()
         await zotero_bridge_bundle_auto_update_manager.stop()
         await local_runtime_lease_service.stop()
         await process_supervisor.stop()
+        await concurrency_manager.stop_adaptive()
         engine_status_cache_service.stop()
         engine_model_catalog_lifecycle.stop()
         from .services.platform.sqlite_db_handle import sqlite_db_handle_registry, sqlite_sync_bridge
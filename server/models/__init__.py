@@ -4,6 +4,7 @@ from .common import (
     ClientConversationMode,
     ClientMetadata,
     DispatchPhase,
+    DispatchPriorityClass,
     EngineInteractiveProfile,
     EngineResumeCapability,
     EngineSessionHandle,
@@ -77,6 +78,8 @@ from .management import (
     ManagementDataResetPathResult,
     ManagementDataResetRequest,
     ManagementDataResetResponse,
+    ManagementProtocolReindexJobResponse,
+    ManagementProtocolReindexRequest,
     ManagementEngineDetail,
     ManagementEngineCredentialDeleteResponse,
     ManagementEngineCredentialStatus,
@@ -113,6 +116,11 @@ from .management import (
     ManagementLoggingSettingsResponse,
     ManagementSystemLogItem,
     ManagementSystemLogQueryResponse,
+    ManagementConcurrencyDecision,
+    ManagementConcurrencyPool,
+    ManagementConcurrencyStateResponse,
+    ManagementResultCacheStateResponse,
+    ManagementContentStoreStateResponse,
     ManagementSystemSettingsResponse,
     ManagementSystemSettingsUpdateRequest,
 )
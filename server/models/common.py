@@ -1,6 +1,7 @@
 """Common enums and shared models."""
 
 from enum import Enum
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
@@ -31,10 +32,20 @@ class ClientConversationMode(str, Enum):
     NON_SESSION = "non_session"
 
 
+class DispatchPriorityClass(str, Enum):
+    """Dispatch queue priority class; FIFO within a class."""
+
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
 class ClientMetadata(BaseModel):
     """Client-declared runtime capabilities."""
 
     conversation_mode: ClientConversationMode = ClientConversationMode.SESSION
+    client_id: Optional[str] = Field(default=None, max_length=128)
+    dispatch_priority: DispatchPriorityClass = DispatchPriorityClass.NORMAL
 
 
 class EngineSessionHandleType(str, Enum):
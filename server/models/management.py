@@ -102,6 +102,38 @@ class ManagementDataResetResponse(BaseModel):
     path_results: List[ManagementDataResetPathResult] = Field(default_factory=list)
 
 
+class ManagementProtocolReindexRequest(BaseModel):
+    """Request payload for a bulk protocol history reindex job."""
+
+    request_ids: List[str] = Field(default_factory=list)
+    engines: List[str] = Field(default_factory=list)
+    limit: Optional[int] = Field(default=None, ge=1)
+    workers: Optional[int] = Field(default=None, ge=1, le=32)
+    dry_run: bool = False
+    max_runs_per_sec: Optional[float] = Field(default=None, ge=0)
+    resume_job_id: Optional[str] = None
+
+
+class ManagementProtocolReindexJobResponse(BaseModel):
+    """Checkpointed state of a bulk protocol history reindex job."""
+
+    job_id: str
+    status: str
+    options: Dict[str, Any] = Field(default_factory=dict)
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    total: int = 0
+    done: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    changed: int = 0
+    resumed_from: int = 0
+    last_request_id: Optional[str] = None
+    error: Optional[str] = None
+    recent_results: List[Dict[str, Any]] = Field(default_factory=list)
+
+
 class ManagementLoggingEditableSettings(BaseModel):
     """Writable logging settings exposed by management API."""
 
@@ -186,8 +218,81 @@ class ManagementSystemLogQueryResponse(BaseModel):
 
     source: str
     items: List[ManagementSystemLogItem] = Field(default_factory=list)
-    next_cursor: Optional[int] = Field(default=None, ge=0)
+    next_cursor: Optional[str] = None
     total_matched: int = Field(default=0, ge=0)
+    total_matched_exact: bool = True
+
+
+class ManagementConcurrencyDecision(BaseModel):
+    """One adaptive concurrency controller decision."""
+
+    ts: float
+    previous_limit: int = Field(ge=1)
+    target_limit: int = Field(ge=1)
+    applied_limit: int = Field(ge=1)
+    running: int = Field(ge=0)
+    reason: str
+    limits: Dict[str, int] = Field(default_factory=dict)
+    per_run: Dict[str, float] = Field(default_factory=dict)
+    sampled_runs: int = Field(default=0, ge=0)
+
+
+class ManagementConcurrencyPool(BaseModel):
+    """Engine, provider or model budget pool nested under the global slot gate."""
+
+    pool: str
+    tier: str
+    limit: Optional[int] = None
+    effective_limit: Optional[int] = None
+    running: int = Field(ge=0)
+    queued: int = Field(default=0, ge=0)
+    start_rate_per_min: Optional[float] = None
+    tokens: Optional[float] = None
+    rate_limit_streak: int = Field(default=0, ge=0)
+    backoff_remaining_sec: float = Field(default=0.0, ge=0)
+    blocked_reason: Optional[str] = None
+
+
+class ManagementConcurrencyStateResponse(BaseModel):
+    """Run slot usage, budget pools and recent adaptive concurrency decisions."""
+
+    adaptive_enabled: bool
+    running: int = Field(ge=0)
+    queued: int = Field(ge=0)
+    max_concurrent: int = Field(ge=1)
+    max_queue_size: int = Field(ge=1)
+    min_concurrent: Optional[int] = None
+    hard_cap: Optional[int] = None
+    per_run_estimates: Dict[str, float] = Field(default_factory=dict)
+    decisions: List[ManagementConcurrencyDecision] = Field(default_factory=list)
+    pools: List[ManagementConcurrencyPool] = Field(default_factory=list)
+
+
+class ManagementResultCacheStateResponse(BaseModel):
+    """Result cache usage, limits and process-local hit/miss/stale counters."""
+
+    entries: int = Field(ge=0)
+    total_bytes: int = Field(ge=0)
+    max_bytes: int = Field(ge=0)
+    ttl_hours: float = Field(ge=0)
+    hits: int = Field(ge=0)
+    misses: int = Field(ge=0)
+    stale: int = Field(ge=0)
+    hit_ratio: Optional[float] = None
+    evictions: int = Field(ge=0)
+    evicted_bytes: int = Field(ge=0)
+    last_eviction_at: Optional[str] = None
+
+
+class ManagementContentStoreStateResponse(BaseModel):
+    """Content-addressed store usage and space saved by cross-run deduplication."""
+
+    enabled: bool
+    objects: int = Field(ge=0)
+    unreferenced_objects: int = Field(ge=0)
+    physical_bytes: int = Field(ge=0)
+    logical_bytes: int = Field(ge=0)
+    saved_bytes: int = Field(ge=0)
 
 
 class ManagementEngineAuthImportSpecResponse(BaseModel):
@@ -397,6 +502,7 @@ class ManagementRunListResponse(BaseModel):
     page_size: int = Field(default=20, ge=1)
     total: int = Field(default=0, ge=0)
     total_pages: int = Field(default=0, ge=0)
+    next_cursor: Optional[str] = None
 
 
 class ManagementRunFilesResponse(BaseModel):
@@ -3,28 +3,30 @@ API Router for Job Management.
 
 Exposes endpoints for:
 - Creating new jobs (POST /jobs)
-- Querying job status (GET /jobs/{request_id})
+- Querying job status (GET /jobs/{request_id}); status, result and pending
+  interaction reads support ETag / If-None-Match and `wait_for_change` long-poll
 - Uploading files to a job workspace (POST /jobs/{request_id}/upload)
 """
 
+import asyncio
+import hashlib
 import logging
 import contextlib
-import io
 import json
 import shutil
-import zipfile
 from pathlib import Path
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Form, Query, Request  # type: ignore[import-not-found]
-from pydantic import ValidationError
-from typing import Any
+from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Form, Header, Query, Request, Response  # type: ignore[import-not-found]
+from pydantic import BaseModel, ValidationError
+from typing import Annotated, Any, Awaitable, Callable
 from ..config import config
 from ..models import (
     AuthSessionStatusResponse,
     CancelResponse,
     ClientConversationMode,
     DispatchPhase,
+    DispatchPriorityClass,
     ExecutionMode,
     InteractionPendingResponse,
     InteractionFileReplyMetadata,
@@ -48,6 +50,7 @@ from ..models import (
     RunCleanupResponse
 )
 from ..services.orchestration.workspace_manager import workspace_manager
+from ..services.ui.ui_auth import is_ui_basic_auth_enabled, verify_ui_basic_auth_header
 from ..services.skill.skill_registry import skill_registry
 from ..services.orchestration.job_orchestrator import job_orchestrator
 from ..services.orchestration.runtime_observability_ports import install_runtime_observability_ports
@@ -57,13 +60,18 @@ from ..services.skill.skill_asset_resolver import resolve_schema_asset
 from ..services.engine_management.model_registry import model_registry
 from ..services.platform.cache_key_builder import (
     build_input_manifest,
-    compute_bytes_hash,
     compute_skill_fingerprint,
     compute_input_manifest_hash,
     compute_inline_input_hash,
     compute_cache_key,
 )
 from ..services.platform.async_compat import maybe_await
+from ..services.platform.file_preview_renderer import (
+    PREVIEW_MAX_BYTES,
+    PREVIEW_WINDOW_DEFAULT_LINES,
+    PREVIEW_WINDOW_MAX_LINES,
+    build_preview_window,
+)
 from ..services.platform.runtime_env_options import (
     runtime_env_secret_service,
     sanitize_runtime_options_env,
@@ -73,6 +81,13 @@ from ..services.platform.runtime_preamble_options import (
     runtime_preamble_secret_service,
     sanitize_runtime_options_preamble,
 )
+from ..services.orchestration.run_dispatch_queue import run_dispatch_queue
+from ..services.orchestration.run_inflight_coalescer import (
+    CacheKeyReservation,
+    run_inflight_coalescer,
+)
+from ..services.orchestration.run_content_store_service import run_content_store_service
+from ..services.orchestration.run_result_cache_service import run_result_cache_service
 from ..services.orchestration.run_store import run_store
 from ..services.orchestration.run_interaction_file_service import (
     InteractionFileReplyError,
@@ -96,6 +111,12 @@ from ..services.orchestration.workspace_file_binding_service import (
     materialize_workspace_file_bindings,
 )
 from ..services.platform.concurrency_manager import concurrency_manager
+from ..services.platform.upload_spooling import (
+    UploadTooLargeError,
+    ZipLimitError,
+    extract_zip_file,
+    spool_upload,
+)
 from ..runtime.observability.run_observability import run_observability_service
 from ..services.engine_management.engine_policy import resolve_skill_engine_policy
 from ..services.skill.skill_package_identity_service import skill_package_identity_service
@@ -122,6 +143,69 @@ import json
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 logger = logging.getLogger(__name__)
 
+LONG_POLL_MAX_SEC = 60.0
+# Run state writes wake long-polls immediately; this bounds how stale a
+# change that does not go through run state (e.g. another process) can be.
+_LONG_POLL_RECHECK_SEC = 5.0
+_NOT_MODIFIED_RESPONSES: dict[int | str, dict[str, Any]] = {304: {"description": "Not Modified"}}
+
+
+def _response_etag(payload: BaseModel) -> str:
+    digest = hashlib.sha256(payload.model_dump_json(by_alias=True).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def _conditional_read(
+    request_id: str,
+    build: Callable[[], Awaitable[BaseModel]],
+    *,
+    response: Response | None,
+    wait_for_change: float,
+    if_none_match: str | None,
+    pending_status_codes: frozenset[int] = frozenset(),
+) -> Any:
+    """Serve a run read with an ETag, 304s and optional long-poll.
+
+    With `wait_for_change`, the read is held while the representation still
+    matches `If-None-Match` (or the read fails with one of
+    `pending_status_codes`, e.g. 409 for a result that is not ready yet),
+    re-evaluating whenever the run state version changes.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(max(float(wait_for_change), 0.0), LONG_POLL_MAX_SEC)
+    while True:
+        version = await run_store.run_state_version(request_id)
+        remaining = deadline - loop.time()
+        try:
+            payload = await build()
+        except HTTPException as exc:
+            if exc.status_code not in pending_status_codes or remaining <= 0:
+                raise
+        else:
+            etag = _response_etag(payload)
+            if not _etag_matches(if_none_match, etag):
+                if response is not None:
+                    response.headers["ETag"] = etag
+                    response.headers["Cache-Control"] = "no-cache"
+                return payload
+            if remaining <= 0:
+                return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        await run_store.wait_for_run_state_change(
+            request_id,
+            since=version,
+            timeout=min(remaining, _LONG_POLL_RECHECK_SEC),
+        )
+
 
 async def _cleanup_unpersisted_runtime_env_secret(request_id: str | None) -> None:
     if not request_id:
@@ -177,6 +261,7 @@ async def _resolve_workspace_reuse(runtime_options: dict[str, Any]) -> dict[str,
     source_layout = require_layout_from_record(source_record)
     if not source_layout.workspace_dir.exists():
         raise HTTPException(status_code=409, detail="Workspace source directory is unavailable")
+    await run_content_store_service.detach_workspace(source_layout.workspace_dir)
     output_token = str(source_record.get("workspace_output_token") or "").strip()
     if not output_token:
         output_token = build_workspace_output_token(
@@ -210,6 +295,13 @@ def _workspace_response_fields(record: dict[str, Any], run_dir: Path | None) ->
     }
 
 
+async def _record_cache_lookup_outcome(cache_key: str, *, hit: bool) -> None:
+    if hit:
+        await run_result_cache_service.record_hit(cache_key, run_store_backend=run_store)
+    else:
+        await run_result_cache_service.record_stale(cache_key, run_store_backend=run_store)
+
+
 async def _bind_cached_run_and_materialize_state(
     *,
     request_id: str,
@@ -314,12 +406,19 @@ def _execution_mode_value(mode: object) -> str:
     return str(value)
 
 
-def _extract_zip_to_dir(file_bytes: bytes, target_dir: Path) -> list[str]:
+async def _extract_upload_to_dir(upload: UploadFile, spool_dir: Path, target_dir: Path) -> list[str]:
+    try:
+        spooled = await spool_upload(upload, spool_dir)
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
     try:
-        with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
-            archive.extractall(target_dir)
-    except zipfile.BadZipFile as exc:
+        await asyncio.to_thread(extract_zip_file, spooled.path, target_dir)
+    except ZipLimitError:
+        raise
+    except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid zip file") from exc
+    finally:
+        spooled.discard()
     return [str(p.relative_to(target_dir)) for p in target_dir.rglob("*") if p.is_file()]
 
 
@@ -358,10 +457,24 @@ def _reject_reserved_interaction_reply_path(rel: Path) -> None:
             detail="uploads/.interaction-replies is reserved for managed interaction replies",
         )
 
+def _clamp_dispatch_priority(client_metadata: dict[str, Any], *, authorization: str | None) -> dict[str, Any]:
+    """Only UI basic-auth callers may queue runs ahead of the normal class."""
+    if client_metadata.get("dispatch_priority") != DispatchPriorityClass.HIGH.value:
+        return client_metadata
+    if is_ui_basic_auth_enabled() and verify_ui_basic_auth_header(authorization):
+        return client_metadata
+    return {**client_metadata, "dispatch_priority": DispatchPriorityClass.NORMAL.value}
+
+
 @router.post("", response_model=RunCreateResponse)
-async def create_run(request: RunCreateRequest, background_tasks: BackgroundTasks):
+async def create_run(
+    request: RunCreateRequest,
+    background_tasks: BackgroundTasks,
+    authorization: Annotated[str | None, Header()] = None,
+):
     request_id: str | None = None
     stage_root: Path | None = None
+    inflight_reservation: CacheKeyReservation | None = None
     try:
         skill = None
         if request.skill_source == RequestSkillSource.INSTALLED:
@@ -394,7 +507,10 @@ async def create_run(request: RunCreateRequest, background_tasks: BackgroundTask
                 runtime_options=request.runtime_options,
             )
         )
-        client_metadata = request.client_metadata.model_dump(mode="json")
+        client_metadata = _clamp_dispatch_priority(
+            request.client_metadata.model_dump(mode="json"),
+            authorization=authorization,
+        )
         declared_modes = (
             declared_execution_modes(skill) if skill is not None else {ExecutionMode.AUTO.value}
         )
@@ -556,7 +672,11 @@ async def create_run(request: RunCreateRequest, background_tasks: BackgroundTask
             skill_package_hash=skill_package_hash,
         )
         if cache_enabled:
-            cached_run = await run_store.get_cached_run_for_source(cache_key, request.skill_source.value)
+            cached_run = await run_result_cache_service.lookup(
+                cache_key,
+                request.skill_source.value,
+                run_store_backend=run_store,
+            )
             if cached_run:
                 cache_hit_ready = await _bind_cached_run_and_materialize_state(
                     request_id=request_id,
@@ -564,6 +684,7 @@ async def create_run(request: RunCreateRequest, background_tasks: BackgroundTask
                     cache_key=cache_key,
                     skill_source=request.skill_source.value,
                 )
+                await _record_cache_lookup_outcome(cache_key, hit=cache_hit_ready)
                 if cache_hit_ready:
                     if stage_root is not None:
                         shutil.rmtree(stage_root, ignore_errors=True)
@@ -573,6 +694,23 @@ async def create_run(request: RunCreateRequest, background_tasks: BackgroundTask
                         cache_hit=True,
                         status=RunStatus.SUCCEEDED,
                     )
+            if workspace_reuse is None:
+                inflight_reservation = await run_inflight_coalescer.reserve(cache_key)
+                follower_status = await run_inflight_coalescer.bind_follower(
+                    request_id=request_id,
+                    cache_key=cache_key,
+                    skill_source=request.skill_source.value,
+                    run_store_backend=run_store,
+                )
+                if follower_status is not None:
+                    if stage_root is not None:
+                        shutil.rmtree(stage_root, ignore_errors=True)
+                        stage_root = None
+                    return RunCreateResponse(
+                        request_id=request_id,
+                        cache_hit=True,
+                        status=follower_status,
+                    )
 
         run_request = RunCreateRequest(
             skill_source=RequestSkillSource.INSTALLED,
@@ -731,13 +869,15 @@ async def create_run(request: RunCreateRequest, background_tasks: BackgroundTask
                 request_id,
                 request.engine,
             )
-        background_tasks.add_task(
-            job_orchestrator.run_job,
+        await run_dispatch_queue.enqueue(
             run_id=run_status.run_id,
+            request_id=request_id,
             skill_id=skill.id,
             engine_name=request.engine,
             options=merged_options,
-            cache_key=run_cache_key
+            cache_key=run_cache_key,
+            client_metadata=client_metadata,
+            run_store_backend=run_store,
         )
         if stage_root is not None:
             shutil.rmtree(stage_root, ignore_errors=True)
@@ -787,9 +927,27 @@ async def create_run(request: RunCreateRequest, background_tasks: BackgroundTask
             },
         )
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if inflight_reservation is not None:
+            inflight_reservation.release()
+
+@router.get("/{request_id}", response_model=RequestStatusResponse, responses=_NOT_MODIFIED_RESPONSES)
+async def get_run_status(
+    request_id: str,
+    response: Response,
+    wait_for_change: Annotated[float, Query(ge=0, le=LONG_POLL_MAX_SEC)] = 0,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    return await _conditional_read(
+        request_id,
+        lambda: _build_run_status(request_id),
+        response=response,
+        wait_for_change=wait_for_change,
+        if_none_match=if_none_match,
+    )
+
 
-@router.get("/{request_id}", response_model=RequestStatusResponse)
-async def get_run_status(request_id: str):
+async def _build_run_status(request_id: str) -> RequestStatusResponse:
     request_record: dict[str, Any] | None = await maybe_await(
         run_store.get_request(request_id)
     )
@@ -1091,9 +1249,22 @@ async def get_run_status(request_id: str):
         observability_ready=True,
     )
 
-@router.get("/{request_id}/result", response_model=RunResultResponse)
-async def get_run_result(request_id: str):
-    return await run_read_facade.get_result(request_id=request_id)
+@router.get("/{request_id}/result", response_model=RunResultResponse, responses=_NOT_MODIFIED_RESPONSES)
+async def get_run_result(
+    request_id: str,
+    response: Response,
+    wait_for_change: Annotated[float, Query(ge=0, le=LONG_POLL_MAX_SEC)] = 0,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    # While the run is not terminal the read answers 409; a long-poll waits that out.
+    return await _conditional_read(
+        request_id,
+        lambda: run_read_facade.get_result(request_id=request_id),
+        response=response,
+        wait_for_change=wait_for_change,
+        if_none_match=if_none_match,
+        pending_status_codes=frozenset({409}),
+    )
 
 @router.get("/{request_id}/artifacts", response_model=RunArtifactsResponse)
 async def get_run_artifacts(request_id: str):
@@ -1118,10 +1289,19 @@ async def get_run_files(request_id: str):
 async def get_run_file(
     request_id: str,
     path: str = Query(..., min_length=1),
+    window: str | None = Query(default=None),
+    lines: int = Query(default=PREVIEW_WINDOW_DEFAULT_LINES, ge=1, le=PREVIEW_WINDOW_MAX_LINES),
+    offset: int = Query(default=0, ge=0),
+    length: int = Query(default=PREVIEW_MAX_BYTES, ge=1, le=PREVIEW_MAX_BYTES),
 ):
+    try:
+        preview_window = build_preview_window(window, lines=lines, offset=offset, length=length)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     return await run_read_facade.get_file_preview(
         request_id=request_id,
         path=path,
+        window=preview_window,
     )
 
 @router.get("/{request_id}/logs", response_model=RunLogsResponse)
@@ -1211,11 +1391,26 @@ async def get_run_log_range(
     )
 
 
-@router.get("/{request_id}/interaction/pending", response_model=InteractionPendingResponse)
-async def get_interaction_pending(request_id: str):
-    return await run_interaction_service.get_pending(
-        request_id=request_id,
-        run_store_backend=run_store,
+@router.get(
+    "/{request_id}/interaction/pending",
+    response_model=InteractionPendingResponse,
+    responses=_NOT_MODIFIED_RESPONSES,
+)
+async def get_interaction_pending(
+    request_id: str,
+    response: Response,
+    wait_for_change: Annotated[float, Query(ge=0, le=LONG_POLL_MAX_SEC)] = 0,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    return await _conditional_read(
+        request_id,
+        lambda: run_interaction_service.get_pending(
+            request_id=request_id,
+            run_store_backend=run_store,
+        ),
+        response=response,
+        wait_for_change=wait_for_change,
+        if_none_match=if_none_match,
     )
 
 
@@ -1316,6 +1511,7 @@ async def upload_file(
     request_record: dict[str, Any] | None = None
     source = "unknown"
     run_id_for_log: str | None = None
+    inflight_reservation: CacheKeyReservation | None = None
     try:
         with bind_request_logging_context(request_id=request_id, phase="upload"):
             log_event(
@@ -1336,7 +1532,6 @@ async def upload_file(
             )
             runtime_options = request_record.get("runtime_options", {})
             skill = None
-            skill_package_bytes: bytes | None = None
             temp_skill_package_hash = ""
             skill_package_hash = ""
             log_event(
@@ -1352,12 +1547,22 @@ async def upload_file(
             if source == RequestSkillSource.TEMP_UPLOAD.value:
                 if skill_package is None:
                     raise HTTPException(status_code=422, detail="skill_package is required for temp_upload source")
-                skill_package_bytes = await skill_package.read()
-                temp_skill_package_hash = compute_bytes_hash(skill_package_bytes)
-                cached_package = await temp_skill_package_cache_service.prepare_package(
-                    skill_package_bytes,
-                    run_store_backend=run_store,
-                )
+                try:
+                    skill_package_spool = await spool_upload(
+                        skill_package,
+                        Path(config.SYSTEM.TMP_UPLOADS_DIR),
+                        max_bytes=int(config.SYSTEM.TEMP_SKILL_PACKAGE_MAX_BYTES),
+                    )
+                except UploadTooLargeError as exc:
+                    raise HTTPException(status_code=413, detail=str(exc)) from exc
+                temp_skill_package_hash = skill_package_spool.sha256
+                try:
+                    cached_package = await temp_skill_package_cache_service.prepare_package_from_path(
+                        skill_package_spool.path,
+                        run_store_backend=run_store,
+                    )
+                finally:
+                    skill_package_spool.discard()
                 skill = cached_package.skill
                 skill_package_hash = cached_package.skill_package_hash
                 await run_store.update_request_skill_identity(
@@ -1436,8 +1641,7 @@ async def upload_file(
                 )
                 extracted_files: list[str] = []
                 if file is not None:
-                    content = await file.read()
-                    extracted_files = _extract_zip_to_dir(content, uploads_dir)
+                    extracted_files = await _extract_upload_to_dir(file, stage_root, uploads_dir)
                 materialized_files = await materialize_workspace_file_bindings(
                     bindings=file_bindings,
                     inline_input=request_record.get("input", {}),
@@ -1524,7 +1728,11 @@ async def upload_file(
                 )
                 cache_enabled = is_cache_enabled(effective_runtime_options)
                 if cache_enabled:
-                    cached_run = await run_store.get_cached_run_for_source(cache_key, source)
+                    cached_run = await run_result_cache_service.lookup(
+                        cache_key,
+                        source,
+                        run_store_backend=run_store,
+                    )
                     if cached_run:
                         cache_hit_ready = await _bind_cached_run_and_materialize_state(
                             request_id=request_id,
@@ -1532,6 +1740,7 @@ async def upload_file(
                             cache_key=cache_key,
                             skill_source=source,
                         )
+                        await _record_cache_lookup_outcome(cache_key, hit=cache_hit_ready)
                         if cache_hit_ready:
                             log_event(
                                 logger,
@@ -1549,6 +1758,30 @@ async def upload_file(
                                 status=RunStatus.SUCCEEDED,
                                 extracted_files=extracted_files,
                             )
+                    if workspace_reuse is None:
+                        inflight_reservation = await run_inflight_coalescer.reserve(cache_key)
+                        follower_status = await run_inflight_coalescer.bind_follower(
+                            request_id=request_id,
+                            cache_key=cache_key,
+                            skill_source=source,
+                            run_store_backend=run_store,
+                        )
+                        if follower_status is not None:
+                            log_event(
+                                logger,
+                                event="upload.cache.inflight_hit",
+                                phase="upload",
+                                outcome="ok",
+                                request_id=request_id,
+                                cache_key=cache_key,
+                                skill_source=source,
+                            )
+                            return RunUploadResponse(
+                                request_id=request_id,
+                                cache_hit=True,
+                                status=follower_status,
+                                extracted_files=extracted_files,
+                            )
                 log_event(
                     logger,
                     event="upload.cache.miss",
@@ -1764,13 +1997,15 @@ async def upload_file(
                     run_id=run_status.run_id,
                     engine=request_record["engine"],
                 )
-            background_tasks.add_task(
-                job_orchestrator.run_job,
+            await run_dispatch_queue.enqueue(
                 run_id=run_status.run_id,
+                request_id=request_id,
                 skill_id=skill.id,
                 engine_name=request_record["engine"],
                 options=merged_options,
-                cache_key=run_cache_key
+                cache_key=run_cache_key,
+                client_metadata=request_record.get("client_metadata"),
+                run_store_backend=run_store,
             )
             return RunUploadResponse(
                 request_id=request_id,
@@ -1863,6 +2098,9 @@ async def upload_file(
             skill_source=source,
         )
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if inflight_reservation is not None:
+            inflight_reservation.release()
 
 
 async def _read_pending_interaction_id(request_id: str) -> int | None:
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Query, Request, UploadFile  # type: ignore[import-not-found]
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile  # type: ignore[import-not-found]
 
 from ..config import config
 from ..logging_config import get_logging_settings_payload, reload_logging_from_settings
@@ -26,6 +26,9 @@ from ..models import (
     ManagementEngineAuthImportSubmitResponse,
     ManagementEngineListResponse,
     ManagementEngineSummary,
+    ManagementConcurrencyStateResponse,
+    ManagementResultCacheStateResponse,
+    ManagementContentStoreStateResponse,
     ManagementSystemSettingsResponse,
     ManagementSystemLogQueryResponse,
     ManagementSystemSettingsUpdateRequest,
@@ -44,6 +47,8 @@ from ..models import (
     ManagementMcpServerUpsertRequest,
     ManagementMcpServerView,
     ManagementPluginUpdateResponse,
+    ManagementProtocolReindexJobResponse,
+    ManagementProtocolReindexRequest,
     RecoveryState,
     RunStatus,
     SkillManifest,
@@ -63,7 +68,15 @@ from ..services.engine_management.zotero_bridge_bundle_auto_update import (
 from ..services.orchestration.runtime_observability_ports import install_runtime_observability_ports
 from ..services.orchestration.runtime_protocol_ports import install_runtime_protocol_ports
 from ..runtime.observability.run_observability import run_observability_service
+from ..services.orchestration.run_protocol_reindex_service import (
+    ProtocolReindexBusyError,
+    ProtocolReindexOptions,
+    ProtocolReindexValidationError,
+    run_protocol_reindex_service,
+)
+from ..services.orchestration.run_result_cache_service import run_result_cache_service
 from ..services.orchestration.run_store import run_store
+from ..services.orchestration.run_store_request_store import RunListFilters
 from ..services.skill.skill_browser import list_skill_entries
 from ..services.skill.skill_asset_resolver import load_resolved_json, resolve_schema_asset
 from ..services.engine_management.engine_policy import resolve_skill_engine_policy
@@ -79,7 +92,16 @@ from ..services.platform.system_settings_service import (
     SystemSettingsValidationError,
     system_settings_service,
 )
+from ..services.platform.concurrency_manager import concurrency_manager
+from ..services.platform.content_addressed_store import content_addressed_store
+from ..services.platform.engine_budget_manager import engine_budget_manager
 from ..services.platform.system_log_explorer_service import system_log_explorer_service
+from ..services.platform.file_preview_renderer import (
+    PREVIEW_MAX_BYTES,
+    PREVIEW_WINDOW_DEFAULT_LINES,
+    PREVIEW_WINDOW_MAX_LINES,
+    build_preview_window,
+)
 from ..services.skill.skill_registry import is_builtin_skill_path, skill_registry
 from ..services.orchestration.run_workspace_layout import require_layout_from_record
 from ..services.ui.ui_auth import require_ui_basic_auth
@@ -225,6 +247,28 @@ async def update_management_system_settings(request: ManagementSystemSettingsUpd
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+@router.get("/system/concurrency", response_model=ManagementConcurrencyStateResponse)
+async def get_management_system_concurrency():
+    concurrency_manager.start()
+    payload = concurrency_manager.adaptive_state()
+    payload["pools"] = engine_budget_manager.state(
+        queued_by_pool=await run_store.count_queued_dispatches_by_pool()
+    )
+    return ManagementConcurrencyStateResponse(**payload)
+
+
+@router.get("/system/result-cache", response_model=ManagementResultCacheStateResponse)
+async def get_management_system_result_cache():
+    payload = await run_result_cache_service.state(run_store_backend=run_store)
+    return ManagementResultCacheStateResponse(**payload)
+
+
+@router.get("/system/content-store", response_model=ManagementContentStoreStateResponse)
+async def get_management_system_content_store():
+    payload = await asyncio.to_thread(content_addressed_store.usage)
+    return ManagementContentStoreStateResponse(**payload)
+
+
 @router.post("/system/reset-data", response_model=ManagementDataResetResponse)
 async def reset_management_data(request: ManagementDataResetRequest):
     if request.confirmation.strip() != DATA_RESET_CONFIRMATION_TEXT:
@@ -256,13 +300,16 @@ async def reset_management_data(request: ManagementDataResetRequest):
             },
         )
         raise HTTPException(status_code=500, detail=str(exc))
+    if not options.dry_run:
+        # The state databases were deleted underneath the run store.
+        await run_store.invalidate_run_state_cache()
     return ManagementDataResetResponse(**result.to_payload())
 
 
 @router.get("/system/logs/query", response_model=ManagementSystemLogQueryResponse)
 async def query_management_system_logs(
     source: str = Query(...),
-    cursor: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
     limit: int = Query(default=200, ge=1, le=1000),
     q: str | None = Query(default=None),
     level: str | None = Query(default=None),
@@ -644,7 +691,24 @@ async def list_management_runs(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=200),
     limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    status: list[str] | None = Query(default=None),
+    engine: str | None = Query(default=None),
+    skill_id: str | None = Query(default=None),
+    model: str | None = Query(default=None),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    q: str | None = Query(default=None, max_length=200),
 ):
+    filters = RunListFilters(
+        statuses=tuple(status or ()),
+        engine=engine,
+        skill_id=skill_id,
+        model=model,
+        created_from=created_from,
+        created_to=created_to,
+        text=q,
+    )
     paging_payload: dict[str, Any]
     if limit is not None:
         listed_rows = await run_observability_service.list_runs(limit=limit)
@@ -655,6 +719,18 @@ async def list_management_runs(
             "total": len(listed_rows),
             "total_pages": 1 if listed_rows else 0,
         }
+    elif cursor is not None or page == 1:
+        try:
+            paging_payload = await run_observability_service.list_runs_keyset(
+                limit=page_size,
+                cursor=cursor,
+                filters=None if filters.is_empty() else filters,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        paging_payload["page"] = page
+    elif not filters.is_empty():
+        raise HTTPException(status_code=400, detail="Filtered run listings page with `cursor`, not `page`")
     else:
         paging_payload = await run_observability_service.list_runs_paginated(
             page=page,
@@ -716,6 +792,7 @@ async def list_management_runs(
         page_size=_coerce_int_or_default(paging_payload.get("page_size"), 20),
         total=_coerce_int_or_default(paging_payload.get("total"), 0),
         total_pages=_coerce_int_or_default(paging_payload.get("total_pages"), 0),
+        next_cursor=_coerce_str_or_none(paging_payload.get("next_cursor")),
     )
 
 
@@ -739,10 +816,15 @@ async def get_management_run_files(request_id: str):
 async def get_management_run_file(
     request_id: str,
     path: str = Query(..., min_length=1),
+    window: str | None = Query(default=None),
+    lines: int = Query(default=PREVIEW_WINDOW_DEFAULT_LINES, ge=1, le=PREVIEW_WINDOW_MAX_LINES),
+    offset: int = Query(default=0, ge=0),
+    length: int = Query(default=PREVIEW_MAX_BYTES, ge=1, le=PREVIEW_MAX_BYTES),
 ):
     detail = await _get_run_detail_or_404(request_id)
     try:
-        preview = await run_observability_service.build_run_file_preview(request_id, path)
+        preview_window = build_preview_window(window, lines=lines, offset=offset, length=length)
+        preview = await run_observability_service.build_run_file_preview(request_id, path, window=preview_window)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     except FileNotFoundError as exc:
@@ -939,6 +1021,55 @@ async def rebuild_management_run_protocol_history(request_id: str):
     return payload
 
 
+@router.post("/protocol/reindex", response_model=ManagementProtocolReindexJobResponse)
+async def start_management_protocol_reindex(request: ManagementProtocolReindexRequest):
+    defaults = ProtocolReindexOptions()
+    options = ProtocolReindexOptions(
+        request_ids=tuple(request.request_ids),
+        engines=tuple(request.engines),
+        limit=request.limit,
+        workers=request.workers if request.workers is not None else defaults.workers,
+        dry_run=request.dry_run,
+        max_runs_per_sec=(
+            request.max_runs_per_sec if request.max_runs_per_sec is not None else defaults.max_runs_per_sec
+        ),
+    )
+    try:
+        job_id = await run_protocol_reindex_service.start_job(options, job_id=request.resume_job_id)
+    except ProtocolReindexBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ProtocolReindexValidationError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return _protocol_reindex_job_response(job_id, recent=0)
+
+
+@router.get("/protocol/reindex/{job_id}", response_model=ManagementProtocolReindexJobResponse)
+async def get_management_protocol_reindex(job_id: str, recent: int = Query(default=20, ge=0, le=500)):
+    return _protocol_reindex_job_response(job_id, recent=recent)
+
+
+@router.post("/protocol/reindex/{job_id}/cancel", response_model=ManagementProtocolReindexJobResponse)
+async def cancel_management_protocol_reindex(job_id: str):
+    try:
+        accepted = run_protocol_reindex_service.request_cancel(job_id)
+    except ProtocolReindexValidationError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if not accepted:
+        raise HTTPException(status_code=409, detail="Protocol reindex job is not running")
+    return _protocol_reindex_job_response(job_id, recent=0)
+
+
+def _protocol_reindex_job_response(job_id: str, *, recent: int) -> ManagementProtocolReindexJobResponse:
+    try:
+        state = run_protocol_reindex_service.get_job(job_id)
+        rows = run_protocol_reindex_service.read_progress(job_id)[-recent:] if recent > 0 else []
+    except ProtocolReindexValidationError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if state is None:
+        raise HTTPException(status_code=404, detail="Protocol reindex job not found")
+    return ManagementProtocolReindexJobResponse(**{**state, "recent_results": rows})
+
+
 @router.get("/runs/{request_id}/logs/range")
 async def get_management_run_log_range(
     request_id: str,
@@ -964,8 +1095,8 @@ async def get_management_run_log_range(
 
 
 @router.get("/runs/{request_id}/pending", response_model=InteractionPendingResponse)
-async def get_management_run_pending(request_id: str):
-    return await jobs_router.get_interaction_pending(request_id)
+async def get_management_run_pending(request_id: str, response: Response):
+    return await jobs_router.get_interaction_pending(request_id, response)
 
 
 @router.post("/runs/{request_id}/reply", response_model=InteractionReplyResponse)
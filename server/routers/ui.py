@@ -2,11 +2,11 @@ import logging
 import os
 import uuid
 import inspect
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from collections.abc import Mapping
 from pathlib import Path
 from typing import NoReturn
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlencode
 from jinja2 import pass_context
 
 from fastapi import (  # type: ignore[import-not-found]
@@ -77,10 +77,8 @@ from ..services.engine_management.provider_aware_auth import (
     list_engine_auth_providers,
     provider_aware_engines,
 )
-from ..services.skill.skill_browser import (
-    build_preview_payload,
-    resolve_skill_file_path,
-)
+from ..services.skill.skill_browser import resolve_skill_file_path
+from ..services.platform.file_preview_service import file_preview_service
 from ..runtime.observability.run_observability import run_observability_service
 from ..services.skill.skill_install_store import skill_install_store
 from ..services.skill.skill_package_manager import skill_package_manager
@@ -279,13 +277,52 @@ def _serialize_payload_list(payload: object, key: str) -> list[dict[str, object]
     return [_serialize_payload_item(item) for item in raw_items]
 
 
-async def _list_management_runs_payload(*, page: int, page_size: int):
+_RUNS_TABLE_FILTER_KEYS = ("q", "status", "engine", "skill_id", "model", "created_from", "created_to")
+
+
+def _runs_table_filters(**raw: str | None) -> dict[str, str]:
+    return {
+        key: value.strip()
+        for key in _RUNS_TABLE_FILTER_KEYS
+        if isinstance((value := raw.get(key)), str) and value.strip()
+    }
+
+
+def _parse_runs_table_date(raw: str | None, *, end_of_day: bool = False) -> datetime | None:
+    # Date inputs are whole UTC days; `created_to` is inclusive of its day.
+    if not raw:
+        return None
+    try:
+        day = date.fromisoformat(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {raw}")
+    if end_of_day:
+        day = day + timedelta(days=1)
+    return datetime.combine(day, time.min)
+
+
+async def _list_management_runs_payload(
+    *,
+    page: int,
+    page_size: int,
+    cursor: str | None = None,
+    filters: dict[str, str] | None = None,
+):
+    active = filters or {}
     try:
         return await _resolve_async(
             management_router.list_management_runs(
                 page=page,
                 page_size=page_size,
                 limit=None,
+                cursor=cursor,
+                status=[active["status"]] if active.get("status") else None,
+                engine=active.get("engine"),
+                skill_id=active.get("skill_id"),
+                model=active.get("model"),
+                created_from=_parse_runs_table_date(active.get("created_from")),
+                created_to=_parse_runs_table_date(active.get("created_to"), end_of_day=True),
+                q=active.get("q"),
             )
         )
     except TypeError:
@@ -648,7 +685,7 @@ async def ui_skill_view_file(request: Request, skill_id: str, path: str):
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
 
-    preview = build_preview_payload(file_path)
+    preview = await file_preview_service.build_preview(file_path)
     return templates.TemplateResponse(
         request=request,
         name="ui/partials/file_preview.html",
@@ -677,7 +714,7 @@ async def ui_skill_preview_file_json(skill_id: str, path: str):
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
 
-    preview = build_preview_payload(file_path)
+    preview = await file_preview_service.build_preview(file_path)
     return JSONResponse(
         content={
             "skill_id": skill_id,
@@ -708,8 +745,31 @@ async def ui_management_runs_table(
     request: Request,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    q: str | None = Query(default=None, max_length=200),
+    status: str | None = Query(default=None),
+    engine: str | None = Query(default=None),
+    skill_id: str | None = Query(default=None),
+    model: str | None = Query(default=None),
+    created_from: str | None = Query(default=None),
+    created_to: str | None = Query(default=None),
 ):
-    runs_payload = await _list_management_runs_payload(page=page, page_size=page_size)
+    filters = _runs_table_filters(
+        q=q,
+        status=status,
+        engine=engine,
+        skill_id=skill_id,
+        model=model,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    cursor = cursor or None
+    runs_payload = await _list_management_runs_payload(
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        filters=filters,
+    )
     runs = _serialize_payload_list(runs_payload, "runs")
     return templates.TemplateResponse(
         request=request,
@@ -720,6 +780,12 @@ async def ui_management_runs_table(
             "page_size": _payload_get(runs_payload, "page_size", page_size),
             "total": _payload_get(runs_payload, "total", len(runs)),
             "total_pages": _payload_get(runs_payload, "total_pages", 0),
+            "cursor": cursor or "",
+            "next_cursor": _payload_get(runs_payload, "next_cursor"),
+            # Mirrors list_management_runs: keyset paging unless plain `page > 1`.
+            "keyset": bool(cursor or filters or page == 1),
+            "filters": filters,
+            "filter_query": urlencode(filters),
         },
     )
 
@@ -729,12 +795,28 @@ async def ui_runs_table(
     request: Request,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    q: str | None = Query(default=None, max_length=200),
+    status: str | None = Query(default=None),
+    engine: str | None = Query(default=None),
+    skill_id: str | None = Query(default=None),
+    model: str | None = Query(default=None),
+    created_from: str | None = Query(default=None),
+    created_to: str | None = Query(default=None),
 ):
     _handle_legacy_data_endpoint("/ui/runs/table", "/ui/management/runs/table")
     response = await ui_management_runs_table(
         request=request,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        q=q,
+        status=status,
+        engine=engine,
+        skill_id=skill_id,
+        model=model,
+        created_from=created_from,
+        created_to=created_to,
     )
     response.headers.update(_legacy_data_headers("/ui/management/runs/table"))
     return response
@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Callable, Literal, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Literal, Protocol
 
-from server.runtime.adapter.types import LiveParserEmission, RuntimeStreamRawRef
+from server.runtime.adapter.types import LiveParserEmission, RuntimeStreamParseResult, RuntimeStreamRawRef
 from server.runtime.protocol.contracts import LiveStreamParserSession
 
+if TYPE_CHECKING:
+    from server.runtime.protocol.parse_utils import PreparedRuntimeStreams, RuntimeStreamsCollector
+
 LIVE_STREAM_LINE_LIMIT_BYTES = 4096
 LIVE_STREAM_LINE_TRUNCATION_MARKER = " ... [truncated by live overflow guard]"
 LIVE_STREAM_LINE_OVERFLOW_REPAIRED = "RUNTIME_STREAM_LINE_OVERFLOW_REPAIRED"
@@ -18,6 +21,7 @@ RUNTIME_STREAM_LINE_OVERFLOW_DIAGNOSTIC_SUBSTITUTED = (
 )
 SemanticOverflowExemptionKind = Literal["reasoning", "assistant_message"]
 NdjsonOverflowExemptionProbe = Callable[[str, str], SemanticOverflowExemptionKind | None]
+PreparedRuntimeStreamParser = Callable[["PreparedRuntimeStreams"], RuntimeStreamParseResult]
 OVERFLOW_PREVIEW_CHAR_LIMIT = 256
 
 
@@ -668,17 +672,40 @@ class NdjsonLineBuffer:
 
 
 class NdjsonLiveStreamParserSession(LiveStreamParserSession, ABC):
+    """
+    Live NDJSON parsing for one attempt.
+
+    With `prepared_stream_parser`, the session also accumulates the engine's
+    attempt-end `parse_runtime_stream` input as output arrives (lines split
+    and JSON-decoded once) and runs the engine's parse over it on `finish`;
+    `runtime_parse_result()` then equals `parse_runtime_stream` on the same
+    stdout/stderr/pty bytes.
+    """
+
     def __init__(
         self,
         *,
         accepted_streams: set[str] | None = None,
         overflow_exemption_probe: NdjsonOverflowExemptionProbe | None = None,
+        prepared_stream_parser: PreparedRuntimeStreamParser | None = None,
     ) -> None:
         self._accepted_streams = set(accepted_streams or {"stdout", "pty"})
         self._line_buffer = NdjsonLineBuffer(
             accepted_streams=self._accepted_streams,
             overflow_exemption_probe=overflow_exemption_probe,
         )
+        self._prepared_stream_parser = prepared_stream_parser
+        self._runtime_streams: RuntimeStreamsCollector | None = None
+        if prepared_stream_parser is not None:
+            # parse_utils imports the adapter package, which imports this module.
+            from server.runtime.protocol.parse_utils import RuntimeStreamsCollector
+
+            self._runtime_streams = RuntimeStreamsCollector()
+        self._runtime_parse_result: RuntimeStreamParseResult | None = None
+
+    def runtime_parse_result(self) -> RuntimeStreamParseResult | None:
+        """Attempt-end parse result, available after `finish`."""
+        return self._runtime_parse_result
 
     @abstractmethod
     def handle_live_row(
@@ -704,8 +731,20 @@ class NdjsonLiveStreamParserSession(LiveStreamParserSession, ABC):
             if prepared is None:
                 continue
             emissions.extend(self._process_prepared_line(stream=stream, line=prepared))
+        self._finish_runtime_parse()
         return emissions
 
+    def _finish_runtime_parse(self) -> None:
+        runtime_streams = self._runtime_streams
+        self._runtime_streams = None
+        if runtime_streams is None or self._prepared_stream_parser is None:
+            return
+        try:
+            self._runtime_parse_result = self._prepared_stream_parser(runtime_streams.finish())
+        except (OSError, RuntimeError, TypeError, ValueError, LookupError):
+            # Same failures the attempt-end callers tolerate; they re-parse and handle them.
+            self._runtime_parse_result = None
+
     def feed(
         self,
         *,
@@ -714,6 +753,8 @@ class NdjsonLiveStreamParserSession(LiveStreamParserSession, ABC):
         byte_from: int,
         byte_to: int,
     ) -> list[LiveParserEmission]:
+        if self._runtime_streams is not None:
+            self._runtime_streams.feed(stream=stream, text=text)
         emissions: list[LiveParserEmission] = []
         for line in self._line_buffer.feed(
             stream=stream,
@@ -2,15 +2,39 @@ from __future__ import annotations
 
 import json
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping, Sequence
 
 import jsonschema  # type: ignore[import-untyped]
 
+try:
+    from re import _parser as _regex_parser  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover - private module, literal prefilter is optional
+    _regex_parser = None
+
 from server.config import config
 from server.runtime.adapter.types import RuntimeAuthSignal
 
+_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+# Numbered/named back-references and inline global flags change meaning (or
+# stop compiling) once a pattern is wrapped into a larger alternation.
+_UNMERGEABLE_PATTERN_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)")
+_COMPILED_RULE_SET_CACHE_MAX = 64
+_MIN_PREFILTER_LITERAL_LEN = 2
+_MAX_PREFILTER_ALTERNATIVES = 16
+# The only non-ASCII code points IGNORECASE matching treats as equal to an
+# ASCII character; folded to it before the required-literal prefilter.
+_ASCII_CASE_ALIASES = {"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"}
+_ASCII_CASE_ALIAS_TABLE = str.maketrans(_ASCII_CASE_ALIASES)
+_MISSING = object()
+
+FieldPath = tuple[str, ...]
+LiteralRequirement = tuple[frozenset[str], ...]
+
 
 def detect_auth_signal_from_patterns(
     *,
@@ -19,22 +43,15 @@ def detect_auth_signal_from_patterns(
     evidence: Mapping[str, Any],
 ) -> RuntimeAuthSignal | None:
     engine_id = engine.strip().lower()
-    ordered_engine_rules = _sort_rules(rules)
-    for rule in ordered_engine_rules:
-        if not _matches_rule(rule, evidence):
-            continue
-        signal = _build_signal(evidence=evidence, rule=rule, confidence="high")
-        if signal is not None:
-            return signal
-
-    fallback_rules = _load_common_fallback_rules()
-    ordered_fallback_rules = _sort_rules(fallback_rules)
-    for rule in ordered_fallback_rules:
-        if not _matches_rule(rule, {**dict(evidence), "engine": engine_id}):
-            continue
-        signal = _build_signal(evidence=evidence, rule=rule, confidence="low")
-        if signal is not None:
-            return signal
+    rule = compile_auth_rules(engine_id, rules).first_match(evidence)
+    if rule is not None:
+        _record_rule_hit(engine_id, rule.rule_id)
+        return _build_signal(evidence=evidence, rule_id=rule.rule_id, confidence="high")
+
+    rule = _compiled_common_fallback_rules().first_match(evidence, overrides={"engine": engine_id})
+    if rule is not None:
+        _record_rule_hit(engine_id, rule.rule_id)
+        return _build_signal(evidence=evidence, rule_id=rule.rule_id, confidence="low")
     return None
 
 
@@ -44,27 +61,444 @@ def is_high_confidence_auth_required(signal: RuntimeAuthSignal | None) -> bool:
     return bool(signal.get("required")) and signal.get("confidence") == "high"
 
 
+class _Evaluation:
+    """Per-evidence lookup state shared by every clause of one rule set pass."""
+
+    __slots__ = ("_evidence", "_overrides", "_values", "_folded", "_regex_hits")
+
+    def __init__(self, evidence: Mapping[str, Any], overrides: Mapping[str, Any] | None) -> None:
+        self._evidence = evidence
+        self._overrides = overrides
+        self._values: dict[FieldPath, Any] = {}
+        self._folded: dict[FieldPath, str] = {}
+        self._regex_hits: dict[tuple[FieldPath, str], bool] = {}
+
+    def value(self, path: FieldPath) -> Any:
+        cached = self._values.get(path, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        head = path[0]
+        if self._overrides is not None and head in self._overrides:
+            current: Any = self._overrides[head]
+        else:
+            current = self._evidence.get(head)
+        for part in path[1:]:
+            if not isinstance(current, dict):
+                current = None
+                break
+            current = current.get(part)
+        self._values[path] = current
+        return current
+
+    def regex_hit(self, path: FieldPath, pattern: re.Pattern[str], required: LiteralRequirement | None) -> bool:
+        actual = self.value(path)
+        if not isinstance(actual, str):
+            return False
+        if required is not None:
+            folded = self._folded.get(path)
+            if folded is None:
+                folded = _fold_ascii_case(actual)
+                self._folded[path] = folded
+            for literals in required:
+                if not any(literal in folded for literal in literals):
+                    return False
+        key = (path, pattern.pattern)
+        hit = self._regex_hits.get(key)
+        if hit is None:
+            hit = pattern.search(actual) is not None
+            self._regex_hits[key] = hit
+        return hit
+
+
+ClausePredicate = Callable[[_Evaluation], bool]
+
+
+@dataclass(frozen=True)
+class CompiledAuthRule:
+    rule_id: str
+    priority: int
+    all_clauses: tuple[ClausePredicate, ...]
+    any_clauses: tuple[ClausePredicate, ...]
+
+    def matches(self, evaluation: _Evaluation) -> bool:
+        for clause in self.all_clauses:
+            if not clause(evaluation):
+                return False
+        if self.any_clauses:
+            for clause in self.any_clauses:
+                if clause(evaluation):
+                    return True
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class CompiledAuthRuleSet:
+    """
+    Auth rules of one engine, compiled once and evaluated many times.
+
+    Rules are pre-sorted by priority, field paths are pre-split, regexes are
+    compiled up front, and regex clauses of one `any` block that target the
+    same field are merged into a single alternation. Each regex also carries
+    the literals its matches must contain; plain substring checks on the
+    lower-cased field skip the regex scan when they are absent.
+    A field value and a regex result are computed once per evaluation even
+    when several rules share them.
+    """
+
+    engine: str
+    rules: tuple[CompiledAuthRule, ...]
+
+    def first_match(
+        self,
+        evidence: Mapping[str, Any],
+        *,
+        overrides: Mapping[str, Any] | None = None,
+    ) -> CompiledAuthRule | None:
+        if not self.rules:
+            return None
+        evaluation = _Evaluation(evidence, overrides)
+        for rule in self.rules:
+            if rule.matches(evaluation):
+                return rule
+        return None
+
+
+def compile_auth_rules(
+    engine: str,
+    rules: Sequence[dict[str, Any]],
+) -> CompiledAuthRuleSet:
+    """
+    Return the compiled form of `rules`, compiling at most once per rule tuple.
+
+    Adapter profiles are cached, so each engine passes the same rule tuple on
+    every call; the compiled set is keyed by that tuple's identity. Lists are
+    compiled on every call because they may be mutated by the caller.
+    """
+    engine_id = engine.strip().lower()
+    if not isinstance(rules, tuple):
+        return _compile_rule_set(engine_id, rules)
+    key = (engine_id, id(rules))
+    with _compiled_cache_lock:
+        entry = _compiled_rule_sets.get(key)
+        if entry is not None and entry[0] is rules:
+            _compiled_rule_sets.move_to_end(key)
+            return entry[1]
+    compiled = _compile_rule_set(engine_id, rules)
+    with _compiled_cache_lock:
+        # Keep the source tuple alive so its id cannot be reused while cached.
+        _compiled_rule_sets[key] = (rules, compiled)
+        _compiled_rule_sets.move_to_end(key)
+        while len(_compiled_rule_sets) > _COMPILED_RULE_SET_CACHE_MAX:
+            _compiled_rule_sets.popitem(last=False)
+    return compiled
+
+
+def auth_rule_hit_counts() -> dict[str, dict[str, int]]:
+    """Return `{engine: {rule_id: hits}}` for every rule that produced a signal."""
+    with _hit_counts_lock:
+        return {engine: dict(counts) for engine, counts in _rule_hit_counts.items()}
+
+
+def reset_auth_rule_hit_counts() -> None:
+    with _hit_counts_lock:
+        _rule_hit_counts.clear()
+
+
+_compiled_cache_lock = threading.Lock()
+_compiled_rule_sets: OrderedDict[tuple[str, int], tuple[Sequence[dict[str, Any]], CompiledAuthRuleSet]] = (
+    OrderedDict()
+)
+_hit_counts_lock = threading.Lock()
+_rule_hit_counts: dict[str, dict[str, int]] = {}
+
+
+def _record_rule_hit(engine: str, rule_id: str) -> None:
+    with _hit_counts_lock:
+        counts = _rule_hit_counts.setdefault(engine, {})
+        counts[rule_id] = counts.get(rule_id, 0) + 1
+
+
+def _compile_rule_set(engine: str, rules: Sequence[dict[str, Any]]) -> CompiledAuthRuleSet:
+    ordered = _sort_rules(rules)
+    patterns: dict[str, re.Pattern[str]] = {}
+    for rule in ordered:
+        for clause in _iter_rule_clauses(rule):
+            value = clause.get("value")
+            if clause.get("op") == "regex" and isinstance(value, str) and value not in patterns:
+                patterns[value] = re.compile(value, _REGEX_FLAGS)
+    compiled_rules: list[CompiledAuthRule] = []
+    for rule in ordered:
+        compiled = _compile_rule(rule, patterns=patterns)
+        if compiled is not None:
+            compiled_rules.append(compiled)
+    return CompiledAuthRuleSet(engine=engine, rules=tuple(compiled_rules))
+
+
+def _compile_rule(
+    rule: dict[str, Any],
+    *,
+    patterns: dict[str, re.Pattern[str]],
+) -> CompiledAuthRule | None:
+    rule_id = str(rule.get("id") or "").strip()
+    match = rule.get("match", {})
+    if not rule_id or not isinstance(match, dict):
+        return None
+    all_raw = match.get("all", [])
+    any_raw = match.get("any", [])
+    has_all = isinstance(all_raw, list) and bool(all_raw)
+    has_any = isinstance(any_raw, list) and bool(any_raw)
+    if not has_all and not has_any:
+        return None
+    # Clauses are side-effect free, so cheap field comparisons go before regex scans.
+    all_clauses = (
+        tuple(
+            _compile_clause(clause, patterns=patterns)
+            for clause in sorted(
+                (clause for clause in all_raw if isinstance(clause, dict)),
+                key=lambda clause: clause.get("op") == "regex",
+            )
+        )
+        if has_all
+        else ()
+    )
+    any_clauses = (
+        _compile_any_clauses(
+            [clause for clause in any_raw if isinstance(clause, dict)],
+            patterns=patterns,
+        )
+        if has_any
+        else ()
+    )
+    if has_any and not any_clauses:
+        # `any` over only malformed clauses can never match.
+        any_clauses = (_never,)
+    return CompiledAuthRule(
+        rule_id=rule_id,
+        priority=int(rule.get("priority", 0)),
+        all_clauses=all_clauses,
+        any_clauses=any_clauses,
+    )
+
+
+def _compile_any_clauses(
+    clauses: list[dict[str, Any]],
+    *,
+    patterns: dict[str, re.Pattern[str]],
+) -> tuple[ClausePredicate, ...]:
+    regex_by_field: dict[FieldPath, list[str]] = {}
+    others: list[dict[str, Any]] = []
+    for clause in clauses:
+        path = _split_field(clause.get("field"))
+        value = clause.get("value")
+        if path is not None and clause.get("op") == "regex" and isinstance(value, str):
+            regex_by_field.setdefault(path, []).append(value)
+        else:
+            others.append(clause)
+    compiled: list[ClausePredicate] = []
+    for path, values in regex_by_field.items():
+        merged = _merge_patterns(values) if len(values) > 1 else None
+        if merged is not None:
+            compiled.append(_regex_predicate(path, merged))
+            continue
+        for value in values:
+            compiled.append(_regex_predicate(path, patterns[value]))
+    compiled.extend(_compile_clause(clause, patterns=patterns) for clause in others)
+    return tuple(compiled)
+
+
+def _compile_clause(
+    clause: dict[str, Any],
+    *,
+    patterns: dict[str, re.Pattern[str]],
+) -> ClausePredicate:
+    path = _split_field(clause.get("field"))
+    if path is None:
+        return _never
+    op = clause.get("op")
+    expected = clause.get("value")
+    if op == "eq":
+        return lambda evaluation: evaluation.value(path) == expected
+    if op == "in":
+        if not isinstance(expected, list):
+            return _never
+        return lambda evaluation: evaluation.value(path) in expected
+    if op == "regex":
+        if not isinstance(expected, str):
+            return _never
+        return _regex_predicate(path, patterns[expected])
+    if op == "contains":
+        return _contains_predicate(path, expected)
+    if op == "gte":
+        if expected is None:
+            return _never
+        try:
+            threshold = float(expected)
+        except (TypeError, ValueError):
+            return _never
+        return _gte_predicate(path, threshold)
+    return _never
+
+
+def _regex_predicate(path: FieldPath, pattern: re.Pattern[str]) -> ClausePredicate:
+    required = _required_literals(pattern.pattern)
+    return lambda evaluation: evaluation.regex_hit(path, pattern, required)
+
+
+def _contains_predicate(path: FieldPath, expected: Any) -> ClausePredicate:
+    expected_lower = expected.lower() if isinstance(expected, str) else None
+
+    def _contains(evaluation: _Evaluation) -> bool:
+        actual = evaluation.value(path)
+        if isinstance(actual, str) and expected_lower is not None:
+            return expected_lower in actual.lower()
+        if isinstance(actual, list):
+            return expected in actual
+        return False
+
+    return _contains
+
+
+def _gte_predicate(path: FieldPath, threshold: float) -> ClausePredicate:
+    def _gte(evaluation: _Evaluation) -> bool:
+        actual = evaluation.value(path)
+        if actual is None:
+            return False
+        try:
+            return float(actual) >= threshold
+        except (TypeError, ValueError):
+            return False
+
+    return _gte
+
+
+def _never(evaluation: _Evaluation) -> bool:
+    return False
+
+
+def _merge_patterns(values: list[str]) -> re.Pattern[str] | None:
+    if any(_UNMERGEABLE_PATTERN_RE.search(value) for value in values):
+        return None
+    try:
+        return re.compile("|".join(f"(?:{value})" for value in values), _REGEX_FLAGS)
+    except re.error:
+        return None
+
+
+def _fold_ascii_case(text: str) -> str:
+    if not text.isascii() and any(alias in text for alias in _ASCII_CASE_ALIASES):
+        text = text.translate(_ASCII_CASE_ALIAS_TABLE)
+    return text.lower()
+
+
+def _required_literals(pattern: str) -> LiteralRequirement | None:
+    """
+    Lower-cased ASCII literal sets every match of `pattern` satisfies.
+
+    Each returned set holds alternatives: a match contains at least one
+    literal of every set. Returns None when nothing useful can be derived,
+    in which case the regex always runs.
+    """
+    if _regex_parser is None:
+        return None
+    try:
+        parsed = _regex_parser.parse(pattern, _REGEX_FLAGS)
+    except (re.error, RecursionError):
+        return None
+    requirement = tuple(
+        literals
+        for literals in _sequence_literals(list(parsed))
+        if min(len(literal) for literal in literals) >= _MIN_PREFILTER_LITERAL_LEN
+    )
+    return requirement or None
+
+
+def _sequence_literals(items: list[tuple[Any, Any]]) -> list[frozenset[str]]:
+    required: list[frozenset[str]] = []
+    # Literal runs as alternatives, so `40[13]` becomes {"401", "403"}.
+    run: list[str] = [""]
+
+    def _flush() -> None:
+        if run[0]:
+            required.append(frozenset(run))
+        run[:] = [""]
+
+    for op, av in items:
+        if op is _regex_parser.LITERAL and av < 128:
+            run[:] = [prefix + chr(av).lower() for prefix in run]
+            continue
+        chars = _small_literal_class(av) if op is _regex_parser.IN else None
+        if chars is not None and len(run) * len(chars) <= _MAX_PREFILTER_ALTERNATIVES:
+            run[:] = [prefix + char for prefix in run for char in chars]
+            continue
+        _flush()
+        if op is _regex_parser.SUBPATTERN:
+            required.extend(_sequence_literals(list(av[-1])))
+        elif op is _regex_parser.ATOMIC_GROUP:
+            required.extend(_sequence_literals(list(av)))
+        elif op in (_regex_parser.MAX_REPEAT, _regex_parser.MIN_REPEAT, _regex_parser.POSSESSIVE_REPEAT):
+            if av[0] >= 1:
+                required.extend(_sequence_literals(list(av[2])))
+        elif op is _regex_parser.BRANCH:
+            alternatives = [_best_literals(_sequence_literals(list(branch))) for branch in av[1]]
+            if all(alternatives):
+                required.append(frozenset().union(*alternatives))  # type: ignore[arg-type]
+    _flush()
+    return required
+
+
+def _small_literal_class(items: list[tuple[Any, Any]]) -> list[str] | None:
+    chars: set[str] = set()
+    for op, av in items:
+        if op is not _regex_parser.LITERAL or av >= 128:
+            return None
+        chars.add(chr(av).lower())
+    return sorted(chars) if chars else None
+
+
+def _best_literals(required: list[frozenset[str]]) -> frozenset[str] | None:
+    if not required:
+        return None
+    # Prefer the set whose shortest literal is longest, then the smallest set.
+    return max(required, key=lambda item: (min(len(literal) for literal in item), -len(item)))
+
+
+def _split_field(field: Any) -> FieldPath | None:
+    if not isinstance(field, str) or not field:
+        return None
+    return tuple(field.split("."))
+
+
+def _iter_rule_clauses(rule: dict[str, Any]) -> list[dict[str, Any]]:
+    match = rule.get("match", {})
+    if not isinstance(match, dict):
+        return []
+    clauses: list[dict[str, Any]] = []
+    for key in ("all", "any"):
+        block = match.get(key, [])
+        if isinstance(block, list):
+            clauses.extend(clause for clause in block if isinstance(clause, dict))
+    return clauses
+
+
 def _build_signal(
     *,
     evidence: Mapping[str, Any],
-    rule: dict[str, Any],
+    rule_id: str,
     confidence: str,
-) -> RuntimeAuthSignal | None:
-    provider_id = _resolve_field_value(dict(evidence), "provider_id")
+) -> RuntimeAuthSignal:
+    provider_id = evidence.get("provider_id")
     if provider_id is None:
-        provider_id = _resolve_field_value(dict(evidence), "extracted.provider_id")
+        extracted = evidence.get("extracted")
+        provider_id = extracted.get("provider_id") if isinstance(extracted, dict) else None
     provider_id_value = provider_id if isinstance(provider_id, str) and provider_id else None
-    matched_pattern_id = str(rule.get("id") or "").strip() or None
-    if matched_pattern_id is None:
-        return None
-    reason_code = _normalize_reason_code(matched_pattern_id)
     signal: RuntimeAuthSignal = {
         "required": True,
         "confidence": confidence,  # type: ignore[typeddict-item]
         "subcategory": None,
         "provider_id": provider_id_value,
-        "reason_code": reason_code,
-        "matched_pattern_id": matched_pattern_id,
+        "reason_code": _normalize_reason_code(rule_id),
+        "matched_pattern_id": rule_id,
     }
     return signal
 
@@ -76,7 +510,7 @@ def _normalize_reason_code(value: str) -> str:
     return upper
 
 
-def _sort_rules(rules: tuple[dict[str, Any], ...] | list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _sort_rules(rules: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
     return sorted(
         (
             rule
@@ -88,62 +522,6 @@ def _sort_rules(rules: tuple[dict[str, Any], ...] | list[dict[str, Any]]) -> lis
     )
 
 
-def _matches_rule(rule: dict[str, Any], evidence: Mapping[str, Any]) -> bool:
-    match = rule.get("match", {})
-    if not isinstance(match, dict):
-        return False
-    all_clauses = match.get("all", [])
-    any_clauses = match.get("any", [])
-    if isinstance(all_clauses, list) and all_clauses:
-        if not all(_matches_clause(dict(clause), evidence) for clause in all_clauses if isinstance(clause, dict)):
-            return False
-    if isinstance(any_clauses, list) and any_clauses:
-        if not any(_matches_clause(dict(clause), evidence) for clause in any_clauses if isinstance(clause, dict)):
-            return False
-    return bool((isinstance(all_clauses, list) and all_clauses) or (isinstance(any_clauses, list) and any_clauses))
-
-
-def _matches_clause(clause: dict[str, Any], evidence: Mapping[str, Any]) -> bool:
-    field = clause.get("field")
-    if not isinstance(field, str) or not field:
-        return False
-    op = clause.get("op")
-    expected = clause.get("value")
-    actual = _resolve_field_value(dict(evidence), field)
-    if op == "eq":
-        return actual == expected
-    if op == "in":
-        return actual in expected if isinstance(expected, list) else False
-    if op == "regex":
-        if not isinstance(actual, str) or not isinstance(expected, str):
-            return False
-        return re.search(expected, actual, re.IGNORECASE | re.MULTILINE) is not None
-    if op == "contains":
-        if isinstance(actual, str) and isinstance(expected, str):
-            return expected.lower() in actual.lower()
-        if isinstance(actual, list):
-            return expected in actual
-        return False
-    if op == "gte":
-        if actual is None or expected is None:
-            return False
-        try:
-            return float(actual) >= float(expected)
-        except (TypeError, ValueError):
-            return False
-    return False
-
-
-def _resolve_field_value(evidence: dict[str, Any], field: str) -> Any:
-    current: Any = evidence
-    for part in field.split("."):
-        if isinstance(current, dict):
-            current = current.get(part)
-        else:
-            return None
-    return current
-
-
 @lru_cache(maxsize=1)
 def _load_common_fallback_rules() -> tuple[dict[str, Any], ...]:
     root = Path(config.SYSTEM.ROOT).resolve()
@@ -158,3 +536,8 @@ def _load_common_fallback_rules() -> tuple[dict[str, Any], ...]:
     if not isinstance(raw_rules, list):
         return ()
     return tuple(rule for rule in raw_rules if isinstance(rule, dict))
+
+
+@lru_cache(maxsize=1)
+def _compiled_common_fallback_rules() -> CompiledAuthRuleSet:
+    return _compile_rule_set("common_fallback", _load_common_fallback_rules())
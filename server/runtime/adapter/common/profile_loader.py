@@ -334,6 +334,16 @@ def _load_schema() -> dict[str, Any]:
     return json.loads(schema_path.read_text(encoding="utf-8"))
 
 
+@lru_cache(maxsize=1)
+def _schema_validator() -> Any:
+    # `jsonschema.validate` re-checks the schema against its metaschema on every
+    # call; check it once and reuse the compiled validator for every profile.
+    schema = _load_schema()
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
 def _validate_resolved_path(
     *,
     profile_path: Path,
@@ -374,13 +384,11 @@ def _parse_adapter_profile(
 
     payload = json.loads(profile_path.read_text(encoding="utf-8"))
     if validate_schema:
-        schema = _load_schema()
-        try:
-            jsonschema.validate(instance=payload, schema=schema)
-        except jsonschema.ValidationError as exc:
+        error = jsonschema.exceptions.best_match(_schema_validator().iter_errors(payload))
+        if error is not None:
             raise RuntimeError(
-                f"Adapter profile validation failed for {engine} ({profile_path}): {exc.message}"
-            ) from exc
+                f"Adapter profile validation failed for {engine} ({profile_path}): {error.message}"
+            ) from error
 
     payload_engine = payload.get("engine")
     if payload_engine != engine:
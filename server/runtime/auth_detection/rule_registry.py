@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from server.config import config
 from server.config_registry import keys
+from server.runtime.adapter.common.parser_auth_signal_matcher import (
+    CompiledAuthRuleSet,
+    compile_auth_rules,
+)
 from server.runtime.adapter.common.profile_loader import load_adapter_profile
 
 from .rule_loader import RulePackLoadError
@@ -24,19 +29,22 @@ def _default_profile_paths() -> dict[str, Path]:
 @dataclass
 class AuthDetectionRuleRegistry:
     """
-    Validation-only registry for parser auth patterns.
+    Validation registry for parser auth patterns.
 
     Runtime auth classification is parser-signal based and no longer uses this
-    registry for evaluation.
+    registry for evaluation. Loading also compiles each engine's rules through
+    the parser matcher cache, so the stream parsers reuse the compiled form.
     """
 
     profile_paths: dict[str, Path] = field(default_factory=_default_profile_paths)
     _loaded: bool = False
     _rules_by_engine: dict[str, list[AuthDetectionRule]] = field(default_factory=dict)
+    _compiled_by_engine: dict[str, CompiledAuthRuleSet] = field(default_factory=dict)
 
     def load(self) -> None:
         seen_rule_ids: set[str] = set()
         rules_by_engine: dict[str, list[AuthDetectionRule]] = {}
+        compiled_by_engine: dict[str, CompiledAuthRuleSet] = {}
         for engine, profile_path in sorted(self.profile_paths.items()):
             profile = load_adapter_profile(engine, profile_path)
             parsed_rules: list[AuthDetectionRule] = []
@@ -54,13 +62,19 @@ class AuthDetectionRuleRegistry:
                 key=lambda item: int(item["priority"]),
                 reverse=True,
             )
+            compiled_by_engine[engine] = compile_auth_rules(engine, profile.parser_auth_patterns.rules)
         self._rules_by_engine = rules_by_engine
+        self._compiled_by_engine = compiled_by_engine
         self._loaded = True
 
     def ensure_loaded(self) -> None:
         if not self._loaded:
             self.load()
 
+    def compiled_rules(self, engine: str) -> CompiledAuthRuleSet | None:
+        self.ensure_loaded()
+        return self._compiled_by_engine.get(engine.strip().lower())
+
     def _validate_match_ops(self, rule: AuthDetectionRule, *, engine: str) -> None:
         match = rule.get("match", {})
         if not isinstance(match, dict):
@@ -83,3 +97,10 @@ class AuthDetectionRuleRegistry:
                     raise RulePackLoadError(
                         f"Invalid auth detection operator '{op}' in rule '{rule.get('id')}'"
                     )
+                if op == "regex":
+                    try:
+                        re.compile(str(clause.get("value")))
+                    except re.error as exc:
+                        raise RulePackLoadError(
+                            f"Invalid auth detection regex in rule '{rule.get('id')}': {exc}"
+                        ) from exc
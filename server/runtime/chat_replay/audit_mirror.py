@@ -5,16 +5,10 @@ import json
 from pathlib import Path
 from typing import Any
 
+from server.runtime.chat_replay.chat_index import CHAT_REPLAY_FILE_NAME, append_chat_rows_sync
 from server.runtime.common.async_audit_writer import BufferedAsyncTextFileWriter, audit_writer_registry
 
 
-def _append_jsonl_sync(path: Path, row: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as fp:
-        fp.write(json.dumps(row, ensure_ascii=False))
-        fp.write("\n")
-
-
 class ChatReplayAuditMirrorWriter:
     def __init__(self) -> None:
         self._writers_by_path: dict[str, BufferedAsyncTextFileWriter] = {}
@@ -30,11 +24,11 @@ class ChatReplayAuditMirrorWriter:
         if audit_dir is None:
             raise RuntimeError("audit_dir is required")
         target_audit_dir = audit_dir
-        path = target_audit_dir / "chat_replay.jsonl"
+        path = target_audit_dir / CHAT_REPLAY_FILE_NAME
         key = str(path.resolve(strict=False))
         writer = self._writers_by_path.get(key)
         if writer is None:
-            writer = BufferedAsyncTextFileWriter(path=path)
+            writer = BufferedAsyncTextFileWriter(path=path, append_fn=append_chat_rows_sync)
             self._writers_by_path[key] = writer
             self._writers_by_run.setdefault(run_id, set()).add(writer)
             audit_writer_registry.register(run_id=run_id, writer=writer)
@@ -55,7 +49,10 @@ class ChatReplayAuditMirrorWriter:
         try:
             asyncio.get_running_loop()
         except RuntimeError:
-            _append_jsonl_sync(target_audit_dir / "chat_replay.jsonl", row)
+            append_chat_rows_sync(
+                target_audit_dir / CHAT_REPLAY_FILE_NAME,
+                f"{json.dumps(row, ensure_ascii=False)}\n",
+            )
             return
         writer = self._writer_for(run_dir=run_dir, run_id=run_id, audit_dir=target_audit_dir)
         writer.enqueue(f"{json.dumps(row, ensure_ascii=False)}\n")
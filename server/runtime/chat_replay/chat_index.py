@@ -0,0 +1,174 @@
+"""Append-only chat replay store with a per-run seek index.
+
+`chat_replay.jsonl` holds one chat replay row per line in `seq` order.
+`chat_replay.idx` holds a fixed-width `(seq, byte offset)` record per row,
+written together with the rows in the same flush. A history query seeks to
+the last indexed row before `from_seq` and reads forward, so opening a long
+session reads only the rows it returns. The index may lag the data (crash
+between the two appends) or have gaps (dropped writes); readers then scan
+forward from the nearest valid record, so results stay complete.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Iterable, List
+
+CHAT_REPLAY_FILE_NAME = "chat_replay.jsonl"
+CHAT_REPLAY_INDEX_FILE_NAME = "chat_replay.idx"
+
+_INDEX_RECORD = struct.Struct("<QQ")
+
+
+def _parse_row(line: bytes) -> dict[str, Any] | None:
+    text = line.strip()
+    if not text:
+        return None
+    try:
+        payload = json.loads(text)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _row_seq(row: dict[str, Any] | None) -> int | None:
+    seq_obj = row.get("seq") if row is not None else None
+    return seq_obj if isinstance(seq_obj, int) and seq_obj > 0 else None
+
+
+def _index_records(data: bytes, base_offset: int) -> bytes:
+    records = bytearray()
+    position = 0
+    for line in data.splitlines(keepends=True):
+        seq = _row_seq(_parse_row(line))
+        if seq is not None:
+            records += _INDEX_RECORD.pack(seq, base_offset + position)
+        position += len(line)
+    return bytes(records)
+
+
+def append_chat_rows_sync(data_path: Path, text: str) -> None:
+    """Append serialized rows (JSONL text) to `data_path` and index them."""
+    data = text.encode("utf-8", errors="replace")
+    if not data:
+        return
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path = data_path.with_name(CHAT_REPLAY_INDEX_FILE_NAME)
+    with data_path.open("ab") as fp:
+        base_offset = fp.tell()
+        fp.write(data)
+    records = _index_records(data, base_offset)
+    # A fresh data file invalidates any index left behind by a deleted one.
+    with index_path.open("wb" if base_offset == 0 else "ab") as fp:
+        fp.write(records)
+
+
+def write_chat_rows_sync(audit_dir: Path, rows: Iterable[dict[str, Any]]) -> None:
+    """Atomically replace the store with `rows` (one-time backfill)."""
+    data = "".join(f"{json.dumps(row, ensure_ascii=False)}\n" for row in rows).encode("utf-8")
+    audit_dir.mkdir(parents=True, exist_ok=True)
+    data_path = audit_dir / CHAT_REPLAY_FILE_NAME
+    index_path = audit_dir / CHAT_REPLAY_INDEX_FILE_NAME
+    for path, payload in ((index_path, _index_records(data, 0)), (data_path, data)):
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+
+def _read_record(fp: Any, position: int) -> tuple[int, int]:
+    fp.seek(position * _INDEX_RECORD.size)
+    seq, offset = _INDEX_RECORD.unpack(fp.read(_INDEX_RECORD.size))
+    return seq, offset
+
+
+def _record_matches(data_fp: Any, seq: int, offset: int, data_size: int) -> bool:
+    if offset >= data_size:
+        return False
+    data_fp.seek(offset)
+    return _row_seq(_parse_row(data_fp.readline())) == seq
+
+
+def _seek_offset(index_path: Path, data_fp: Any, data_size: int, *, before_seq: int | None) -> int:
+    """Offset of the last valid indexed row with `seq < before_seq` (any seq when None)."""
+    try:
+        index_size = index_path.stat().st_size
+    except OSError:
+        return 0
+    count = index_size // _INDEX_RECORD.size
+    if count <= 0:
+        return 0
+    with index_path.open("rb") as index_fp:
+        # Records past the end of the data file belong to a lost or replaced write.
+        while count > 0 and _read_record(index_fp, count - 1)[1] >= data_size:
+            count -= 1
+        if before_seq is not None:
+            low, high = 0, count
+            while low < high:
+                middle = (low + high) // 2
+                if _read_record(index_fp, middle)[0] < before_seq:
+                    low = middle + 1
+                else:
+                    high = middle
+            count = low
+        if count <= 0:
+            return 0
+        seq, offset = _read_record(index_fp, count - 1)
+    return offset if _record_matches(data_fp, seq, offset, data_size) else 0
+
+
+def read_chat_rows_sync(
+    audit_dir: Path,
+    *,
+    from_seq: int | None = None,
+    to_seq: int | None = None,
+) -> List[dict[str, Any]] | None:
+    """Rows with `from_seq <= seq <= to_seq`; None when the run has no chat store yet."""
+    data_path = audit_dir / CHAT_REPLAY_FILE_NAME
+    try:
+        data_size = data_path.stat().st_size
+    except OSError:
+        return None
+    rows: List[dict[str, Any]] = []
+    with data_path.open("rb") as fp:
+        start = 0
+        if from_seq is not None and from_seq > 1:
+            start = _seek_offset(
+                audit_dir / CHAT_REPLAY_INDEX_FILE_NAME,
+                fp,
+                data_size,
+                before_seq=from_seq,
+            )
+        fp.seek(start)
+        for line in fp:
+            row = _parse_row(line)
+            if row is None:
+                continue
+            seq = _row_seq(row)
+            if seq is not None:
+                if from_seq is not None and seq < from_seq:
+                    continue
+                if to_seq is not None and seq > to_seq:
+                    continue
+            rows.append(row)
+    return rows
+
+
+def last_chat_seq_sync(audit_dir: Path) -> int:
+    """Highest `seq` in the store, reading only past the last indexed row."""
+    data_path = audit_dir / CHAT_REPLAY_FILE_NAME
+    try:
+        data_size = data_path.stat().st_size
+    except OSError:
+        return 0
+    max_seq = 0
+    with data_path.open("rb") as fp:
+        start = _seek_offset(audit_dir / CHAT_REPLAY_INDEX_FILE_NAME, fp, data_size, before_seq=None)
+        fp.seek(start)
+        for line in fp:
+            seq = _row_seq(_parse_row(line))
+            if seq is not None:
+                max_seq = max(max_seq, seq)
+    return max_seq
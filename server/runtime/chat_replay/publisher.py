@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import inspect
 from datetime import datetime
 from pathlib import Path
@@ -10,31 +9,11 @@ from server.models import ChatReplayEventEnvelope
 from server.runtime.protocol.schema_registry import validate_chat_replay_event
 
 from .audit_mirror import ChatReplayAuditMirrorWriter
+from .chat_index import last_chat_seq_sync
 from .factories import derive_chat_replay_rows_from_fcmp
 from .live_journal import chat_replay_live_journal
 
 
-def _read_jsonl(path: Path) -> List[dict[str, Any]]:
-    if not path.exists() or not path.is_file():
-        return []
-    rows: List[dict[str, Any]] = []
-    try:
-        with path.open("r", encoding="utf-8") as fp:
-            for line in fp:
-                text = line.strip()
-                if not text:
-                    continue
-                try:
-                    payload = json.loads(text)
-                except json.JSONDecodeError:
-                    continue
-                if isinstance(payload, dict):
-                    rows.append(payload)
-    except OSError:
-        return []
-    return rows
-
-
 def _enqueue_mirror(
     mirror_writer: ChatReplayAuditMirrorWriter,
     *,
@@ -74,13 +53,7 @@ class ChatReplayPublisher:
             return
         if audit_dir is None:
             raise RuntimeError("audit_dir is required")
-        target_audit_dir = audit_dir
-        max_seq = 0
-        for row in _read_jsonl(target_audit_dir / "chat_replay.jsonl"):
-            seq_obj = row.get("seq")
-            if isinstance(seq_obj, int):
-                max_seq = max(max_seq, seq_obj)
-        self._next_seq_by_run[run_id] = max_seq + 1
+        self._next_seq_by_run[run_id] = last_chat_seq_sync(audit_dir) + 1
 
     def publish(
         self,
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from collections import defaultdict, deque
 from pathlib import Path
-from typing import Deque
+from typing import Callable, Deque
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +22,10 @@ class BufferedAsyncTextFileWriter:
         path: Path,
         max_buffered_bytes: int = 4 * 1024 * 1024,
         batch_bytes: int = 256 * 1024,
+        append_fn: Callable[[Path, str], None] = _append_text_sync,
     ) -> None:
         self._path = path
+        self._append_fn = append_fn
         self._max_buffered_bytes = max(1, int(max_buffered_bytes))
         self._batch_bytes = max(1, int(batch_bytes))
         self._pending_chunks: Deque[str] = deque()
@@ -109,7 +111,7 @@ class BufferedAsyncTextFileWriter:
                 if not batch_parts:
                     break
                 try:
-                    await asyncio.to_thread(_append_text_sync, self._path, "".join(batch_parts))
+                    await asyncio.to_thread(self._append_fn, self._path, "".join(batch_parts))
                 except OSError:
                     logger.exception("Buffered audit writer append failed path=%s", self._path)
             if not self._pending_chunks:
@@ -5,7 +5,10 @@ import threading
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Deque, Dict, List, Tuple
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+# (run_id, row, terminal) -> None; called after every local publish.
+PublishListener = Callable[[str, dict[str, Any], bool], None]
 
 
 @dataclass
@@ -21,8 +24,21 @@ class _BaseLiveJournal:
         self._terminal_retention_sec = max(1.0, float(terminal_retention_sec))
         self._buffers: Dict[str, _RunJournalBuffer] = {}
         self._lock = threading.Lock()
+        self._publish_listener: PublishListener | None = None
+
+    def set_publish_listener(self, listener: PublishListener | None) -> None:
+        """Install the multi-worker relay hook (None removes it)."""
+        self._publish_listener = listener
 
     def publish(self, *, run_id: str, row: dict[str, Any], terminal: bool = False) -> dict[str, Any]:
+        published = self.publish_relayed(run_id=run_id, row=row, terminal=terminal)
+        listener = self._publish_listener
+        if listener is not None:
+            listener(run_id, published, terminal)
+        return published
+
+    def publish_relayed(self, *, run_id: str, row: dict[str, Any], terminal: bool = False) -> dict[str, Any]:
+        """Publish locally without notifying the relay (rows received from a peer worker)."""
         with self._lock:
             self._cleanup_expired_locked()
             buffer = self._buffers.setdefault(run_id, _RunJournalBuffer())
@@ -11,6 +11,12 @@ from pathlib import Path, PurePosixPath
 from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
 from server.config import config
+from server.runtime.chat_replay.chat_index import (
+    CHAT_REPLAY_FILE_NAME,
+    CHAT_REPLAY_INDEX_FILE_NAME,
+    read_chat_rows_sync,
+    write_chat_rows_sync,
+)
 from server.runtime.chat_replay.factories import derive_chat_replay_rows_from_fcmp
 from server.runtime.chat_replay.live_journal import chat_replay_live_journal
 from server.runtime.protocol.event_protocol import (
@@ -48,9 +54,8 @@ from server.runtime.observability.contracts import (
     WorkspacePort,
 )
 from server.services.platform.async_compat import maybe_await
-from server.services.skill.skill_browser import (
-    build_preview_payload,
-)
+from server.services.platform.file_preview_renderer import PreviewWindow
+from server.services.platform.file_preview_service import file_preview_service
 from server.services.platform.run_file_filter_service import (
     normalize_relative_path,
     run_file_filter_service,
@@ -163,6 +168,23 @@ def configure_run_observability_ports(
     queued_resume_redriver = queued_resume_redriver_backend
 
 
+# Fields that differ between two replays of the same journal (random publish
+# ids, FCMP sequence numbers assigned by the global reindex).
+_PROTOCOL_DIFF_VOLATILE_KEYS = frozenset({"publish_id", "seq", "local_seq"})
+
+
+def _normalize_protocol_row_for_diff(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _normalize_protocol_row_for_diff(item)
+            for key, item in value.items()
+            if key not in _PROTOCOL_DIFF_VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [_normalize_protocol_row_for_diff(item) for item in value]
+    return value
+
+
 def _resolve_conversation_mode(client_metadata: dict[str, Any] | None) -> str:
     if not isinstance(client_metadata, dict):
         return "session"
@@ -695,13 +717,19 @@ class RunObservabilityService:
             needs_audit = True
         elif live_floor > 0 and requested_from < live_floor:
             needs_audit = True
+        audit_to_seq = to_seq
+        if live_rows and live_floor > 0:
+            # The live journal holds every row from its floor up; the audit
+            # store only has to supply what the journal already evicted.
+            audit_to_seq = live_floor - 1 if to_seq is None else min(int(to_seq), live_floor - 1)
+            needs_audit = needs_audit and audit_to_seq >= max(1, requested_from or 1)
         audit_rows: List[Dict[str, Any]] = []
         if needs_audit:
             audit_rows = await self._list_chat_history_from_audit(
                 run_dir=run_dir,
                 request_id=request_id,
                 from_seq=from_seq,
-                to_seq=to_seq,
+                to_seq=audit_to_seq,
                 from_ts=from_ts,
                 to_ts=to_ts,
             )
@@ -783,18 +811,23 @@ class RunObservabilityService:
     ) -> List[Dict[str, Any]]:
         layout = await self._resolve_layout_for_request(request_id, run_dir)
         audit_dir = self._audit_dir_for_layout(run_dir, layout)
-        audit_path = audit_dir / "chat_replay.jsonl"
+        context = f"chat-audit:{request_id or run_dir.name}"
+        indexed_rows = read_chat_rows_sync(audit_dir, from_seq=from_seq, to_seq=to_seq)
         rows: List[Dict[str, Any]]
-        if audit_path.exists() and audit_path.is_file():
-            rows = self._filter_valid_chat_rows(
-                rows=read_jsonl(audit_path),
-                context=f"chat-audit:{request_id or run_dir.name}",
-            )
+        if indexed_rows is not None:
+            rows = self._filter_valid_chat_rows(rows=indexed_rows, context=context)
         else:
             rows = await self._derive_chat_history_from_fcmp_audit(
                 run_dir=run_dir,
                 request_id=request_id,
             )
+            if await self._is_terminal_request(request_id, run_dir, layout):
+                # Terminal runs no longer publish; persist the derivation once so
+                # later reads are index range reads instead of an FCMP replay.
+                try:
+                    write_chat_rows_sync(audit_dir, rows)
+                except OSError:
+                    logger.warning("Chat history backfill failed (%s)", context, exc_info=True)
         rows.sort(key=lambda row: (int(row.get("seq") or 0), str(row.get("created_at") or "")))
         return self._filter_events(
             rows=rows,
@@ -804,6 +837,13 @@ class RunObservabilityService:
             to_ts=to_ts,
         )
 
+    async def _is_terminal_request(self, request_id: Optional[str], run_dir: Path, layout: Any) -> bool:
+        try:
+            status_payload = await self._read_status_payload_for_request(request_id or "", run_dir, layout)
+        except RuntimeError:
+            return False
+        return status_payload.get("status") in TERMINAL_STATUSES
+
     async def _list_event_history_from_audit(
         self,
         *,
@@ -1878,6 +1918,33 @@ class RunObservabilityService:
             "diagnostics": diagnostics,
         }
 
+    async def _regenerate_chat_index(
+        self,
+        *,
+        run_dir: Path,
+        request_id: Optional[str],
+        audit_dir: Path,
+        backup_dir: Path,
+    ) -> None:
+        """Re-derive a persisted chat store from the rebuilt FCMP history."""
+        data_path = audit_dir / CHAT_REPLAY_FILE_NAME
+        if not data_path.is_file():
+            return
+        index_path = audit_dir / CHAT_REPLAY_INDEX_FILE_NAME
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        for path in (data_path, index_path):
+            if path.is_file():
+                shutil.copy2(path, backup_dir / path.name)
+        rows = await self._derive_chat_history_from_fcmp_audit(run_dir=run_dir, request_id=request_id)
+        try:
+            write_chat_rows_sync(audit_dir, rows)
+        except OSError:
+            # A store that cannot be rewritten must not keep serving the old
+            # derivation; without it reads fall back to the rebuilt FCMP.
+            logger.warning("Chat index regeneration failed (%s)", request_id or run_dir.name, exc_info=True)
+            for path in (data_path, index_path):
+                path.unlink(missing_ok=True)
+
     def _backup_protocol_attempt_files(
         self,
         *,
@@ -1891,6 +1958,55 @@ class RunObservabilityService:
                 continue
             shutil.copy2(source, backup_attempt_dir / source.name)
 
+    def _protocol_replay_diff(
+        self,
+        *,
+        paths: Dict[str, Path],
+        rasp_rows: list[dict[str, Any]],
+        fcmp_rows: list[dict[str, Any]],
+        diagnostics_rows: list[dict[str, Any]],
+        metrics_payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Compare replayed rows with the stored protocol files of one attempt."""
+        streams: Dict[str, Any] = {}
+        changed = False
+        for key, rebuilt in (("events", rasp_rows), ("fcmp", fcmp_rows), ("diagnostics", diagnostics_rows)):
+            stored = [row for row in read_jsonl(paths[key]) if isinstance(row, dict)]
+            stored_norm = [_normalize_protocol_row_for_diff(row) for row in stored]
+            rebuilt_norm = [_normalize_protocol_row_for_diff(row) for row in rebuilt]
+            changed_rows = sum(1 for old, new in zip(stored_norm, rebuilt_norm) if old != new)
+            changed_rows += abs(len(stored_norm) - len(rebuilt_norm))
+            first_changed = next(
+                (
+                    index
+                    for index in range(max(len(stored_norm), len(rebuilt_norm)))
+                    if index >= len(stored_norm)
+                    or index >= len(rebuilt_norm)
+                    or stored_norm[index] != rebuilt_norm[index]
+                ),
+                None,
+            )
+            streams[key] = {
+                "stored": len(stored),
+                "rebuilt": len(rebuilt),
+                "changed_rows": changed_rows,
+                "first_changed_index": first_changed,
+            }
+            changed = changed or changed_rows > 0
+        stored_metrics: Any = None
+        metrics_path = paths["metrics"]
+        if metrics_path.exists() and metrics_path.is_file():
+            try:
+                stored_metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                stored_metrics = None
+        metrics_changed = stored_metrics != json.loads(json.dumps(metrics_payload, ensure_ascii=False))
+        return {
+            "changed": changed or metrics_changed,
+            "streams": streams,
+            "metrics_changed": metrics_changed,
+        }
+
     def _atomic_write_jsonl(self, *, path: Path, rows: list[dict[str, Any]]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         temp_path = path.with_name(f"{path.name}.tmp")
@@ -2002,6 +2118,7 @@ class RunObservabilityService:
         attempt_number: int,
         paths: Dict[str, Path],
         attempt_meta: Dict[str, Any],
+        dry_run: bool = False,
     ) -> Dict[str, Any]:
         io_chunks_decode = self._load_io_chunks_for_strict_replay(io_chunks_path=paths["io_chunks"])
         if not bool(io_chunks_decode.get("used")):
@@ -2092,7 +2209,7 @@ class RunObservabilityService:
         if finished_at is None and replay_chunks:
             finished_at = self._parse_optional_ts(replay_chunks[-1].get("ts"))
 
-        temp_root = paths["audit_dir"] / ".strict_replay_tmp"
+        temp_root = paths["audit_dir"] / (".strict_replay_dry_run_tmp" if dry_run else ".strict_replay_tmp")
         temp_run_dir = temp_root / f"attempt-{attempt_number}"
         temp_audit_dir = temp_run_dir / AUDIT_DIR_NAME
         temp_audit_dir.mkdir(parents=True, exist_ok=True)
@@ -2239,6 +2356,25 @@ class RunObservabilityService:
         rasp_models = [RuntimeEventEnvelope.model_validate(row) for row in rasp_rows]
         metrics_payload = compute_protocol_metrics(rasp_models)
 
+        if dry_run:
+            shutil.rmtree(temp_root, ignore_errors=True)
+            return {
+                "success": True,
+                "written": False,
+                "reason": "DRY_RUN",
+                "source": "io_chunks",
+                "event_count": len(rasp_rows),
+                "fcmp_count": len(fcmp_rows),
+                "diagnostics": list(io_chunks_decode.get("diagnostics") or []),
+                "diff": self._protocol_replay_diff(
+                    paths=paths,
+                    rasp_rows=rasp_rows,
+                    fcmp_rows=fcmp_rows,
+                    diagnostics_rows=diagnostics_rows,
+                    metrics_payload=metrics_payload,
+                ),
+            }
+
         metrics_text = json.dumps(metrics_payload, ensure_ascii=False, indent=2)
         self._atomic_write_jsonl(path=paths["events"], rows=rasp_rows)
         self._atomic_write_jsonl(path=paths["fcmp"], rows=fcmp_rows)
@@ -2338,7 +2474,15 @@ class RunObservabilityService:
         *,
         run_dir: Path,
         request_id: Optional[str],
+        dry_run: bool = False,
     ) -> Dict[str, Any]:
+        """
+        Strictly replay every attempt of a run from its io_chunks journal.
+
+        Existing protocol files are backed up under `rebuild_backups/` before
+        they are rewritten. With `dry_run` nothing is backed up or written and
+        each attempt reports a diff against the stored files instead.
+        """
         rebuild_mode = "strict_replay"
         layout = await self._resolve_layout_for_request(request_id, run_dir)
         logical_run_id = await self._resolve_logical_run_id(request_id, run_dir)
@@ -2353,11 +2497,11 @@ class RunObservabilityService:
         success = True
         for attempt_number in attempts:
             paths = self._protocol_paths(run_dir, attempt_number, audit_dir=audit_dir)
-            backup_attempt_dir = backup_root / f"attempt-{attempt_number}"
-            self._backup_protocol_attempt_files(
-                paths=paths,
-                backup_attempt_dir=backup_attempt_dir,
-            )
+            if not dry_run:
+                self._backup_protocol_attempt_files(
+                    paths=paths,
+                    backup_attempt_dir=backup_root / f"attempt-{attempt_number}",
+                )
             attempt_meta = self._read_attempt_meta(paths["audit_dir"], attempt_number)
             attempt_engine_obj = attempt_meta.get("engine")
             attempt_engine = (
@@ -2374,21 +2518,23 @@ class RunObservabilityService:
                     attempt_number=attempt_number,
                     paths=paths,
                     attempt_meta=attempt_meta,
+                    dry_run=dry_run,
                 )
                 success = success and bool(replay_result.get("success"))
-                attempt_results.append(
-                    {
-                        "attempt": attempt_number,
-                        "source": str(replay_result.get("source") or "io_chunks"),
-                        "written": bool(replay_result.get("written")),
-                        "reason": str(replay_result.get("reason") or "UNKNOWN"),
-                        "event_count": int(replay_result.get("event_count") or 0),
-                        "fcmp_count": int(replay_result.get("fcmp_count") or 0),
-                        "diagnostics": list(replay_result.get("diagnostics") or []),
-                        "mode": rebuild_mode,
-                        "success": bool(replay_result.get("success")),
-                    }
-                )
+                attempt_result = {
+                    "attempt": attempt_number,
+                    "source": str(replay_result.get("source") or "io_chunks"),
+                    "written": bool(replay_result.get("written")),
+                    "reason": str(replay_result.get("reason") or "UNKNOWN"),
+                    "event_count": int(replay_result.get("event_count") or 0),
+                    "fcmp_count": int(replay_result.get("fcmp_count") or 0),
+                    "diagnostics": list(replay_result.get("diagnostics") or []),
+                    "mode": rebuild_mode,
+                    "success": bool(replay_result.get("success")),
+                }
+                if isinstance(replay_result.get("diff"), dict):
+                    attempt_result["diff"] = replay_result["diff"]
+                attempt_results.append(attempt_result)
             except (OSError, RuntimeError, ValueError, ProtocolSchemaViolation, json.JSONDecodeError) as exc:
                 success = False
                 attempt_results.append(
@@ -2410,12 +2556,20 @@ class RunObservabilityService:
                     logical_run_id,
                     attempt_number,
                 )
+        if not dry_run and any(result.get("written") for result in attempt_results):
+            await self._regenerate_chat_index(
+                run_dir=run_dir,
+                request_id=request_id,
+                audit_dir=audit_dir,
+                backup_dir=backup_root,
+            )
         return {
             "request_id": request_id,
             "run_id": logical_run_id,
             "mode": rebuild_mode,
             "success": success,
-            "backup_dir": str(backup_root),
+            "dry_run": dry_run,
+            "backup_dir": None if dry_run else str(backup_root),
             "attempts": attempt_results,
         }
 
@@ -2815,6 +2969,39 @@ class RunObservabilityService:
             "total_pages": total_pages,
         }
 
+    async def list_runs_keyset(
+        self,
+        *,
+        limit: int = 20,
+        cursor: str | None = None,
+        filters: Any = None,
+    ) -> Dict[str, Any]:
+        """
+        Filtered run listing paged by an opaque `(created_at, request_id)` cursor.
+
+        `filters` is the run store's `RunListFilters`; None lists every run.
+        """
+        safe_limit = max(1, min(int(limit), 1000))
+        page = await maybe_await(
+            self._run_store().list_requests_with_runs_keyset(
+                limit=safe_limit,
+                cursor=cursor,
+                filters=filters,
+            )
+        )
+        if filters is None:
+            total = await maybe_await(self._run_store().count_requests_with_runs())
+        else:
+            total = await maybe_await(self._run_store().count_requests_with_runs_filtered(filters))
+        runs = await self._build_run_rows(list(page.get("rows") or []))
+        return {
+            "runs": runs,
+            "page_size": safe_limit,
+            "total": total,
+            "total_pages": (total + safe_limit - 1) // safe_limit if total > 0 else 0,
+            "next_cursor": page.get("next_cursor"),
+        }
+
     async def _build_run_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
         for row in rows:
@@ -2998,9 +3185,14 @@ class RunObservabilityService:
             raise ValueError("path escapes run root") from exc
         return candidate_resolved
 
-    async def build_run_file_preview(self, request_id: str, relative_path: str) -> Dict[str, Any]:
+    async def build_run_file_preview(
+        self,
+        request_id: str,
+        relative_path: str,
+        window: PreviewWindow | None = None,
+    ) -> Dict[str, Any]:
         file_path = await self.resolve_run_file_path(request_id, relative_path)
-        return build_preview_payload(file_path)
+        return await file_preview_service.build_preview(file_path, window=window)
 
     async def get_logs_tail(self, request_id: str, max_bytes: int = 64 * 1024) -> Dict[str, Any]:
         detail = await self.get_run_detail(request_id)
@@ -8,6 +8,7 @@ from fastapi import HTTPException, Request  # type: ignore[import-not-found]
 from fastapi.responses import FileResponse, StreamingResponse  # type: ignore[import-not-found]
 
 from server.services.platform.async_compat import maybe_await
+from server.services.platform.file_preview_renderer import PreviewWindow
 from server.models import (
     CancelResponse,
     RunArtifactsResponse,
@@ -280,6 +281,7 @@ class RunReadFacade:
         source_adapter: RunSourceAdapter | None = None,
         request_id: str,
         path: str,
+        window: PreviewWindow | None = None,
     ) -> RunFilePreviewResponse:
         _request_record, _run_dir = await self._resolve_request_and_workspace_dir(
             source_adapter=source_adapter,
@@ -290,7 +292,7 @@ class RunReadFacade:
         except ValueError as exc:
             raise HTTPException(status_code=404, detail=str(exc))
         try:
-            preview = await run_observability_service.build_run_file_preview(request_id, path)
+            preview = await run_observability_service.build_run_file_preview(request_id, path, window=window)
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc))
         except FileNotFoundError as exc:
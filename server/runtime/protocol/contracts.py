@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Awaitable, Protocol
 
 from server.runtime.adapter.types import LiveParserEmission
 
@@ -15,6 +15,13 @@ class RuntimeParserResolverPort(Protocol):
 
 
 class LiveStreamParserSession(Protocol):
+    """
+    Incremental parser state for one attempt.
+
+    In-process sessions return emissions directly; sessions hosted by the
+    attempt parser executor return an awaitable of them.
+    """
+
     def feed(
         self,
         *,
@@ -22,7 +29,7 @@ class LiveStreamParserSession(Protocol):
         text: str,
         byte_from: int,
         byte_to: int,
-    ) -> list[LiveParserEmission]:
+    ) -> list[LiveParserEmission] | Awaitable[list[LiveParserEmission]]:
         ...
 
     def finish(
@@ -30,7 +37,7 @@ class LiveStreamParserSession(Protocol):
         *,
         exit_code: int,
         failure_reason: str | None,
-    ) -> list[LiveParserEmission]:
+    ) -> list[LiveParserEmission] | Awaitable[list[LiveParserEmission]]:
         ...
 
 
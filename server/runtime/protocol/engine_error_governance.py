@@ -1,7 +1,19 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
+_RATE_LIMIT_TOKENS = (
+    "usage limit",
+    "rate limit",
+    "quota exceeded",
+    "too many requests",
+    "resource_exhausted",
+    "ratelimitexceeded",
+)
+_RATE_LIMIT_STATUS_RE = re.compile(r"\b(?:status|code)\s*[:=]\s*429\b", re.IGNORECASE)
+_RATE_LIMIT_SCAN_TAIL_CHARS = 64 * 1024
+
 
 def _normalize_text(value: Any) -> str | None:
     if isinstance(value, str):
@@ -25,7 +37,7 @@ def classify_engine_message_pattern(
     lower = normalized.lower()
     if "deprecated" in lower or "will be removed" in lower:
         return "ENGINE_DEPRECATION_WARNING", "engine_deprecation_warning", "warning"
-    if any(token in lower for token in ("usage limit", "rate limit", "quota exceeded", "too many requests")):
+    if any(token in lower for token in _RATE_LIMIT_TOKENS):
         return "ENGINE_RATE_LIMIT_HINT", "engine_rate_limit_hint", "warning"
     if any(
         token in lower
@@ -116,3 +128,26 @@ def classify_engine_error_payload(payload: dict[str, Any]) -> dict[str, Any] | N
         result["message"] = message
         result["detail"] = message
     return result
+
+
+def has_rate_limit_signal(runtime_parse_result: dict[str, Any] | None, *raw_texts: str | None) -> bool:
+    """Whether an attempt hit an upstream rate limit (parsed diagnostics first, raw stderr tail second)."""
+    if isinstance(runtime_parse_result, dict):
+        diagnostics = runtime_parse_result.get("diagnostic_events")
+        if isinstance(diagnostics, list):
+            for diagnostic in diagnostics:
+                if isinstance(diagnostic, dict) and (
+                    diagnostic.get("pattern_kind") == "engine_rate_limit_hint"
+                    or diagnostic.get("code") == "ENGINE_RATE_LIMIT_HINT"
+                ):
+                    return True
+        turn_failure = runtime_parse_result.get("turn_failure_data")
+        if isinstance(turn_failure, dict) and turn_failure.get("pattern_kind") == "engine_rate_limit_hint":
+            return True
+    for raw in raw_texts:
+        if not isinstance(raw, str) or not raw:
+            continue
+        tail = raw[-_RATE_LIMIT_SCAN_TAIL_CHARS:]
+        if _RATE_LIMIT_STATUS_RE.search(tail) or any(token in tail.lower() for token in _RATE_LIMIT_TOKENS):
+            return True
+    return False
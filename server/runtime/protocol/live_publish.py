@@ -627,6 +627,10 @@ class _BufferedLiveParserSession:
         self._stdout = bytearray()
         self._stderr = bytearray()
         self._pty = bytearray()
+        self._runtime_parse_result: dict[str, Any] | None = None
+
+    def runtime_parse_result(self) -> dict[str, Any] | None:
+        return self._runtime_parse_result
 
     def feed(
         self,
@@ -659,6 +663,8 @@ class _BufferedLiveParserSession:
         if not callable(parser):
             return []
         parsed = parser(stdout_raw=bytes(self._stdout), stderr_raw=bytes(self._stderr), pty_raw=bytes(self._pty))
+        if isinstance(parsed, dict):
+            self._runtime_parse_result = parsed
         emissions: list[LiveParserEmission] = []
         parsed_turn_complete_data = (
             parsed.get("turn_complete_data")
@@ -832,6 +838,7 @@ class LiveRuntimeEmitterImpl(LiveRuntimeEmitter):
         run_handle_consumer: Callable[[str], Awaitable[dict[str, Any] | None] | dict[str, Any] | None] | None = None,
         message_family_id: str | None = None,
         audit_dir: Path | None = None,
+        parser_session: LiveStreamParserSession | None = None,
     ) -> None:
         self._run_id = run_id
         self._run_dir = run_dir
@@ -846,7 +853,10 @@ class LiveRuntimeEmitterImpl(LiveRuntimeEmitter):
         self._rasp_publisher = rasp_publisher or rasp_event_publisher
         self._run_handle_consumer = run_handle_consumer
         start_live_session = getattr(stream_parser, "start_live_session", None)
-        if callable(start_live_session):
+        self._parser_session: LiveStreamParserSession | _BufferedLiveParserSession
+        if parser_session is not None:
+            self._parser_session = parser_session
+        elif callable(start_live_session):
             self._parser_session = start_live_session()
         else:
             self._parser_session = _BufferedLiveParserSession(stream_parser=stream_parser)
@@ -866,6 +876,30 @@ class LiveRuntimeEmitterImpl(LiveRuntimeEmitter):
         self._turn_start_emitted = False
         self._turn_complete_emitted = False
         self._turn_failed_emitted = False
+        self._fed_chars: dict[str, int] = {}
+        self._parser_finished = False
+
+    def runtime_parse_result(self, *, raw_stdout: str, raw_stderr: str) -> dict[str, Any] | None:
+        """
+        Attempt-end parse accumulated by the live parser session, if it covers the attempt output.
+
+        Only returned when the session was finished and was fed exactly
+        `raw_stdout`/`raw_stderr` (no pty output), so it equals
+        `parse_runtime_stream` on those streams; otherwise callers parse the
+        captured output themselves.
+        """
+        if not self._parser_finished:
+            return None
+        fed_chars = {stream: count for stream, count in self._fed_chars.items() if count}
+        if fed_chars.get("stdout", 0) != len(raw_stdout) or fed_chars.get("stderr", 0) != len(raw_stderr):
+            return None
+        if set(fed_chars) - {"stdout", "stderr"}:
+            return None
+        result_getter = getattr(self._parser_session, "runtime_parse_result", None)
+        if not callable(result_getter):
+            return None
+        parsed = result_getter()
+        return parsed if isinstance(parsed, dict) else None
 
     def _publish_rasp(self, event: RuntimeEventEnvelope | dict[str, Any]) -> dict[str, Any]:
         return self._rasp_publisher.publish(
@@ -895,12 +929,15 @@ class LiveRuntimeEmitterImpl(LiveRuntimeEmitter):
         byte_to: int,
         event_ts: datetime | None = None,
     ) -> None:
+        self._fed_chars[stream] = self._fed_chars.get(stream, 0) + len(text)
         emissions = self._parser_session.feed(
             stream=stream,
             text=text,
             byte_from=byte_from,
             byte_to=byte_to,
         )
+        if inspect.isawaitable(emissions):
+            emissions = await emissions
         await self._publish_emissions(emissions, event_ts=event_ts)
         self._publish_raw_lines(
             stream=stream,
@@ -918,6 +955,9 @@ class LiveRuntimeEmitterImpl(LiveRuntimeEmitter):
         event_ts: datetime | None = None,
     ) -> None:
         emissions = self._parser_session.finish(exit_code=exit_code, failure_reason=failure_reason)
+        if inspect.isawaitable(emissions):
+            emissions = await emissions
+        self._parser_finished = True
         await self._publish_emissions(emissions, event_ts=event_ts)
         self._flush_partial_lines(event_ts=event_ts)
         self._flush_pending_raw_rows(event_ts=event_ts)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import re
+from dataclasses import dataclass
 from typing import Any
 
 from server.runtime.adapter.types import RuntimeAssistantMessage, RuntimeStreamRawRow
@@ -19,34 +20,57 @@ SESSION_ID_PATTERNS = (
 )
 
 
+def _stream_line_row(stream: str, chunk: bytes, cursor: int) -> RuntimeStreamRawRow:
+    return {
+        "stream": stream,
+        "line": chunk.rstrip(b"\r\n").decode("utf-8", errors="replace"),
+        "byte_from": cursor,
+        "byte_to": cursor + len(chunk),
+    }
+
+
+def _is_runtime_script_envelope_line(line: str) -> bool:
+    if line.startswith(SCRIPT_STARTED_PREFIX) and "[COMMAND=" in line:
+        return True
+    return line.startswith(SCRIPT_DONE_PREFIX) and "[COMMAND_EXIT_CODE=" in line
+
+
+def _collect_json_row(
+    row: RuntimeStreamRawRow,
+    records: list[dict[str, Any]],
+    raw_rows: list[RuntimeStreamRawRow],
+) -> None:
+    line = str(row.get("line", "")).strip()
+    if not line:
+        return
+    try:
+        payload = json.loads(line)
+        if isinstance(payload, dict):
+            records.append(
+                {
+                    "payload": payload,
+                    "stream": row["stream"],
+                    "byte_from": int(row["byte_from"]),
+                    "byte_to": int(row["byte_to"]),
+                }
+            )
+        else:
+            raw_rows.append(row)
+    except json.JSONDecodeError:
+        raw_rows.append(row)
+
+
 def stream_lines_with_offsets(stream: str, raw: bytes) -> list[RuntimeStreamRawRow]:
     lines: list[RuntimeStreamRawRow] = []
     cursor = 0
     for chunk in raw.splitlines(keepends=True):
-        next_cursor = cursor + len(chunk)
-        text = chunk.rstrip(b"\r\n").decode("utf-8", errors="replace")
-        lines.append(
-            {
-                "stream": stream,
-                "line": text,
-                "byte_from": cursor,
-                "byte_to": next_cursor,
-            }
-        )
-        cursor = next_cursor
+        lines.append(_stream_line_row(stream, chunk, cursor))
+        cursor += len(chunk)
     return lines
 
 
 def strip_runtime_script_envelope(lines: list[RuntimeStreamRawRow]) -> list[RuntimeStreamRawRow]:
-    filtered: list[RuntimeStreamRawRow] = []
-    for row in lines:
-        line = str(row.get("line", ""))
-        if line.startswith(SCRIPT_STARTED_PREFIX) and "[COMMAND=" in line:
-            continue
-        if line.startswith(SCRIPT_DONE_PREFIX) and "[COMMAND_EXIT_CODE=" in line:
-            continue
-        filtered.append(row)
-    return filtered
+    return [row for row in lines if not _is_runtime_script_envelope_line(str(row.get("line", "")))]
 
 
 def collect_json_parse_errors(
@@ -55,27 +79,116 @@ def collect_json_parse_errors(
     records: list[dict[str, Any]] = []
     raw_rows: list[RuntimeStreamRawRow] = []
     for row in lines:
-        line = str(row.get("line", "")).strip()
-        if not line:
-            continue
-        try:
-            payload = json.loads(line)
-            if isinstance(payload, dict):
-                records.append(
-                    {
-                        "payload": payload,
-                        "stream": row["stream"],
-                        "byte_from": int(row["byte_from"]),
-                        "byte_to": int(row["byte_to"]),
-                    }
-                )
-            else:
-                raw_rows.append(row)
-        except json.JSONDecodeError:
-            raw_rows.append(row)
+        _collect_json_row(row, records, raw_rows)
     return records, raw_rows
 
 
+@dataclass(frozen=True)
+class RuntimeStreamLines:
+    """One stream after line splitting, envelope stripping and JSON decoding."""
+
+    stream: str
+    raw: bytes
+    records: list[dict[str, Any]]
+    error_rows: list[RuntimeStreamRawRow]
+
+
+@dataclass(frozen=True)
+class PreparedRuntimeStreams:
+    """
+    Input of an NDJSON engine's runtime stream parse.
+
+    `stdout` and `pty` hold what `stream_lines_with_offsets` →
+    `strip_runtime_script_envelope` → `collect_json_parse_errors` would
+    produce for them; stderr is only ever read as text.
+    """
+
+    stdout: RuntimeStreamLines
+    pty: RuntimeStreamLines
+    stderr_raw: bytes
+
+
+class RuntimeStreamLineCollector:
+    """
+    Incremental `stream_lines_with_offsets` → `strip_runtime_script_envelope`
+    → `collect_json_parse_errors` for one stream.
+
+    Bytes may arrive in any chunking; the rows match the batch functions on
+    the concatenated bytes. A line is processed once it is terminated
+    (`\n`, `\r\n`, or a `\r` not followed by `\n`, as in
+    `bytes.splitlines`); a trailing `\r` waits for the next byte.
+    """
+
+    def __init__(self, stream: str) -> None:
+        self._stream = stream
+        self._raw = bytearray()
+        self._cursor = 0
+        self._records: list[dict[str, Any]] = []
+        self._error_rows: list[RuntimeStreamRawRow] = []
+
+    def feed(self, data: bytes) -> None:
+        if not data:
+            return
+        self._raw.extend(data)
+        if b"\n" in data or b"\r" in data:
+            self._consume(final=False)
+
+    def finish(self) -> RuntimeStreamLines:
+        self._consume(final=True)
+        return RuntimeStreamLines(
+            stream=self._stream,
+            raw=bytes(self._raw),
+            records=self._records,
+            error_rows=self._error_rows,
+        )
+
+    def _consume(self, *, final: bool) -> None:
+        pending = bytes(self._raw[self._cursor :])
+        if not pending:
+            return
+        pieces = pending.splitlines(keepends=True)
+        if not final and not pieces[-1].endswith(b"\n"):
+            pieces.pop()
+        for piece in pieces:
+            row = _stream_line_row(self._stream, piece, self._cursor)
+            self._cursor += len(piece)
+            if not _is_runtime_script_envelope_line(str(row["line"])):
+                _collect_json_row(row, self._records, self._error_rows)
+
+
+class RuntimeStreamsCollector:
+    """Live counterpart of `prepare_runtime_streams`, fed with published text chunks."""
+
+    def __init__(self) -> None:
+        self._stdout = RuntimeStreamLineCollector("stdout")
+        self._pty = RuntimeStreamLineCollector("pty")
+        self._stderr = bytearray()
+
+    def feed(self, *, stream: str, text: str) -> None:
+        encoded = text.encode("utf-8", errors="replace")
+        if stream == "stderr":
+            self._stderr.extend(encoded)
+        elif stream == "pty":
+            self._pty.feed(encoded)
+        else:
+            self._stdout.feed(encoded)
+
+    def finish(self) -> PreparedRuntimeStreams:
+        return PreparedRuntimeStreams(
+            stdout=self._stdout.finish(),
+            pty=self._pty.finish(),
+            stderr_raw=bytes(self._stderr),
+        )
+
+
+def prepare_runtime_streams(*, stdout_raw: bytes, stderr_raw: bytes, pty_raw: bytes = b"") -> PreparedRuntimeStreams:
+    stdout = RuntimeStreamLineCollector("stdout")
+    stdout.feed(stdout_raw)
+    pty = RuntimeStreamLineCollector("pty")
+    pty.feed(pty_raw)
+    return PreparedRuntimeStreams(stdout=stdout.finish(), pty=pty.finish(), stderr_raw=stderr_raw)
+
+
 def dedup_assistant_messages(messages: list[RuntimeAssistantMessage]) -> list[RuntimeAssistantMessage]:
     deduped: list[RuntimeAssistantMessage] = []
     seen: set[str] = set()
@@ -1,55 +1,53 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 
-from server.engines.claude.adapter.execution_adapter import ClaudeExecutionAdapter
-from server.engines.codebuddy.adapter.execution_adapter import CodeBuddyExecutionAdapter
-from server.engines.codex.adapter.execution_adapter import CodexExecutionAdapter
-from server.engines.kilo.adapter.execution_adapter import KiloExecutionAdapter
-from server.engines.opencode.adapter.execution_adapter import OpencodeExecutionAdapter
-from server.engines.qwen.adapter.execution_adapter import QwenExecutionAdapter
-from server.runtime.adapter.base_execution_adapter import EngineExecutionAdapter
-from server.runtime.adapter.common.profile_loader import validate_adapter_profiles
+if TYPE_CHECKING:
+    from server.runtime.adapter.base_execution_adapter import EngineExecutionAdapter
+
+_ENGINES_ROOT = Path(__file__).resolve().parents[2] / "engines"
 
 
 class EngineAdapterRegistry:
+    """Engine execution adapters, built (and their profiles validated) on first use.
+
+    Building the adapters validates every adapter profile against its JSON
+    schema and imports each engine's adapter package, so it is kept off the
+    server import path and done once, on the first lookup.
+    """
+
     def __init__(self) -> None:
+        self._adapters: Dict[str, EngineExecutionAdapter] | None = None
+        self._lock = threading.Lock()
+
+    def _loaded_adapters(self) -> Dict[str, EngineExecutionAdapter]:
+        adapters = self._adapters
+        if adapters is not None:
+            return adapters
+        with self._lock:
+            if self._adapters is None:
+                self._adapters = self._build_adapters()
+            return self._adapters
+
+    @staticmethod
+    def _build_adapters() -> Dict[str, EngineExecutionAdapter]:
+        from server.engines.claude.adapter.execution_adapter import ClaudeExecutionAdapter
+        from server.engines.codebuddy.adapter.execution_adapter import CodeBuddyExecutionAdapter
+        from server.engines.codex.adapter.execution_adapter import CodexExecutionAdapter
+        from server.engines.kilo.adapter.execution_adapter import KiloExecutionAdapter
+        from server.engines.opencode.adapter.execution_adapter import OpencodeExecutionAdapter
+        from server.engines.qwen.adapter.execution_adapter import QwenExecutionAdapter
+        from server.runtime.adapter.common.profile_loader import validate_adapter_profiles
+
         validate_adapter_profiles(
             {
-                "codex": Path(__file__).resolve().parents[2]
-                / "engines"
-                / "codex"
-                / "adapter"
-                / "adapter_profile.json",
-                "opencode": Path(__file__).resolve().parents[2]
-                / "engines"
-                / "opencode"
-                / "adapter"
-                / "adapter_profile.json",
-                "claude": Path(__file__).resolve().parents[2]
-                / "engines"
-                / "claude"
-                / "adapter"
-                / "adapter_profile.json",
-                "qwen": Path(__file__).resolve().parents[2]
-                / "engines"
-                / "qwen"
-                / "adapter"
-                / "adapter_profile.json",
-                "kilo": Path(__file__).resolve().parents[2]
-                / "engines"
-                / "kilo"
-                / "adapter"
-                / "adapter_profile.json",
-                "codebuddy": Path(__file__).resolve().parents[2]
-                / "engines"
-                / "codebuddy"
-                / "adapter"
-                / "adapter_profile.json",
+                engine: _ENGINES_ROOT / engine / "adapter" / "adapter_profile.json"
+                for engine in ("codex", "opencode", "claude", "qwen", "kilo", "codebuddy")
             }
         )
-        self._adapters: Dict[str, EngineExecutionAdapter] = {
+        return {
             "codex": CodexExecutionAdapter(),
             "opencode": OpencodeExecutionAdapter(),
             "claude": ClaudeExecutionAdapter(),
@@ -59,7 +57,7 @@ class EngineAdapterRegistry:
         }
 
     def get(self, engine: str) -> EngineExecutionAdapter | None:
-        return self._adapters.get(engine)
+        return self._loaded_adapters().get(engine)
 
     def require(self, engine: str) -> EngineExecutionAdapter:
         adapter = self.get(engine)
@@ -68,7 +66,7 @@ class EngineAdapterRegistry:
         return adapter
 
     def adapter_map(self) -> Dict[str, EngineExecutionAdapter]:
-        return dict(self._adapters)
+        return dict(self._loaded_adapters())
 
 
 engine_adapter_registry = EngineAdapterRegistry()
@@ -7,14 +7,15 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from threading import Lock
+from threading import Lock, RLock
 from typing import Any, Dict, Optional, Protocol, cast
 from urllib.parse import urlsplit
 
 from server.config import config
 from server.engines.common.openai_auth import OpenAIDeviceProxySession, OpenAIOAuthError
 from server.engines.opencode.auth import OpencodeAuthStore
-from server.runtime.auth.callbacks import CallbackStateStore
+from server.runtime.auth.callbacks import CallbackListenerRegistry, CallbackStateStore
+from server.runtime.auth.driver_registry import AuthDriverRegistry
 from server.runtime.auth.log_writer import AuthLogWriter, AuthSessionLogWriter, NoopAuthLogWriter, TransportLogPaths
 from server.runtime.auth.session_lifecycle import (
     AuthSessionCallbackCompleter,
@@ -25,7 +26,6 @@ from server.runtime.auth.session_lifecycle import (
 )
 from server.runtime.auth.session_store import AuthSessionStore, SessionPointer
 from server.services.engine_management.agent_cli_manager import AgentCliManager
-from server.services.engine_management.engine_auth_bootstrap import build_engine_auth_bootstrap
 from server.services.engine_management.engine_interaction_gate import (
     EngineInteractionBusyError,
     EngineInteractionGate,
@@ -102,6 +102,33 @@ class _AuthSession:
     source_attempt: Optional[int] = None
 
 
+@dataclass(frozen=True)
+class _AuthRuntime:
+    driver_registry: AuthDriverRegistry
+    callback_listener_registry: CallbackListenerRegistry
+    engine_auth_handlers: Dict[str, Any]
+    session_refresher: AuthSessionRefresher
+    session_input_handler: AuthSessionInputHandler
+    session_callback_completer: AuthSessionCallbackCompleter
+    session_start_planner: AuthSessionStartPlanner
+    session_starter: AuthSessionStarter
+
+
+class _LazyAuthFlow:
+    """Auth flow attribute attached by the bootstrap; reading it loads the auth runtime first."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: "EngineAuthFlowManager | None", owner: type) -> Any:  # noqa: ANN401
+        if instance is None:
+            return self
+        return instance._auth_flow(self._name)
+
+    def __set__(self, instance: "EngineAuthFlowManager", flow: Any) -> None:  # noqa: ANN401
+        instance._auth_flows[self._name] = flow
+
+
 class TrustManagerProtocol(Protocol):
     def register_run_folder(self, engine: str, run_dir: Path) -> None:
         ...
@@ -128,11 +155,6 @@ class EngineAuthFlowManager:
         self._sessions: Dict[str, _AuthSession] = {}
         self._active_session_ids_by_scope: Dict[str, str] = {}
         self._durable_store = durable_store
-        bootstrap_bundle = build_engine_auth_bootstrap(
-            self,
-            agent_home=self.agent_manager.profile.agent_home,
-        )
-        self._driver_registry = bootstrap_bundle.driver_registry
         self._auth_log_writer: AuthSessionLogWriter
         self._auth_log_persistence_enabled = bool(config.SYSTEM.ENGINE_AUTH_SESSION_LOG_PERSISTENCE_ENABLED)
         if self._auth_log_persistence_enabled:
@@ -141,31 +163,107 @@ class EngineAuthFlowManager:
             self._auth_log_writer = NoopAuthLogWriter(self._session_root())
         self._session_store = AuthSessionStore()
         self._callback_state_store = CallbackStateStore()
-        self._callback_listener_registry = bootstrap_bundle.callback_listener_registry
-        self._engine_auth_handlers = bootstrap_bundle.engine_auth_handlers
-        self._session_refresher = AuthSessionRefresher(
-            self,
-            handlers=cast(Any, self._engine_auth_handlers),
-        )
-        self._session_input_handler = AuthSessionInputHandler(
-            self,
-            handlers=cast(Any, self._engine_auth_handlers),
-        )
-        self._session_callback_completer = AuthSessionCallbackCompleter(
-            self,
-            handlers=cast(Any, self._engine_auth_handlers),
-            state_store=self._callback_state_store,
-        )
         self._completion_listeners: list[Any] = []
-        self._session_start_planner = AuthSessionStartPlanner(
+        # Engine auth drivers and handlers are bootstrapped on first use so the
+        # per-engine auth packages stay off the server import path.
+        self._auth_runtime: _AuthRuntime | None = None
+        self._auth_runtime_lock = RLock()
+        self._auth_runtime_building = False
+        self._auth_flows: Dict[str, Any] = {}
+
+    def _loaded_auth_runtime(self) -> "_AuthRuntime":
+        runtime = self._auth_runtime
+        if runtime is not None:
+            return runtime
+        with self._auth_runtime_lock:
+            if self._auth_runtime is None:
+                if self._auth_runtime_building:
+                    raise RuntimeError("engine auth runtime requested while it is being bootstrapped")
+                self._auth_runtime_building = True
+                try:
+                    self._auth_runtime = self._build_auth_runtime()
+                finally:
+                    self._auth_runtime_building = False
+            return self._auth_runtime
+
+    def _build_auth_runtime(self) -> "_AuthRuntime":
+        from server.services.engine_management.engine_auth_bootstrap import build_engine_auth_bootstrap
+
+        bootstrap_bundle = build_engine_auth_bootstrap(
             self,
-            planners=cast(Any, self._engine_auth_handlers),
+            agent_home=self.agent_manager.profile.agent_home,
         )
-        self._session_starter = AuthSessionStarter(
-            self,
-            handlers=cast(Any, self._engine_auth_handlers),
+        handlers = cast(Any, bootstrap_bundle.engine_auth_handlers)
+        return _AuthRuntime(
+            driver_registry=bootstrap_bundle.driver_registry,
+            callback_listener_registry=bootstrap_bundle.callback_listener_registry,
+            engine_auth_handlers=bootstrap_bundle.engine_auth_handlers,
+            session_refresher=AuthSessionRefresher(self, handlers=handlers),
+            session_input_handler=AuthSessionInputHandler(self, handlers=handlers),
+            session_callback_completer=AuthSessionCallbackCompleter(
+                self,
+                handlers=handlers,
+                state_store=self._callback_state_store,
+            ),
+            session_start_planner=AuthSessionStartPlanner(self, planners=handlers),
+            session_starter=AuthSessionStarter(self, handlers=handlers),
         )
 
+    def _auth_flow(self, name: str) -> Any:  # noqa: ANN401
+        # Flows the bootstrap has attached are served directly, so handlers built
+        # during the bootstrap can reach them without re-entering it.
+        flow = self._auth_flows.get(name)
+        if flow is None:
+            self._loaded_auth_runtime()
+            flow = self._auth_flows.get(name)
+        if flow is None:
+            raise AttributeError(name)
+        return flow
+
+    _opencode_flow = _LazyAuthFlow()
+    _claude_flow = _LazyAuthFlow()
+    _openai_device_proxy_flow = _LazyAuthFlow()
+    _codex_oauth_proxy_flow = _LazyAuthFlow()
+    _claude_oauth_proxy_flow = _LazyAuthFlow()
+    _opencode_openai_oauth_proxy_flow = _LazyAuthFlow()
+    _kilo_opencode_openai_oauth_proxy_flow = _LazyAuthFlow()
+    _qwen_coding_plan_flow = _LazyAuthFlow()
+    _qwen_flow = _LazyAuthFlow()
+    _kilo_gateway_device_auth_flow = _LazyAuthFlow()
+    _codebuddy_sdk_auth_flow = _LazyAuthFlow()
+
+    @property
+    def _driver_registry(self) -> AuthDriverRegistry:
+        return self._loaded_auth_runtime().driver_registry
+
+    @property
+    def _callback_listener_registry(self) -> CallbackListenerRegistry:
+        return self._loaded_auth_runtime().callback_listener_registry
+
+    @property
+    def _engine_auth_handlers(self) -> Dict[str, Any]:
+        return self._loaded_auth_runtime().engine_auth_handlers
+
+    @property
+    def _session_refresher(self) -> AuthSessionRefresher:
+        return self._loaded_auth_runtime().session_refresher
+
+    @property
+    def _session_input_handler(self) -> AuthSessionInputHandler:
+        return self._loaded_auth_runtime().session_input_handler
+
+    @property
+    def _session_callback_completer(self) -> AuthSessionCallbackCompleter:
+        return self._loaded_auth_runtime().session_callback_completer
+
+    @property
+    def _session_start_planner(self) -> AuthSessionStartPlanner:
+        return self._loaded_auth_runtime().session_start_planner
+
+    @property
+    def _session_starter(self) -> AuthSessionStarter:
+        return self._loaded_auth_runtime().session_starter
+
     def _enabled(self) -> bool:
         return bool(config.SYSTEM.ENGINE_AUTH_DEVICE_PROXY_ENABLED)
 
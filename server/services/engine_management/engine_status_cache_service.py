@@ -108,7 +108,12 @@ class EngineStatusCacheService:
     async def refresh_all(self) -> Dict[str, EngineVersionStatus]:
         current = self._read_snapshot_payload()
         for engine in _supported_engines():
-            current[engine] = self._collect_status_payload(engine, previous=current.get(engine))
+            # Version probes spawn engine CLIs; keep them off the event loop.
+            current[engine] = await asyncio.to_thread(
+                self._collect_status_payload,
+                engine,
+                previous=current.get(engine),
+            )
         await self.write_payload(current)
         return self.get_snapshot()
 
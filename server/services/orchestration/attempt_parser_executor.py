@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import queue
+import signal
+import threading
+import weakref
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Tuple
+
+from server.config import config
+from server.runtime.adapter.types import LiveParserEmission
+from server.runtime.protocol.contracts import LiveStreamParserSession
+
+logger = logging.getLogger(__name__)
+
+OP_FEED = "feed"
+OP_FINISH = "finish"
+OP_CLOSE = "close"
+OP_STOP = "stop"
+
+_PARSER_ERRORS = (AttributeError, LookupError, OSError, RuntimeError, TypeError, ValueError)
+# Builtin types a parser failure is re-raised as in the server process; a
+# failure is reported as the nearest of these in its class hierarchy.
+_REPLY_ERROR_TYPES = {
+    cls.__name__: cls
+    for cls in (
+        AttributeError,
+        KeyError,
+        IndexError,
+        LookupError,
+        FileNotFoundError,
+        PermissionError,
+        OSError,
+        NotImplementedError,
+        RecursionError,
+        RuntimeError,
+        TypeError,
+        UnicodeError,
+        ValueError,
+    )
+}
+
+
+def _reply_error_type(exc: BaseException) -> str:
+    for cls in type(exc).__mro__:
+        if _REPLY_ERROR_TYPES.get(cls.__name__) is cls:
+            return cls.__name__
+    return RuntimeError.__name__
+
+
+def _rebuild_reply_error(error: Any) -> Exception:
+    type_name, message = error
+    return _REPLY_ERROR_TYPES.get(type_name, RuntimeError)(f"attempt parser failed: {message}")
+
+
+def _executor_process_main(conn: Connection) -> None:
+    """
+    Executor process loop.
+
+    Requests are `(op, request_id, session_key, engine, payload)` tuples;
+    replies are `(request_id, ok, result_or_error)`, where a finish result
+    also carries the session's attempt-end parse and an error is
+    `(builtin_type_name, message)`. A session is created from
+    the engine's registered stream parser on its first request and dropped
+    on finish/close. The loop ends on stop or when the server side
+    of the pipe goes away.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from server.services.engine_management.engine_adapter_registry import engine_adapter_registry
+
+    sessions: Dict[str, Any] = {}
+    while True:
+        try:
+            op, request_id, session_key, engine, payload = conn.recv()
+        except (EOFError, OSError):
+            return
+        if op == OP_STOP:
+            return
+        if op == OP_CLOSE:
+            sessions.pop(session_key, None)
+            continue
+        try:
+            session = sessions.pop(session_key, None) if op == OP_FINISH else sessions.get(session_key)
+            if session is None:
+                session = engine_adapter_registry.require(engine).stream_parser.start_live_session()
+                if op == OP_FEED:
+                    sessions[session_key] = session
+            if op == OP_FEED:
+                result: Any = session.feed(**payload)
+            else:
+                emissions = session.finish(**payload)
+                result_getter = getattr(session, "runtime_parse_result", None)
+                result = {
+                    "emissions": emissions,
+                    "runtime_parse_result": result_getter() if callable(result_getter) else None,
+                }
+            reply: Tuple[int, bool, Any] = (request_id, True, result)
+        except _PARSER_ERRORS as exc:
+            reply = (request_id, False, (_reply_error_type(exc), f"{type(exc).__name__}: {exc}"))
+        try:
+            conn.send(reply)
+        except (OSError, ValueError):
+            return
+
+
+class _ExecutorProcess:
+    """
+    One executor process plus the server-side plumbing for it.
+
+    Requests are queued to a writer thread (a full pipe never blocks the
+    event loop) and replies are read by a reader thread that resolves the
+    waiting futures on their own loops.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe(duplex=True)
+        self._conn = parent_conn
+        self._process = context.Process(
+            target=_executor_process_main,
+            args=(child_conn,),
+            name=f"attempt-parser-{index}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._outbox: queue.SimpleQueue[Tuple[str, int, str, str, Dict[str, Any]] | None] = queue.SimpleQueue()
+        self._pending: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future[Any]]] = {}
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._alive = True
+        self.sessions = 0
+        self._writer = threading.Thread(target=self._write_loop, name=f"attempt-parser-{index}-tx", daemon=True)
+        self._reader = threading.Thread(target=self._read_loop, name=f"attempt-parser-{index}-rx", daemon=True)
+        self._writer.start()
+        self._reader.start()
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid
+
+    def alive(self) -> bool:
+        return self._alive and self._process.is_alive()
+
+    async def request(self, op: str, session_key: str, engine: str, payload: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        request_id = next(self._request_ids)
+        with self._pending_lock:
+            if not self._alive:
+                raise ConnectionError(f"attempt parser process {self.index} is not running")
+            self._pending[request_id] = (loop, future)
+        self._outbox.put((op, request_id, session_key, engine, payload))
+        return await future
+
+    def post_close(self, session_key: str) -> None:
+        if self._alive:
+            self._outbox.put((OP_CLOSE, 0, session_key, "", {}))
+
+    def _write_loop(self) -> None:
+        while True:
+            message = self._outbox.get()
+            try:
+                self._conn.send(message if message is not None else (OP_STOP, 0, "", "", {}))
+            except (OSError, ValueError):
+                self._mark_dead()
+                return
+            if message is None:
+                return
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                request_id, ok, result = self._conn.recv()
+            except (EOFError, OSError, ValueError):
+                self._mark_dead()
+                return
+            with self._pending_lock:
+                waiter = self._pending.pop(request_id, None)
+            if waiter is None:
+                continue
+            loop, future = waiter
+            if ok:
+                self._resolve(loop, future, result, None)
+            else:
+                self._resolve(loop, future, None, _rebuild_reply_error(result))
+
+    @staticmethod
+    def _resolve(
+        loop: asyncio.AbstractEventLoop,
+        future: asyncio.Future[Any],
+        result: Any,
+        error: BaseException | None,
+    ) -> None:
+        def _apply() -> None:
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        try:
+            loop.call_soon_threadsafe(_apply)
+        except RuntimeError:
+            # The waiting loop already closed; nobody is left to notify.
+            pass
+
+    def _mark_dead(self) -> None:
+        with self._pending_lock:
+            self._alive = False
+            waiters = list(self._pending.values())
+            self._pending.clear()
+        for loop, future in waiters:
+            self._resolve(loop, future, None, ConnectionError(f"attempt parser process {self.index} exited"))
+
+    def shutdown(self, timeout: float) -> None:
+        self._outbox.put(None)
+        self._writer.join(timeout=timeout)
+        self._process.join(timeout=timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=timeout)
+        # The reader sees EOF once the process end of the pipe is gone.
+        self._reader.join(timeout=timeout)
+        self._mark_dead()
+        self._conn.close()
+
+
+class _ExecutorParserSession:
+    """
+    Live parser session hosted by an executor process.
+
+    Emissions are identical to the in-process session of the same engine. If
+    the process dies mid-attempt the session continues in-process from the
+    next chunk; a line split across that boundary may lose its live
+    emission, while the attempt-end parse still sees the complete output.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: "AttemptParserExecutor",
+        process: _ExecutorProcess,
+        session_key: str,
+        engine: str,
+        stream_parser: Any,
+    ) -> None:
+        self._executor = executor
+        self._process: _ExecutorProcess | None = process
+        self._session_key = session_key
+        self._engine = engine
+        self._stream_parser = stream_parser
+        self._local: LiveStreamParserSession | None = None
+        self._runtime_parse_result: Dict[str, Any] | None = None
+        process.sessions += 1
+        self._finalizer = weakref.finalize(self, self._release, process, session_key)
+
+    @staticmethod
+    def _release(process: _ExecutorProcess, session_key: str) -> None:
+        process.sessions -= 1
+        process.post_close(session_key)
+
+    async def feed(
+        self,
+        *,
+        stream: str,
+        text: str,
+        byte_from: int,
+        byte_to: int,
+    ) -> list[LiveParserEmission]:
+        payload = {"stream": stream, "text": text, "byte_from": byte_from, "byte_to": byte_to}
+        if self._local is None and self._process is not None:
+            try:
+                return list(await self._process.request(OP_FEED, self._session_key, self._engine, payload))
+            except ConnectionError:
+                self._fall_back()
+        assert self._local is not None
+        return list(self._local.feed(**payload))  # type: ignore[arg-type]
+
+    async def finish(
+        self,
+        *,
+        exit_code: int,
+        failure_reason: str | None,
+    ) -> list[LiveParserEmission]:
+        payload = {"exit_code": exit_code, "failure_reason": failure_reason}
+        if self._local is None and self._process is not None:
+            try:
+                finished = await self._process.request(OP_FINISH, self._session_key, self._engine, payload)
+                parsed = finished.get("runtime_parse_result")
+                self._runtime_parse_result = parsed if isinstance(parsed, dict) else None
+                return list(finished.get("emissions") or [])
+            except ConnectionError:
+                self._fall_back()
+            finally:
+                self._finalizer.detach()
+                self._process.sessions -= 1
+                self._process = None
+        assert self._local is not None
+        return list(self._local.finish(**payload))  # type: ignore[arg-type]
+
+    def runtime_parse_result(self) -> Dict[str, Any] | None:
+        if self._local is None:
+            return self._runtime_parse_result
+        # A session resumed in-process missed the chunks fed before the loss,
+        # so it cannot stand in for the whole attempt.
+        return None
+
+    def _fall_back(self) -> None:
+        logger.warning(
+            "Attempt parser process lost; continuing in-process: engine=%s session=%s",
+            self._engine,
+            self._session_key,
+        )
+        self._executor.record_fallback()
+        self._local = self._stream_parser.start_live_session()
+
+
+class AttemptParserExecutor:
+    """
+    Pool of dedicated processes hosting engine live parser sessions.
+
+    With `SYSTEM.ATTEMPT_PARSER_EXECUTOR_ENABLED`, each attempt's NDJSON
+    parsing and semantic extraction run in one of `ATTEMPT_PARSER_PROCESSES`
+    spawned processes (a session stays on the process that opened it), so
+    parser CPU spreads across cores and chatty runs no longer stall the
+    event loop that serves HTTP. Process capture, raw row coalescing,
+    FCMP/RASP canonicalization and persistence stay in the server process,
+    where the ordering gates and live journals live.
+
+    Only engines whose registered adapter owns the attempt's stream parser
+    are hosted; anything else (and the whole feature when disabled) keeps
+    the in-process session. Missing or dead processes are respawned on a
+    background thread; until one is running, attempts parse in-process.
+    """
+
+    def __init__(self) -> None:
+        self._processes: list[_ExecutorProcess | None] = []
+        self._spawning: set[int] = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._session_ids = itertools.count(1)
+        self._opened = 0
+        self._fallbacks = 0
+        self._respawns = 0
+
+    def enabled(self) -> bool:
+        return bool(getattr(config.SYSTEM, "ATTEMPT_PARSER_EXECUTOR_ENABLED", False))
+
+    def process_count(self) -> int:
+        return max(1, int(getattr(config.SYSTEM, "ATTEMPT_PARSER_PROCESSES", 2)))
+
+    def start(self) -> None:
+        """Spawn the executor processes ahead of the first attempt."""
+        if not self.enabled():
+            return
+        with self._lock:
+            missing = self._claim_missing_locked()
+            generation = self._generation
+        for index in missing:
+            self._spawn(index, generation)
+
+    def open_session(self, *, engine: str, stream_parser: Any) -> LiveStreamParserSession | None:
+        """Return an executor-hosted session for `engine`, or None to parse in-process."""
+        if not self.enabled() or not self._hosts_parser(engine, stream_parser):
+            return None
+        process: _ExecutorProcess | None = None
+        with self._lock:
+            missing = self._claim_missing_locked()
+            generation = self._generation
+            alive = [item for item in self._processes if item is not None and item.alive()]
+            if alive:
+                process = min(alive, key=lambda item: item.sessions)
+                self._opened += 1
+                session_key = f"s{next(self._session_ids)}"
+        for index in missing:
+            # Spawning starts a process and two threads; keep that off the event loop.
+            threading.Thread(
+                target=self._spawn,
+                args=(index, generation),
+                name=f"attempt-parser-{index}-spawn",
+                daemon=True,
+            ).start()
+        if process is None:
+            return None
+        return _ExecutorParserSession(
+            executor=self,
+            process=process,
+            session_key=session_key,
+            engine=engine,
+            stream_parser=stream_parser,
+        )
+
+    def record_fallback(self) -> None:
+        self._fallbacks += 1
+
+    async def stop(self, *, timeout: float = 2.0) -> None:
+        with self._lock:
+            processes = [process for process in self._processes if process is not None]
+            self._processes = []
+            self._spawning.clear()
+            self._generation += 1
+        for process in processes:
+            await asyncio.to_thread(process.shutdown, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            processes = [process for process in self._processes if process is not None]
+        return {
+            "enabled": self.enabled(),
+            "processes": [
+                {"index": process.index, "pid": process.pid, "alive": process.alive(), "sessions": process.sessions}
+                for process in processes
+            ],
+            "opened_sessions": self._opened,
+            "fallbacks": self._fallbacks,
+            "respawns": self._respawns,
+        }
+
+    @staticmethod
+    def _hosts_parser(engine: str, stream_parser: Any) -> bool:
+        if not callable(getattr(stream_parser, "start_live_session", None)):
+            return False
+        from server.services.engine_management.engine_adapter_registry import engine_adapter_registry
+
+        adapter = engine_adapter_registry.get(engine)
+        # The executor rebuilds the parser from the registry, so it must be the same one.
+        return adapter is not None and getattr(adapter, "stream_parser", None) is stream_parser
+
+    def _claim_missing_locked(self) -> list[int]:
+        """Slots without a live process that no spawn is already filling."""
+        wanted = self.process_count()
+        while len(self._processes) < wanted:
+            self._processes.append(None)
+        missing: list[int] = []
+        for index in range(wanted):
+            process = self._processes[index]
+            if index in self._spawning or (process is not None and process.alive()):
+                continue
+            if process is not None:
+                self._respawns += 1
+                logger.warning("Attempt parser process %s exited; respawning", index)
+                self._processes[index] = None
+            self._spawning.add(index)
+            missing.append(index)
+        return missing
+
+    def _spawn(self, index: int, generation: int) -> None:
+        try:
+            process = _ExecutorProcess(index)
+        except OSError:
+            logger.warning("Failed to spawn attempt parser process %s", index, exc_info=True)
+            with self._lock:
+                if generation == self._generation:
+                    self._spawning.discard(index)
+            return
+        with self._lock:
+            current = generation == self._generation
+            if current:
+                self._processes[index] = process
+                self._spawning.discard(index)
+        if not current:
+            # The executor was stopped while this process started.
+            process.shutdown(2.0)
+
+
+attempt_parser_executor = AttemptParserExecutor()
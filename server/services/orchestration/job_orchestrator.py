@@ -58,6 +58,8 @@ from server.services.orchestration.run_attempt_audit_finalizer import (
     RunAttemptAuditFinalizer,
 )
 from server.services.orchestration.run_projection_service import run_projection_service
+from server.services.orchestration.worker_coordinator import worker_coordinator
+from server.services.orchestration.run_inflight_coalescer import run_inflight_coalescer
 from server.services.platform.runtime_env_options import RUNTIME_ENV_SECRET_MISSING
 from server.runtime.protocol.schema_registry import (
     ProtocolSchemaViolation,
@@ -102,7 +104,8 @@ class JobOrchestrator:
     def __init__(self, deps: OrchestratorDeps | None = None):
         self.deps = deps or OrchestratorDeps()
         self.agent_cli_manager = self.deps.agent_cli_manager or AgentCliManager()
-        self.adapters = self.deps.adapters or engine_adapter_registry.adapter_map()
+        # The shared registry builds adapters on first lookup, keeping them off the import path.
+        self.adapters = self.deps.adapters or engine_adapter_registry
         self.bundle_service = self.deps.bundle_service or RunBundleService()
         self.snapshot_service = self.deps.snapshot_service or RunFilesystemSnapshotService(
             bundle_service=self.bundle_service
@@ -155,6 +158,7 @@ class JobOrchestrator:
         cache_key: Optional[str] = None,
         skill_override: Optional[SkillManifest] = None,
         temp_request_id: Optional[str] = None,
+        slot_preacquired: bool = False,
     ) -> None:
         log_event(
             logger,
@@ -173,6 +177,7 @@ class JobOrchestrator:
             cache_key=cache_key,
             skill_override=skill_override,
             temp_request_id=temp_request_id,
+            slot_preacquired=slot_preacquired,
         )
         await self.run_job_lifecycle_service.run(
             orchestrator=self,
@@ -190,12 +195,19 @@ class JobOrchestrator:
         temp_request_id: Optional[str] = None,
     ) -> bool:
         run_store = self._run_store_backend()
+        if request_id and callable(getattr(run_store, "get_request_follower", None)):
+            # A coalesced follower leaves the shared run running for its leader.
+            if await run_inflight_coalescer.detach_follower(
+                request_id=request_id,
+                run_store_backend=run_store,
+            ):
+                return True
         changed = await run_store.set_cancel_requested(run_id, True)
         if status == RunStatus.RUNNING:
-            adapter = self.adapters.get(engine_name)
-            if adapter is not None:
-                with contextlib.suppress(OSError, RuntimeError, TypeError, ValueError):
-                    await adapter.cancel_run_process(run_id)
+            if not await self.cancel_local_run_process(run_id, engine_name):
+                # Multi-worker mode: the process may belong to another worker.
+                with contextlib.suppress(OSError, RuntimeError, ValueError):
+                    await worker_coordinator.route_cancel(run_id, engine_name)
         if request_id:
             with contextlib.suppress(OSError, RuntimeError, TypeError, ValueError):
                 await self.auth_orchestration_service.cancel_request_auth_sessions(
@@ -235,6 +247,15 @@ class JobOrchestrator:
 
         return changed
 
+    async def cancel_local_run_process(self, run_id: str, engine_name: str) -> bool:
+        """Terminate `run_id`'s engine process if this worker runs it."""
+        adapter = self.adapters.get(engine_name)
+        if adapter is None:
+            return False
+        with contextlib.suppress(OSError, RuntimeError, TypeError, ValueError):
+            return bool(await adapter.cancel_run_process(run_id))
+        return False
+
     def _build_canceled_error(self) -> Dict[str, Any]:
         return {
             "code": "CANCELED_BY_USER",
@@ -385,8 +406,16 @@ class JobOrchestrator:
             trust_manager_backend=self._trust_manager_backend(),
             recover_single=self._recover_single_incomplete_run,
             cleanup_orphan_bindings=self._cleanup_orphan_runtime_bindings,
+            skip_run_ids=await worker_coordinator.live_peer_run_ids(),
         )
 
+    async def recover_lost_runs(self, run_ids: List[str]) -> None:
+        """Reconcile runs whose owning worker stopped heartbeating (multi-worker mode)."""
+        lost = set(run_ids)
+        for record in await self._run_store_backend().list_incomplete_runs():
+            if isinstance(record, dict) and str(record.get("run_id") or "") in lost:
+                await self._recover_single_incomplete_run(record)
+
     async def _recover_single_incomplete_run(self, record: Dict[str, Any]) -> None:
         await self.recovery_service.recover_single_incomplete_run(
             record=record,
@@ -1,11 +1,12 @@
-import io
 import json
-import zipfile
+import os
+import tempfile
 from pathlib import Path
 from shutil import move, rmtree
 from typing import Any
 
 from server.services.platform.cache_key_builder import build_input_manifest
+from server.services.platform.upload_spooling import extract_zip_file
 
 
 def ensure_request_root(base_dir: str | Path, request_id: str, request_payload: dict[str, Any] | None = None) -> Path:
@@ -25,17 +26,24 @@ def get_request_root(base_dir: str | Path, request_id: str) -> Path | None:
     return path if path.exists() else None
 
 
-def handle_upload(base_dir: str | Path, request_id: str, file_bytes: bytes) -> dict[str, Any]:
+def handle_upload(base_dir: str | Path, request_id: str, upload: bytes | Path) -> dict[str, Any]:
+    """Extract an uploaded zip into `<request>/uploads`; `upload` is a spooled zip path or raw bytes."""
     request_dir = get_request_root(base_dir, request_id)
     if request_dir is None:
         raise ValueError(f"Request {request_id} not found")
     uploads_dir = request_dir / "uploads"
     uploads_dir.mkdir(exist_ok=True)
-    try:
-        with zipfile.ZipFile(io.BytesIO(file_bytes)) as zipped:
-            zipped.extractall(uploads_dir)
-    except zipfile.BadZipFile as exc:
-        raise ValueError("Invalid zip file") from exc
+    if isinstance(upload, Path):
+        extract_zip_file(upload, uploads_dir)
+    else:
+        fd, raw_path = tempfile.mkstemp(prefix=".upload-", suffix=".zip", dir=str(request_dir))
+        spooled = Path(raw_path)
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                dst.write(upload)
+            extract_zip_file(spooled, uploads_dir)
+        finally:
+            spooled.unlink(missing_ok=True)
     extracted_files = [
         path.relative_to(uploads_dir).as_posix()
         for path in uploads_dir.rglob("*")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
 import logging
 from dataclasses import dataclass
@@ -8,6 +9,7 @@ from typing import Any, Awaitable, Callable
 
 from server.runtime.protocol.live_publish import LiveRuntimeEmitterImpl
 
+from .attempt_parser_executor import attempt_parser_executor
 from .run_attempt_preparation_service import RunAttemptContext
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,7 @@ class RunAttemptExecutionResult:
     auth_signal_snapshot: dict[str, Any] | None
     run_handle_consumer: Callable[[str], Awaitable[dict[str, Any]]]
     live_runtime_emitter_factory: Callable[..., Any]
+    runtime_parse_result: dict[str, Any] | None = None
 
 
 class RunAttemptExecutionService:
@@ -69,9 +72,14 @@ class RunAttemptExecutionService:
             attempt_number=context.attempt_number,
             stream_parser=adapter_stream_parser,
             run_handle_consumer=run_handle_consumer,
+            parser_session=attempt_parser_executor.open_session(
+                engine=engine_name,
+                stream_parser=adapter_stream_parser,
+            ),
         )
 
-        trust_manager_backend.register_run_folder(engine_name, context.run_dir)
+        # Off the event loop so concurrent runs join one batched trust-file rewrite.
+        await asyncio.to_thread(lambda: trust_manager_backend.register_run_folder(engine_name, context.run_dir))
         try:
             logger.info(
                 "run_attempt_execute_begin run_id=%s request_id=%s attempt=%s engine=%s",
@@ -97,7 +105,9 @@ class RunAttemptExecutionService:
                 )
         finally:
             try:
-                trust_manager_backend.remove_run_folder(engine_name, context.run_dir)
+                await asyncio.to_thread(
+                    lambda: trust_manager_backend.remove_run_folder(engine_name, context.run_dir)
+                )
             except (OSError, RuntimeError, ValueError):
                 logger.warning(
                     "Failed to cleanup run folder trust for engine=%s run_id=%s",
@@ -106,12 +116,14 @@ class RunAttemptExecutionService:
                     exc_info=True,
                 )
 
+        process_raw_stdout = getattr(result, "raw_stdout", "") or ""
+        process_raw_stderr = getattr(result, "raw_stderr", "") or ""
         return RunAttemptExecutionResult(
             engine_result=result,
             process_exit_code=getattr(result, "exit_code", None),
             process_failure_reason=getattr(result, "failure_reason", None),
-            process_raw_stdout=getattr(result, "raw_stdout", "") or "",
-            process_raw_stderr=getattr(result, "raw_stderr", "") or "",
+            process_raw_stdout=process_raw_stdout,
+            process_raw_stderr=process_raw_stderr,
             runtime_execution_warnings=(
                 [
                     dict(item)
@@ -145,4 +157,9 @@ class RunAttemptExecutionService:
                     else None
                 ),
             ),
+            # Parsed as the output streamed in; saves re-parsing it at attempt end.
+            runtime_parse_result=live_runtime_emitter.runtime_parse_result(
+                raw_stdout=process_raw_stdout,
+                raw_stderr=process_raw_stderr,
+            ),
         )
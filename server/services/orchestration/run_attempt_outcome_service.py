@@ -313,10 +313,14 @@ class RunAttemptOutcomeService:
                 if isinstance(warning_payload, dict):
                     runtime_execution_warnings.append(dict(warning_payload))
 
-        runtime_parse_result = parse_runtime_stream_for_auth_detection(
-            adapter=context.adapter,
-            raw_stdout=process_raw_stdout,
-            raw_stderr=process_raw_stderr,
+        runtime_parse_result = (
+            execution.runtime_parse_result
+            if isinstance(execution.runtime_parse_result, dict)
+            else parse_runtime_stream_for_auth_detection(
+                adapter=context.adapter,
+                raw_stdout=process_raw_stdout,
+                raw_stderr=process_raw_stderr,
+            )
         )
         auth_signal_snapshot = cast(RuntimeAuthSignal | None, execution.auth_signal_snapshot)
         auth_detection_result = auth_detection_result_from_auth_signal(
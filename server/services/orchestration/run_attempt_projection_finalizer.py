@@ -1,5 +1,7 @@
 from __future__ import annotations
+import json
 import logging
+import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -9,6 +11,8 @@ from server.models import OrchestratorEventType, PendingOwner, RunStatus
 from server.runtime.logging.structured_trace import log_event
 from server.services.orchestration.run_workspace_layout import require_layout_from_record
 from server.services.orchestration.run_bundle_service import BundleAssemblyError
+from server.services.orchestration.run_content_store_service import run_content_store_service
+from server.services.orchestration.run_result_cache_service import run_result_cache_service
 
 from .run_attempt_execution_service import RunAttemptExecutionResult
 from .run_attempt_outcome_service import RunAttemptResolvedOutcome
@@ -344,8 +348,34 @@ class RunAttemptProjectionFinalizer:
                 run_id=inputs.run_id,
             )
 
+        if inputs.request_id:
+            await self._record_search_text(
+                inputs=inputs,
+                final_status=final_status,
+                final_error_code=final_error_code,
+                terminal_error_summary=terminal_error_summary,
+                normalized_error=normalized_error,
+            )
+
+        if bundle_written and final_status == RunStatus.SUCCEEDED:
+            snapshot_service = getattr(inputs.audit_service, "snapshot_service", None)
+            known_file_digests = getattr(snapshot_service, "known_file_digests", None)
+            await run_content_store_service.ingest_succeeded_run(
+                run_id=inputs.run_id,
+                run_dir=run_dir,
+                layout=layout,
+                engine_name=engine_name,
+                skill_id=context.request.skill_id,
+                known_digests=known_file_digests(run_dir) if callable(known_file_digests) else None,
+            )
+
         if inputs.cache_key and final_status == RunStatus.SUCCEEDED:
-            await inputs.run_store_backend.record_cache_entry(inputs.cache_key, inputs.run_id)
+            await run_result_cache_service.record_entry(
+                cache_key=inputs.cache_key,
+                run_id=inputs.run_id,
+                run_dir=run_dir,
+                run_store_backend=inputs.run_store_backend,
+            )
             cache_recorded = True
 
         return RunAttemptProjectionResult(
@@ -356,6 +386,39 @@ class RunAttemptProjectionFinalizer:
             cache_recorded=cache_recorded,
         )
 
+    async def _record_search_text(
+        self,
+        *,
+        inputs: RunAttemptFinalizeInput,
+        final_status: RunStatus,
+        final_error_code: str | None,
+        terminal_error_summary: str | None,
+        normalized_error: dict[str, Any] | None,
+    ) -> None:
+        update_search_text = getattr(inputs.run_store_backend, "update_run_search_text", None)
+        if update_search_text is None or inputs.request_id is None:
+            return
+        error_parts: list[str] = []
+        if final_status != RunStatus.SUCCEEDED:
+            message = terminal_error_summary
+            if not message and isinstance(normalized_error, dict):
+                message_obj = normalized_error.get("message")
+                message = message_obj if isinstance(message_obj, str) else None
+            error_parts = [part for part in (final_error_code, message) if isinstance(part, str) and part]
+        try:
+            await update_search_text(
+                inputs.request_id,
+                error_summary=" ".join(error_parts),
+                final_message=_final_message_preview(inputs.outcome, final_status),
+            )
+        except (sqlite3.Error, OSError, RuntimeError, ValueError):
+            logger.warning(
+                "run search text update failed request_id=%s run_id=%s",
+                inputs.request_id,
+                inputs.run_id,
+                exc_info=True,
+            )
+
     def _diagnose_skill_run_feedback_sidecar(
         self,
         *,
@@ -438,3 +501,16 @@ class RunAttemptProjectionFinalizer:
             path=str(sidecar_path),
             size=len(content.encode("utf-8")),
         )
+
+
+def _final_message_preview(outcome: RunAttemptResolvedOutcome, final_status: RunStatus) -> str:
+    parse_result = outcome.runtime_parse_result
+    messages = parse_result.get("assistant_messages") if isinstance(parse_result, dict) else None
+    if isinstance(messages, list):
+        for item in reversed(messages):
+            text = item.get("text") if isinstance(item, dict) else None
+            if isinstance(text, str) and text.strip():
+                return text.strip()
+    if final_status == RunStatus.SUCCEEDED and outcome.output_data:
+        return json.dumps(outcome.output_data, ensure_ascii=False)
+    return ""
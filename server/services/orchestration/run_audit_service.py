@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from server.models import InteractiveErrorCode, OrchestratorEventType, RunStatus
 from server.runtime.protocol.parse_utils import extract_fenced_or_plain_json
@@ -31,6 +34,133 @@ DONE_MARKER_STREAM_PATTERN = re.compile(
 
 logger = logging.getLogger(__name__)
 
+_SEQ_TAIL_BLOCK_BYTES = 8192
+_SEQ_ALLOCATOR_MAX_PATHS = 1024
+
+
+def _read_last_jsonl_line(path: Path) -> str | None:
+    """Return the last non-empty line of a JSONL file by reading backwards in blocks."""
+    with path.open("rb") as fp:
+        fp.seek(0, os.SEEK_END)
+        position = fp.tell()
+        buffer = b""
+        while position > 0:
+            step = min(_SEQ_TAIL_BLOCK_BYTES, position)
+            position -= step
+            fp.seek(position)
+            buffer = fp.read(step) + buffer
+            stripped = buffer.rstrip()
+            if not stripped:
+                buffer = b""
+                continue
+            newline_index = stripped.rfind(b"\n")
+            if newline_index >= 0 or position == 0:
+                return stripped[newline_index + 1 :].decode("utf-8", errors="replace")
+    return None
+
+
+class _JsonlSeqState:
+    __slots__ = ("lock", "next_seq", "size")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.next_seq: int | None = None
+        self.size = -1
+
+
+class JsonlSeqAllocator:
+    """Per-path seq allocator for append-only JSONL audit journals.
+
+    The next seq is initialized once from the file tail and then advanced in
+    memory on every append. A cached entry is trusted only while the file size
+    matches the size observed after our last append; any outside change
+    (truncation, rebuild, foreign writer) triggers a tail re-read.
+    """
+
+    def __init__(self, *, max_paths: int = _SEQ_ALLOCATOR_MAX_PATHS) -> None:
+        self._max_paths = max(1, int(max_paths))
+        self._states: OrderedDict[str, _JsonlSeqState] = OrderedDict()
+        self._states_lock = threading.Lock()
+
+    def _state_for(self, path: Path) -> _JsonlSeqState:
+        key = os.path.abspath(path)
+        with self._states_lock:
+            state = self._states.get(key)
+            if state is None:
+                state = _JsonlSeqState()
+                self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self._max_paths:
+                self._states.popitem(last=False)
+            return state
+
+    def _resolve_next_seq(
+        self,
+        path: Path,
+        state: _JsonlSeqState,
+        full_scan: Callable[[Path], int],
+    ) -> int:
+        try:
+            size = path.stat().st_size if path.is_file() else -1
+        except OSError:
+            size = -1
+        if state.next_seq is not None and size == state.size:
+            return state.next_seq
+        state.size = size
+        if size <= 0:
+            state.next_seq = 1
+            return 1
+        next_seq: int | None = None
+        try:
+            last_line = _read_last_jsonl_line(path)
+        except OSError:
+            last_line = None
+        if last_line is not None:
+            try:
+                payload = json.loads(last_line)
+            except json.JSONDecodeError:
+                payload = None
+            seq_obj = payload.get("seq") if isinstance(payload, dict) else None
+            if isinstance(seq_obj, int) and not isinstance(seq_obj, bool) and seq_obj > 0:
+                next_seq = seq_obj + 1
+        if next_seq is None:
+            next_seq = full_scan(path)
+        state.next_seq = next_seq
+        return next_seq
+
+    def peek(self, path: Path, *, full_scan: Callable[[Path], int]) -> int:
+        state = self._state_for(path)
+        with state.lock:
+            return self._resolve_next_seq(path, state, full_scan)
+
+    def append(
+        self,
+        path: Path,
+        *,
+        build_payload: Callable[[int], dict[str, Any]],
+        full_scan: Callable[[Path], int],
+    ) -> dict[str, Any]:
+        state = self._state_for(path)
+        with state.lock:
+            seq = self._resolve_next_seq(path, state, full_scan)
+            payload = build_payload(seq)
+            with path.open("a", encoding="utf-8") as fp:
+                fp.write(json.dumps(payload, ensure_ascii=False))
+                fp.write("\n")
+            try:
+                state.size = path.stat().st_size
+                state.next_seq = seq + 1
+            except OSError:
+                state.next_seq = None
+            return payload
+
+    def reset(self) -> None:
+        with self._states_lock:
+            self._states.clear()
+
+
+jsonl_seq_allocator = JsonlSeqAllocator()
+
 
 class RunAuditService:
     def __init__(self, snapshot_service: RunFilesystemSnapshotService | None = None):
@@ -385,7 +515,6 @@ class RunAuditService:
         classification = auth_detection.get("classification")
         if classification != "auth_required" or confidence not in {"high", "low"}:
             return
-        seq = self._next_jsonl_seq(path)
         confidence_score = 1.0 if confidence == "high" else 0.3
         matched_rule_ids = auth_detection.get("matched_rule_ids", [])
         matched_pattern_id = None
@@ -405,7 +534,7 @@ class RunAuditService:
         payload = {
             "protocol_version": "rasp/1.0",
             "run_id": run_id,
-            "seq": seq,
+            "seq": 0,
             "ts": datetime.utcnow().isoformat(),
             "source": {
                 "engine": engine_name,
@@ -429,9 +558,11 @@ class RunAuditService:
             "attempt_number": attempt_number,
             "raw_ref": None,
         }
-        with path.open("a", encoding="utf-8") as fp:
-            fp.write(json.dumps(payload, ensure_ascii=False))
-            fp.write("\n")
+        jsonl_seq_allocator.append(
+            path,
+            build_payload=lambda seq: {**payload, "seq": seq},
+            full_scan=self._next_jsonl_seq,
+        )
 
     def _next_jsonl_seq(self, path: Path) -> int:
         if not path.exists() or not path.is_file():
@@ -461,24 +592,29 @@ class RunAuditService:
             raise RuntimeError("audit_dir is required")
         audit_dir.mkdir(parents=True, exist_ok=True)
         event_path = audit_dir / f"orchestrator_events.{attempt_number}.jsonl"
-        event_seq = self.next_orchestrator_event_seq(event_path)
-        payload = make_orchestrator_event(
-            attempt_number=attempt_number,
-            seq=event_seq,
-            category=category,
-            type_name=type_name,
-            data=data,
-            ts=datetime.utcnow().isoformat(),
+
+        def _build_payload(event_seq: int) -> dict[str, Any]:
+            payload = make_orchestrator_event(
+                attempt_number=attempt_number,
+                seq=event_seq,
+                category=category,
+                type_name=type_name,
+                data=data,
+                ts=datetime.utcnow().isoformat(),
+            )
+            try:
+                validate_orchestrator_event(payload)
+            except ProtocolSchemaViolation as exc:
+                raise RuntimeError(
+                    f"{InteractiveErrorCode.PROTOCOL_SCHEMA_VIOLATION.value} [{type_name}]: {exc}"
+                ) from exc
+            return payload
+
+        jsonl_seq_allocator.append(
+            event_path,
+            build_payload=_build_payload,
+            full_scan=self._scan_orchestrator_event_seq,
         )
-        try:
-            validate_orchestrator_event(payload)
-        except ProtocolSchemaViolation as exc:
-            raise RuntimeError(
-                f"{InteractiveErrorCode.PROTOCOL_SCHEMA_VIOLATION.value} [{type_name}]: {exc}"
-            ) from exc
-        with event_path.open("a", encoding="utf-8") as fp:
-            fp.write(json.dumps(payload, ensure_ascii=False))
-            fp.write("\n")
         logical_run_id = run_id or run_dir.name
         resolved_engine = self._resolve_orchestrator_event_engine(
             run_dir=run_dir,
@@ -545,6 +681,9 @@ class RunAuditService:
             fp.write("\n")
 
     def next_orchestrator_event_seq(self, event_path: Path) -> int:
+        return jsonl_seq_allocator.peek(event_path, full_scan=self._scan_orchestrator_event_seq)
+
+    def _scan_orchestrator_event_seq(self, event_path: Path) -> int:
         if not event_path.exists() or not event_path.is_file():
             return 1
         max_seq = 0
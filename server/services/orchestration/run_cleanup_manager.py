@@ -1,12 +1,17 @@
+import asyncio
 import logging
 import shutil
+import sqlite3
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from apscheduler.schedulers.asyncio import AsyncIOScheduler  # type: ignore[import-untyped]
 from server.config import config
+from server.models import RunStatus
+from server.services.orchestration.run_result_cache_service import run_result_cache_service
 from server.services.orchestration.run_store import run_store
 from server.services.orchestration.workspace_manager import workspace_manager
 from server.services.orchestration.run_folder_trust_manager import run_folder_trust_manager
+from server.services.platform.content_addressed_store import content_addressed_store
 from server.services.platform.process_lease_store import process_lease_store
 from server.services.platform.runtime_env_options import runtime_env_secret_service
 
@@ -18,6 +23,7 @@ class RunCleanupManager:
     Responsibilities:
     - Periodically prune run records and directories based on TTL.
     - Delete failed runs immediately.
+    - Periodically enforce result cache TTL/size limits (LRU eviction).
     - Provide a manual purge API for clearing all cached history.
     """
 
@@ -26,11 +32,38 @@ class RunCleanupManager:
 
     def start(self) -> None:
         interval_hours = int(config.SYSTEM.RUN_CLEANUP_INTERVAL_HOURS)
+        eviction_minutes = int(config.SYSTEM.RESULT_CACHE_EVICTION_INTERVAL_MINUTES)
         if interval_hours <= 0:
             logger.info("Run cleanup scheduler disabled (interval <= 0)")
+        else:
+            self.scheduler.add_job(self.cleanup_expired_runs, "interval", hours=interval_hours)
+        if eviction_minutes > 0:
+            self.scheduler.add_job(self.enforce_result_cache_limits, "interval", minutes=eviction_minutes)
+        if interval_hours > 0 or eviction_minutes > 0:
+            self.scheduler.start()
+
+    async def enforce_result_cache_limits(self) -> None:
+        try:
+            evicted = await run_result_cache_service.enforce_limits(run_store_backend=run_store)
+        except (OSError, RuntimeError, ValueError, sqlite3.Error):
+            logger.warning("Result cache eviction failed", exc_info=True)
+            return
+        if evicted.get("runs"):
+            await self.collect_content_store_garbage()
+
+    async def collect_content_store_garbage(self) -> None:
+        """Drop content store objects no run workspace links to any more."""
+        try:
+            removed = await asyncio.to_thread(content_addressed_store.collect_garbage)
+        except OSError:
+            logger.warning("Content store garbage collection failed", exc_info=True)
             return
-        self.scheduler.add_job(self.cleanup_expired_runs, "interval", hours=interval_hours)
-        self.scheduler.start()
+        if removed["objects"]:
+            logger.info(
+                "Run cleanup removed content store objects=%s bytes=%s",
+                removed["objects"],
+                removed["bytes"],
+            )
 
     async def cleanup_expired_runs(self) -> None:
         retention_days = int(config.SYSTEM.RUN_RETENTION_DAYS)
@@ -39,10 +72,14 @@ class RunCleanupManager:
             return
         logger.info("Run cleanup started at %s", datetime.utcnow().isoformat())
         candidates = await run_store.list_runs_for_cleanup(retention_days)
+        # Runs behind a recently hit cache entry are left to the result cache LRU.
+        cached_run_ids = await run_result_cache_service.fresh_run_ids(run_store_backend=run_store)
         deleted_runs = 0
         deleted_requests = 0
         for row in candidates:
             run_id = row["run_id"]
+            if run_id in cached_run_ids and row.get("status") == RunStatus.SUCCEEDED.value:
+                continue
             workspace_dir_obj = row.get("workspace_dir") if isinstance(row, dict) else None
             request_ids = await run_store.delete_run_records(run_id)
             runtime_env_secret_service.delete_many(request_ids)
@@ -58,6 +95,8 @@ class RunCleanupManager:
                 deleted_runs,
                 deleted_requests
             )
+        await self.enforce_result_cache_limits()
+        await self.collect_content_store_garbage()
         await self.cleanup_stale_trust_entries()
         await self.cleanup_auxiliary_storage(retention_days)
 
@@ -65,6 +104,7 @@ class RunCleanupManager:
         counts = await run_store.clear_all()
         workspace_manager.purge_workspaces_dir()
         runtime_env_secret_service.clear_all()
+        await self.collect_content_store_garbage()
         return counts
 
     async def cleanup_stale_trust_entries(self) -> None:
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any
+
+from server.runtime.logging.structured_trace import log_event
+from server.runtime.workspace_layout import RunWorkspaceLayout
+from server.services.orchestration.run_skill_materialization_service import run_folder_bootstrapper
+from server.services.platform.content_addressed_store import content_addressed_store
+
+logger = logging.getLogger(__name__)
+
+_WRITE_ONCE_DIRS = ("uploads", "artifacts")
+
+
+class RunContentStoreService:
+    """
+    Moves write-once files of a succeeded run into the content-addressed store.
+
+    Ingested: `uploads/`, `artifacts/`, the materialized skill snapshot and the
+    bundle zips. Bundle manifests and result/state JSON are rewritten in place
+    and stay private. Digests from the filesystem snapshot fingerprints are
+    reused only while size, mtime_ns and inode still match; bundle manifest
+    digests carry no stat and are never trusted for linking. Ingested files
+    become read-only links to store objects, so an in-place rewrite fails
+    instead of changing the copy every other linked run sees.
+    """
+
+    def __init__(self, store: Any | None = None) -> None:
+        self._store = store
+
+    def _cas(self) -> Any:
+        return self._store or content_addressed_store
+
+    async def ingest_succeeded_run(
+        self,
+        *,
+        run_id: str,
+        run_dir: Path,
+        layout: RunWorkspaceLayout,
+        engine_name: str,
+        skill_id: str,
+        known_digests: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, int] | None:
+        if not self._cas().enabled:
+            return None
+        try:
+            totals = await asyncio.to_thread(
+                self._ingest,
+                run_dir=run_dir,
+                layout=layout,
+                engine_name=engine_name,
+                skill_id=skill_id,
+                known_digests=known_digests or {},
+            )
+        except (OSError, RuntimeError, ValueError):
+            logger.warning("Content store ingest failed: run_id=%s", run_id, exc_info=True)
+            return None
+        log_event(
+            logger,
+            event="run.content_store.ingested",
+            phase="run_finalize",
+            outcome="ok",
+            run_id=run_id,
+            files=totals["files"],
+            linked=totals["linked"],
+            saved_bytes=totals["saved_bytes"],
+        )
+        return totals
+
+    async def detach_workspace(self, workspace_dir: Path) -> int:
+        """Break shared links before a succeeded workspace is written again (workspace reuse)."""
+        return await asyncio.to_thread(self._cas().detach_tree, workspace_dir)
+
+    def _ingest(
+        self,
+        *,
+        run_dir: Path,
+        layout: RunWorkspaceLayout,
+        engine_name: str,
+        skill_id: str,
+        known_digests: dict[str, dict[str, Any]],
+    ) -> dict[str, int]:
+        cas = self._cas()
+        known = dict(known_digests)
+        totals = {"files": 0, "linked": 0, "saved_bytes": 0}
+        trees = [run_dir / name for name in _WRITE_ONCE_DIRS]
+        try:
+            trees.append(
+                run_folder_bootstrapper.snapshot_dir(run_dir=run_dir, engine_name=engine_name, skill_id=skill_id)
+            )
+        except RuntimeError:
+            logger.debug("Skill snapshot dir unresolved for content store: engine=%s", engine_name)
+        for tree in trees:
+            self._add(totals, cas.ingest_tree(tree, base_dir=run_dir, known_digests=known))
+        bundle_zips = [layout.bundle_path(debug=False), layout.bundle_path(debug=True)]
+        self._add(totals, cas.ingest_files(bundle_zips, base_dir=run_dir, known_digests=known))
+        return totals
+
+    def _add(self, totals: dict[str, int], part: dict[str, int]) -> None:
+        for key in totals:
+            totals[key] += int(part.get(key) or 0)
+
+
+run_content_store_service = RunContentStoreService()
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from server.models import RunStatus
+from server.runtime.logging.structured_trace import log_event
+from server.services.orchestration.run_store import run_store
+from server.services.orchestration.worker_coordinator import worker_coordinator
+from server.services.platform.concurrency_manager import concurrency_manager
+from server.services.platform.engine_budget_manager import (
+    budget_target_from_options,
+    engine_budget_manager,
+)
+
+logger = logging.getLogger(__name__)
+
+RunJobCallable = Callable[..., Awaitable[Any]]
+
+
+class RunDispatchQueue:
+    """
+    Durable dispatch queue for new runs.
+
+    Queued runs are rows in `run_dispatch_queue` rather than live coroutines
+    parked on the concurrency gate. A single dispatcher claims the next row
+    only after a run slot is free, so in-flight run tasks never exceed the
+    slot count. Claim order is priority class first, then the skill/client
+    pair with the fewest running entries, then FIFO. Rows whose engine,
+    provider or model budget pool is blocked are skipped, and the dispatcher
+    sleeps until a budget is released or a backoff/start-rate window ends.
+
+    In multi-worker mode every worker runs a dispatcher against the shared
+    queue. A claim then also requires fewer claimed rows than the slot count
+    across all workers, claims are owned by the coordinator's worker id, and
+    a restart only requeues claims of workers whose heartbeat has expired.
+    """
+
+    def __init__(
+        self,
+        *,
+        run_store_backend: Any | None = None,
+        concurrency_backend: Any | None = None,
+        budget_backend: Any | None = None,
+    ) -> None:
+        self._run_store_backend = run_store_backend
+        self._concurrency_backend = concurrency_backend
+        self._budget_backend = budget_backend
+        self._worker_id = f"dispatcher-{uuid4().hex[:12]}"
+        self._run_job: RunJobCallable | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._run_tasks: set[asyncio.Task[None]] = set()
+        self._blocked_retry_in: float | None = None
+
+    def _store(self) -> Any:
+        return self._run_store_backend or run_store
+
+    def _concurrency(self) -> Any:
+        return self._concurrency_backend or concurrency_manager
+
+    def _budgets(self) -> Any:
+        return self._budget_backend or engine_budget_manager
+
+    async def enqueue(
+        self,
+        *,
+        run_id: str,
+        request_id: str | None,
+        skill_id: str,
+        engine_name: str,
+        options: dict[str, Any],
+        cache_key: str | None = None,
+        client_metadata: dict[str, Any] | None = None,
+        run_store_backend: Any | None = None,
+    ) -> None:
+        metadata = client_metadata if isinstance(client_metadata, dict) else {}
+        client_id = metadata.get("client_id")
+        provider_id, model = budget_target_from_options(options)
+        await (run_store_backend or self._store()).enqueue_dispatch(
+            run_id=run_id,
+            request_id=request_id,
+            skill_id=skill_id,
+            engine=engine_name,
+            options=options,
+            cache_key=cache_key,
+            priority=metadata.get("dispatch_priority"),
+            client_key=client_id if isinstance(client_id, str) else None,
+            provider_id=provider_id,
+            model=model,
+        )
+        self.notify()
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self, run_job: RunJobCallable) -> None:
+        if self._task is not None:
+            return
+        self._run_job = run_job
+        if worker_coordinator.active:
+            requeued = await self._store().requeue_claimed_dispatches(live_since=worker_coordinator.live_since())
+        else:
+            requeued = await self._store().requeue_claimed_dispatches()
+        if requeued:
+            logger.info("Dispatch queue requeued %s claimed entries from previous process", requeued)
+        await self._sync_queued()
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._budgets().add_release_listener(self.notify)
+        self._task = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    async def stop(self) -> None:
+        task = self._task
+        self._task = None
+        self._wakeup = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return
+
+    async def dispatch_available(self) -> int:
+        """Claim and start queued runs until the queue is empty or budget-blocked; returns the number started."""
+        store = self._store()
+        concurrency = self._concurrency()
+        budgets = self._budgets()
+        dispatched = 0
+        self._blocked_retry_in = None
+        shared = worker_coordinator.active
+        worker_id = worker_coordinator.worker_id if shared else self._worker_id
+        while await store.count_queued_dispatches() > 0:
+            await concurrency.acquire_slot()
+            try:
+                if shared:
+                    entry = await store.claim_next_dispatch(
+                        worker_id,
+                        blocked_pools=budgets.blocked_pools(),
+                        max_claimed=(await concurrency.state())["max_concurrent"],
+                    )
+                else:
+                    entry = await store.claim_next_dispatch(
+                        worker_id,
+                        blocked_pools=budgets.blocked_pools(),
+                    )
+            except BaseException:
+                await concurrency.release_slot()
+                raise
+            if entry is None:
+                # Remaining rows all sit in blocked pools (or, shared, every slot
+                # is taken by some worker); retry once a window lifts.
+                await concurrency.release_slot()
+                self._blocked_retry_in = budgets.next_ready_in()
+                if shared:
+                    # Peers wake us over the relay; poll in case a frame is lost.
+                    self._blocked_retry_in = min(
+                        self._blocked_retry_in or worker_coordinator.heartbeat_interval_sec(),
+                        worker_coordinator.heartbeat_interval_sec(),
+                    )
+                break
+            run_id = str(entry["run_id"])
+            if not await self._is_still_queued(entry):
+                await store.complete_dispatch(run_id)
+                await concurrency.release_slot()
+                continue
+            if not budgets.try_acquire(
+                run_id,
+                str(entry["engine"]),
+                entry.get("provider_id") or None,
+                entry.get("model") or None,
+            ):
+                await store.release_dispatch_claim(run_id)
+                await concurrency.release_slot()
+                continue
+            self._spawn(entry)
+            dispatched += 1
+        await self._sync_queued()
+        return dispatched
+
+    async def _dispatch_loop(self) -> None:
+        assert self._wakeup is not None
+        wakeup = self._wakeup
+        while True:
+            try:
+                await self._wait_for_wakeup(wakeup)
+                wakeup.clear()
+                await self.dispatch_available()
+            except asyncio.CancelledError:
+                raise
+            except (OSError, RuntimeError, ValueError, sqlite3.Error):
+                logger.warning("Dispatch queue iteration failed", exc_info=True)
+                await asyncio.sleep(1)
+                wakeup.set()
+
+    async def _wait_for_wakeup(self, wakeup: asyncio.Event) -> None:
+        retry_in = self._blocked_retry_in
+        if retry_in is None:
+            await wakeup.wait()
+            return
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout=max(0.05, retry_in))
+        except asyncio.TimeoutError:
+            return
+
+    async def _is_still_queued(self, entry: dict[str, Any]) -> bool:
+        run = await self._store().get_run(str(entry["run_id"]))
+        return isinstance(run, dict) and run.get("status") == RunStatus.QUEUED.value
+
+    def _spawn(self, entry: dict[str, Any]) -> None:
+        task = asyncio.get_running_loop().create_task(self._run_entry(entry))
+        self._run_tasks.add(task)
+        task.add_done_callback(self._run_tasks.discard)
+
+    async def _run_entry(self, entry: dict[str, Any]) -> None:
+        run_id = str(entry["run_id"])
+        run_job = self._run_job
+        if run_job is None:
+            from server.services.orchestration.job_orchestrator import job_orchestrator
+
+            run_job = job_orchestrator.run_job
+        log_event(
+            logger,
+            event="dispatch.queue.claimed",
+            phase="orchestrator_dispatch",
+            outcome="ok",
+            request_id=entry.get("request_id"),
+            run_id=run_id,
+            engine=entry.get("engine"),
+            priority=entry.get("priority"),
+        )
+        try:
+            await run_job(
+                run_id=run_id,
+                skill_id=str(entry["skill_id"]),
+                engine_name=str(entry["engine"]),
+                options=dict(entry.get("options") or {}),
+                cache_key=entry.get("cache_key"),
+                slot_preacquired=True,
+            )
+        except (OSError, RuntimeError, ValueError, TypeError, KeyError, sqlite3.Error):
+            logger.exception("Dispatched run failed outside lifecycle handling: run_id=%s", run_id)
+        finally:
+            self._budgets().release(run_id)
+            try:
+                await self._store().complete_dispatch(run_id)
+            except (OSError, RuntimeError, sqlite3.Error):
+                logger.warning("Failed to remove dispatch queue entry: run_id=%s", run_id, exc_info=True)
+            self.notify()
+            worker_coordinator.notify_dispatch()
+
+    async def _sync_queued(self) -> None:
+        count = await self._store().count_queued_dispatches()
+        sync = getattr(self._concurrency(), "sync_queued", None)
+        if callable(sync):
+            sync(count)
+
+
+run_dispatch_queue = RunDispatchQueue()
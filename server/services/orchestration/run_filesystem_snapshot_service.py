@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -9,12 +16,59 @@ from server.runtime.adapter.common.profile_loader import load_adapter_profile
 
 from .run_bundle_service import RunBundleService
 
+# Files modified this close to the previous capture may still change without
+# moving size/mtime (coarse filesystem timestamps), so they are always rehashed.
+_RACY_WINDOW_NS = 2_000_000_000
+_MAX_CACHED_RUN_DIRS = 32
+_MAX_CACHED_FILES = 200_000
+_PARALLEL_HASH_MIN_BYTES = 8 * 1024 * 1024
+_HASH_BATCH_FILES = 256
+
+
+@dataclass(frozen=True)
+class _FileFingerprint:
+    size: int
+    mtime_ns: int
+    inode: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class _CachedSnapshot:
+    started_ns: int
+    files: dict[str, _FileFingerprint]
+
 
 class RunFilesystemSnapshotService:
-    def __init__(self, bundle_service: RunBundleService | None = None):
+    """
+    Capture and diff run-dir file snapshots around each attempt.
+
+    The walk uses `os.scandir` and prunes ignored directories. The previous
+    capture of each run dir is kept in memory: a file whose size, mtime_ns
+    and inode are unchanged (and which was not modified right before that
+    capture) reuses its SHA-256. Everything else is hashed on a thread pool.
+    The cache is bounded by run dirs and by total file entries; terminal runs
+    drop theirs through `forget_run_dir`.
+    """
+
+    def __init__(
+        self,
+        bundle_service: RunBundleService | None = None,
+        *,
+        hash_workers: int | None = None,
+    ):
         self.bundle_service = bundle_service or RunBundleService()
         self._ignored_prefixes = self._build_ignored_prefixes()
         self._ignored_files = self._build_ignored_files()
+        self._hash_workers = max(
+            1,
+            int(hash_workers if hash_workers is not None else config.SYSTEM.FS_SNAPSHOT_HASH_WORKERS),
+        )
+        self._cache: OrderedDict[str, _CachedSnapshot] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cached_files = 0
+        self.files_hashed = 0
+        self.files_reused = 0
 
     def _readonly_engine_keys(self) -> tuple[str, ...]:
         return tuple(dict.fromkeys((*keys.ENGINE_KEYS, *keys.LEGACY_READONLY_ENGINE_KEYS)))
@@ -41,22 +95,155 @@ class RunFilesystemSnapshotService:
         return ignored_files
 
     def capture_filesystem_snapshot(self, run_dir: Path) -> dict[str, dict[str, Any]]:
-        snapshot: dict[str, dict[str, Any]] = {}
-        for path in run_dir.rglob("*"):
-            if not path.is_file():
+        started_ns = time.time_ns()
+        cache_key = os.path.abspath(run_dir)
+        with self._cache_lock:
+            previous = self._cache.get(cache_key)
+        previous_files = previous.files if previous is not None else {}
+        reuse_before_ns = previous.started_ns - _RACY_WINDOW_NS if previous is not None else 0
+
+        entries: list[tuple[str, str, os.stat_result]] = []
+        for rel_path, abs_path in self._walk_files(run_dir):
+            try:
+                file_stat = os.stat(abs_path)
+            except FileNotFoundError:
                 continue
-            rel_path = path.relative_to(run_dir).as_posix()
-            if rel_path.startswith(self._ignored_prefixes):
+            entries.append((rel_path, abs_path, file_stat))
+        entries.sort(key=lambda item: item[0])
+
+        fingerprints: dict[str, _FileFingerprint] = {}
+        to_hash: list[tuple[str, str, os.stat_result]] = []
+        for rel_path, abs_path, file_stat in entries:
+            known = previous_files.get(rel_path)
+            if (
+                known is not None
+                and known.size == file_stat.st_size
+                and known.mtime_ns == file_stat.st_mtime_ns
+                and known.inode == file_stat.st_ino
+                and file_stat.st_mtime_ns < reuse_before_ns
+            ):
+                fingerprints[rel_path] = known
+            else:
+                to_hash.append((rel_path, abs_path, file_stat))
+        digests = self._hash_files(
+            [abs_path for _rel_path, abs_path, _file_stat in to_hash],
+            sum(file_stat.st_size for _rel_path, _abs_path, file_stat in to_hash),
+        )
+        for (rel_path, _abs_path, file_stat), digest in zip(to_hash, digests):
+            if digest is None:
                 continue
-            if rel_path in self._ignored_files:
+            fingerprints[rel_path] = _FileFingerprint(
+                size=file_stat.st_size,
+                mtime_ns=file_stat.st_mtime_ns,
+                inode=file_stat.st_ino,
+                sha256=digest,
+            )
+        self.files_hashed += len(to_hash)
+        self.files_reused += len(entries) - len(to_hash)
+
+        snapshot: dict[str, dict[str, Any]] = {}
+        for rel_path, _abs_path, file_stat in entries:
+            fingerprint = fingerprints.get(rel_path)
+            if fingerprint is None:
                 continue
             snapshot[rel_path] = {
-                "size": path.stat().st_size,
-                "mtime": path.stat().st_mtime,
-                "sha256": self.bundle_service.hash_file(path),
+                "size": file_stat.st_size,
+                "mtime": file_stat.st_mtime,
+                "sha256": fingerprint.sha256,
             }
+        with self._cache_lock:
+            replaced = self._cache.pop(cache_key, None)
+            if replaced is not None:
+                self._cached_files -= len(replaced.files)
+            self._cache[cache_key] = _CachedSnapshot(started_ns=started_ns, files=fingerprints)
+            self._cached_files += len(fingerprints)
+            while self._cache and (
+                len(self._cache) > _MAX_CACHED_RUN_DIRS or self._cached_files > _MAX_CACHED_FILES
+            ):
+                _evicted_key, evicted = self._cache.popitem(last=False)
+                self._cached_files -= len(evicted.files)
         return snapshot
 
+    def known_file_digests(self, run_dir: Path) -> dict[str, dict[str, Any]]:
+        """
+        Digests from the last capture of `run_dir`, keyed by relative path.
+
+        Entries carry the `size`/`mtime_ns`/`inode` the digest was taken
+        for, so a consumer can reuse a digest only while the file is
+        unchanged; files modified right before that capture are left out.
+        """
+        with self._cache_lock:
+            cached = self._cache.get(os.path.abspath(run_dir))
+        if cached is None:
+            return {}
+        stable_before_ns = cached.started_ns - _RACY_WINDOW_NS
+        return {
+            rel_path: {
+                "sha256": fingerprint.sha256,
+                "size": fingerprint.size,
+                "mtime_ns": fingerprint.mtime_ns,
+                "inode": fingerprint.inode,
+            }
+            for rel_path, fingerprint in cached.files.items()
+            if fingerprint.mtime_ns < stable_before_ns
+        }
+
+    def forget_run_dir(self, run_dir: Path) -> None:
+        with self._cache_lock:
+            forgotten = self._cache.pop(os.path.abspath(run_dir), None)
+            if forgotten is not None:
+                self._cached_files -= len(forgotten.files)
+
+    def _walk_files(self, run_dir: Path) -> list[tuple[str, str]]:
+        """Regular files under `run_dir` (symlinked files included, symlinked dirs not followed)."""
+        files: list[tuple[str, str]] = []
+        pending: list[tuple[str, str]] = [(os.fspath(run_dir), "")]
+        while pending:
+            abs_dir, rel_dir = pending.pop()
+            try:
+                with os.scandir(abs_dir) as iterator:
+                    dir_entries = list(iterator)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            for entry in dir_entries:
+                rel_path = f"{rel_dir}{entry.name}"
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not f"{rel_path}/".startswith(self._ignored_prefixes):
+                            pending.append((entry.path, f"{rel_path}/"))
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                if rel_path.startswith(self._ignored_prefixes) or rel_path in self._ignored_files:
+                    continue
+                files.append((rel_path, entry.path))
+        return files
+
+    def _hash_files(self, paths: list[str], total_bytes: int) -> list[str | None]:
+        if len(paths) < 2 or self._hash_workers < 2 or total_bytes < _PARALLEL_HASH_MIN_BYTES:
+            return [self._hash_one(path) for path in paths]
+        # Batches keep per-task overhead negligible for many small files;
+        # hashlib releases the GIL on large buffers, so big files overlap.
+        batch_size = max(1, min(_HASH_BATCH_FILES, -(-len(paths) // (self._hash_workers * 4))))
+        batches = [paths[index:index + batch_size] for index in range(0, len(paths), batch_size)]
+        with ThreadPoolExecutor(
+            max_workers=min(self._hash_workers, len(batches)),
+            thread_name_prefix="fs-snapshot-hash",
+        ) as pool:
+            results: list[str | None] = []
+            for digests in pool.map(lambda batch: [self._hash_one(path) for path in batch], batches):
+                results.extend(digests)
+            return results
+
+    def _hash_one(self, path: str) -> str | None:
+        try:
+            with open(path, "rb") as handle:
+                return hashlib.file_digest(handle, "sha256").hexdigest()
+        except FileNotFoundError:
+            return None
+
     def diff_filesystem_snapshot(
         self,
         before_snapshot: dict[str, dict[str, Any]],
@@ -1,13 +1,42 @@
 from __future__ import annotations
 
+import os
+import shutil
+import uuid
+from functools import cached_property
 from pathlib import Path
 
 from server.services.platform.subprocess_text import run_text
 
+_GIT_SKELETON_DIRS: tuple[str, ...] = (
+    "objects",
+    "objects/info",
+    "objects/pack",
+    "refs",
+    "refs/heads",
+    "refs/tags",
+)
+
 
 class RunFolderGitInitializer:
-    def __init__(self, git_executable: str = "git") -> None:
+    """Ensure run folders are git work trees.
+
+    By default the `.git` skeleton is written in-process from a template
+    cached per initializer, matching what `git init --template=` produces
+    (HEAD, config, objects/ and refs/). This avoids a git fork/exec per run
+    workspace. `native=False` keeps the `git init` subprocess path.
+    """
+
+    def __init__(
+        self,
+        git_executable: str = "git",
+        *,
+        native: bool = True,
+        initial_branch: str = "master",
+    ) -> None:
         self.git_executable = git_executable
+        self.native = native
+        self.initial_branch = initial_branch
 
     def ensure_git_repo(self, run_dir: Path) -> bool:
         resolved = run_dir.resolve()
@@ -15,6 +44,8 @@ class RunFolderGitInitializer:
         if git_dir.exists():
             return False
         resolved.mkdir(parents=True, exist_ok=True)
+        if self.native:
+            return self._write_skeleton(resolved)
         result = run_text(
             [self.git_executable, "init", "-q", str(resolved)],
         )
@@ -23,5 +54,44 @@ class RunFolderGitInitializer:
             raise RuntimeError(f"Failed to initialize git repo for run folder {resolved}: {detail}")
         return True
 
+    @cached_property
+    def _template_files(self) -> dict[str, str]:
+        core_lines = [
+            "[core]",
+            "\trepositoryformatversion = 0",
+            f"\tfilemode = {'false' if os.name == 'nt' else 'true'}",
+            "\tbare = false",
+            "\tlogallrefupdates = true",
+        ]
+        if os.name == "nt":
+            core_lines.extend(["\tsymlinks = false", "\tignorecase = true"])
+        return {
+            "HEAD": f"ref: refs/heads/{self.initial_branch}\n",
+            "config": "\n".join(core_lines) + "\n",
+        }
+
+    def _write_skeleton(self, run_dir: Path) -> bool:
+        # Build next to the target and rename into place so concurrent callers
+        # never observe a partially written `.git` directory.
+        staging_dir = run_dir / f".git.init-{uuid.uuid4().hex}"
+        try:
+            staging_dir.mkdir()
+            for relative in _GIT_SKELETON_DIRS:
+                (staging_dir / relative).mkdir()
+            for relative, content in self._template_files.items():
+                (staging_dir / relative).write_text(content, encoding="utf-8", newline="\n")
+            try:
+                staging_dir.rename(run_dir / ".git")
+            except OSError:
+                if (run_dir / ".git").exists():
+                    return False
+                raise
+        except OSError as exc:
+            raise RuntimeError(f"Failed to initialize git repo for run folder {run_dir}: {exc}") from exc
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        return True
+
 
 run_folder_git_initializer = RunFolderGitInitializer()
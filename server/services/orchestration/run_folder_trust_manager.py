@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 from typing import Iterable
 
@@ -5,7 +6,13 @@ from server.config import config
 from server.engines.common.trust_registry import create_default_trust_registry
 
 class RunFolderTrustManager:
-    """Dispatch run-folder trust operations to engine-registered strategies."""
+    """
+    Dispatch run-folder trust operations to engine-registered strategies.
+
+    Strategies batch concurrent writes to their trust file. For engines whose
+    trust covers sub-folders (`inherits_parent_trust`), a run dir below a
+    parent trusted through `bootstrap_parent_trust` gets no entry of its own.
+    """
 
     def __init__(
         self,
@@ -30,25 +37,40 @@ class RunFolderTrustManager:
             runs_root=self.runs_root,
             managed_roots=self.managed_roots,
         )
+        self._trusted_parents: dict[str, set[Path]] = {}
+        self._parents_guard = threading.Lock()
 
     def register_run_folder(self, engine: str, run_dir: Path) -> None:
         normalized = self._normalize_path(run_dir)
+        if self._covered_by_parent(engine, normalized):
+            return
         self._registry.resolve(engine).register(normalized)
 
     def remove_run_folder(self, engine: str, run_dir: Path) -> None:
         normalized = self._normalize_path(run_dir)
+        if self._covered_by_parent(engine, normalized):
+            return
         self._registry.resolve(engine).remove(normalized)
 
     def bootstrap_parent_trust(self, runs_parent: Path) -> None:
         normalized = self._normalize_path(runs_parent)
-        for _engine, strategy in self._registry.iter_registered():
+        for engine, strategy in self._registry.iter_registered():
             strategy.bootstrap_parent_trust(normalized)
+            if getattr(strategy, "inherits_parent_trust", False):
+                with self._parents_guard:
+                    self._trusted_parents.setdefault(engine, set()).add(Path(normalized))
 
     def cleanup_stale_entries(self, active_run_dirs: Iterable[Path]) -> None:
         active = {self._normalize_path(path) for path in active_run_dirs}
         for _engine, strategy in self._registry.iter_registered():
             strategy.cleanup_stale(active)
 
+    def _covered_by_parent(self, engine: str, normalized: str) -> bool:
+        with self._parents_guard:
+            parents = tuple(self._trusted_parents.get(engine.strip().lower(), ()))
+        candidate = Path(normalized)
+        return any(parent != candidate and parent in candidate.parents for parent in parents)
+
     def _normalize_path(self, path: Path) -> str:
         return str(path.resolve())
 
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from server.models import RunStatus
+from server.runtime.logging.structured_trace import log_event
+from server.services.orchestration.run_state_service import run_state_service
+from server.services.orchestration.run_store import run_store
+
+logger = logging.getLogger(__name__)
+
+COALESCED_FOLLOWER_CANCELED_CODE = "COALESCED_FOLLOWER_CANCELED"
+_COALESCIBLE_STATUSES = {RunStatus.QUEUED.value, RunStatus.RUNNING.value}
+
+
+class CacheKeyReservation:
+    """Holds the per-cache-key lock from the in-flight lookup until the new run row exists."""
+
+    def __init__(self, owner: "RunInflightCoalescer", cache_key: str) -> None:
+        self._owner = owner
+        self._cache_key = cache_key
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._owner._release(self._cache_key)
+
+
+class RunInflightCoalescer:
+    """
+    Single-flight binding of identical auto-mode submissions.
+
+    A submission whose cache key matches a queued or running run is bound to
+    that run as a follower request instead of launching another engine
+    process. Followers share the leader's result, bundle and events; their
+    request-scoped state is mirrored from the leader on every status write
+    (see `RunStateService.write_non_terminal_projection`). Interactive and
+    `no_cache` requests never carry a cache key and are never coalesced.
+    """
+
+    def __init__(self, *, run_store_backend: Any | None = None) -> None:
+        self._run_store_backend = run_store_backend
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._waiters: dict[str, int] = {}
+
+    def _store(self) -> Any:
+        return self._run_store_backend or run_store
+
+    async def reserve(self, cache_key: str) -> CacheKeyReservation:
+        lock = self._locks.get(cache_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[cache_key] = lock
+        self._waiters[cache_key] = self._waiters.get(cache_key, 0) + 1
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._drop_waiter(cache_key)
+            raise
+        return CacheKeyReservation(self, cache_key)
+
+    def _release(self, cache_key: str) -> None:
+        lock = self._locks.get(cache_key)
+        if lock is not None and lock.locked():
+            lock.release()
+        self._drop_waiter(cache_key)
+
+    def _drop_waiter(self, cache_key: str) -> None:
+        remaining = self._waiters.get(cache_key, 0) - 1
+        if remaining > 0:
+            self._waiters[cache_key] = remaining
+            return
+        self._waiters.pop(cache_key, None)
+        self._locks.pop(cache_key, None)
+
+    async def bind_follower(
+        self,
+        *,
+        request_id: str,
+        cache_key: str,
+        skill_source: str,
+        run_store_backend: Any | None = None,
+    ) -> RunStatus | None:
+        """Bind `request_id` to an in-flight run with the same cache key; returns its status or None."""
+        store = run_store_backend or self._store()
+        run = await store.find_inflight_run_for_cache_key(cache_key)
+        if not isinstance(run, dict) or str(run.get("status") or "") not in _COALESCIBLE_STATUSES:
+            return None
+        run_id = str(run["run_id"])
+        if str(run.get("status")) == RunStatus.QUEUED.value and await store.get_dispatch_queue_entry(run_id) is None:
+            # Run row exists but was never admitted (e.g. rejected with 429); don't wait on it.
+            return None
+        leader_record = await store.get_request_by_run_id(run_id)
+        if not isinstance(leader_record, dict) or leader_record.get("request_id") == request_id:
+            return None
+        if str(leader_record.get("skill_source") or "") != skill_source:
+            return None
+        leader_request_id = str(leader_record["request_id"])
+        leader_state = await store.get_run_state(leader_request_id)
+        if not isinstance(leader_state, dict):
+            return None
+        await store.add_request_follower(request_id, run_id, leader_request_id)
+        status = RunStatus(str(run["status"]))
+        await store.bind_request_run_id(request_id, run_id, status=status.value)
+        # Copy after registering so a concurrent leader write is mirrored either way.
+        leader_state = await store.get_run_state(leader_request_id) or leader_state
+        follower_state = await run_state_service.write_follower_state(
+            request_id=request_id,
+            source_state=leader_state,
+            run_store_backend=store,
+        )
+        log_event(
+            logger,
+            event="run.coalesce.follower_bound",
+            phase="run_create",
+            outcome="ok",
+            request_id=request_id,
+            run_id=run_id,
+            leader_request_id=leader_request_id,
+            cache_key=cache_key,
+        )
+        return RunStatus(str(follower_state.get("status") or status.value))
+
+    async def detach_follower(self, *, request_id: str, run_store_backend: Any | None = None) -> bool:
+        """Cancel a follower request without canceling the run it shares with its leader."""
+        store = run_store_backend or self._store()
+        follower = await store.get_request_follower(request_id)
+        if not isinstance(follower, dict) or follower.get("detached_at"):
+            return False
+        if not await store.detach_request_follower(request_id):
+            return False
+        current_state = await store.get_run_state(request_id)
+        if isinstance(current_state, dict):
+            await run_state_service.write_follower_state(
+                request_id=request_id,
+                source_state=current_state,
+                status=RunStatus.CANCELED,
+                error={
+                    "code": COALESCED_FOLLOWER_CANCELED_CODE,
+                    "message": "Canceled by user request; the shared run continues for other requests",
+                },
+                run_store_backend=store,
+            )
+        log_event(
+            logger,
+            event="run.coalesce.follower_detached",
+            phase="run_cancel",
+            outcome="ok",
+            request_id=request_id,
+            run_id=follower.get("run_id"),
+        )
+        return True
+
+
+run_inflight_coalescer = RunInflightCoalescer()
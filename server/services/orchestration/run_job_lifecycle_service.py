@@ -59,10 +59,16 @@ from server.services.orchestration.run_attempt_preparation_service import (
 from server.services.orchestration.run_attempt_projection_finalizer import (
     RunAttemptFinalizeInput,
 )
+from server.services.orchestration.worker_coordinator import worker_coordinator
 from server.services.orchestration.run_workspace_layout import (
     require_layout_from_record,
 )
+from server.runtime.protocol.engine_error_governance import has_rate_limit_signal
 from server.services.platform.async_compat import maybe_await
+from server.services.platform.engine_budget_manager import (
+    budget_target_from_options,
+    engine_budget_manager,
+)
 from server.services.platform.schema_validator import schema_validator
 from server.services.skill.skill_asset_resolver import resolve_schema_asset
 from server.services.skill.skill_registry import skill_registry
@@ -70,6 +76,7 @@ from server.services.skill.skill_registry import skill_registry
 logger = logging.getLogger(__name__)
 
 _TERMINAL_ERROR_SUMMARY_MAX_CHARS = 512
+_SNAPSHOT_RELEASE_STATUSES = frozenset({RunStatus.SUCCEEDED, RunStatus.FAILED, RunStatus.CANCELED})
 
 
 def _normalize_provider_id(value: Any) -> str | None:
@@ -295,6 +302,7 @@ class RunJobRequest:
     cache_key: Optional[str] = None
     skill_override: Optional[SkillManifest] = None
     temp_request_id: Optional[str] = None
+    slot_preacquired: bool = False
 
 
 @dataclass
@@ -523,8 +531,12 @@ class _RunJobLifecyclePipeline:
         workspace_manager = orchestrator._workspace_backend()
         concurrency_manager = orchestrator._concurrency_backend()
         run_folder_trust_manager = orchestrator._trust_manager_backend()
-        await concurrency_manager.acquire_slot()
+        if not request.slot_preacquired:
+            await concurrency_manager.acquire_slot()
         slot_acquired = True
+        budget_provider_id, budget_model = budget_target_from_options(options)
+        # Dispatched runs already hold their budget lease; this accounts resume paths.
+        engine_budget_manager.acquire_unchecked(run_id, engine_name, budget_provider_id, budget_model)
         log_event(
             logger,
             event="run.lifecycle.slot_acquired",
@@ -535,6 +547,8 @@ class _RunJobLifecyclePipeline:
             engine=engine_name,
         )
         try:
+            # Multi-worker mode: mark this worker as the run's owner for cancel routing.
+            await worker_coordinator.acquire_run(run_id)
             request_record = await run_store.get_request_by_run_id(run_id)
             request_id = request_record.get("request_id") if request_record else None
             if not isinstance(request_record, dict):
@@ -710,7 +724,10 @@ class _RunJobLifecyclePipeline:
                 execution_mode=execution_mode,
             )
             attempt_started_at = datetime.utcnow()
-            fs_before_snapshot = orchestrator.snapshot_service.capture_filesystem_snapshot(run_dir)
+            fs_before_snapshot = await asyncio.to_thread(
+                orchestrator.snapshot_service.capture_filesystem_snapshot,
+                run_dir,
+            )
             process_exit_code: Optional[int] = None
             process_failure_reason: Optional[str] = None
             process_raw_stdout = ""
@@ -955,6 +972,16 @@ class _RunJobLifecyclePipeline:
                 )
                 final_status = outcome.final_status
                 current_outcome = outcome
+                engine_budget_manager.record_attempt(
+                    engine_name,
+                    budget_provider_id,
+                    budget_model,
+                    rate_limited=has_rate_limit_signal(
+                        outcome.runtime_parse_result,
+                        outcome.process_raw_stderr,
+                    ),
+                    succeeded=final_status == RunStatus.SUCCEEDED,
+                )
                 normalized_error = outcome.normalized_error
                 normalized_error_message = (
                     str(normalized_error.get("message"))
@@ -1201,7 +1228,9 @@ class _RunJobLifecyclePipeline:
                     )
             finally:
                 if run_dir is not None and current_outcome is not None:
-                    orchestrator.run_attempt_audit_finalizer.finalize(
+                    # The after-attempt filesystem capture walks and hashes the run dir.
+                    await asyncio.to_thread(
+                        orchestrator.run_attempt_audit_finalizer.finalize,
                         inputs=_build_finalize_input(
                             request=request,
                             context=context,
@@ -1234,6 +1263,9 @@ class _RunJobLifecyclePipeline:
                         ),
                         finished_at=datetime.utcnow(),
                     )
+                    if current_outcome.final_status in _SNAPSHOT_RELEASE_STATUSES:
+                        # No further attempt will reuse this run dir's fingerprints.
+                        orchestrator.snapshot_service.forget_run_dir(run_dir)
                 return RunJobOutcome(
                     run_id=run_id,
                     final_status=final_status,
@@ -1244,7 +1276,9 @@ class _RunJobLifecyclePipeline:
         finally:
             if run_log_mirror_stack is not None:
                 run_log_mirror_stack.close()
+            await worker_coordinator.release_run(run_id)
             if slot_acquired and release_slot_on_exit:
+                engine_budget_manager.release(run_id)
                 await concurrency_manager.release_slot()
                 log_event(
                     logger,
@@ -378,10 +378,16 @@ class RunOutputConvergenceService:
                 options=rerun_options,
                 live_runtime_emitter=emitter,
             )
-            rerun_parse_result = self._parse_runtime_stream(
+            rerun_raw_stdout = getattr(rerun_result, "raw_stdout", "") or ""
+            rerun_raw_stderr = getattr(rerun_result, "raw_stderr", "") or ""
+            rerun_parse_result = self._live_runtime_parse_result(
+                live_runtime_emitter=emitter,
+                raw_stdout=rerun_raw_stdout,
+                raw_stderr=rerun_raw_stderr,
+            ) or self._parse_runtime_stream(
                 adapter=adapter,
-                raw_stdout=getattr(rerun_result, "raw_stdout", "") or "",
-                raw_stderr=getattr(rerun_result, "raw_stderr", "") or "",
+                raw_stdout=rerun_raw_stdout,
+                raw_stderr=rerun_raw_stderr,
             )
             handle = await self._resolve_session_handle(
                 request_id=request_id,
@@ -1103,6 +1109,19 @@ class RunOutputConvergenceService:
                 return True
         return False
 
+    def _live_runtime_parse_result(
+        self,
+        *,
+        live_runtime_emitter: Any,
+        raw_stdout: str,
+        raw_stderr: str,
+    ) -> dict[str, Any] | None:
+        getter = getattr(live_runtime_emitter, "runtime_parse_result", None)
+        if not callable(getter):
+            return None
+        parsed = getter(raw_stdout=raw_stdout, raw_stderr=raw_stderr)
+        return parsed if isinstance(parsed, dict) else None
+
     def _parse_runtime_stream(
         self,
         *,
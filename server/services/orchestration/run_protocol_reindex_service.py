@@ -0,0 +1,596 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util as multiprocessing_util
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Awaitable, Callable, Optional
+
+from server.config import config
+from server.runtime.logging.structured_trace import log_event
+from server.runtime.observability.run_observability import run_observability_service
+from server.services.orchestration.run_store import run_store
+from server.services.orchestration.run_store_request_store import RunListFilters
+from server.services.orchestration.run_workspace_layout import layout_from_record
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_RUN_STATUSES = ("succeeded", "failed", "canceled")
+JOB_FILE_NAME = "job.json"
+TARGETS_FILE_NAME = "targets.json"
+PROGRESS_FILE_NAME = "progress.jsonl"
+RUNNING_LOCK_FILE_NAME = ".running.lock"
+_SELECT_PAGE_SIZE = 1000
+_CHECKPOINT_EVERY_RUNS = 25
+_CHECKPOINT_EVERY_SEC = 2.0
+
+ProgressCallback = Callable[[dict[str, Any], dict[str, Any]], Awaitable[None] | None]
+
+
+class ProtocolReindexBusyError(RuntimeError):
+    """Raised when another protocol reindex job is already running."""
+
+
+class ProtocolReindexValidationError(ValueError):
+    """Raised when reindex options or the job id are invalid."""
+
+
+@dataclass(frozen=True)
+class ProtocolReindexOptions:
+    """Selection and pacing of one bulk protocol reindex job."""
+
+    request_ids: tuple[str, ...] = ()
+    engines: tuple[str, ...] = ()
+    limit: Optional[int] = None
+    workers: int = field(default_factory=lambda: int(config.SYSTEM.PROTOCOL_REINDEX_WORKERS))
+    dry_run: bool = False
+    max_runs_per_sec: float = field(
+        default_factory=lambda: float(config.SYSTEM.PROTOCOL_REINDEX_MAX_RUNS_PER_SEC)
+    )
+    worker_nice: int = field(default_factory=lambda: int(config.SYSTEM.PROTOCOL_REINDEX_WORKER_NICE))
+
+    def to_payload(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["request_ids"] = list(self.request_ids)
+        payload["engines"] = list(self.engines)
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "ProtocolReindexOptions":
+        limit_obj = payload.get("limit")
+        return cls(
+            request_ids=tuple(str(item) for item in payload.get("request_ids") or ()),
+            engines=tuple(str(item) for item in payload.get("engines") or ()),
+            limit=int(limit_obj) if isinstance(limit_obj, int) else None,
+            workers=int(payload.get("workers", config.SYSTEM.PROTOCOL_REINDEX_WORKERS)),
+            dry_run=bool(payload.get("dry_run", False)),
+            max_runs_per_sec=float(
+                payload.get("max_runs_per_sec", config.SYSTEM.PROTOCOL_REINDEX_MAX_RUNS_PER_SEC)
+            ),
+            worker_nice=int(payload.get("worker_nice", config.SYSTEM.PROTOCOL_REINDEX_WORKER_NICE)),
+        )
+
+
+async def reindex_single_run(request_id: str, *, dry_run: bool) -> dict[str, Any]:
+    """Rebuild (or diff) one terminal run through `rebuild_protocol_history`."""
+    record = await run_store.get_request_with_run(request_id)
+    if not record:
+        return _run_result(request_id, success=False, reason="REQUEST_NOT_FOUND")
+    run_id = str(record.get("run_id") or "") or None
+    status = str(record.get("run_status") or "").strip().lower()
+    if status not in TERMINAL_RUN_STATUSES:
+        return _run_result(request_id, run_id=run_id, success=False, skipped=True, reason="RUN_NOT_TERMINAL")
+    layout = layout_from_record(record)
+    run_dir = layout.workspace_dir if layout is not None else None
+    if run_dir is None or not run_dir.exists():
+        return _run_result(request_id, run_id=run_id, success=False, reason="RUN_DIR_NOT_FOUND")
+    payload = await run_observability_service.rebuild_protocol_history(
+        run_dir=run_dir,
+        request_id=request_id,
+        dry_run=dry_run,
+    )
+    attempts = [item for item in payload.get("attempts") or [] if isinstance(item, dict)]
+    failed = [item for item in attempts if not item.get("success")]
+    result = _run_result(
+        request_id,
+        run_id=run_id,
+        success=bool(payload.get("success")),
+        reason=str(failed[0].get("reason")) if failed else "OK",
+    )
+    result["attempts"] = len(attempts)
+    result["backup_dir"] = payload.get("backup_dir")
+    if dry_run:
+        diffs = {
+            str(item.get("attempt")): item["diff"]
+            for item in attempts
+            if isinstance(item.get("diff"), dict)
+        }
+        result["changed"] = any(bool(diff.get("changed")) for diff in diffs.values())
+        result["diff"] = diffs
+    return result
+
+
+def _run_result(
+    request_id: str,
+    *,
+    success: bool,
+    reason: str,
+    run_id: Optional[str] = None,
+    skipped: bool = False,
+) -> dict[str, Any]:
+    return {
+        "request_id": request_id,
+        "run_id": run_id,
+        "success": success,
+        "skipped": skipped,
+        "reason": reason,
+    }
+
+
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _init_reindex_worker(nice: int) -> None:
+    """Process-pool initializer: lower CPU priority and install runtime ports."""
+    global _worker_loop
+    if nice > 0 and hasattr(os, "nice"):
+        try:
+            os.nice(nice)
+        except OSError:
+            logger.warning("protocol reindex worker could not lower its priority", exc_info=True)
+    from server.services.orchestration.runtime_observability_ports import install_runtime_observability_ports
+    from server.services.orchestration.runtime_protocol_ports import install_runtime_protocol_ports
+
+    install_runtime_protocol_ports()
+    install_runtime_observability_ports()
+    _worker_loop = asyncio.new_event_loop()
+    # aiosqlite connection threads are not daemonic; close them before the
+    # worker's interpreter joins its threads, or the pool shutdown hangs.
+    multiprocessing_util.Finalize(None, _close_reindex_worker, exitpriority=10)
+
+
+def _close_reindex_worker() -> None:
+    global _worker_loop
+    loop = _worker_loop
+    _worker_loop = None
+    if loop is None:
+        return
+    try:
+        loop.run_until_complete(close_sqlite_handles())
+    finally:
+        loop.close()
+
+
+async def close_sqlite_handles() -> None:
+    """Close pooled SQLite handles opened by a standalone (non-server) reindex."""
+    from server.services.platform.sqlite_db_handle import sqlite_db_handle_registry, sqlite_sync_bridge
+
+    try:
+        await asyncio.wait_for(sqlite_db_handle_registry.close_all(), timeout=2.0)
+        await asyncio.wait_for(sqlite_sync_bridge.close(), timeout=2.0)
+    except (asyncio.TimeoutError, OSError, RuntimeError, ValueError):
+        logger.warning("SQLite handle shutdown did not finish cleanly", exc_info=True)
+
+
+def _reindex_run_in_worker(request_id: str, dry_run: bool) -> dict[str, Any]:
+    loop = _worker_loop
+    if loop is None:
+        raise RuntimeError("protocol reindex worker is not initialized")
+    return loop.run_until_complete(reindex_single_run(request_id, dry_run=dry_run))
+
+
+class _RunRateLimiter:
+    def __init__(self, max_per_sec: float) -> None:
+        self._interval = 1.0 / max_per_sec if max_per_sec > 0 else 0.0
+        self._next_at = time.monotonic()
+
+    async def wait(self) -> None:
+        if self._interval <= 0:
+            return
+        now = time.monotonic()
+        if self._next_at > now:
+            await asyncio.sleep(self._next_at - now)
+        self._next_at = max(self._next_at, now) + self._interval
+
+
+class RunProtocolReindexService:
+    """
+    Bulk strict-replay rebuild of protocol history across many runs.
+
+    Each job lives in `<PROTOCOL_REINDEX_DIR>/<job_id>/`: `targets.json` holds
+    the request ids selected when the job was created, `progress.jsonl` one
+    result row per finished run, and `job.json` the checkpointed counters.
+    Re-running a job id skips runs already recorded as successful, so an
+    interrupted or canceled job resumes where it stopped.
+
+    Runs are sharded over a process pool of low-priority (`nice`) workers that
+    each call `rebuild_protocol_history`, so replay CPU stays off the server's
+    event loop; submissions are paced by `max_runs_per_sec`. `workers=0`
+    replays in the calling process instead.
+
+    Only one job runs at a time across all server workers: the running job
+    holds an exclusive `flock` on `<PROTOCOL_REINDEX_DIR>/.running.lock`.
+    """
+
+    def __init__(self, *, root_dir: Path | None = None) -> None:
+        self._root_override = root_dir
+        self._state_lock = threading.Lock()
+        self._running_job_id: Optional[str] = None
+        self._running_lock_file: Optional[IO[str]] = None
+        self._cancel_requested: set[str] = set()
+        self._job_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def root_dir(self) -> Path:
+        return self._root_override or Path(config.SYSTEM.PROTOCOL_REINDEX_DIR)
+
+    def job_dir(self, job_id: str) -> Path:
+        if not job_id or "/" in job_id or "\\" in job_id or job_id in {".", ".."}:
+            raise ProtocolReindexValidationError(f"Invalid reindex job id: {job_id!r}")
+        return self.root_dir / job_id
+
+    def get_job(self, job_id: str) -> Optional[dict[str, Any]]:
+        path = self.job_dir(job_id) / JOB_FILE_NAME
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def read_progress(self, job_id: str) -> list[dict[str, Any]]:
+        path = self.job_dir(job_id) / PROGRESS_FILE_NAME
+        rows: list[dict[str, Any]] = []
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from an interrupted job; the run is replayed again.
+                        continue
+                    if isinstance(row, dict):
+                        rows.append(row)
+        except FileNotFoundError:
+            return []
+        return rows
+
+    def request_cancel(self, job_id: str) -> bool:
+        with self._state_lock:
+            if self._running_job_id != job_id:
+                return False
+            self._cancel_requested.add(job_id)
+            return True
+
+    async def select_request_ids(self, options: ProtocolReindexOptions) -> list[str]:
+        if options.request_ids:
+            selected = list(dict.fromkeys(options.request_ids))
+        else:
+            engines = [engine.strip() for engine in options.engines if engine.strip()] or [None]
+            selected = []
+            for engine in dict.fromkeys(engines):
+                filters = RunListFilters(statuses=TERMINAL_RUN_STATUSES, engine=engine)
+                cursor: Optional[str] = None
+                while True:
+                    page = await run_store.list_requests_with_runs_keyset(
+                        limit=_SELECT_PAGE_SIZE,
+                        cursor=cursor,
+                        filters=filters,
+                    )
+                    selected.extend(str(row["request_id"]) for row in page.get("rows") or [])
+                    cursor = page.get("next_cursor")
+                    if not cursor or (options.limit is not None and 0 < options.limit <= len(selected)):
+                        break
+        if options.limit is not None and options.limit > 0:
+            selected = selected[: options.limit]
+        return selected
+
+    async def start_job(
+        self,
+        options: ProtocolReindexOptions,
+        *,
+        job_id: Optional[str] = None,
+    ) -> str:
+        """Create (or resume) a job and run it as a background task."""
+        if options.workers < 1:
+            raise ProtocolReindexValidationError("Background reindex jobs need at least one worker process")
+        job_id = self._claim(job_id)
+        try:
+            await self._prepare_job(job_id, options)
+        except BaseException:
+            self._release(job_id)
+            raise
+        task = asyncio.get_running_loop().create_task(self._run_claimed(job_id))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+        return job_id
+
+    async def run_job(
+        self,
+        options: ProtocolReindexOptions,
+        *,
+        job_id: Optional[str] = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> dict[str, Any]:
+        """Create (or resume) a job and run it to completion in the foreground."""
+        job_id = self._claim(job_id)
+        try:
+            await self._prepare_job(job_id, options)
+        except BaseException:
+            self._release(job_id)
+            raise
+        return await self._run_claimed(job_id, on_progress=on_progress)
+
+    def _claim(self, job_id: Optional[str]) -> str:
+        resolved = job_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ-") + uuid.uuid4().hex[:8]
+        self.job_dir(resolved)
+        with self._state_lock:
+            if self._running_job_id is not None:
+                raise ProtocolReindexBusyError(f"Protocol reindex job {self._running_job_id} is running")
+            self._running_lock_file = self._acquire_running_lock(resolved)
+            self._running_job_id = resolved
+            self._cancel_requested.discard(resolved)
+        return resolved
+
+    def _release(self, job_id: str) -> None:
+        with self._state_lock:
+            if self._running_job_id == job_id:
+                self._running_job_id = None
+                lock_file, self._running_lock_file = self._running_lock_file, None
+                if lock_file is not None:
+                    # Closing the descriptor drops the flock.
+                    lock_file.close()
+            self._cancel_requested.discard(job_id)
+
+    def _acquire_running_lock(self, job_id: str) -> Optional[IO[str]]:
+        try:
+            import fcntl
+        except ImportError:
+            return None
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.root_dir / RUNNING_LOCK_FILE_NAME, "a+", encoding="utf-8")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.seek(0)
+            holder = lock_file.read().strip() or "unknown"
+            lock_file.close()
+            raise ProtocolReindexBusyError(f"Protocol reindex job {holder} is running in another worker") from None
+        except OSError:
+            lock_file.close()
+            raise
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(job_id)
+        lock_file.flush()
+        return lock_file
+
+    async def _prepare_job(self, job_id: str, options: ProtocolReindexOptions) -> None:
+        job_dir = self.job_dir(job_id)
+        existing = self.get_job(job_id)
+        if existing is not None and (job_dir / TARGETS_FILE_NAME).exists():
+            # Resume keeps the original selection and options.
+            return
+        targets = await self.select_request_ids(options)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write_json(job_dir / TARGETS_FILE_NAME, {"request_ids": targets})
+        now = _utc_now_iso()
+        _atomic_write_json(
+            job_dir / JOB_FILE_NAME,
+            {
+                "job_id": job_id,
+                "status": "queued",
+                "options": options.to_payload(),
+                "created_at": now,
+                "updated_at": now,
+                "total": len(targets),
+                **_empty_counters(),
+            },
+        )
+
+    async def _run_claimed(
+        self,
+        job_id: str,
+        *,
+        on_progress: ProgressCallback | None = None,
+    ) -> dict[str, Any]:
+        job_dir = self.job_dir(job_id)
+        state = self.get_job(job_id) or {}
+        try:
+            options = ProtocolReindexOptions.from_payload(dict(state.get("options") or {}))
+            targets_payload = json.loads((job_dir / TARGETS_FILE_NAME).read_text(encoding="utf-8"))
+            targets = [str(item) for item in targets_payload.get("request_ids") or []]
+            finished = {
+                str(row.get("request_id")): row
+                for row in self.read_progress(job_id)
+                if row.get("success") or row.get("skipped")
+            }
+            pending = [request_id for request_id in targets if request_id not in finished]
+            counters = _counters_from_rows(finished.values())
+            state.update(counters)
+            state.update({"status": "running", "total": len(targets), "resumed_from": len(finished)})
+            state.pop("error", None)
+            self._checkpoint(job_dir, state)
+            log_event(
+                logger,
+                event="protocol.reindex.started",
+                phase="protocol_reindex",
+                outcome="start",
+                job_id=job_id,
+                total=len(targets),
+                pending=len(pending),
+                workers=options.workers,
+                dry_run=options.dry_run,
+            )
+            canceled = await self._process(
+                job_id,
+                job_dir=job_dir,
+                state=state,
+                options=options,
+                pending=pending,
+                on_progress=on_progress,
+            )
+            state["status"] = "canceled" if canceled else ("succeeded" if state["failed"] == 0 else "failed")
+        except (OSError, RuntimeError, ValueError, json.JSONDecodeError) as exc:
+            logger.exception("protocol reindex job failed job_id=%s", job_id)
+            state["status"] = "failed"
+            state["error"] = f"{type(exc).__name__}: {exc}"
+        finally:
+            self._checkpoint(job_dir, state)
+            self._release(job_id)
+        log_event(
+            logger,
+            event="protocol.reindex.finished",
+            phase="protocol_reindex",
+            outcome=str(state.get("status")),
+            job_id=job_id,
+            done=state.get("done"),
+            failed=state.get("failed"),
+            changed=state.get("changed"),
+        )
+        return state
+
+    async def _process(
+        self,
+        job_id: str,
+        *,
+        job_dir: Path,
+        state: dict[str, Any],
+        options: ProtocolReindexOptions,
+        pending: list[str],
+        on_progress: ProgressCallback | None,
+    ) -> bool:
+        limiter = _RunRateLimiter(options.max_runs_per_sec)
+        last_checkpoint = time.monotonic()
+        since_checkpoint = 0
+        progress_path = job_dir / PROGRESS_FILE_NAME
+
+        async def _record(result: dict[str, Any]) -> None:
+            nonlocal last_checkpoint, since_checkpoint
+            result["finished_at"] = _utc_now_iso()
+            with progress_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+            _apply_result(state, result)
+            state["last_request_id"] = result["request_id"]
+            since_checkpoint += 1
+            now = time.monotonic()
+            if since_checkpoint >= _CHECKPOINT_EVERY_RUNS or now - last_checkpoint >= _CHECKPOINT_EVERY_SEC:
+                self._checkpoint(job_dir, state)
+                last_checkpoint = now
+                since_checkpoint = 0
+            if on_progress is not None:
+                maybe_awaitable = on_progress(result, state)
+                if maybe_awaitable is not None:
+                    await maybe_awaitable
+
+        if options.workers <= 0:
+            for request_id in pending:
+                if self._is_cancel_requested(job_id):
+                    return True
+                await limiter.wait()
+                await _record(await self._run_inline(request_id, dry_run=options.dry_run))
+            return False
+
+        pool = ProcessPoolExecutor(
+            max_workers=options.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_reindex_worker,
+            initargs=(max(0, options.worker_nice),),
+        )
+        # One run in flight per worker keeps the queue short, so cancel and
+        # throttling take effect within a run.
+        slots = asyncio.Semaphore(options.workers)
+        in_flight: set[asyncio.Task[None]] = set()
+        canceled = False
+
+        async def _submit(request_id: str) -> None:
+            try:
+                future = pool.submit(_reindex_run_in_worker, request_id, options.dry_run)
+                result = await asyncio.wrap_future(future)
+            except (OSError, RuntimeError, ValueError) as exc:
+                # BrokenProcessPool is a RuntimeError.
+                result = _run_result(request_id, success=False, reason=f"WORKER_FAILED:{type(exc).__name__}")
+                result["error"] = str(exc)
+            try:
+                await _record(result)
+            finally:
+                slots.release()
+
+        try:
+            for request_id in pending:
+                await slots.acquire()
+                if self._is_cancel_requested(job_id):
+                    slots.release()
+                    canceled = True
+                    break
+                await limiter.wait()
+                task = asyncio.create_task(_submit(request_id))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+        return canceled
+
+    async def _run_inline(self, request_id: str, *, dry_run: bool) -> dict[str, Any]:
+        try:
+            return await reindex_single_run(request_id, dry_run=dry_run)
+        except (OSError, RuntimeError, ValueError) as exc:
+            result = _run_result(request_id, success=False, reason=f"REINDEX_FAILED:{type(exc).__name__}")
+            result["error"] = str(exc)
+            return result
+
+    def _is_cancel_requested(self, job_id: str) -> bool:
+        with self._state_lock:
+            return job_id in self._cancel_requested
+
+    def _checkpoint(self, job_dir: Path, state: dict[str, Any]) -> None:
+        state["updated_at"] = _utc_now_iso()
+        _atomic_write_json(job_dir / JOB_FILE_NAME, state)
+
+
+def _empty_counters() -> dict[str, int]:
+    return {"done": 0, "succeeded": 0, "failed": 0, "skipped": 0, "changed": 0}
+
+
+def _apply_result(state: dict[str, Any], result: dict[str, Any]) -> None:
+    state["done"] = int(state.get("done") or 0) + 1
+    if result.get("skipped"):
+        key = "skipped"
+    elif result.get("success"):
+        key = "succeeded"
+    else:
+        key = "failed"
+    state[key] = int(state.get(key) or 0) + 1
+    if result.get("changed"):
+        state["changed"] = int(state.get("changed") or 0) + 1
+
+
+def _counters_from_rows(rows: Any) -> dict[str, int]:
+    counters: dict[str, Any] = _empty_counters()
+    for row in rows:
+        _apply_result(counters, row)
+    return counters
+
+
+def _atomic_write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    temp_path.replace(path)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+run_protocol_reindex_service = RunProtocolReindexService()
@@ -4,7 +4,7 @@ import asyncio
 import contextlib
 import logging
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Collection, Mapping
 
 from server.models import InteractiveErrorCode, RunStatus
 from server.runtime.logging.structured_trace import log_event
@@ -14,6 +14,9 @@ from server.services.orchestration.run_state_service import run_state_service
 from server.services.orchestration.workspace_manager import workspace_manager
 from server.services.platform.process_supervisor import process_supervisor
 
+if TYPE_CHECKING:
+    from server.services.engine_management.engine_adapter_registry import EngineAdapterRegistry
+
 logger = logging.getLogger(__name__)
 
 
@@ -194,6 +197,7 @@ class RunRecoveryService:
         trust_manager_backend: Any,
         recover_single: Callable[[dict[str, Any]], Awaitable[None]],
         cleanup_orphan_bindings: Callable[[list[dict[str, Any]]], Awaitable[None]],
+        skip_run_ids: Collection[str] = (),
     ) -> None:
         records = await run_store_backend.list_incomplete_runs()
         if not records:
@@ -201,6 +205,9 @@ class RunRecoveryService:
             return
 
         for record in records:
+            # Runs executing on a live peer worker are not interrupted.
+            if isinstance(record, dict) and str(record.get("run_id") or "") in skip_run_ids:
+                continue
             await recover_single(record)
 
         await cleanup_orphan_bindings(records)
@@ -308,6 +315,14 @@ class RunRecoveryService:
             )
             if redriven:
                 return
+            if record.get("dispatch_queue_state") in {"queued", "claimed"}:
+                # Still in the durable dispatch queue; the dispatcher picks it up after startup.
+                await run_store_backend.set_recovery_info(
+                    run_id,
+                    recovery_state="recovered_waiting",
+                    recovery_reason="dispatch_queue_preserved",
+                )
+                return
         if run_status in {RunStatus.QUEUED, RunStatus.RUNNING}:
             await mark_restart_reconciled_failed(
                 request_id=request_id,
@@ -328,7 +343,7 @@ class RunRecoveryService:
         run_store_backend: Any,
         workspace_backend: Any,
         update_status: Callable[..., None],
-        adapters: dict[str, Any],
+        adapters: EngineAdapterRegistry | Mapping[str, Any],
     ) -> None:
         message = f"{error_code}: {reason}"
         request_record = await run_store_backend.get_request(request_id)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from server.config import config
+from server.models import RunStatus
+from server.runtime.logging.structured_trace import log_event
+from server.services.orchestration.run_store import run_store
+from server.services.orchestration.workspace_manager import workspace_manager
+from server.services.platform.runtime_env_options import runtime_env_secret_service
+
+logger = logging.getLogger(__name__)
+
+_ACTIVE_RUN_STATUSES = {
+    RunStatus.QUEUED.value,
+    RunStatus.RUNNING.value,
+    RunStatus.WAITING_USER.value,
+    RunStatus.WAITING_AUTH.value,
+}
+
+
+def directory_size_bytes(root: Path) -> int:
+    """Apparent size of regular files under `root`; symlinks are not followed."""
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            try:
+                stat = os.lstat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            total += int(stat.st_size)
+    return total
+
+
+@dataclass(frozen=True)
+class RunResultCachePolicy:
+    max_bytes: int = 0
+    ttl_hours: float = 0.0
+
+    @classmethod
+    def from_config(cls) -> "RunResultCachePolicy":
+        return cls(
+            max_bytes=max(0, int(config.SYSTEM.RESULT_CACHE_MAX_BYTES)),
+            ttl_hours=max(0.0, float(config.SYSTEM.RESULT_CACHE_TTL_HOURS)),
+        )
+
+
+class RunResultCacheService:
+    """
+    Lifecycle of result cache entries (`cache_entries` / `temp_cache_entries`).
+
+    Entries carry `last_hit_at`, `hit_count` and the byte size of the run
+    directory they point at. `enforce_limits` drops entries idle for longer
+    than the TTL, then evicts least recently hit entries until the total is
+    under `max_bytes`; the referenced run is reclaimed (records and directory)
+    once no other cache entry points at it and it is not active. Hit, miss
+    and stale counters are process-local and reset on restart.
+    """
+
+    def __init__(
+        self,
+        *,
+        run_store_backend: Any | None = None,
+        policy: RunResultCachePolicy | None = None,
+    ) -> None:
+        self._run_store_backend = run_store_backend
+        self._policy = policy
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._last_eviction_at: str | None = None
+        self._eviction_lock = asyncio.Lock()
+
+    def _store(self, run_store_backend: Any | None = None) -> Any:
+        return run_store_backend or self._run_store_backend or run_store
+
+    def policy(self) -> RunResultCachePolicy:
+        return self._policy or RunResultCachePolicy.from_config()
+
+    async def lookup(
+        self,
+        cache_key: str,
+        skill_source: str,
+        *,
+        run_store_backend: Any | None = None,
+    ) -> str | None:
+        cached_run_id = await self._store(run_store_backend).get_cached_run_for_source(cache_key, skill_source)
+        if not cached_run_id:
+            self._misses += 1
+        return cached_run_id
+
+    async def record_hit(self, cache_key: str, *, run_store_backend: Any | None = None) -> None:
+        self._hits += 1
+        await self._store(run_store_backend).touch_cache_entry(cache_key)
+
+    async def record_stale(self, cache_key: str, *, run_store_backend: Any | None = None) -> None:
+        """Count a lookup whose cached run is unusable and drop the dead entry."""
+        self._stale += 1
+        await self._store(run_store_backend).delete_cache_entry(cache_key)
+
+    async def record_entry(
+        self,
+        *,
+        cache_key: str,
+        run_id: str,
+        run_dir: Path | None,
+        run_store_backend: Any | None = None,
+    ) -> int:
+        size_bytes = 0
+        if run_dir is not None and run_dir.exists():
+            size_bytes = await asyncio.to_thread(directory_size_bytes, run_dir)
+        await self._store(run_store_backend).record_cache_entry(cache_key, run_id, size_bytes=size_bytes)
+        return size_bytes
+
+    async def fresh_run_ids(self, *, run_store_backend: Any | None = None) -> set[str]:
+        """Run ids whose cache entry was used within the TTL; retention cleanup leaves these to the LRU."""
+        ttl_hours = self.policy().ttl_hours
+        if ttl_hours <= 0:
+            return set()
+        cutoff = (datetime.utcnow() - timedelta(hours=ttl_hours)).isoformat()
+        entries = await self._store(run_store_backend).list_cache_entries_lru()
+        return {
+            str(entry["run_id"])
+            for entry in entries
+            if str(entry.get("last_used_at") or "") > cutoff
+        }
+
+    async def enforce_limits(self, *, run_store_backend: Any | None = None) -> dict[str, int]:
+        async with self._eviction_lock:
+            return await self._enforce_limits(self._store(run_store_backend))
+
+    async def _enforce_limits(self, store: Any) -> dict[str, int]:
+        policy = self.policy()
+        entries = await store.list_cache_entries_lru()
+        total_bytes = sum(int(entry.get("size_bytes") or 0) for entry in entries)
+        cutoff = (
+            (datetime.utcnow() - timedelta(hours=policy.ttl_hours)).isoformat()
+            if policy.ttl_hours > 0
+            else None
+        )
+        evicted: list[dict[str, Any]] = []
+        evicted_keys: set[tuple[str, str]] = set()
+        for entry in entries:
+            expired = cutoff is not None and str(entry.get("last_used_at") or "") <= cutoff
+            over_budget = policy.max_bytes > 0 and total_bytes > policy.max_bytes
+            if not expired and not over_budget:
+                continue
+            await store.delete_cache_entry(str(entry["cache_key"]), cache_table=str(entry["cache_table"]))
+            total_bytes -= int(entry.get("size_bytes") or 0)
+            evicted.append(entry)
+            evicted_keys.add((str(entry["cache_table"]), str(entry["cache_key"])))
+        remaining_run_ids = {
+            str(entry["run_id"])
+            for entry in entries
+            if (str(entry["cache_table"]), str(entry["cache_key"])) not in evicted_keys
+        }
+        reclaimed_runs = 0
+        evicted_bytes = 0
+        for entry in evicted:
+            evicted_bytes += int(entry.get("size_bytes") or 0)
+            run_id = str(entry["run_id"])
+            if run_id in remaining_run_ids:
+                continue
+            remaining_run_ids.add(run_id)
+            if await self._reclaim_run(store, run_id):
+                reclaimed_runs += 1
+        if evicted:
+            self._evictions += len(evicted)
+            self._evicted_bytes += evicted_bytes
+            self._last_eviction_at = datetime.utcnow().isoformat()
+            log_event(
+                logger,
+                event="cache.result.evicted",
+                phase="cache_eviction",
+                outcome="ok",
+                entries=len(evicted),
+                runs=reclaimed_runs,
+                bytes=evicted_bytes,
+            )
+        return {"entries": len(evicted), "runs": reclaimed_runs, "bytes": evicted_bytes}
+
+    async def _reclaim_run(self, store: Any, run_id: str) -> bool:
+        try:
+            run = await store.get_run(run_id)
+        except (OSError, RuntimeError, sqlite3.Error):
+            logger.warning("Result cache eviction could not load run: run_id=%s", run_id, exc_info=True)
+            return False
+        if not isinstance(run, dict) or str(run.get("status") or "") in _ACTIVE_RUN_STATUSES:
+            return False
+        workspace_dir = run.get("workspace_dir")
+        shared = False
+        if isinstance(workspace_dir, str) and workspace_dir.strip():
+            # Reused workspaces are shared by several runs; only the records go.
+            shared = await store.count_runs_sharing_workspace_dir(workspace_dir, exclude_run_id=run_id) > 0
+        request_ids = await store.delete_run_records(run_id)
+        runtime_env_secret_service.delete_many(request_ids)
+        if isinstance(workspace_dir, str) and workspace_dir.strip() and not shared:
+            workspace_manager.delete_workspace_dir(Path(workspace_dir))
+        return True
+
+    async def state(self, *, run_store_backend: Any | None = None) -> dict[str, Any]:
+        policy = self.policy()
+        usage = await self._store(run_store_backend).get_cache_usage()
+        lookups = self._hits + self._misses + self._stale
+        return {
+            "entries": int(usage.get("entries") or 0),
+            "total_bytes": int(usage.get("total_bytes") or 0),
+            "max_bytes": policy.max_bytes,
+            "ttl_hours": policy.ttl_hours,
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale": self._stale,
+            "hit_ratio": (self._hits / lookups) if lookups else None,
+            "evictions": self._evictions,
+            "evicted_bytes": self._evicted_bytes,
+            "last_eviction_at": self._last_eviction_at,
+        }
+
+
+run_result_cache_service = RunResultCacheService()
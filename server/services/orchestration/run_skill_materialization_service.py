@@ -19,6 +19,7 @@ from server.runtime.adapter.common.prompt_builder_common import (
 from server.services.engine_management.engine_policy import apply_engine_policy_to_manifest
 from server.services.orchestration.manifest_artifact_inference import infer_manifest_artifacts
 from server.services.orchestration.run_output_schema_service import run_output_schema_service
+from server.services.platform.upload_spooling import ZipExtractionBudget
 from server.services.skill.skill_package_validator import SkillPackageValidator
 from server.services.skill.skill_patcher import skill_patcher
 from server.runtime.adapter.common.structured_output_pipeline import structured_output_pipeline
@@ -75,7 +76,8 @@ class RunFolderBootstrapper:
     def materialize_temp_skill_package(
         self,
         *,
-        package_bytes: bytes,
+        package_bytes: bytes | None = None,
+        package_path: Path | None = None,
         run_dir: Path,
         engine_name: str,
         execution_mode: str,
@@ -85,7 +87,14 @@ class RunFolderBootstrapper:
         audit_dir: Path | None = None,
         input_manifest_path: Path | None = None,
     ) -> tuple[SkillManifest, RunLocalSkillRef]:
-        top_level = self._validator.inspect_zip_top_level_from_bytes(package_bytes)
+        if package_path is not None:
+            top_level = self._validator.inspect_zip_top_level_from_path(package_path)
+            package_source: Path | io.BytesIO = package_path
+        elif package_bytes is not None:
+            top_level = self._validator.inspect_zip_top_level_from_bytes(package_bytes)
+            package_source = io.BytesIO(package_bytes)
+        else:
+            raise ValueError("Skill package is required")
         snapshot_dir = self.snapshot_dir(
             run_dir=run_dir,
             engine_name=engine_name,
@@ -96,10 +105,11 @@ class RunFolderBootstrapper:
         snapshot_dir.mkdir(parents=True, exist_ok=True)
         materialized = False
         try:
-            with zipfile.ZipFile(io.BytesIO(package_bytes), "r") as zf:
+            budget = ZipExtractionBudget()
+            with zipfile.ZipFile(package_source, "r") as zf:
                 snapshot_root = snapshot_dir.resolve()
                 prefix = f"{top_level}/"
-                for member in zf.infolist():
+                for member in budget.check_archive(zf):
                     clean = member.filename.strip("/")
                     if not clean or clean.startswith("__MACOSX/"):
                         continue
@@ -117,9 +127,7 @@ class RunFolderBootstrapper:
                     if member.is_dir():
                         out_path.mkdir(parents=True, exist_ok=True)
                         continue
-                    out_path.parent.mkdir(parents=True, exist_ok=True)
-                    with zf.open(member, "r") as src, open(out_path, "wb") as dst:
-                        shutil.copyfileobj(src, dst)
+                    budget.copy_member(zf, member, out_path)
             self._validator.validate_skill_dir(
                 snapshot_dir,
                 top_level,
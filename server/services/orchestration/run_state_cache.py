@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+RUN_STATE_CACHE_DEFAULT_MAX_ENTRIES = 4096
+
+
+class RunStateCache:
+    """Bounded, process-local cache of `request_run_state` payloads.
+
+    `RunStore` writes through it whenever run state is set or cleared, so
+    readers hit memory and SQLite is only touched on a cold miss. Every
+    change bumps a per-request version and wakes `wait_for_change` callers.
+    Change listeners (multi-worker relay) hear about local writes so peer
+    processes can evict their copy; `evict(..., propagate=False)` applies
+    such a remote change without echoing it back. In multi-worker mode the
+    store reads through to SQLite and `refresh` keeps versions in step with
+    what it read, so a lost relay frame cannot leave a stale entry behind.
+    Database reads take a `change_token()` first; `prime` and `refresh` drop
+    what they read if the request was written, evicted or cleared since.
+    """
+
+    def __init__(self, *, max_entries: int = RUN_STATE_CACHE_DEFAULT_MAX_ENTRIES) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[str, tuple[Dict[str, Any], int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._seq = 0
+        # request_id -> seq of its last put/evict; older records fold into the floor.
+        self._changed_at: OrderedDict[str, int] = OrderedDict()
+        self._changed_floor = 0
+        # request_id -> [event, waiter count]; a notify pops and sets the event.
+        self._waiters: dict[str, list[Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._listeners: list[Callable[[str], None]] = []
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(request_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(request_id)
+            self._hits += 1
+            payload = entry[0]
+        return copy.deepcopy(payload)
+
+    def put(self, request_id: str, payload: Dict[str, Any]) -> int:
+        """Store a freshly written payload and signal waiters."""
+        version = self._store(request_id, payload)
+        self._notify(request_id)
+        self._emit(request_id)
+        return version
+
+    def change_token(self) -> int:
+        """Token to take before a database read that will be passed to `prime`/`refresh`."""
+        with self._lock:
+            return self._seq
+
+    def prime(self, request_id: str, payload: Dict[str, Any], *, since: int) -> None:
+        """Fill a cold miss from the database without signalling a change."""
+        with self._lock:
+            if request_id in self._entries or self._changed_since_locked(request_id, since):
+                return
+            self._store_locked(request_id, payload)
+
+    def refresh(self, request_id: str, payload: Optional[Dict[str, Any]], *, since: int) -> None:
+        """Reconcile with a payload just read from the database; a difference counts as a change."""
+        with self._lock:
+            if self._changed_since_locked(request_id, since):
+                # A local write or eviction after the read is newer than the read.
+                return
+            entry = self._entries.get(request_id)
+            unchanged = entry[0] == payload if entry is not None else payload is None
+        if unchanged:
+            return
+        if payload is None:
+            self.evict(request_id, propagate=False)
+            return
+        self._store(request_id, payload)
+        self._notify(request_id)
+
+    def evict(self, request_id: str, *, propagate: bool = True) -> None:
+        with self._lock:
+            self._entries.pop(request_id, None)
+            self._seq += 1
+            self._mark_changed_locked(request_id)
+        self._notify(request_id)
+        if propagate:
+            self._emit(request_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._seq += 1
+            self._changed_at.clear()
+            self._changed_floor = self._seq
+        waiting = list(self._waiters)
+        for request_id in waiting:
+            self._notify(request_id)
+
+    def version(self, request_id: str) -> int:
+        """Version of the cached entry; 0 when the request is not cached."""
+        with self._lock:
+            entry = self._entries.get(request_id)
+        return entry[1] if entry is not None else 0
+
+    async def wait_for_change(self, request_id: str, *, since: int, timeout: float) -> int:
+        """Wait until the request's version differs from `since` or `timeout` elapses."""
+        current = self.version(request_id)
+        if current != since or timeout <= 0:
+            return current
+        waiter = self._waiters.get(request_id)
+        if waiter is None:
+            waiter = [asyncio.Event(), 0]
+            self._waiters[request_id] = waiter
+        waiter[1] += 1
+        try:
+            await asyncio.wait_for(waiter[0].wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiter[1] -= 1
+            if waiter[1] <= 0 and self._waiters.get(request_id) is waiter:
+                self._waiters.pop(request_id, None)
+        return self.version(request_id)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "waiting_requests": len(self._waiters),
+            }
+
+    def _store(self, request_id: str, payload: Dict[str, Any]) -> int:
+        with self._lock:
+            return self._store_locked(request_id, payload)
+
+    def _store_locked(self, request_id: str, payload: Dict[str, Any]) -> int:
+        self._seq += 1
+        self._entries[request_id] = (copy.deepcopy(payload), self._seq)
+        self._entries.move_to_end(request_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        self._mark_changed_locked(request_id)
+        return self._seq
+
+    def _mark_changed_locked(self, request_id: str) -> None:
+        self._changed_at[request_id] = self._seq
+        self._changed_at.move_to_end(request_id)
+        while len(self._changed_at) > self._max_entries:
+            _dropped, dropped_seq = self._changed_at.popitem(last=False)
+            self._changed_floor = max(self._changed_floor, dropped_seq)
+
+    def _changed_since_locked(self, request_id: str, since: int) -> bool:
+        return self._changed_at.get(request_id, self._changed_floor) > since
+
+    def _emit(self, request_id: str) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(request_id)
+
+    def _notify(self, request_id: str) -> None:
+        waiter = self._waiters.pop(request_id, None)
+        if waiter is not None:
+            waiter[0].set()
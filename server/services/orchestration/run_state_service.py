@@ -447,8 +447,68 @@ class RunStateService:
         projection_payload = self._state_to_projection(state_payload)
         validate_current_run_projection(projection_payload)
         await self._set_current_projection(run_store_backend, request_id, projection_payload)
+        await self._mirror_to_followers(
+            run_store_backend,
+            request_id=request_id,
+            run_id=run_id,
+            state_payload=state_payload,
+        )
+        return state_payload
+
+    async def write_follower_state(
+        self,
+        *,
+        request_id: str,
+        source_state: Dict[str, Any],
+        status: RunStatus | None = None,
+        error: Any = None,
+        run_store_backend: Any = run_store,
+    ) -> Dict[str, Any]:
+        """Copy the shared run state onto a coalesced follower request without touching the run row."""
+        payload = dict(source_state)
+        payload["request_id"] = request_id
+        payload["pending"] = self._build_pending_state(
+            pending_owner=None,
+            pending_interaction=None,
+            pending_auth=None,
+            pending_auth_method_selection=None,
+        ).model_dump(mode="json")
+        if status is not None:
+            payload["status"] = status.value
+            payload["error"] = error
+            payload["updated_at"] = datetime.utcnow().isoformat()
+        state_payload = RunStateEnvelope.model_validate(payload).model_dump(mode="json")
+        validate_run_state_envelope(state_payload)
+        await self._set_run_state(run_store_backend, request_id, state_payload)
+        projection_payload = self._state_to_projection(state_payload)
+        validate_current_run_projection(projection_payload)
+        await self._set_current_projection(run_store_backend, request_id, projection_payload)
         return state_payload
 
+    async def _mirror_to_followers(
+        self,
+        run_store_backend: Any,
+        *,
+        request_id: str,
+        run_id: str,
+        state_payload: Dict[str, Any],
+    ) -> None:
+        lister = self._backend_method(run_store_backend, "list_request_followers")
+        if lister is None:
+            return
+        followers = await maybe_await(lister(run_id))
+        if not isinstance(followers, list):
+            return
+        for follower in followers:
+            follower_request_id = follower.get("request_id") if isinstance(follower, dict) else None
+            if not isinstance(follower_request_id, str) or follower_request_id == request_id:
+                continue
+            await self.write_follower_state(
+                request_id=follower_request_id,
+                source_state=state_payload,
+                run_store_backend=run_store_backend,
+            )
+
     async def write_terminal_projection(
         self,
         *,
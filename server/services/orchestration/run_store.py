@@ -2,7 +2,7 @@ import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from pydantic import ValidationError
 
@@ -34,9 +34,12 @@ from server.services.orchestration.run_store_database import (
     SCHEMA_STATE,
     RunStoreDatabase,
 )
+from server.services.orchestration.run_store_dispatch_queue_store import RunDispatchQueueStore
 from server.services.orchestration.run_store_interaction_store import RunInteractionStore, RunInteractiveRuntimeStore
-from server.services.orchestration.run_store_request_store import RunRegistryStore, RunRequestStore
+from server.services.orchestration.run_store_request_store import RunListFilters, RunRegistryStore, RunRequestStore
 from server.services.orchestration.run_store_state_store import RunProjectionStateStore, RunRecoveryStateStore
+from server.services.orchestration.run_store_worker_store import RunWorkerStore
+from server.services.orchestration.run_state_cache import RunStateCache
 
 
 class RunStore:
@@ -83,6 +86,12 @@ class RunStore:
         self._run_registry = RunRegistryStore(self._database)
         self._cache_store = RunCacheStore(self._cache_database)
         self._projection_state_store = RunProjectionStateStore(self._state_database)
+        self._run_state_cache = RunStateCache(
+            max_entries=int(getattr(config.SYSTEM, "RUN_STATE_CACHE_MAX_ENTRIES", 4096)),
+        )
+        self._run_state_read_through = False
+        self._dispatch_queue_store = RunDispatchQueueStore(self._state_database)
+        self._worker_store = RunWorkerStore(self._state_database)
         self._recovery_state_store = RunRecoveryStateStore(
             self._database,
             state_database=self._state_database,
@@ -242,6 +251,31 @@ class RunStore:
     async def list_requests_with_runs_page(self, page: int = 1, page_size: int = 20) -> List[Dict[str, Any]]:
         return await self._request_store.list_requests_with_runs_page(page=page, page_size=page_size)
 
+    async def list_requests_with_runs_keyset(
+        self,
+        *,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[RunListFilters] = None,
+    ) -> Dict[str, Any]:
+        return await self._request_store.list_requests_with_runs_keyset(limit=limit, cursor=cursor, filters=filters)
+
+    async def count_requests_with_runs_filtered(self, filters: RunListFilters) -> int:
+        return await self._request_store.count_requests_with_runs_filtered(filters)
+
+    async def update_run_search_text(
+        self,
+        request_id: str,
+        *,
+        error_summary: Optional[str] = None,
+        final_message: Optional[str] = None,
+    ) -> None:
+        await self._request_store.update_run_search_text(
+            request_id,
+            error_summary=error_summary,
+            final_message=final_message,
+        )
+
     async def create_run(
         self,
         run_id: str,
@@ -290,17 +324,92 @@ class RunStore:
             workspace_output_token=workspace_output_token,
         )
 
+    async def find_inflight_run_for_cache_key(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        return await self._run_registry.find_inflight_run_for_cache_key(cache_key)
+
+    async def count_runs_sharing_workspace_dir(self, workspace_dir: str, *, exclude_run_id: str) -> int:
+        return await self._run_registry.count_runs_sharing_workspace_dir(
+            workspace_dir,
+            exclude_run_id=exclude_run_id,
+        )
+
+    async def add_request_follower(self, request_id: str, run_id: str, leader_request_id: str) -> None:
+        await self._run_registry.add_request_follower(request_id, run_id, leader_request_id)
+
+    async def get_request_follower(self, request_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run_registry.get_request_follower(request_id)
+
+    async def list_request_followers(self, run_id: str) -> List[Dict[str, Any]]:
+        return await self._run_registry.list_request_followers(run_id)
+
+    async def detach_request_follower(self, request_id: str) -> bool:
+        return await self._run_registry.detach_request_follower(request_id)
+
     async def set_current_projection(self, request_id: str, projection: Dict[str, Any]) -> None:
         await self._projection_state_store.set_current_projection(request_id, projection)
 
     async def set_run_state(self, request_id: str, state: Dict[str, Any]) -> None:
         await self._projection_state_store.set_run_state(request_id, state)
+        # Cache the normalized payload so readers see exactly what a DB read would return.
+        self._run_state_cache.put(request_id, RunStateEnvelope.model_validate(state).model_dump(mode="json"))
 
     async def get_run_state(self, request_id: str) -> Optional[Dict[str, Any]]:
-        return await self._projection_state_store.get_run_state(request_id)
+        if self._run_state_read_through:
+            # Peers may have written it; the relay that evicts cached copies is best effort.
+            since = self._run_state_cache.change_token()
+            payload = await self._projection_state_store.get_run_state(request_id)
+            self._run_state_cache.refresh(request_id, payload, since=since)
+            return payload
+        cached = self._run_state_cache.get(request_id)
+        if cached is not None:
+            return cached
+        since = self._run_state_cache.change_token()
+        payload = await self._projection_state_store.get_run_state(request_id)
+        if payload is not None:
+            self._run_state_cache.prime(request_id, payload, since=since)
+        return payload
 
     async def clear_run_state(self, request_id: str) -> None:
         await self._projection_state_store.clear_run_state(request_id)
+        self._run_state_cache.evict(request_id)
+
+    async def run_state_version(self, request_id: str) -> int:
+        return self._run_state_cache.version(request_id)
+
+    async def wait_for_run_state_change(self, request_id: str, *, since: int, timeout: float) -> int:
+        """Block until `request_id`'s run state is written or cleared, or `timeout` elapses."""
+        return await self._run_state_cache.wait_for_change(request_id, since=since, timeout=timeout)
+
+    async def warm_run_state_cache(self) -> int:
+        """Load active runs' state into the cache (startup, after recovery)."""
+        since = self._run_state_cache.change_token()
+        states = await self._projection_state_store.list_active_run_states(
+            int(getattr(config.SYSTEM, "RUN_STATE_CACHE_MAX_ENTRIES", 4096))
+        )
+        for request_id, payload in states.items():
+            self._run_state_cache.prime(request_id, payload, since=since)
+        return len(states)
+
+    async def set_run_state_read_through(self, enabled: bool) -> None:
+        """Serve run state reads from SQLite (multi-worker mode); the cache then only versions changes."""
+        self._run_state_read_through = bool(enabled)
+
+    async def invalidate_run_state_cache(self) -> None:
+        self._run_state_cache.clear()
+
+    async def run_state_cache_stats(self) -> Dict[str, int]:
+        return self._run_state_cache.stats()
+
+    async def add_run_state_change_listener(self, listener: Callable[[str], None]) -> None:
+        """Call `listener(request_id)` after every run state write or clear made by this process."""
+        self._run_state_cache.add_listener(listener)
+
+    async def remove_run_state_change_listener(self, listener: Callable[[str], None]) -> None:
+        self._run_state_cache.remove_listener(listener)
+
+    async def apply_remote_run_state_change(self, request_id: str) -> None:
+        """Another worker changed `request_id`'s state: drop the cached copy and wake waiters."""
+        self._run_state_cache.evict(request_id, propagate=False)
 
     async def set_dispatch_state(self, request_id: str, state: Dict[str, Any]) -> None:
         await self._projection_state_store.set_dispatch_state(request_id, state)
@@ -311,17 +420,140 @@ class RunStore:
     async def clear_dispatch_state(self, request_id: str) -> None:
         await self._projection_state_store.clear_dispatch_state(request_id)
 
+    async def enqueue_dispatch(
+        self,
+        *,
+        run_id: str,
+        request_id: Optional[str],
+        skill_id: str,
+        engine: str,
+        options: Dict[str, Any],
+        cache_key: Optional[str] = None,
+        priority: Optional[str] = None,
+        client_key: Optional[str] = None,
+        provider_id: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        await self._dispatch_queue_store.enqueue(
+            run_id=run_id,
+            request_id=request_id,
+            skill_id=skill_id,
+            engine=engine,
+            options=options,
+            cache_key=cache_key,
+            priority=priority,
+            client_key=client_key,
+            provider_id=provider_id,
+            model=model,
+        )
+
+    async def claim_next_dispatch(
+        self,
+        worker_id: str,
+        *,
+        blocked_pools: Iterable[str] = (),
+        max_claimed: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        return await self._dispatch_queue_store.claim_next(
+            worker_id,
+            blocked_pools=blocked_pools,
+            max_claimed=max_claimed,
+        )
+
+    async def release_dispatch_claim(self, run_id: str) -> bool:
+        return await self._dispatch_queue_store.release_claim(run_id)
+
+    async def complete_dispatch(self, run_id: str) -> bool:
+        return await self._dispatch_queue_store.complete(run_id)
+
+    async def requeue_claimed_dispatches(self, *, live_since: Optional[str] = None) -> int:
+        return await self._dispatch_queue_store.requeue_claimed(live_since=live_since)
+
+    async def register_worker(
+        self,
+        *,
+        worker_id: str,
+        pid: int,
+        hostname: str,
+        ipc_path: Optional[str],
+        live_since: str,
+    ) -> int:
+        return await self._worker_store.register(
+            worker_id=worker_id,
+            pid=pid,
+            hostname=hostname,
+            ipc_path=ipc_path,
+            live_since=live_since,
+        )
+
+    async def heartbeat_worker(self, worker_id: str) -> bool:
+        return await self._worker_store.heartbeat(worker_id)
+
+    async def deregister_worker(self, worker_id: str) -> None:
+        await self._worker_store.deregister(worker_id)
+
+    async def expire_workers(self, *, live_since: str) -> List[str]:
+        return await self._worker_store.expire(live_since=live_since)
+
+    async def list_stale_workers(self, *, live_since: str) -> List[Dict[str, Any]]:
+        return await self._worker_store.list_stale(live_since=live_since)
+
+    async def list_live_workers(self, *, live_since: str) -> List[Dict[str, Any]]:
+        return await self._worker_store.list_live(live_since=live_since)
+
+    async def acquire_run_worker_lease(self, run_id: str, worker_id: str) -> None:
+        await self._worker_store.acquire_run_lease(run_id, worker_id)
+
+    async def release_run_worker_lease(self, run_id: str, worker_id: str) -> bool:
+        return await self._worker_store.release_run_lease(run_id, worker_id)
+
+    async def get_run_worker_lease(self, run_id: str, *, live_since: str) -> Optional[Dict[str, Any]]:
+        return await self._worker_store.get_run_lease(run_id, live_since=live_since)
+
+    async def list_live_run_worker_leases(self, *, live_since: str) -> List[Dict[str, Any]]:
+        return await self._worker_store.list_live_run_leases(live_since=live_since)
+
+    async def take_orphaned_run_worker_leases(self, *, live_since: str) -> List[str]:
+        return await self._worker_store.take_orphaned_run_leases(live_since=live_since)
+
+    async def count_queued_dispatches(self) -> int:
+        return await self._dispatch_queue_store.count()
+
+    async def count_queued_dispatches_by_pool(self) -> Dict[str, int]:
+        return await self._dispatch_queue_store.count_by_pool()
+
+    async def get_dispatch_queue_entry(self, run_id: str) -> Optional[Dict[str, Any]]:
+        return await self._dispatch_queue_store.get(run_id)
+
+    async def list_dispatch_queue(self, limit: int = 200) -> List[Dict[str, Any]]:
+        return await self._dispatch_queue_store.list_entries(limit=limit)
+
     async def get_current_projection(self, request_id: str) -> Optional[Dict[str, Any]]:
-        return await self._projection_state_store.get_current_projection(request_id)
+        return await self._projection_state_store.get_current_projection_for_state(
+            request_id,
+            await self.get_run_state(request_id),
+        )
 
     async def clear_current_projection(self, request_id: str) -> None:
         await self._projection_state_store.clear_current_projection(request_id)
 
-    async def record_cache_entry(self, cache_key: str, run_id: str) -> None:
-        await self._cache_store.record_cache_entry(cache_key, run_id)
+    async def record_cache_entry(self, cache_key: str, run_id: str, *, size_bytes: int = 0) -> None:
+        await self._cache_store.record_cache_entry(cache_key, run_id, size_bytes=size_bytes)
+
+    async def record_temp_cache_entry(self, cache_key: str, run_id: str, *, size_bytes: int = 0) -> None:
+        await self._cache_store.record_temp_cache_entry(cache_key, run_id, size_bytes=size_bytes)
+
+    async def touch_cache_entry(self, cache_key: str) -> None:
+        await self._cache_store.touch_cache_entry(cache_key)
+
+    async def delete_cache_entry(self, cache_key: str, *, cache_table: str = "cache_entries") -> None:
+        await self._cache_store.delete_cache_entry(cache_key, cache_table=cache_table)
+
+    async def list_cache_entries_lru(self) -> List[Dict[str, Any]]:
+        return await self._cache_store.list_cache_entries_lru()
 
-    async def record_temp_cache_entry(self, cache_key: str, run_id: str) -> None:
-        await self._cache_store.record_temp_cache_entry(cache_key, run_id)
+    async def get_cache_usage(self) -> Dict[str, int]:
+        return await self._cache_store.get_cache_usage()
 
     async def _record_cache_entry(self, table: str, cache_key: str, run_id: str) -> None:
         await self._cache_store._record_cache_entry(table, cache_key, run_id)
@@ -391,13 +623,19 @@ class RunStore:
         return await self._recovery_state_store.list_runs_for_cleanup(retention_days)
 
     async def delete_run_records(self, run_id: str) -> List[str]:
-        return await self._recovery_state_store.delete_run_records(run_id)
+        request_ids = await self._recovery_state_store.delete_run_records(run_id)
+        for request_id in request_ids:
+            self._run_state_cache.evict(request_id)
+        return request_ids
 
     async def list_request_ids(self) -> List[str]:
         return await self._request_store.list_request_ids()
 
     async def clear_all(self) -> Dict[str, int]:
-        return await self._recovery_state_store.clear_all()
+        try:
+            return await self._recovery_state_store.clear_all()
+        finally:
+            self._run_state_cache.clear()
 
     async def list_active_run_ids(self) -> List[str]:
         return await self._recovery_state_store.list_active_run_ids()
@@ -6,16 +6,28 @@ from server.services.platform import aiosqlite_compat as aiosqlite
 
 from .run_store_database import RunStoreDatabase
 
+_CACHE_TABLES = ("cache_entries", "temp_cache_entries")
+
 
 class RunCacheStore:
     def __init__(self, database: RunStoreDatabase) -> None:
         self._database = database
 
-    async def record_cache_entry(self, cache_key: str, run_id: str) -> None:
-        await self._record_cache_entry(table="cache_entries", cache_key=cache_key, run_id=run_id)
+    async def record_cache_entry(self, cache_key: str, run_id: str, *, size_bytes: int = 0) -> None:
+        await self._record_cache_entry(
+            table="cache_entries",
+            cache_key=cache_key,
+            run_id=run_id,
+            size_bytes=size_bytes,
+        )
 
-    async def record_temp_cache_entry(self, cache_key: str, run_id: str) -> None:
-        await self._record_cache_entry(table="temp_cache_entries", cache_key=cache_key, run_id=run_id)
+    async def record_temp_cache_entry(self, cache_key: str, run_id: str, *, size_bytes: int = 0) -> None:
+        await self._record_cache_entry(
+            table="temp_cache_entries",
+            cache_key=cache_key,
+            run_id=run_id,
+            size_bytes=size_bytes,
+        )
 
     async def get_cached_run(self, cache_key: str) -> Optional[str]:
         return await self._get_cached_run(table="cache_entries", cache_key=cache_key)
@@ -27,17 +39,77 @@ class RunCacheStore:
         _ = source
         return await self.get_cached_run(cache_key)
 
-    async def _record_cache_entry(self, table: str, cache_key: str, run_id: str) -> None:
+    async def touch_cache_entry(self, cache_key: str) -> None:
+        """Record a served hit: bump `hit_count` and move the entry to the LRU tail."""
+        await self._database.ensure_initialized()
+        now = datetime.utcnow().isoformat()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            for table in _CACHE_TABLES:
+                await conn.execute(
+                    f"UPDATE {table} SET last_hit_at = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                    (now, cache_key),
+                )
+            await conn.commit()
+
+    async def delete_cache_entry(self, cache_key: str, *, cache_table: str = "cache_entries") -> None:
+        if cache_table not in _CACHE_TABLES:
+            raise ValueError(f"Unknown cache table: {cache_table!r}")
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute(f"DELETE FROM {cache_table} WHERE cache_key = ?", (cache_key,))
+            await conn.commit()
+
+    async def list_cache_entries_lru(self) -> List[Dict[str, Any]]:
+        """All result cache entries, least recently hit (or created) first."""
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT 'cache_entries' AS cache_table, cache_key, run_id, created_at,
+                       COALESCE(last_hit_at, created_at) AS last_used_at, hit_count, size_bytes
+                FROM cache_entries
+                UNION ALL
+                SELECT 'temp_cache_entries' AS cache_table, cache_key, run_id, created_at,
+                       COALESCE(last_hit_at, created_at) AS last_used_at, hit_count, size_bytes
+                FROM temp_cache_entries
+                ORDER BY last_used_at ASC, created_at ASC
+                """
+            )
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def get_cache_usage(self) -> Dict[str, int]:
+        await self._database.ensure_initialized()
+        entries = 0
+        total_bytes = 0
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            for table in _CACHE_TABLES:
+                cursor = await conn.execute(
+                    f"SELECT COUNT(1) AS entries, COALESCE(SUM(size_bytes), 0) AS total_bytes FROM {table}"
+                )
+                row = await cursor.fetchone()
+                if row is not None:
+                    entries += int(row["entries"] or 0)
+                    total_bytes += int(row["total_bytes"] or 0)
+        return {"entries": entries, "total_bytes": total_bytes}
+
+    async def _record_cache_entry(self, table: str, cache_key: str, run_id: str, size_bytes: int = 0) -> None:
         await self._database.ensure_initialized()
         created_at = datetime.utcnow().isoformat()
         async with self._database.connect() as conn:
             conn.row_factory = aiosqlite.Row
             await conn.execute(
                 f"""
-                INSERT OR REPLACE INTO {table} (cache_key, run_id, status, created_at)
-                VALUES (?, ?, ?, ?)
+                INSERT OR REPLACE INTO {table} (
+                    cache_key, run_id, status, created_at, last_hit_at, hit_count, size_bytes
+                )
+                VALUES (?, ?, ?, ?, ?, 0, ?)
                 """,
-                (cache_key, run_id, "succeeded", created_at),
+                (cache_key, run_id, "succeeded", created_at, created_at, max(0, int(size_bytes))),
             )
             await conn.commit()
 
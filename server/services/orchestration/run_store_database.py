@@ -23,6 +23,9 @@ SCHEMA_INTERACTIONS = "interactions"
 SCHEMA_AUTH = "auth"
 SCHEMA_CACHE = "cache"
 
+RUN_SEARCH_DOCUMENTS_TABLE = "run_search_documents"
+RUN_SEARCH_FTS_TABLE = "run_search_fts"
+
 
 class RunStoreSchemaMigration:
     async def migrate_interactive_runtime_table(self, conn: aiosqlite.Connection) -> None:
@@ -111,6 +114,7 @@ class RunStoreDatabase:
         self._init_lock = asyncio.Lock()
         self._initialized = False
         self._schema_migration = schema_migration or RunStoreSchemaMigration()
+        self.run_search_fts_enabled = False
 
     def connect(self):
         return sqlite_db_handle_registry.operation(self.db_path)
@@ -136,6 +140,8 @@ class RunStoreDatabase:
             await self._apply_pragmas(conn)
             tables = await self._create_schema(conn)
             await self._copy_from_legacy_if_empty(conn, tables)
+            if "requests" in tables:
+                await self._backfill_request_models(conn)
             if self.schema in {SCHEMA_ALL, SCHEMA_INTERACTIONS}:
                 await self._schema_migration.migrate_interactive_runtime_table(conn)
             await conn.commit()
@@ -189,6 +195,7 @@ class RunStoreDatabase:
                 temp_skill_manifest_json TEXT,
                 run_id TEXT,
                 status TEXT,
+                model TEXT,
                 created_at TEXT NOT NULL
             )
             """
@@ -197,6 +204,7 @@ class RunStoreDatabase:
             conn,
             "requests",
             {
+                "model": "TEXT",
                 "run_id": "TEXT",
                 "skill_source": "TEXT NOT NULL DEFAULT 'installed'",
                 "input_json": "TEXT NOT NULL DEFAULT '{}'",
@@ -249,18 +257,158 @@ class RunStoreDatabase:
                 "workspace_output_token": "TEXT",
             },
         )
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS request_followers (
+                request_id TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                leader_request_id TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                detached_at TEXT
+            )
+            """
+        )
         await self._create_indexes(
             conn,
             [
                 "CREATE INDEX IF NOT EXISTS idx_requests_run_id ON requests(run_id)",
+                "CREATE INDEX IF NOT EXISTS idx_request_followers_run_id ON request_followers(run_id)",
+                "CREATE INDEX IF NOT EXISTS idx_runs_cache_key_status ON runs(cache_key, status)",
                 "CREATE INDEX IF NOT EXISTS idx_requests_created_at ON requests(created_at)",
                 "CREATE INDEX IF NOT EXISTS idx_requests_status_created_at ON requests(status, created_at)",
                 "CREATE INDEX IF NOT EXISTS idx_runs_status_created_at ON runs(status, created_at)",
                 "CREATE INDEX IF NOT EXISTS idx_runs_workspace_id ON runs(workspace_id)",
                 "CREATE INDEX IF NOT EXISTS idx_runs_workspace_dir ON runs(workspace_dir)",
+                # Keyset run listing: ORDER BY (created_at, request_id) DESC, optionally per filter column.
+                "CREATE INDEX IF NOT EXISTS idx_requests_created_at_request_id ON requests(created_at, request_id)",
+                "CREATE INDEX IF NOT EXISTS idx_requests_engine_created_at ON requests(engine, created_at, request_id)",
+                "CREATE INDEX IF NOT EXISTS idx_requests_skill_created_at ON requests(skill_id, created_at, request_id)",
+                "CREATE INDEX IF NOT EXISTS idx_requests_model_created_at ON requests(model, created_at, request_id)",
             ],
         )
-        return ["requests", "runs"]
+        await self._create_run_search_schema(conn)
+        return ["requests", "runs", "request_followers"]
+
+    async def _backfill_request_models(self, conn: aiosqlite.Connection) -> None:
+        # Requests written before the `model` column existed ('' = no model option).
+        await conn.execute(
+            """
+            UPDATE requests
+            SET model = CASE
+                WHEN json_valid(engine_options_json) THEN COALESCE(
+                    NULLIF(TRIM(json_extract(engine_options_json, '$.model')), ''),
+                    NULLIF(TRIM(json_extract(engine_options_json, '$.model_id')), ''),
+                    ''
+                )
+                ELSE ''
+            END
+            WHERE model IS NULL
+            """
+        )
+
+    async def _create_run_search_schema(self, conn: aiosqlite.Connection) -> None:
+        """
+        Free-text search documents for run listings.
+
+        `run_search_documents` holds one row per request (skill id, terminal
+        error summary, final message preview); triggers on `requests` keep
+        the row set in sync. `run_search_fts` is an FTS5 trigram index over
+        it (external content, synced by triggers) so substring queries,
+        including CJK text, use the index. Without FTS5 the documents table
+        is still maintained and searched with LIKE.
+        """
+        exists_cur = await conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name = ?",
+            (RUN_SEARCH_DOCUMENTS_TABLE,),
+        )
+        documents_existed = await exists_cur.fetchone() is not None
+        await conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {RUN_SEARCH_DOCUMENTS_TABLE} (
+                doc_id INTEGER PRIMARY KEY,
+                request_id TEXT NOT NULL UNIQUE,
+                skill_id TEXT NOT NULL DEFAULT '',
+                error_summary TEXT NOT NULL DEFAULT '',
+                final_message TEXT NOT NULL DEFAULT '',
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        for statement in (
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_requests_search_insert AFTER INSERT ON requests BEGIN
+                INSERT OR IGNORE INTO {RUN_SEARCH_DOCUMENTS_TABLE} (request_id, skill_id, updated_at)
+                VALUES (new.request_id, new.skill_id, new.created_at);
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_requests_search_skill AFTER UPDATE OF skill_id ON requests BEGIN
+                UPDATE {RUN_SEARCH_DOCUMENTS_TABLE} SET skill_id = new.skill_id WHERE request_id = new.request_id;
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_requests_search_delete AFTER DELETE ON requests BEGIN
+                DELETE FROM {RUN_SEARCH_DOCUMENTS_TABLE} WHERE request_id = old.request_id;
+            END
+            """,
+        ):
+            await conn.execute(statement)
+        if not documents_existed:
+            await conn.execute(
+                f"""
+                INSERT OR IGNORE INTO {RUN_SEARCH_DOCUMENTS_TABLE} (request_id, skill_id, updated_at)
+                SELECT request_id, skill_id, created_at FROM requests
+                """
+            )
+        try:
+            fts_cur = await conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name = ?",
+                (RUN_SEARCH_FTS_TABLE,),
+            )
+            fts_existed = await fts_cur.fetchone() is not None
+            await conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {RUN_SEARCH_FTS_TABLE} USING fts5(
+                    skill_id, error_summary, final_message,
+                    content='{RUN_SEARCH_DOCUMENTS_TABLE}', content_rowid='doc_id', tokenize='trigram'
+                )
+                """
+            )
+        except sqlite3.OperationalError:
+            logger.warning(
+                "SQLite FTS5 trigram tokenizer unavailable; run search falls back to LIKE: db=%s",
+                self.db_path,
+                exc_info=True,
+            )
+            self.run_search_fts_enabled = False
+            return
+        fts_columns = "skill_id, error_summary, final_message"
+        for statement in (
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_run_search_documents_ai AFTER INSERT ON {RUN_SEARCH_DOCUMENTS_TABLE} BEGIN
+                INSERT INTO {RUN_SEARCH_FTS_TABLE} (rowid, {fts_columns})
+                VALUES (new.doc_id, new.skill_id, new.error_summary, new.final_message);
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_run_search_documents_ad AFTER DELETE ON {RUN_SEARCH_DOCUMENTS_TABLE} BEGIN
+                INSERT INTO {RUN_SEARCH_FTS_TABLE} ({RUN_SEARCH_FTS_TABLE}, rowid, {fts_columns})
+                VALUES ('delete', old.doc_id, old.skill_id, old.error_summary, old.final_message);
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_run_search_documents_au AFTER UPDATE ON {RUN_SEARCH_DOCUMENTS_TABLE} BEGIN
+                INSERT INTO {RUN_SEARCH_FTS_TABLE} ({RUN_SEARCH_FTS_TABLE}, rowid, {fts_columns})
+                VALUES ('delete', old.doc_id, old.skill_id, old.error_summary, old.final_message);
+                INSERT INTO {RUN_SEARCH_FTS_TABLE} (rowid, {fts_columns})
+                VALUES (new.doc_id, new.skill_id, new.error_summary, new.final_message);
+            END
+            """,
+        ):
+            await conn.execute(statement)
+        if not fts_existed:
+            await conn.execute(f"INSERT INTO {RUN_SEARCH_FTS_TABLE} ({RUN_SEARCH_FTS_TABLE}) VALUES ('rebuild')")
+        self.run_search_fts_enabled = True
 
     async def _create_state_schema(self, conn: aiosqlite.Connection) -> list[str]:
         await conn.execute(
@@ -308,6 +456,56 @@ class RunStoreDatabase:
             )
             """
         )
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_dispatch_queue (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL UNIQUE,
+                request_id TEXT,
+                skill_id TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                client_key TEXT NOT NULL DEFAULT '',
+                cache_key TEXT,
+                options_json TEXT NOT NULL,
+                state TEXT NOT NULL,
+                worker_id TEXT,
+                enqueued_at TEXT NOT NULL,
+                claimed_at TEXT
+            )
+            """
+        )
+        await self._ensure_columns(
+            conn,
+            "run_dispatch_queue",
+            {
+                "provider_id": "TEXT NOT NULL DEFAULT ''",
+                "model": "TEXT NOT NULL DEFAULT ''",
+            },
+        )
+        # Worker registry and run ownership leases are process-liveness data;
+        # they are never copied from a legacy database.
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS server_workers (
+                worker_id TEXT PRIMARY KEY,
+                pid INTEGER NOT NULL,
+                hostname TEXT NOT NULL,
+                ipc_path TEXT,
+                started_at TEXT NOT NULL,
+                heartbeat_at TEXT NOT NULL
+            )
+            """
+        )
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_worker_leases (
+                run_id TEXT PRIMARY KEY,
+                worker_id TEXT NOT NULL,
+                acquired_at TEXT NOT NULL
+            )
+            """
+        )
         await self._create_indexes(
             conn,
             [
@@ -316,9 +514,13 @@ class RunStoreDatabase:
                 "CREATE INDEX IF NOT EXISTS idx_request_run_state_status_updated_at ON request_run_state(status, updated_at)",
                 "CREATE INDEX IF NOT EXISTS idx_request_dispatch_state_run_id ON request_dispatch_state(run_id)",
                 "CREATE INDEX IF NOT EXISTS idx_request_dispatch_state_phase_updated_at ON request_dispatch_state(phase, updated_at)",
+                "CREATE INDEX IF NOT EXISTS idx_run_dispatch_queue_state_priority_seq ON run_dispatch_queue(state, priority, seq)",
+                "CREATE INDEX IF NOT EXISTS idx_run_dispatch_queue_state_skill ON run_dispatch_queue(state, skill_id)",
+                "CREATE INDEX IF NOT EXISTS idx_run_dispatch_queue_state_client ON run_dispatch_queue(state, client_key)",
+                "CREATE INDEX IF NOT EXISTS idx_run_worker_leases_worker_id ON run_worker_leases(worker_id)",
             ],
         )
-        return ["request_current_projection", "request_run_state", "request_dispatch_state"]
+        return ["request_current_projection", "request_run_state", "request_dispatch_state", "run_dispatch_queue"]
 
     async def _create_interaction_schema(self, conn: aiosqlite.Connection) -> list[str]:
         await conn.execute(
@@ -513,11 +715,23 @@ class RunStoreDatabase:
             )
             """
         )
+        for table in ("cache_entries", "temp_cache_entries"):
+            await self._ensure_columns(
+                conn,
+                table,
+                {
+                    "last_hit_at": "TEXT",
+                    "hit_count": "INTEGER NOT NULL DEFAULT 0",
+                    "size_bytes": "INTEGER NOT NULL DEFAULT 0",
+                },
+            )
         await self._create_indexes(
             conn,
             [
                 "CREATE INDEX IF NOT EXISTS idx_cache_entries_run_status ON cache_entries(run_id, status)",
                 "CREATE INDEX IF NOT EXISTS idx_temp_cache_entries_run_status ON temp_cache_entries(run_id, status)",
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_last_hit_at ON cache_entries(last_hit_at)",
+                "CREATE INDEX IF NOT EXISTS idx_temp_cache_entries_last_hit_at ON temp_cache_entries(last_hit_at)",
                 "CREATE INDEX IF NOT EXISTS idx_temp_skill_package_cache_expires_at ON temp_skill_package_cache(expires_at)",
             ],
         )
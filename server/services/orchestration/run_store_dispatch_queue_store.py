@@ -0,0 +1,332 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from server.models import DispatchPriorityClass
+from server.services.platform import aiosqlite_compat as aiosqlite
+from server.services.platform.engine_budget_manager import budget_pool_keys
+
+from .run_store_database import RunStoreDatabase
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_QUEUE_STATE_QUEUED = "queued"
+DISPATCH_QUEUE_STATE_CLAIMED = "claimed"
+
+_PRIORITY_RANK = {
+    DispatchPriorityClass.HIGH: 0,
+    DispatchPriorityClass.NORMAL: 1,
+    DispatchPriorityClass.LOW: 2,
+}
+_RANK_PRIORITY = {rank: priority for priority, rank in _PRIORITY_RANK.items()}
+
+# Highest priority class first; inside a class, prefer the skill/client pair
+# with the fewest claimed (running) entries, then FIFO by enqueue sequence.
+# Rows whose engine, engine/provider or engine/provider/model budget pool is
+# blocked are skipped so one saturated pool cannot hold up the others.
+_CLAIM_CANDIDATE_SQL = """
+SELECT q.run_id AS run_id
+FROM run_dispatch_queue q
+WHERE q.state = 'queued'{blocked_filter}
+ORDER BY
+    q.priority ASC,
+    (
+        SELECT COUNT(1) FROM run_dispatch_queue c
+        WHERE c.state = 'claimed' AND c.skill_id = q.skill_id
+    ) + (
+        SELECT COUNT(1) FROM run_dispatch_queue c
+        WHERE c.state = 'claimed' AND c.client_key = q.client_key
+    ) ASC,
+    q.seq ASC
+LIMIT 1
+"""
+_POOL_KEY_EXPRESSIONS = (
+    "q.engine",
+    "q.engine || '/' || q.provider_id",
+    "q.engine || '/' || q.provider_id || '/' || q.model",
+)
+
+
+def _claim_candidate_query(blocked_pools: Iterable[str]) -> tuple[str, list[str]]:
+    blocked = sorted({pool for pool in blocked_pools if pool})
+    if not blocked:
+        return _CLAIM_CANDIDATE_SQL.format(blocked_filter=""), []
+    placeholders = ", ".join("?" for _ in blocked)
+    clauses = "".join(
+        f"\n  AND ({expression}) NOT IN ({placeholders})" for expression in _POOL_KEY_EXPRESSIONS
+    )
+    return _CLAIM_CANDIDATE_SQL.format(blocked_filter=clauses), blocked * len(_POOL_KEY_EXPRESSIONS)
+
+
+def dispatch_priority_rank(priority: DispatchPriorityClass | str | None) -> int:
+    try:
+        resolved = DispatchPriorityClass(priority) if priority is not None else DispatchPriorityClass.NORMAL
+    except ValueError:
+        resolved = DispatchPriorityClass.NORMAL
+    return _PRIORITY_RANK[resolved]
+
+
+class RunDispatchQueueStore:
+    def __init__(self, database: RunStoreDatabase) -> None:
+        self._database = database
+
+    async def enqueue(
+        self,
+        *,
+        run_id: str,
+        request_id: Optional[str],
+        skill_id: str,
+        engine: str,
+        options: Dict[str, Any],
+        cache_key: Optional[str] = None,
+        priority: DispatchPriorityClass | str | None = None,
+        client_key: Optional[str] = None,
+        provider_id: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute(
+                """
+                INSERT INTO run_dispatch_queue (
+                    run_id, request_id, skill_id, engine, provider_id, model, priority,
+                    client_key, cache_key, options_json, state, enqueued_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(run_id) DO NOTHING
+                """,
+                (
+                    run_id,
+                    request_id,
+                    skill_id,
+                    engine,
+                    provider_id or "",
+                    model or "",
+                    dispatch_priority_rank(priority),
+                    client_key or "",
+                    cache_key,
+                    json.dumps(options, sort_keys=True),
+                    DISPATCH_QUEUE_STATE_QUEUED,
+                    datetime.utcnow().isoformat(),
+                ),
+            )
+            await conn.commit()
+
+    async def claim_next(
+        self,
+        worker_id: str,
+        *,
+        blocked_pools: Iterable[str] = (),
+        max_claimed: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next eligible row for `worker_id`.
+
+        With `max_claimed`, the claim only succeeds while fewer rows than that
+        are claimed across all workers sharing the database; the count and
+        the update run in one write transaction so workers cannot overshoot.
+        """
+        candidate_sql, candidate_params = _claim_candidate_query(blocked_pools)
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            if max_claimed is not None:
+                return await self._claim_next_bounded(
+                    conn,
+                    worker_id,
+                    candidate_sql=candidate_sql,
+                    candidate_params=candidate_params,
+                    max_claimed=max_claimed,
+                )
+            while True:
+                cursor = await conn.execute(candidate_sql, candidate_params)
+                candidate = await cursor.fetchone()
+                if candidate is None:
+                    return None
+                update_cursor = await conn.execute(
+                    """
+                    UPDATE run_dispatch_queue
+                    SET state = ?, worker_id = ?, claimed_at = ?
+                    WHERE run_id = ? AND state = ?
+                    """,
+                    (
+                        DISPATCH_QUEUE_STATE_CLAIMED,
+                        worker_id,
+                        datetime.utcnow().isoformat(),
+                        candidate["run_id"],
+                        DISPATCH_QUEUE_STATE_QUEUED,
+                    ),
+                )
+                await conn.commit()
+                if update_cursor.rowcount != 1:
+                    continue
+                row_cursor = await conn.execute(
+                    "SELECT * FROM run_dispatch_queue WHERE run_id = ?",
+                    (candidate["run_id"],),
+                )
+                row = await row_cursor.fetchone()
+                if row is not None:
+                    return self._decode_row(row)
+
+    async def _claim_next_bounded(
+        self,
+        conn: aiosqlite.Connection,
+        worker_id: str,
+        *,
+        candidate_sql: str,
+        candidate_params: list[str],
+        max_claimed: int,
+    ) -> Optional[Dict[str, Any]]:
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            count_cursor = await conn.execute(
+                "SELECT COUNT(1) AS count FROM run_dispatch_queue WHERE state = ?",
+                (DISPATCH_QUEUE_STATE_CLAIMED,),
+            )
+            count_row = await count_cursor.fetchone()
+            if count_row is not None and int(count_row["count"] or 0) >= max(1, int(max_claimed)):
+                await conn.rollback()
+                return None
+            cursor = await conn.execute(candidate_sql, candidate_params)
+            candidate = await cursor.fetchone()
+            if candidate is None:
+                await conn.rollback()
+                return None
+            await conn.execute(
+                """
+                UPDATE run_dispatch_queue
+                SET state = ?, worker_id = ?, claimed_at = ?
+                WHERE run_id = ?
+                """,
+                (
+                    DISPATCH_QUEUE_STATE_CLAIMED,
+                    worker_id,
+                    datetime.utcnow().isoformat(),
+                    candidate["run_id"],
+                ),
+            )
+            row_cursor = await conn.execute(
+                "SELECT * FROM run_dispatch_queue WHERE run_id = ?",
+                (candidate["run_id"],),
+            )
+            row = await row_cursor.fetchone()
+        except BaseException:
+            await conn.rollback()
+            raise
+        await conn.commit()
+        return self._decode_row(row) if row is not None else None
+
+    async def complete(self, run_id: str) -> bool:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute("DELETE FROM run_dispatch_queue WHERE run_id = ?", (run_id,))
+            await conn.commit()
+        return int(cursor.rowcount or 0) > 0
+
+    async def release_claim(self, run_id: str) -> bool:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                UPDATE run_dispatch_queue
+                SET state = ?, worker_id = NULL, claimed_at = NULL
+                WHERE run_id = ? AND state = ?
+                """,
+                (DISPATCH_QUEUE_STATE_QUEUED, run_id, DISPATCH_QUEUE_STATE_CLAIMED),
+            )
+            await conn.commit()
+        return int(cursor.rowcount or 0) > 0
+
+    async def requeue_claimed(self, *, live_since: Optional[str] = None) -> int:
+        """
+        Return claimed rows to the queue.
+
+        Without `live_since` every claim is requeued (single-process restart).
+        With it, only claims held by workers that have not heartbeated since
+        then are requeued, leaving live workers' claims alone.
+        """
+        statement = """
+                UPDATE run_dispatch_queue
+                SET state = ?, worker_id = NULL, claimed_at = NULL
+                WHERE state = ?
+                """
+        params: tuple[Any, ...] = (DISPATCH_QUEUE_STATE_QUEUED, DISPATCH_QUEUE_STATE_CLAIMED)
+        if live_since is not None:
+            statement += """
+                AND (
+                    worker_id IS NULL
+                    OR worker_id NOT IN (SELECT worker_id FROM server_workers WHERE heartbeat_at >= ?)
+                )
+                """
+            params += (live_since,)
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(statement, params)
+            await conn.commit()
+        return int(cursor.rowcount or 0)
+
+    async def count(self, state: str = DISPATCH_QUEUE_STATE_QUEUED) -> int:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "SELECT COUNT(1) AS count FROM run_dispatch_queue WHERE state = ?",
+                (state,),
+            )
+            row = await cursor.fetchone()
+        return int(row["count"] or 0) if row else 0
+
+    async def count_by_pool(self, state: str = DISPATCH_QUEUE_STATE_QUEUED) -> Dict[str, int]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT engine, provider_id, model, COUNT(1) AS count
+                FROM run_dispatch_queue
+                WHERE state = ?
+                GROUP BY engine, provider_id, model
+                """,
+                (state,),
+            )
+            rows = await cursor.fetchall()
+        counts: Dict[str, int] = {}
+        for row in rows:
+            for key in budget_pool_keys(row["engine"], row["provider_id"], row["model"]):
+                counts[key] = counts.get(key, 0) + int(row["count"] or 0)
+        return counts
+
+    async def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute("SELECT * FROM run_dispatch_queue WHERE run_id = ?", (run_id,))
+            row = await cursor.fetchone()
+        return self._decode_row(row) if row is not None else None
+
+    async def list_entries(self, limit: int = 200) -> List[Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "SELECT * FROM run_dispatch_queue ORDER BY priority ASC, seq ASC LIMIT ?",
+                (max(1, int(limit)),),
+            )
+            rows = await cursor.fetchall()
+        return [self._decode_row(row) for row in rows]
+
+    def _decode_row(self, row: Any) -> Dict[str, Any]:
+        data = dict(row)
+        try:
+            options = json.loads(data.pop("options_json") or "{}")
+        except (json.JSONDecodeError, TypeError):
+            logger.warning("Invalid dispatch queue options JSON ignored: run_id=%s", data.get("run_id"))
+            options = {}
+        data["options"] = options if isinstance(options, dict) else {}
+        data["priority"] = _RANK_PRIORITY.get(int(data.get("priority") or 0), DispatchPriorityClass.NORMAL).value
+        return data
@@ -1,10 +1,109 @@
+import base64
+import binascii
 import json
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from server.services.platform import aiosqlite_compat as aiosqlite
 
-from .run_store_database import RunStoreDatabase
+from .run_store_database import RUN_SEARCH_DOCUMENTS_TABLE, RUN_SEARCH_FTS_TABLE, RunStoreDatabase
+
+RUN_SEARCH_TEXT_MAX_CHARS = 2000
+_TRIGRAM_MIN_CHARS = 3
+
+_RUN_LIST_COLUMNS_SQL = """
+    req.request_id AS request_id,
+    req.skill_id AS skill_id,
+    req.skill_source AS skill_source,
+    req.engine AS engine,
+    req.engine_options_json AS engine_options_json,
+    req.run_id AS run_id,
+    req.created_at AS request_created_at,
+    run.status AS run_status,
+    run.created_at AS run_created_at,
+    run.result_path AS result_path,
+    run.artifacts_manifest_path AS artifacts_manifest_path,
+    run.workspace_id AS workspace_id,
+    run.workspace_dir AS workspace_dir,
+    run.workspace_namespace AS workspace_namespace,
+    run.workspace_source_request_id AS workspace_source_request_id,
+    run.input_manifest_path AS run_input_manifest_path,
+    run.workspace_input_token AS workspace_input_token,
+    run.workspace_output_token AS workspace_output_token,
+    run.recovery_state AS recovery_state,
+    run.recovered_at AS recovered_at,
+    run.recovery_reason AS recovery_reason
+"""
+
+
+@dataclass(frozen=True)
+class RunListFilters:
+    """Server-side filters for run listings; empty fields do not filter."""
+
+    statuses: tuple[str, ...] = ()
+    engine: Optional[str] = None
+    skill_id: Optional[str] = None
+    model: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    text: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not (
+            self.statuses
+            or self.engine
+            or self.skill_id
+            or self.model
+            or self.created_from
+            or self.created_to
+            or (self.text and self.text.strip())
+        )
+
+
+def encode_run_list_cursor(created_at: str, request_id: str) -> str:
+    raw = json.dumps([created_at, request_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_run_list_cursor(cursor: str) -> tuple[str, str]:
+    """Decode an opaque listing cursor; raises ValueError when malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("invalid run list cursor") from exc
+    if (
+        not isinstance(payload, list)
+        or len(payload) != 2
+        or not all(isinstance(item, str) for item in payload)
+    ):
+        raise ValueError("invalid run list cursor")
+    return payload[0], payload[1]
+
+
+def model_from_engine_options(engine_options: Dict[str, Any]) -> str:
+    for key in ("model", "model_id"):
+        value = engine_options.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+def _created_at_bound(value: datetime) -> str:
+    # `requests.created_at` is naive UTC `isoformat()`; compare in the same form.
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 
 class RunRequestStore:
@@ -40,9 +139,9 @@ class RunRequestStore:
                     engine_options_json, runtime_options_json, effective_runtime_options_json,
                     client_metadata_json, request_upload_mode, temp_skill_package_sha256,
                     skill_package_hash, temp_skill_manifest_id, temp_skill_manifest_json,
-                    status, created_at
+                    status, model, created_at
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     request_id,
@@ -65,6 +164,7 @@ class RunRequestStore:
                         else None
                     ),
                     "created",
+                    model_from_engine_options(engine_options),
                     created_at,
                 ),
             )
@@ -121,10 +221,10 @@ class RunRequestStore:
             await conn.execute(
                 """
                 UPDATE requests
-                SET engine_options_json = ?
+                SET engine_options_json = ?, model = ?
                 WHERE request_id = ?
                 """,
-                (json.dumps(engine_options, sort_keys=True), request_id),
+                (json.dumps(engine_options, sort_keys=True), model_from_engine_options(engine_options), request_id),
             )
             await conn.commit()
 
@@ -314,7 +414,17 @@ class RunRequestStore:
         await self._database.ensure_initialized()
         async with self._database.connect() as conn:
             conn.row_factory = aiosqlite.Row
-            cursor = await conn.execute("SELECT * FROM requests WHERE run_id = ?", (run_id,))
+            # Coalesced follower requests share the run; the owning request is the non-follower one.
+            cursor = await conn.execute(
+                """
+                SELECT * FROM requests
+                WHERE run_id = ?
+                  AND request_id NOT IN (SELECT request_id FROM request_followers WHERE run_id = ?)
+                ORDER BY rowid ASC
+                LIMIT 1
+                """,
+                (run_id, run_id),
+            )
             row = await cursor.fetchone()
             run_row = None
             if row:
@@ -346,33 +456,12 @@ class RunRequestStore:
         async with self._database.connect() as conn:
             conn.row_factory = aiosqlite.Row
             cursor = await conn.execute(
-                """
-                SELECT
-                    req.request_id AS request_id,
-                    req.skill_id AS skill_id,
-                    req.skill_source AS skill_source,
-                    req.engine AS engine,
-                    req.engine_options_json AS engine_options_json,
-                    req.run_id AS run_id,
-                    req.created_at AS request_created_at,
-                    run.status AS run_status,
-                    run.created_at AS run_created_at,
-                    run.result_path AS result_path,
-                    run.artifacts_manifest_path AS artifacts_manifest_path,
-                    run.workspace_id AS workspace_id,
-                    run.workspace_dir AS workspace_dir,
-                    run.workspace_namespace AS workspace_namespace,
-                    run.workspace_source_request_id AS workspace_source_request_id,
-                    run.input_manifest_path AS run_input_manifest_path,
-                    run.workspace_input_token AS workspace_input_token,
-                    run.workspace_output_token AS workspace_output_token,
-                    run.recovery_state AS recovery_state,
-                    run.recovered_at AS recovered_at,
-                    run.recovery_reason AS recovery_reason
+                f"""
+                SELECT {_RUN_LIST_COLUMNS_SQL}
                 FROM requests req
                 LEFT JOIN runs run ON req.run_id = run.run_id
                 WHERE req.run_id IS NOT NULL
-                ORDER BY req.created_at DESC
+                ORDER BY req.created_at DESC, req.request_id DESC
                 LIMIT ?
                 """,
                 (safe_limit,),
@@ -409,33 +498,12 @@ class RunRequestStore:
         async with self._database.connect() as conn:
             conn.row_factory = aiosqlite.Row
             cursor = await conn.execute(
-                """
-                SELECT
-                    req.request_id AS request_id,
-                    req.skill_id AS skill_id,
-                    req.skill_source AS skill_source,
-                    req.engine AS engine,
-                    req.engine_options_json AS engine_options_json,
-                    req.run_id AS run_id,
-                    req.created_at AS request_created_at,
-                    run.status AS run_status,
-                    run.created_at AS run_created_at,
-                    run.result_path AS result_path,
-                    run.artifacts_manifest_path AS artifacts_manifest_path,
-                    run.workspace_id AS workspace_id,
-                    run.workspace_dir AS workspace_dir,
-                    run.workspace_namespace AS workspace_namespace,
-                    run.workspace_source_request_id AS workspace_source_request_id,
-                    run.input_manifest_path AS run_input_manifest_path,
-                    run.workspace_input_token AS workspace_input_token,
-                    run.workspace_output_token AS workspace_output_token,
-                    run.recovery_state AS recovery_state,
-                    run.recovered_at AS recovered_at,
-                    run.recovery_reason AS recovery_reason
+                f"""
+                SELECT {_RUN_LIST_COLUMNS_SQL}
                 FROM requests req
                 LEFT JOIN runs run ON req.run_id = run.run_id
                 WHERE req.run_id IS NOT NULL
-                ORDER BY req.created_at DESC
+                ORDER BY req.created_at DESC, req.request_id DESC
                 LIMIT ? OFFSET ?
                 """,
                 (safe_page_size, offset),
@@ -443,6 +511,139 @@ class RunRequestStore:
             rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
+    async def list_requests_with_runs_keyset(
+        self,
+        *,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[RunListFilters] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of the run listing, newest first, by keyset on `(created_at, request_id)`.
+
+        Returns `{"rows", "next_cursor"}`; `next_cursor` is None on the last
+        page. Page cost does not grow with depth, unlike `LIMIT/OFFSET`.
+        """
+        await self._database.ensure_initialized()
+        safe_limit = max(1, min(int(limit), 1000))
+        where_sql, params = self._run_list_where(filters or RunListFilters())
+        if cursor:
+            cursor_created_at, cursor_request_id = decode_run_list_cursor(cursor)
+            where_sql += " AND (req.created_at < ? OR (req.created_at = ? AND req.request_id < ?))"
+            params.extend([cursor_created_at, cursor_created_at, cursor_request_id])
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            db_cursor = await conn.execute(
+                f"""
+                SELECT {_RUN_LIST_COLUMNS_SQL}
+                FROM requests req
+                LEFT JOIN runs run ON req.run_id = run.run_id
+                WHERE {where_sql}
+                ORDER BY req.created_at DESC, req.request_id DESC
+                LIMIT ?
+                """,
+                (*params, safe_limit + 1),
+            )
+            rows = [dict(row) for row in await db_cursor.fetchall()]
+        next_cursor = None
+        if len(rows) > safe_limit:
+            rows = rows[:safe_limit]
+            last = rows[-1]
+            next_cursor = encode_run_list_cursor(str(last["request_created_at"]), str(last["request_id"]))
+        return {"rows": rows, "next_cursor": next_cursor}
+
+    async def count_requests_with_runs_filtered(self, filters: RunListFilters) -> int:
+        await self._database.ensure_initialized()
+        where_sql, params = self._run_list_where(filters)
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                f"""
+                SELECT COUNT(1) AS total
+                FROM requests req
+                LEFT JOIN runs run ON req.run_id = run.run_id
+                WHERE {where_sql}
+                """,
+                params,
+            )
+            row = await cursor.fetchone()
+        return max(0, int(row["total"] or 0)) if row else 0
+
+    async def update_run_search_text(
+        self,
+        request_id: str,
+        *,
+        error_summary: Optional[str] = None,
+        final_message: Optional[str] = None,
+    ) -> None:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute(
+                f"""
+                UPDATE {RUN_SEARCH_DOCUMENTS_TABLE}
+                SET error_summary = ?, final_message = ?, updated_at = ?
+                WHERE request_id = ?
+                """,
+                (
+                    (error_summary or "")[:RUN_SEARCH_TEXT_MAX_CHARS],
+                    (final_message or "")[:RUN_SEARCH_TEXT_MAX_CHARS],
+                    datetime.utcnow().isoformat(),
+                    request_id,
+                ),
+            )
+            await conn.commit()
+
+    def _run_list_where(self, filters: RunListFilters) -> tuple[str, List[Any]]:
+        clauses = ["req.run_id IS NOT NULL"]
+        params: List[Any] = []
+        statuses = [item.strip().lower() for item in filters.statuses if item and item.strip()]
+        if statuses:
+            clauses.append(f"run.status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        for column, value in (("engine", filters.engine), ("skill_id", filters.skill_id), ("model", filters.model)):
+            if value and value.strip():
+                clauses.append(f"req.{column} = ?")
+                params.append(value.strip())
+        if filters.created_from is not None:
+            clauses.append("req.created_at >= ?")
+            params.append(_created_at_bound(filters.created_from))
+        if filters.created_to is not None:
+            clauses.append("req.created_at < ?")
+            params.append(_created_at_bound(filters.created_to))
+        text = (filters.text or "").strip()
+        if text:
+            search_sql, search_params = self._run_search_clause(text)
+            clauses.append(search_sql)
+            params.extend(search_params)
+        return " AND ".join(clauses), params
+
+    def _run_search_clause(self, text: str) -> tuple[str, List[Any]]:
+        """Every whitespace-separated term must occur in the skill id, error summary or final message."""
+        terms = list(dict.fromkeys(term for term in text.split() if term))
+        fts_terms = [term for term in terms if len(term) >= _TRIGRAM_MIN_CHARS] if self._database.run_search_fts_enabled else []
+        like_terms = [term for term in terms if term not in fts_terms]
+        doc_clauses: List[str] = []
+        params: List[Any] = []
+        if fts_terms:
+            doc_clauses.append(
+                f"doc.doc_id IN (SELECT rowid FROM {RUN_SEARCH_FTS_TABLE} WHERE {RUN_SEARCH_FTS_TABLE} MATCH ?)"
+            )
+            params.append(" AND ".join(_fts_phrase(term) for term in fts_terms))
+        for term in like_terms:
+            doc_clauses.append(
+                "(doc.skill_id LIKE ? ESCAPE '\\' OR doc.error_summary LIKE ? ESCAPE '\\'"
+                " OR doc.final_message LIKE ? ESCAPE '\\')"
+            )
+            pattern = _like_pattern(term)
+            params.extend([pattern, pattern, pattern])
+        # A pasted request id matches directly.
+        return (
+            f"(req.request_id = ? OR req.request_id IN ("
+            f"SELECT doc.request_id FROM {RUN_SEARCH_DOCUMENTS_TABLE} doc WHERE {' AND '.join(doc_clauses)}))",
+            [text, *params],
+        )
+
     async def list_request_ids(self) -> List[str]:
         await self._database.ensure_initialized()
         async with self._database.connect() as conn:
@@ -571,3 +772,83 @@ class RunRegistryStore:
         if not row:
             return None
         return dict(row)
+
+    async def find_inflight_run_for_cache_key(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT * FROM runs
+                WHERE cache_key = ? AND status IN ('queued', 'running')
+                ORDER BY created_at DESC
+                LIMIT 1
+                """,
+                (cache_key,),
+            )
+            row = await cursor.fetchone()
+        return dict(row) if row else None
+
+    async def count_runs_sharing_workspace_dir(self, workspace_dir: str, *, exclude_run_id: str) -> int:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "SELECT COUNT(1) AS count FROM runs WHERE workspace_dir = ? AND run_id != ?",
+                (workspace_dir, exclude_run_id),
+            )
+            row = await cursor.fetchone()
+        return int(row["count"] or 0) if row else 0
+
+    async def add_request_follower(self, request_id: str, run_id: str, leader_request_id: str) -> None:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute(
+                """
+                INSERT OR REPLACE INTO request_followers (
+                    request_id, run_id, leader_request_id, created_at, detached_at
+                )
+                VALUES (?, ?, ?, ?, NULL)
+                """,
+                (request_id, run_id, leader_request_id, datetime.utcnow().isoformat()),
+            )
+            await conn.commit()
+
+    async def get_request_follower(self, request_id: str) -> Optional[Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute("SELECT * FROM request_followers WHERE request_id = ?", (request_id,))
+            row = await cursor.fetchone()
+        return dict(row) if row else None
+
+    async def list_request_followers(self, run_id: str) -> List[Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT * FROM request_followers
+                WHERE run_id = ? AND detached_at IS NULL
+                ORDER BY created_at ASC
+                """,
+                (run_id,),
+            )
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def detach_request_follower(self, request_id: str) -> bool:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                UPDATE request_followers
+                SET detached_at = ?
+                WHERE request_id = ? AND detached_at IS NULL
+                """,
+                (datetime.utcnow().isoformat(), request_id),
+            )
+            await conn.commit()
+        return int(cursor.rowcount or 0) > 0
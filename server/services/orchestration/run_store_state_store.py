@@ -104,6 +104,31 @@ class RunProjectionStateStore:
             logger.warning("Invalid run state payload ignored: request_id=%s", request_id, exc_info=True)
             return None
 
+    async def list_active_run_states(self, limit: int) -> Dict[str, Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT request_id, payload_json
+                FROM request_run_state
+                WHERE status IN (?, ?, ?, ?)
+                ORDER BY updated_at DESC
+                LIMIT ?
+                """,
+                ("queued", "running", "waiting_user", "waiting_auth", max(0, int(limit))),
+            )
+            rows = await cursor.fetchall()
+        states: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            try:
+                payload = RunStateEnvelope.model_validate(json.loads(row["payload_json"]))
+            except (json.JSONDecodeError, TypeError, ValidationError):
+                logger.warning("Invalid run state payload skipped: request_id=%s", row["request_id"])
+                continue
+            states[str(row["request_id"])] = payload.model_dump(mode="json")
+        return states
+
     async def clear_run_state(self, request_id: str) -> None:
         await self._database.ensure_initialized()
         async with self._database.connect() as conn:
@@ -171,7 +196,13 @@ class RunProjectionStateStore:
             await conn.commit()
 
     async def get_current_projection(self, request_id: str) -> Optional[Dict[str, Any]]:
-        state_payload = await self.get_run_state(request_id)
+        return await self.get_current_projection_for_state(request_id, await self.get_run_state(request_id))
+
+    async def get_current_projection_for_state(
+        self,
+        request_id: str,
+        state_payload: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
         if isinstance(state_payload, dict):
             pending_obj = state_payload.get("pending")
             resume_obj = state_payload.get("resume")
@@ -303,6 +334,7 @@ class RunRecoveryStateStore:
             request_rows = await request_cur.fetchall()
             request_ids = [row["request_id"] for row in request_rows]
             await conn.execute("DELETE FROM requests WHERE run_id = ?", (run_id,))
+            await conn.execute("DELETE FROM request_followers WHERE run_id = ?", (run_id,))
             await conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
             await conn.commit()
         if request_ids:
@@ -322,6 +354,7 @@ class RunRecoveryStateStore:
             request_count = len(request_rows)
             await conn.execute("DELETE FROM runs")
             await conn.execute("DELETE FROM requests")
+            await conn.execute("DELETE FROM request_followers")
             await conn.commit()
         cache_count = await self._clear_cache_records()
         await self._clear_state_records()
@@ -368,6 +401,7 @@ class RunRecoveryStateStore:
                 FROM requests req
                 JOIN runs run ON req.run_id = run.run_id
                 WHERE run.status IN ('queued', 'running', 'waiting_user', 'waiting_auth')
+                  AND req.request_id NOT IN (SELECT request_id FROM request_followers)
                 ORDER BY req.created_at ASC
                 """
             )
@@ -385,6 +419,8 @@ class RunRecoveryStateStore:
             auth_resume_context_json = auth_row.get("auth_resume_context_json") if auth_row else None
             pending_auth_method_selection_json = auth_select_row.get("payload_json") if auth_select_row else None
             item["auth_session_id"] = auth_row.get("auth_session_id") if auth_row else None
+            dispatch_queue_row = await self._get_dispatch_queue_row(str(item.get("run_id") or ""))
+            item["dispatch_queue_state"] = dispatch_queue_row.get("state") if dispatch_queue_row else None
             item["interactive_runtime_updated_at"] = runtime_row.get("updated_at") if runtime_row else None
             try:
                 item["runtime_options"] = json.loads(runtime_options_json or "{}")
@@ -430,6 +466,7 @@ class RunRecoveryStateStore:
             await conn.execute(f"DELETE FROM request_current_projection WHERE request_id IN ({placeholders})", params)
             await conn.execute(f"DELETE FROM request_run_state WHERE request_id IN ({placeholders})", params)
             await conn.execute(f"DELETE FROM request_dispatch_state WHERE request_id IN ({placeholders})", params)
+            await conn.execute(f"DELETE FROM run_dispatch_queue WHERE request_id IN ({placeholders})", params)
             await conn.commit()
         await self._interaction_database.ensure_initialized()
         async with self._interaction_database.connect() as conn:
@@ -472,6 +509,7 @@ class RunRecoveryStateStore:
             await conn.execute("DELETE FROM request_current_projection")
             await conn.execute("DELETE FROM request_run_state")
             await conn.execute("DELETE FROM request_dispatch_state")
+            await conn.execute("DELETE FROM run_dispatch_queue")
             await conn.commit()
 
     async def _clear_interaction_records(self) -> None:
@@ -499,6 +537,14 @@ class RunRecoveryStateStore:
             row = await cursor.fetchone()
         return dict(row) if row else None
 
+    async def _get_dispatch_queue_row(self, run_id: str) -> Dict[str, Any] | None:
+        await self._state_database.ensure_initialized()
+        async with self._state_database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute("SELECT state FROM run_dispatch_queue WHERE run_id = ?", (run_id,))
+            row = await cursor.fetchone()
+        return dict(row) if row else None
+
     async def _get_pending_auth_row(self, request_id: str) -> Dict[str, Any] | None:
         await self._auth_database.ensure_initialized()
         async with self._auth_database.connect() as conn:
@@ -0,0 +1,216 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from server.services.platform import aiosqlite_compat as aiosqlite
+
+from .run_store_database import RunStoreDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class RunWorkerStore:
+    """
+    Worker registry and run ownership leases for multi-worker mode.
+
+    Every server worker process keeps a `server_workers` row fresh with a
+    heartbeat; a worker whose `heartbeat_at` is older than the lease TTL is
+    considered dead. `run_worker_leases` records which worker is executing a
+    run, so cancel requests can be routed to it and its runs reconciled by a
+    peer once it dies. Timestamps are naive UTC ISO strings, compared as text.
+    """
+
+    def __init__(self, database: RunStoreDatabase) -> None:
+        self._database = database
+
+    async def register(
+        self,
+        *,
+        worker_id: str,
+        pid: int,
+        hostname: str,
+        ipc_path: Optional[str],
+        live_since: str,
+    ) -> int:
+        """Upsert this worker's row; returns how many other workers were live at that instant."""
+        now = datetime.utcnow().isoformat()
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            # One write transaction so concurrently starting workers see each other in order.
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = await conn.execute(
+                    "SELECT COUNT(1) AS count FROM server_workers WHERE worker_id != ? AND heartbeat_at >= ?",
+                    (worker_id, live_since),
+                )
+                row = await cursor.fetchone()
+                await conn.execute(
+                    """
+                    INSERT INTO server_workers (worker_id, pid, hostname, ipc_path, started_at, heartbeat_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(worker_id) DO UPDATE SET
+                        pid = excluded.pid,
+                        hostname = excluded.hostname,
+                        ipc_path = excluded.ipc_path,
+                        heartbeat_at = excluded.heartbeat_at
+                    """,
+                    (worker_id, int(pid), hostname, ipc_path, now, now),
+                )
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
+        return int(row["count"] or 0) if row else 0
+
+    async def heartbeat(self, worker_id: str) -> bool:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "UPDATE server_workers SET heartbeat_at = ? WHERE worker_id = ?",
+                (datetime.utcnow().isoformat(), worker_id),
+            )
+            await conn.commit()
+        return int(cursor.rowcount or 0) > 0
+
+    async def deregister(self, worker_id: str) -> None:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute("DELETE FROM server_workers WHERE worker_id = ?", (worker_id,))
+            await conn.commit()
+
+    async def expire(self, *, live_since: str) -> List[str]:
+        """Delete workers whose heartbeat is older than `live_since`; returns their ids."""
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "SELECT worker_id FROM server_workers WHERE heartbeat_at < ?",
+                (live_since,),
+            )
+            expired = [str(row["worker_id"]) for row in await cursor.fetchall()]
+            if expired:
+                await conn.execute("DELETE FROM server_workers WHERE heartbeat_at < ?", (live_since,))
+                await conn.commit()
+        return expired
+
+    async def list_stale(self, *, live_since: str) -> List[Dict[str, Any]]:
+        """Workers whose heartbeat is older than `live_since` (candidates for `expire`)."""
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "SELECT * FROM server_workers WHERE heartbeat_at < ? ORDER BY worker_id ASC",
+                (live_since,),
+            )
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def list_live(self, *, live_since: str) -> List[Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "SELECT * FROM server_workers WHERE heartbeat_at >= ? ORDER BY started_at ASC, worker_id ASC",
+                (live_since,),
+            )
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def acquire_run_lease(self, run_id: str, worker_id: str) -> None:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute(
+                """
+                INSERT INTO run_worker_leases (run_id, worker_id, acquired_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    worker_id = excluded.worker_id,
+                    acquired_at = excluded.acquired_at
+                """,
+                (run_id, worker_id, datetime.utcnow().isoformat()),
+            )
+            await conn.commit()
+
+    async def release_run_lease(self, run_id: str, worker_id: str) -> bool:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "DELETE FROM run_worker_leases WHERE run_id = ? AND worker_id = ?",
+                (run_id, worker_id),
+            )
+            await conn.commit()
+        return int(cursor.rowcount or 0) > 0
+
+    async def get_run_lease(self, run_id: str, *, live_since: str) -> Optional[Dict[str, Any]]:
+        """The run's lease joined with its worker row; `worker_live` tells whether the owner is alive."""
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT l.run_id, l.worker_id, l.acquired_at, w.ipc_path,
+                       (w.worker_id IS NOT NULL AND w.heartbeat_at >= ?) AS worker_live
+                FROM run_worker_leases l
+                LEFT JOIN server_workers w ON w.worker_id = l.worker_id
+                WHERE l.run_id = ?
+                """,
+                (live_since, run_id),
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        payload = dict(row)
+        payload["worker_live"] = bool(payload.get("worker_live"))
+        return payload
+
+    async def list_live_run_leases(self, *, live_since: str) -> List[Dict[str, Any]]:
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT l.run_id, l.worker_id, l.acquired_at
+                FROM run_worker_leases l
+                JOIN server_workers w ON w.worker_id = l.worker_id
+                WHERE w.heartbeat_at >= ?
+                """,
+                (live_since,),
+            )
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def take_orphaned_run_leases(self, *, live_since: str) -> List[str]:
+        """
+        Delete leases whose worker is no longer live and return their run ids.
+
+        Each lease is removed with a compare-and-delete, so when several
+        workers sweep at once every orphaned run is handed to exactly one.
+        """
+        await self._database.ensure_initialized()
+        async with self._database.connect() as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                """
+                SELECT run_id, worker_id FROM run_worker_leases
+                WHERE worker_id NOT IN (SELECT worker_id FROM server_workers WHERE heartbeat_at >= ?)
+                """,
+                (live_since,),
+            )
+            candidates = [(str(row["run_id"]), str(row["worker_id"])) for row in await cursor.fetchall()]
+            taken: List[str] = []
+            for run_id, worker_id in candidates:
+                delete_cursor = await conn.execute(
+                    "DELETE FROM run_worker_leases WHERE run_id = ? AND worker_id = ?",
+                    (run_id, worker_id),
+                )
+                if int(delete_cursor.rowcount or 0) == 1:
+                    taken.append(run_id)
+            await conn.commit()
+        if taken:
+            logger.info("Took %s run leases from workers that stopped heartbeating", len(taken))
+        return taken
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict
+from uuid import uuid4
+
+from server.config import config
+from server.services.orchestration.run_store import run_store
+from server.services.platform.process_supervisor import process_supervisor
+from server.services.platform.worker_ipc_relay import WorkerIpcRelay
+
+logger = logging.getLogger(__name__)
+
+CancelHandler = Callable[[str, str], Awaitable[bool]]
+RunsLostHandler = Callable[[list[str]], Awaitable[None]]
+
+FRAME_JOURNAL = "journal"
+FRAME_RUN_STATE = "run_state"
+FRAME_CANCEL = "cancel"
+FRAME_DISPATCH = "dispatch"
+
+
+def _journals() -> Dict[str, Any]:
+    from server.runtime.chat_replay.live_journal import chat_replay_live_journal
+    from server.runtime.observability.fcmp_live_journal import fcmp_live_journal
+    from server.runtime.observability.rasp_live_journal import rasp_live_journal
+
+    return {
+        "fcmp": fcmp_live_journal,
+        "rasp": rasp_live_journal,
+        "chat": chat_replay_live_journal,
+    }
+
+
+def _worker_process_responsive(pid: int, ipc_path: str | None) -> bool:
+    """Whether a worker process on this host still runs (not merely a reused pid)."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    except OSError:
+        return False
+    if ipc_path is None or not hasattr(socket, "AF_UNIX"):
+        return True
+    # The kernel accepts into the listen backlog even while the owner's loop is blocked;
+    # a dead worker's leftover socket file refuses the connection.
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1.0)
+    try:
+        probe.connect(ipc_path)
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+class WorkerCoordinator:
+    """
+    Cross-process coordination for multi-worker mode (`SYSTEM.WORKERS > 1`).
+
+    - Registry: each worker keeps a heartbeat row in the run store; a worker
+      that misses `WORKER_LEASE_TTL_SEC` is dead. The sweep on every
+      heartbeat requeues its dispatch claims, reaps its leased processes and
+      hands the runs it owned to `on_runs_lost` exactly once. A stale worker
+      on this host whose process is still alive (and whose relay socket still
+      accepts connections) is only stalled, e.g. by a blocked event loop; the
+      sweep renews its heartbeat instead of failing its runs.
+    - Run state: while registered, run state reads go through to SQLite, so
+      a missed relay frame never leaves a peer serving stale state.
+    - Ownership: `acquire_run`/`release_run` bracket run execution, so a
+      cancel for a run executing elsewhere is routed to the owner.
+    - Relay: live journal rows (FCMP/RASP/chat), run state changes and
+      dispatch wakeups are broadcast to peers over `WorkerIpcRelay`.
+
+    With a single worker every method is a cheap no-op and no rows are written.
+    """
+
+    def __init__(self, *, run_store_backend: Any | None = None, relay: WorkerIpcRelay | None = None) -> None:
+        self._run_store_backend = run_store_backend
+        self._relay = relay or WorkerIpcRelay()
+        self._pid = os.getpid()
+        self._worker_id = self._new_worker_id()
+        self._started = False
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._on_cancel: CancelHandler | None = None
+        self._on_runs_lost: RunsLostHandler | None = None
+        self._on_dispatch_wakeup: Callable[[], None] | None = None
+        self._live_peer_ids: frozenset[str] = frozenset()
+        self._journal_map: Dict[str, Any] = {}
+
+    @staticmethod
+    def _new_worker_id() -> str:
+        return f"w{os.getpid()}-{uuid4().hex[:8]}"
+
+    def _store(self) -> Any:
+        return self._run_store_backend or run_store
+
+    @property
+    def worker_id(self) -> str:
+        if self._pid != os.getpid():
+            # Forked after import: never share an identity with the parent.
+            self._pid = os.getpid()
+            self._worker_id = self._new_worker_id()
+        return self._worker_id
+
+    def enabled(self) -> bool:
+        return int(getattr(config.SYSTEM, "WORKERS", 1)) > 1
+
+    def live_since(self) -> str:
+        ttl = max(1, int(getattr(config.SYSTEM, "WORKER_LEASE_TTL_SEC", 30)))
+        return (datetime.utcnow() - timedelta(seconds=ttl)).isoformat()
+
+    def heartbeat_interval_sec(self) -> float:
+        return float(max(1, int(getattr(config.SYSTEM, "WORKER_HEARTBEAT_INTERVAL_SEC", 5))))
+
+    @property
+    def active(self) -> bool:
+        """True once this worker has registered in multi-worker mode."""
+        return self._started
+
+    @property
+    def live_peer_ids(self) -> frozenset[str]:
+        return self._live_peer_ids
+
+    async def start(
+        self,
+        *,
+        on_cancel: CancelHandler,
+        on_runs_lost: RunsLostHandler,
+        on_dispatch_wakeup: Callable[[], None],
+    ) -> bool:
+        """
+        Register this worker and start heartbeats and the relay.
+
+        Returns True when this worker should run startup recovery: always in
+        single-worker mode, otherwise only for the first worker of a fleet
+        (no other worker was live when it registered).
+        """
+        if not self.enabled() or self._started:
+            return True
+        self._on_cancel = on_cancel
+        self._on_runs_lost = on_runs_lost
+        self._on_dispatch_wakeup = on_dispatch_wakeup
+        ipc_path = await self._start_relay()
+        live_peers = await self._store().register_worker(
+            worker_id=self.worker_id,
+            pid=os.getpid(),
+            hostname=socket.gethostname(),
+            ipc_path=str(ipc_path) if ipc_path is not None else None,
+            live_since=self.live_since(),
+        )
+        process_supervisor.set_worker_id(self.worker_id)
+        self._journal_map = _journals()
+        for channel, journal in self._journal_map.items():
+            journal.set_publish_listener(self._journal_listener(channel))
+        await self._store().add_run_state_change_listener(self._relay_run_state_change)
+        await self._store().set_run_state_read_through(True)
+        await self._refresh_peers()
+        self._started = True
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat_loop())
+        logger.info(
+            "Worker registered: worker_id=%s live_peers=%s ipc=%s",
+            self.worker_id,
+            live_peers,
+            ipc_path,
+        )
+        return live_peers == 0
+
+    async def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        task = self._heartbeat_task
+        self._heartbeat_task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for journal in self._journal_map.values():
+            journal.set_publish_listener(None)
+        await self._store().remove_run_state_change_listener(self._relay_run_state_change)
+        await self._store().set_run_state_read_through(False)
+        process_supervisor.set_worker_id(None)
+        await self._relay.stop()
+        try:
+            await self._store().deregister_worker(self.worker_id)
+        except (OSError, RuntimeError, sqlite3.Error):
+            logger.warning("Worker deregistration failed: worker_id=%s", self.worker_id, exc_info=True)
+        self._live_peer_ids = frozenset()
+
+    async def _start_relay(self) -> Path | None:
+        if not self._relay.supported():
+            logger.warning("Worker relay needs Unix sockets; live events stay local to each worker")
+            return None
+        socket_path = Path(str(config.SYSTEM.WORKER_IPC_DIR)) / f"{self.worker_id}.sock"
+        try:
+            await self._relay.start(socket_path, self._handle_frame)
+        except OSError:
+            logger.warning("Worker relay failed to listen on %s; live events stay local", socket_path, exc_info=True)
+            return None
+        return socket_path
+
+    async def acquire_run(self, run_id: str) -> None:
+        """Record that this worker executes `run_id` (no-op in single-worker mode)."""
+        if not self._started:
+            return
+        try:
+            await self._store().acquire_run_worker_lease(run_id, self.worker_id)
+        except (OSError, RuntimeError, sqlite3.Error):
+            logger.warning("Run worker lease acquire failed: run_id=%s", run_id, exc_info=True)
+
+    async def release_run(self, run_id: str) -> None:
+        if not self._started:
+            return
+        try:
+            await self._store().release_run_worker_lease(run_id, self.worker_id)
+        except (OSError, RuntimeError, sqlite3.Error):
+            logger.warning("Run worker lease release failed: run_id=%s", run_id, exc_info=True)
+
+    async def route_cancel(self, run_id: str, engine_name: str) -> bool:
+        """Forward a cancel to the live peer executing `run_id`; False when there is none."""
+        if not self._started:
+            return False
+        lease = await self._store().get_run_worker_lease(run_id, live_since=self.live_since())
+        if not isinstance(lease, dict) or not lease.get("worker_live"):
+            return False
+        owner = str(lease.get("worker_id") or "")
+        if not owner or owner == self.worker_id:
+            return False
+        if owner not in self._live_peer_ids:
+            await self._refresh_peers()
+        routed = self._relay.send(
+            owner,
+            {"type": FRAME_CANCEL, "origin": self.worker_id, "run_id": run_id, "engine": engine_name},
+        )
+        logger.info("Cancel routed to owning worker: run_id=%s worker_id=%s sent=%s", run_id, owner, routed)
+        return routed
+
+    async def live_peer_run_ids(self) -> set[str]:
+        """Runs currently executing on other live workers."""
+        if not self._started:
+            return set()
+        leases = await self._store().list_live_run_worker_leases(live_since=self.live_since())
+        return {str(lease["run_id"]) for lease in leases if lease.get("worker_id") != self.worker_id}
+
+    def notify_dispatch(self) -> None:
+        """Tell peers a run slot was freed so their dispatchers retry."""
+        if self._started:
+            self._relay.broadcast({"type": FRAME_DISPATCH, "origin": self.worker_id})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled(),
+            "worker_id": self.worker_id,
+            "live_peers": sorted(self._live_peer_ids),
+            "relay": self._relay.stats(),
+        }
+
+    async def heartbeat_once(self) -> None:
+        store = self._store()
+        if not await store.heartbeat_worker(self.worker_id):
+            # A peer expired this worker (e.g. a long event-loop stall); rejoin.
+            ipc_path = self._relay.socket_path
+            await store.register_worker(
+                worker_id=self.worker_id,
+                pid=os.getpid(),
+                hostname=socket.gethostname(),
+                ipc_path=str(ipc_path) if ipc_path is not None else None,
+                live_since=self.live_since(),
+            )
+        live_since = self.live_since()
+        await self._renew_stalled_workers(live_since)
+        expired = await store.expire_workers(live_since=live_since)
+        if expired:
+            logger.warning("Workers stopped heartbeating: %s", ", ".join(expired))
+        await self._refresh_peers()
+        await process_supervisor.reap_dead_worker_leases(self._live_peer_ids | {self.worker_id})
+        lost_run_ids = await store.take_orphaned_run_worker_leases(live_since=live_since)
+        requeued = await store.requeue_claimed_dispatches(live_since=live_since)
+        if lost_run_ids and self._on_runs_lost is not None:
+            await self._on_runs_lost(lost_run_ids)
+        if (lost_run_ids or requeued) and self._on_dispatch_wakeup is not None:
+            self._on_dispatch_wakeup()
+
+    async def _renew_stalled_workers(self, live_since: str) -> None:
+        store = self._store()
+        hostname = socket.gethostname()
+        for worker in await store.list_stale_workers(live_since=live_since):
+            pid = worker.get("pid")
+            if worker.get("hostname") != hostname or not isinstance(pid, int):
+                continue
+            ipc_path = worker.get("ipc_path")
+            if not await asyncio.to_thread(_worker_process_responsive, pid, ipc_path if ipc_path else None):
+                continue
+            worker_id = str(worker["worker_id"])
+            if await store.heartbeat_worker(worker_id):
+                logger.warning("Worker missed its heartbeat but is still running; lease renewed: %s", worker_id)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.heartbeat_interval_sec())
+                await self.heartbeat_once()
+            except asyncio.CancelledError:
+                raise
+            except (OSError, RuntimeError, ValueError, sqlite3.Error):
+                logger.warning("Worker heartbeat failed: worker_id=%s", self.worker_id, exc_info=True)
+
+    async def _refresh_peers(self) -> None:
+        workers = await self._store().list_live_workers(live_since=self.live_since())
+        peers = {
+            str(worker["worker_id"]): str(worker.get("ipc_path") or "")
+            for worker in workers
+            if worker.get("worker_id") != self.worker_id
+        }
+        self._live_peer_ids = frozenset(peers)
+        self._relay.set_peers(peers)
+
+    def _journal_listener(self, channel: str) -> Callable[[str, dict[str, Any], bool], None]:
+        def _relay_row(run_id: str, row: dict[str, Any], terminal: bool) -> None:
+            self._relay.broadcast(
+                {
+                    "type": FRAME_JOURNAL,
+                    "origin": self._worker_id,
+                    "channel": channel,
+                    "run_id": run_id,
+                    "row": row,
+                    "terminal": terminal,
+                }
+            )
+
+        return _relay_row
+
+    def _relay_run_state_change(self, request_id: str) -> None:
+        self._relay.broadcast({"type": FRAME_RUN_STATE, "origin": self._worker_id, "request_id": request_id})
+
+    async def _handle_frame(self, frame: Dict[str, Any]) -> None:
+        frame_type = frame.get("type")
+        if frame.get("origin") == self._worker_id:
+            return
+        if frame_type == FRAME_JOURNAL:
+            journal = self._journal_map.get(str(frame.get("channel") or ""))
+            row = frame.get("row")
+            if journal is not None and isinstance(row, dict):
+                journal.publish_relayed(
+                    run_id=str(frame["run_id"]),
+                    row=row,
+                    terminal=bool(frame.get("terminal")),
+                )
+        elif frame_type == FRAME_RUN_STATE:
+            await self._store().apply_remote_run_state_change(str(frame["request_id"]))
+        elif frame_type == FRAME_CANCEL:
+            if self._on_cancel is not None:
+                await self._on_cancel(str(frame["run_id"]), str(frame.get("engine") or ""))
+        elif frame_type == FRAME_DISPATCH:
+            if self._on_dispatch_wakeup is not None:
+                self._on_dispatch_wakeup()
+
+
+worker_coordinator = WorkerCoordinator()
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import psutil  # type: ignore[import-untyped]
+except ImportError:
+    psutil = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_PROC_ROOT = Path("/proc")
+DECISION_HISTORY_SIZE = 64
+
+
+@dataclass(frozen=True)
+class RunUsageSample:
+    """Resource usage of one leased run process tree at one point in time."""
+
+    lease_id: str
+    rss_mb: float
+    cpu_cores: float
+    fd_count: int
+    process_count: int
+    engine: str | None = None
+
+
+@dataclass(frozen=True)
+class SystemCapacity:
+    """Host-wide resources available to new runs at sampling time."""
+
+    cpu_count: int
+    mem_available_mb: int
+    fd_soft_limit: int | None
+    pid_soft_limit: int | None
+    load_per_cpu: float | None = None
+
+
+@dataclass(frozen=True)
+class AdaptivePolicy:
+    min_concurrent: int
+    hard_cap: int
+    cpu_factor: float
+    mem_reserve_mb: int
+    fd_reserve: int
+    pid_reserve: int
+    estimated_mem_per_run_mb: int
+    estimated_fd_per_run: int
+    estimated_pid_per_run: int
+    min_cpu_per_run: float = 0.05
+    ewma_alpha: float = 0.3
+    max_step_up: int = 1
+    overload_load_per_cpu: float = 1.5
+
+
+@dataclass(frozen=True)
+class AdaptiveDecision:
+    ts: float
+    previous_limit: int
+    target_limit: int
+    applied_limit: int
+    running: int
+    reason: str
+    limits: dict[str, int] = field(default_factory=dict)
+    per_run: dict[str, float] = field(default_factory=dict)
+    sampled_runs: int = 0
+
+    def to_payload(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class AdaptiveConcurrencyController:
+    """Grow or shrink the run slot count from observed per-run usage.
+
+    Per-run RSS, CPU, FD and process counts are smoothed with an EWMA and
+    replace the static `ESTIMATED_*_PER_RUN` values (and the one core per run
+    the static CPU sizing assumes) once real samples exist. Until then the slot
+    count is never raised. It grows by at most `max_step_up` per tick and
+    shrinks to the computed target immediately, always within
+    `[min_concurrent, hard_cap]`.
+    """
+
+    def __init__(self, policy: AdaptivePolicy, *, history_size: int = DECISION_HISTORY_SIZE) -> None:
+        self.policy = policy
+        self._per_run: dict[str, float] = {
+            "rss_mb": float(policy.estimated_mem_per_run_mb),
+            # Static sizing grants one slot per `cpu_factor` core.
+            "cpu_cores": 1.0,
+            "fd_count": float(policy.estimated_fd_per_run),
+            "process_count": float(policy.estimated_pid_per_run),
+        }
+        self._observed = False
+        self._decisions: deque[AdaptiveDecision] = deque(maxlen=max(1, history_size))
+
+    @property
+    def per_run_estimates(self) -> dict[str, float]:
+        return dict(self._per_run)
+
+    def decisions(self) -> list[dict[str, Any]]:
+        return [decision.to_payload() for decision in self._decisions]
+
+    def decide(
+        self,
+        *,
+        current_limit: int,
+        running: int,
+        samples: Iterable[RunUsageSample],
+        capacity: SystemCapacity,
+        now: float | None = None,
+    ) -> AdaptiveDecision:
+        sample_list = list(samples)
+        self._absorb(sample_list)
+        policy = self.policy
+        per_run_rss = max(1.0, self._per_run["rss_mb"])
+        per_run_cpu = max(policy.min_cpu_per_run, self._per_run["cpu_cores"])
+        per_run_fd = max(1.0, self._per_run["fd_count"])
+        per_run_pid = max(1.0, self._per_run["process_count"])
+
+        # MemAvailable already excludes what running trees use, so new capacity
+        # is added on top of the runs that are currently holding slots.
+        mem_headroom = max(0, capacity.mem_available_mb - policy.mem_reserve_mb)
+        limits: dict[str, int] = {
+            "hard_cap": policy.hard_cap,
+            "mem": running + int(mem_headroom // per_run_rss),
+            "cpu": max(1, int((capacity.cpu_count * policy.cpu_factor) // per_run_cpu)),
+        }
+        if capacity.fd_soft_limit is not None and capacity.fd_soft_limit > 0:
+            fd_budget = max(0, capacity.fd_soft_limit - policy.fd_reserve)
+            limits["fd"] = int(fd_budget // per_run_fd)
+        if capacity.pid_soft_limit is not None and capacity.pid_soft_limit > 0:
+            pid_budget = max(0, capacity.pid_soft_limit - policy.pid_reserve)
+            limits["pid"] = int(pid_budget // per_run_pid)
+
+        binding = min(limits, key=lambda name: limits[name])
+        target = min(limits.values())
+        reason = f"bound_by_{binding}"
+        if capacity.load_per_cpu is not None and capacity.load_per_cpu > policy.overload_load_per_cpu:
+            overloaded_target = max(policy.min_concurrent, min(target, running - 1, current_limit - 1))
+            if overloaded_target < target:
+                target = overloaded_target
+                reason = "host_overloaded"
+        target = max(policy.min_concurrent, min(policy.hard_cap, target))
+
+        if target > current_limit and not self._observed:
+            # Estimates alone never justify more slots than the static sizing.
+            applied = current_limit
+            reason = "awaiting_samples"
+        elif target > current_limit:
+            applied = min(target, current_limit + max(1, policy.max_step_up))
+        else:
+            applied = target
+        decision = AdaptiveDecision(
+            ts=time.time() if now is None else now,
+            previous_limit=current_limit,
+            target_limit=target,
+            applied_limit=applied,
+            running=running,
+            reason=reason if applied != current_limit else f"hold:{reason}",
+            limits=limits,
+            per_run={key: round(value, 3) for key, value in self._per_run.items()},
+            sampled_runs=len(sample_list),
+        )
+        self._decisions.append(decision)
+        return decision
+
+    def _absorb(self, samples: list[RunUsageSample]) -> None:
+        if not samples:
+            return
+        count = float(len(samples))
+        means = {
+            "rss_mb": sum(sample.rss_mb for sample in samples) / count,
+            "cpu_cores": sum(sample.cpu_cores for sample in samples) / count,
+            "fd_count": sum(sample.fd_count for sample in samples) / count,
+            "process_count": sum(sample.process_count for sample in samples) / count,
+        }
+        if not self._observed:
+            self._per_run.update(means)
+            self._observed = True
+            return
+        alpha = min(1.0, max(0.0, self.policy.ewma_alpha))
+        for key, value in means.items():
+            self._per_run[key] = (1.0 - alpha) * self._per_run[key] + alpha * value
+
+
+@dataclass
+class _CpuMark:
+    cpu_seconds: float
+    wall: float
+
+
+class ProcessTreeSampler:
+    """Sample RSS/CPU/FD usage of a process tree via psutil, or `/proc` when psutil is absent."""
+
+    def __init__(self) -> None:
+        self._cpu_marks: dict[str, _CpuMark] = {}
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def sample(self, leases: Iterable[dict[str, Any]]) -> list[RunUsageSample]:
+        lease_list = [lease for lease in leases if isinstance(lease.get("pid"), int) and int(lease["pid"]) > 0]
+        if not lease_list:
+            self._cpu_marks.clear()
+            return []
+        children_map = self._proc_children_map() if psutil is None else None
+        now = time.monotonic()
+        samples: list[RunUsageSample] = []
+        live_ids: set[str] = set()
+        for lease in lease_list:
+            lease_id = str(lease.get("lease_id") or lease["pid"])
+            try:
+                usage = (
+                    self._sample_psutil(int(lease["pid"]))
+                    if psutil is not None
+                    else self._sample_proc(int(lease["pid"]), children_map or {})
+                )
+            except (OSError, ValueError, RuntimeError):
+                continue
+            if usage is None:
+                continue
+            rss_bytes, cpu_seconds, fd_count, process_count = usage
+            live_ids.add(lease_id)
+            mark = self._cpu_marks.get(lease_id)
+            cpu_cores = 0.0
+            if mark is not None and now > mark.wall:
+                cpu_cores = max(0.0, (cpu_seconds - mark.cpu_seconds) / (now - mark.wall))
+            self._cpu_marks[lease_id] = _CpuMark(cpu_seconds=cpu_seconds, wall=now)
+            samples.append(
+                RunUsageSample(
+                    lease_id=lease_id,
+                    rss_mb=rss_bytes / (1024 * 1024),
+                    cpu_cores=cpu_cores,
+                    fd_count=fd_count,
+                    process_count=process_count,
+                    engine=lease.get("engine") if isinstance(lease.get("engine"), str) else None,
+                )
+            )
+        for stale in set(self._cpu_marks) - live_ids:
+            self._cpu_marks.pop(stale, None)
+        return samples
+
+    def _sample_psutil(self, pid: int) -> tuple[int, float, int, int] | None:
+        assert psutil is not None
+        try:
+            root = psutil.Process(pid)
+            processes = [root, *root.children(recursive=True)]
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        rss = 0
+        cpu = 0.0
+        fds = 0
+        counted = 0
+        for proc in processes:
+            try:
+                with proc.oneshot():
+                    rss += int(proc.memory_info().rss)
+                    times = proc.cpu_times()
+                    cpu += float(times.user + times.system)
+                    fds += int(proc.num_fds() if hasattr(proc, "num_fds") else proc.num_handles())
+                counted += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        if counted == 0:
+            return None
+        return rss, cpu, fds, counted
+
+    def _proc_children_map(self) -> dict[int, list[int]]:
+        children: dict[int, list[int]] = {}
+        if not _PROC_ROOT.is_dir():
+            return children
+        for entry in _PROC_ROOT.iterdir():
+            if not entry.name.isdigit():
+                continue
+            try:
+                stat_text = (entry / "stat").read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            ppid = self._parse_proc_stat(stat_text)[0]
+            if ppid is not None:
+                children.setdefault(ppid, []).append(int(entry.name))
+        return children
+
+    def _sample_proc(self, pid: int, children_map: dict[int, list[int]]) -> tuple[int, float, int, int] | None:
+        pending = [pid]
+        seen: set[int] = set()
+        rss = 0
+        cpu = 0.0
+        fds = 0
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            proc_dir = _PROC_ROOT / str(current)
+            try:
+                statm = (proc_dir / "statm").read_text(encoding="utf-8").split()
+                stat_text = (proc_dir / "stat").read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                seen.discard(current)
+                continue
+            rss += int(statm[1]) * int(self._page_size)
+            cpu += self._parse_proc_stat(stat_text)[1] / float(self._clock_ticks)
+            try:
+                fds += len(os.listdir(proc_dir / "fd"))
+            except OSError:
+                pass
+            pending.extend(children_map.get(current, []))
+        if not seen:
+            return None
+        return rss, cpu, fds, len(seen)
+
+    @staticmethod
+    def _parse_proc_stat(stat_text: str) -> tuple[int | None, float]:
+        # The command name may contain spaces; fields resume after the last ')'.
+        tail = stat_text.rsplit(")", 1)[-1].split()
+        if len(tail) < 13:
+            return None, 0.0
+        ppid = int(tail[1])
+        utime = float(tail[11])
+        stime = float(tail[12])
+        return ppid, utime + stime
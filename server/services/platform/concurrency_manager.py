@@ -5,10 +5,18 @@ import logging
 import os
 import platform
 import threading
+from collections import deque
 from pathlib import Path
 from typing import Any, Dict
 
 from server.config import config
+from server.services.platform.adaptive_concurrency_controller import (
+    AdaptiveConcurrencyController,
+    AdaptivePolicy,
+    ProcessTreeSampler,
+    RunUsageSample,
+    SystemCapacity,
+)
 
 try:
     import psutil  # type: ignore[import-untyped]
@@ -25,19 +33,76 @@ class _WindowsConcurrencyProbeFatal(RuntimeError):
     """Fatal probe error on Windows; caller should fail fast."""
 
 
+class _ResizableSlotGate:
+    """
+    FIFO slot gate whose capacity can change while slots are held.
+
+    Shrinking never revokes held slots; it only delays new grants until
+    enough running slots have been released.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = max(1, int(limit))
+        self._in_use = 0
+        self._waiters: deque[asyncio.Future[bool]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    async def acquire(self) -> bool:
+        if self._in_use < self._limit and not self._waiters:
+            self._in_use += 1
+            return True
+        waiter: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted right before cancellation; hand it on.
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        return True
+
+    def release(self) -> None:
+        if self._in_use > 0:
+            self._in_use -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self._limit = max(1, int(limit))
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_use < self._limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_use += 1
+            waiter.set_result(True)
+
+
 class ConcurrencyManager:
     """
     Global concurrency guard for CLI process execution.
 
     Behavior:
     - Admits requests into a bounded queue.
-    - Moves queued tasks into running slots via a semaphore.
+    - Moves queued tasks into running slots via a resizable slot gate.
     - Rejects new requests with queue-full signal when queue is saturated.
+    - Optionally resizes the slot count from sampled per-run usage of leased
+      run process trees (see `AdaptiveConcurrencyController`).
     """
 
     def __init__(self) -> None:
         self._initialized = False
-        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore: asyncio.Semaphore | _ResizableSlotGate | None = None
         self._state_lock = threading.Lock()
         self._running = 0
         self._queued = 0
@@ -45,6 +110,9 @@ class ConcurrencyManager:
         self._max_queue_size = 1
         self._policy: Dict[str, Any] = {}
         self._loop_id: int | None = None
+        self._adaptive: AdaptiveConcurrencyController | None = None
+        self._sampler = ProcessTreeSampler()
+        self._adaptive_task: asyncio.Task[None] | None = None
 
     def start(self) -> None:
         if self._initialized:
@@ -61,14 +129,45 @@ class ConcurrencyManager:
             self._max_queue_size = 128
             self._policy = {"fallback": True}
 
-        self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        self._adaptive = self._build_adaptive_controller(self._policy)
+        self._semaphore = _ResizableSlotGate(self._max_concurrent)
         self._initialized = True
         logger.info(
-            "Concurrency manager initialized: max_concurrent=%s max_queue_size=%s",
+            "Concurrency manager initialized: max_concurrent=%s max_queue_size=%s adaptive=%s",
             self._max_concurrent,
             self._max_queue_size,
+            self._adaptive is not None,
         )
 
+    def start_adaptive(self) -> None:
+        self.start()
+        if self._adaptive is None or self._adaptive_task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._adaptive_task = loop.create_task(self._adaptive_loop())
+
+    async def stop_adaptive(self) -> None:
+        task = self._adaptive_task
+        self._adaptive_task = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return
+
+    def set_max_concurrent(self, limit: int) -> None:
+        limit = max(1, int(limit))
+        with self._state_lock:
+            self._max_concurrent = limit
+            gate = self._semaphore
+        if isinstance(gate, _ResizableSlotGate):
+            gate.resize(limit)
+
     async def admit_or_reject(self) -> bool:
         self.start()
         self._ensure_loop()
@@ -90,6 +189,11 @@ class ConcurrencyManager:
         with self._state_lock:
             self._running += 1
 
+    def sync_queued(self, count: int) -> None:
+        """Align the admission counter with the durable dispatch queue depth."""
+        with self._state_lock:
+            self._queued = max(0, int(count))
+
     async def release_slot(self) -> None:
         if self._semaphore is None:
             return
@@ -108,12 +212,143 @@ class ConcurrencyManager:
                 "max_queue_size": self._max_queue_size,
             }
 
+    def adaptive_state(self) -> Dict[str, Any]:
+        controller = self._adaptive
+        with self._state_lock:
+            payload: Dict[str, Any] = {
+                "adaptive_enabled": controller is not None,
+                "running": self._running,
+                "queued": self._queued,
+                "max_concurrent": self._max_concurrent,
+                "max_queue_size": self._max_queue_size,
+            }
+        if controller is None:
+            payload.update(
+                {"min_concurrent": None, "hard_cap": None, "per_run_estimates": {}, "decisions": []}
+            )
+            return payload
+        payload.update(
+            {
+                "min_concurrent": controller.policy.min_concurrent,
+                "hard_cap": controller.policy.hard_cap,
+                "per_run_estimates": controller.per_run_estimates,
+                "decisions": controller.decisions(),
+            }
+        )
+        return payload
+
+    def adaptive_tick(self, leases: list[Dict[str, Any]] | None = None) -> Dict[str, Any] | None:
+        """Sample leased run process trees once and apply the controller decision."""
+        if self._adaptive is None:
+            return None
+        samples, capacity = self._collect_adaptive_inputs(leases)
+        return self._apply_adaptive_decision(samples, capacity)
+
+    def _collect_adaptive_inputs(
+        self,
+        leases: list[Dict[str, Any]] | None = None,
+    ) -> tuple[list[RunUsageSample], SystemCapacity]:
+        if leases is None:
+            from server.services.platform.process_supervisor import process_supervisor
+
+            leases = process_supervisor.list_active_leases(owner_kind="run_attempt")
+        return self._sampler.sample(leases), self._system_capacity()
+
+    def _apply_adaptive_decision(
+        self,
+        samples: list[RunUsageSample],
+        capacity: SystemCapacity,
+    ) -> Dict[str, Any] | None:
+        controller = self._adaptive
+        if controller is None:
+            return None
+        with self._state_lock:
+            current_limit = self._max_concurrent
+            running = self._running
+        decision = controller.decide(
+            current_limit=current_limit,
+            running=running,
+            samples=samples,
+            capacity=capacity,
+        )
+        if decision.applied_limit != current_limit:
+            logger.info(
+                "Adaptive concurrency resize: %s -> %s (%s)",
+                current_limit,
+                decision.applied_limit,
+                decision.reason,
+            )
+            self.set_max_concurrent(decision.applied_limit)
+        return decision.to_payload()
+
+    async def _adaptive_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self._adaptive_interval_sec())
+                # Probing /proc is blocking; the gate itself is only resized on the loop.
+                samples, capacity = await asyncio.to_thread(self._collect_adaptive_inputs)
+                self._apply_adaptive_decision(samples, capacity)
+            except asyncio.CancelledError:
+                raise
+            except (OSError, RuntimeError, ValueError, TypeError):
+                logger.warning("Adaptive concurrency tick failed", exc_info=True)
+
+    def _adaptive_interval_sec(self) -> float:
+        return max(1.0, float(self._policy.get("adaptive_interval_sec", 10.0)))
+
+    def _build_adaptive_controller(self, policy: Dict[str, Any]) -> AdaptiveConcurrencyController | None:
+        if not policy.get("adaptive_enabled"):
+            return None
+        hard_cap = max(1, int(policy["max_concurrent_hard_cap"]))
+        return AdaptiveConcurrencyController(
+            AdaptivePolicy(
+                min_concurrent=min(hard_cap, max(1, int(policy["min_concurrent"]))),
+                hard_cap=hard_cap,
+                cpu_factor=float(policy["cpu_factor"]),
+                mem_reserve_mb=int(policy["mem_reserve_mb"]),
+                fd_reserve=int(policy["fd_reserve"]),
+                pid_reserve=int(policy["pid_reserve"]),
+                estimated_mem_per_run_mb=int(policy["estimated_mem_per_run_mb"]),
+                estimated_fd_per_run=int(policy["estimated_fd_per_run"]),
+                estimated_pid_per_run=int(policy["estimated_pid_per_run"]),
+            )
+        )
+
+    def _system_capacity(self) -> SystemCapacity:
+        cpu_count = os.cpu_count() or 1
+        fd_soft: int | None = None
+        pid_soft: int | None = None
+        if self._is_windows():
+            fd_soft = self._windows_max_stdio()
+            pid_soft = self._windows_active_process_limit()
+        else:
+            getrlimit = getattr(resource, "getrlimit", None)
+            if getrlimit is not None:
+                fd_value, _ = getrlimit(resource.RLIMIT_NOFILE)
+                fd_soft = int(fd_value) if fd_value >= 0 else None
+                nproc_value, _ = getrlimit(resource.RLIMIT_NPROC)
+                pid_soft = int(nproc_value) if nproc_value >= 0 else None
+        load_per_cpu: float | None = None
+        getloadavg = getattr(os, "getloadavg", None)
+        if getloadavg is not None:
+            try:
+                load_per_cpu = float(getloadavg()[0]) / float(cpu_count)
+            except OSError:
+                load_per_cpu = None
+        return SystemCapacity(
+            cpu_count=cpu_count,
+            mem_available_mb=self._mem_available_mb(),
+            fd_soft_limit=fd_soft,
+            pid_soft_limit=pid_soft,
+            load_per_cpu=load_per_cpu,
+        )
+
     def reset_runtime_state(self) -> None:
         self.start()
         with self._state_lock:
             self._running = 0
             self._queued = 0
-            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+            self._semaphore = _ResizableSlotGate(self._max_concurrent)
             self._loop_id = None
 
     def _ensure_loop(self) -> None:
@@ -130,7 +365,7 @@ class ConcurrencyManager:
             self._loop_id = current_id
             return
         if self._loop_id != current_id:
-            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+            self._semaphore = _ResizableSlotGate(self._max_concurrent)
             self._running = 0
             self._queued = 0
             self._loop_id = current_id
@@ -148,6 +383,9 @@ class ConcurrencyManager:
             "pid_reserve": int(cfg.PID_RESERVE),
             "estimated_pid_per_run": int(cfg.ESTIMATED_PID_PER_RUN),
             "fallback_max_concurrent": int(cfg.FALLBACK_MAX_CONCURRENT),
+            "adaptive_enabled": bool(cfg.ADAPTIVE_ENABLED),
+            "adaptive_interval_sec": float(cfg.ADAPTIVE_INTERVAL_SEC),
+            "min_concurrent": int(cfg.MIN_CONCURRENT),
         }
 
         policy["max_concurrent_hard_cap"] = self._env_int(
@@ -190,6 +428,18 @@ class ConcurrencyManager:
             "SKILL_RUNNER_FALLBACK_MAX_CONCURRENT",
             policy.get("fallback_max_concurrent", 2),
         )
+        policy["adaptive_enabled"] = self._env_bool(
+            "SKILL_RUNNER_ADAPTIVE_CONCURRENCY_ENABLED",
+            policy.get("adaptive_enabled", False),
+        )
+        policy["adaptive_interval_sec"] = self._env_float(
+            "SKILL_RUNNER_ADAPTIVE_CONCURRENCY_INTERVAL_SEC",
+            policy.get("adaptive_interval_sec", 10.0),
+        )
+        policy["min_concurrent"] = self._env_int(
+            "SKILL_RUNNER_MIN_CONCURRENT",
+            policy.get("min_concurrent", 1),
+        )
         return policy
 
     def _compute_max_concurrency(self, policy: Dict[str, Any]) -> int:
@@ -400,6 +650,18 @@ class ConcurrencyManager:
             logger.warning("Invalid integer env %s=%s, fallback to %s", key, raw, default)
             return int(default)
 
+    def _env_bool(self, key: str, default: bool) -> bool:
+        raw = os.environ.get(key)
+        if raw is None:
+            return bool(default)
+        normalized = raw.strip().lower()
+        if normalized in {"1", "true", "yes", "on"}:
+            return True
+        if normalized in {"0", "false", "no", "off"}:
+            return False
+        logger.warning("Invalid boolean env %s=%s, fallback to %s", key, raw, default)
+        return bool(default)
+
     def _env_float(self, key: str, default: float) -> float:
         raw = os.environ.get(key)
         if raw is None:
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import stat
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+from uuid import uuid4
+
+from server.config import config
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def sha256_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ContentAddressedStore:
+    """
+    Optional content-addressed file store under `<data_dir>/cas`.
+
+    Files are copied once into the store as read-only `objects/<aa>/<sha256>`
+    and hardlinked into run workspaces, so the link count of an object is its
+    reference count: an
+    object whose only remaining link is its own store path is garbage and
+    is removed by `collect_garbage` (called by run cleanup after run
+    directories are deleted). Only files that are written once per run are
+    ingested; a workspace that is about to be written again (workspace
+    reuse) gets private, writable copies back through `detach_tree` first.
+    An object is re-hashed before another file is linked to it, and one that
+    no longer matches its digest is replaced.
+    """
+
+    def __init__(
+        self,
+        *,
+        root: Path | None = None,
+        enabled: bool | None = None,
+        min_file_bytes: int | None = None,
+    ) -> None:
+        self._root = root
+        self._enabled = enabled
+        self._min_file_bytes = min_file_bytes
+
+    @property
+    def root(self) -> Path:
+        return self._root or Path(config.SYSTEM.CONTENT_STORE_DIR)
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        return bool(config.SYSTEM.CONTENT_STORE_ENABLED)
+
+    @property
+    def min_file_bytes(self) -> int:
+        if self._min_file_bytes is not None:
+            return self._min_file_bytes
+        return max(1, int(config.SYSTEM.CONTENT_STORE_MIN_FILE_BYTES))
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.root / "objects"
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def ingest_tree(
+        self,
+        tree: Path,
+        *,
+        base_dir: Path | None = None,
+        known_digests: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> dict[str, int]:
+        if not self.enabled or not tree.is_dir():
+            return {"files": 0, "linked": 0, "saved_bytes": 0}
+        return self.ingest_files(
+            self._iter_regular_files(tree),
+            base_dir=base_dir or tree,
+            known_digests=known_digests,
+        )
+
+    def ingest_files(
+        self,
+        paths: Iterable[Path],
+        *,
+        base_dir: Path,
+        known_digests: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> dict[str, int]:
+        """
+        Replace regular files with hardlinks to store objects.
+
+        `known_digests` maps `base_dir`-relative POSIX paths to entries with
+        `sha256`, `size`, `mtime_ns` and optionally `inode` (e.g. the
+        filesystem snapshot fingerprints); a digest is reused only if all of
+        them still match, otherwise the file is hashed again.
+        """
+        totals = {"files": 0, "linked": 0, "saved_bytes": 0}
+        if not self.enabled:
+            return totals
+        known = known_digests or {}
+        for path in paths:
+            try:
+                file_stat = path.lstat()
+            except OSError:
+                continue
+            if not stat.S_ISREG(file_stat.st_mode):
+                continue
+            if file_stat.st_nlink > 1 or file_stat.st_size < self.min_file_bytes:
+                continue
+            totals["files"] += 1
+            try:
+                rel_path = path.relative_to(base_dir).as_posix()
+            except ValueError:
+                rel_path = ""
+            try:
+                digest = self._known_digest(known.get(rel_path), file_stat) or sha256_file(path)
+                saved = self._link_into_store(path, digest, file_stat.st_size)
+            except OSError:
+                logger.warning("Content store ingest failed: path=%s", path, exc_info=True)
+                continue
+            totals["linked"] += 1
+            totals["saved_bytes"] += saved
+        return totals
+
+    def detach_tree(self, tree: Path) -> int:
+        """Give every hardlinked file under `tree` its own inode again; returns files detached."""
+        if not tree.is_dir() or not self.objects_dir.is_dir():
+            return 0
+        detached = 0
+        for path in self._iter_regular_files(tree):
+            try:
+                if path.lstat().st_nlink <= 1:
+                    continue
+                tmp_path = path.with_name(f".{path.name}.detach-{uuid4().hex[:8]}")
+                shutil.copy2(path, tmp_path)
+                # Store objects are read-only; the private copy is the run's to write again.
+                os.chmod(tmp_path, stat.S_IMODE(tmp_path.stat().st_mode) | stat.S_IWUSR)
+                os.replace(tmp_path, path)
+            except OSError:
+                logger.warning("Content store detach failed: path=%s", path, exc_info=True)
+                continue
+            detached += 1
+        return detached
+
+    def collect_garbage(self) -> dict[str, int]:
+        removed = {"objects": 0, "bytes": 0}
+        for object_path in self._iter_objects():
+            try:
+                object_stat = object_path.lstat()
+                if object_stat.st_nlink > 1:
+                    continue
+                object_path.unlink()
+            except OSError:
+                continue
+            removed["objects"] += 1
+            removed["bytes"] += int(object_stat.st_size)
+        return removed
+
+    def usage(self) -> dict[str, Any]:
+        """Physical vs. logical bytes of referenced objects; `saved_bytes` is the deduplication gain."""
+        objects = 0
+        physical_bytes = 0
+        logical_bytes = 0
+        saved_bytes = 0
+        unreferenced = 0
+        for object_path in self._iter_objects():
+            try:
+                object_stat = object_path.lstat()
+            except OSError:
+                continue
+            objects += 1
+            physical_bytes += int(object_stat.st_size)
+            references = object_stat.st_nlink - 1
+            if references <= 0:
+                unreferenced += 1
+                continue
+            logical_bytes += int(object_stat.st_size) * references
+            saved_bytes += int(object_stat.st_size) * (references - 1)
+        return {
+            "enabled": self.enabled,
+            "objects": objects,
+            "unreferenced_objects": unreferenced,
+            "physical_bytes": physical_bytes,
+            "logical_bytes": logical_bytes,
+            "saved_bytes": saved_bytes,
+        }
+
+    def _link_into_store(self, path: Path, digest: str, size: int) -> int:
+        object_path = self.object_path(digest)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        saved = size
+        if not self._object_matches(object_path, digest, size):
+            # Never the run's own inode: a later in-place write to it would
+            # change the object for every run linking it.
+            self._store_object(path, digest, object_path)
+            saved = 0
+        tmp_path = path.with_name(f".{path.name}.cas-{uuid4().hex[:8]}")
+        os.link(object_path, tmp_path)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return saved
+
+    def _object_matches(self, object_path: Path, digest: str, size: int) -> bool:
+        try:
+            if object_path.lstat().st_size != size:
+                return False
+        except FileNotFoundError:
+            return False
+        return sha256_file(object_path) == digest
+
+    def _store_object(self, path: Path, digest: str, object_path: Path) -> None:
+        """Copy `path` into the store as a read-only object, replacing a missing or corrupt one."""
+        tmp_path = object_path.with_name(f".{digest}.tmp-{uuid4().hex[:8]}")
+        try:
+            hasher = hashlib.sha256()
+            with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(_HASH_CHUNK_BYTES), b""):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+            if hasher.hexdigest() != digest:
+                raise OSError(f"content changed during content store ingest: {path}")
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, object_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _known_digest(self, entry: Mapping[str, Any] | None, file_stat: os.stat_result) -> str | None:
+        if not isinstance(entry, Mapping):
+            return None
+        digest = entry.get("sha256")
+        if not isinstance(digest, str) or len(digest) != 64:
+            return None
+        if entry.get("size") != file_stat.st_size:
+            return None
+        # Without an exact mtime a same-size rewrite would be linked under the old digest.
+        if entry.get("mtime_ns") != file_stat.st_mtime_ns:
+            return None
+        inode = entry.get("inode")
+        if inode is not None and inode != file_stat.st_ino:
+            return None
+        return digest
+
+    def _iter_regular_files(self, tree: Path) -> Iterable[Path]:
+        for dirpath, _dirnames, filenames in os.walk(tree):
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    if stat.S_ISREG(path.lstat().st_mode):
+                        yield path
+                except OSError:
+                    continue
+
+    def _iter_objects(self) -> Iterable[Path]:
+        if not self.objects_dir.is_dir():
+            return
+        for path in self._iter_regular_files(self.objects_dir):
+            # Dot files are objects still being written by an ingest.
+            if not path.name.startswith("."):
+                yield path
+
+
+content_addressed_store = ContentAddressedStore()
@@ -134,6 +134,7 @@ class DataResetService:
             optional_paths.append(data_dir / "engine_auth_sessions")
         optional_paths.append(data_dir / "ui_shell_sessions")
         optional_paths.append(Path(self._cfg.SYSTEM.TMP_UPLOADS_DIR))
+        optional_paths.append(Path(getattr(self._cfg.SYSTEM, "CONTENT_STORE_DIR", data_dir / "cas")))
         # Legacy persistence artifacts cleanup (best-effort).
         optional_paths.append(data_dir / "runs.db")
         optional_paths.append(data_dir / "runs.db-shm")
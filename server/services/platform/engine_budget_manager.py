@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+from server.config import config
+
+logger = logging.getLogger(__name__)
+
+POOL_TIER_ENGINE = "engine"
+POOL_TIER_PROVIDER = "provider"
+POOL_TIER_MODEL = "model"
+_TIER_BY_DEPTH = {1: POOL_TIER_ENGINE, 2: POOL_TIER_PROVIDER, 3: POOL_TIER_MODEL}
+
+
+def _normalize_part(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def budget_pool_keys(engine: str, provider_id: str | None = None, model: str | None = None) -> list[str]:
+    """Return pool keys from outermost to innermost: `engine`, `engine/provider`, `engine/provider/model`."""
+    engine_key = _normalize_part(engine)
+    if not engine_key:
+        return []
+    keys = [engine_key]
+    provider_key = _normalize_part(provider_id)
+    if provider_key:
+        keys.append(f"{engine_key}/{provider_key}")
+        model_key = _normalize_part(model)
+        if model_key:
+            keys.append(f"{engine_key}/{provider_key}/{model_key}")
+    return keys
+
+
+def budget_target_from_options(options: Mapping[str, Any] | None) -> tuple[str | None, str | None]:
+    """Extract `(provider_id, model)` from merged run options."""
+    if not isinstance(options, Mapping):
+        return None, None
+    provider = _normalize_part(options.get("provider_id")) or None
+    model = _normalize_part(options.get("model")) or None
+    return provider, model
+
+
+def _parse_limit_entries(entries: Iterable[Any]) -> dict[str, int]:
+    limits: dict[str, int] = {}
+    for raw in entries:
+        if not isinstance(raw, str) or "=" not in raw:
+            continue
+        pool, value = raw.rsplit("=", 1)
+        pool = pool.strip().strip("/")
+        try:
+            limit = int(value.strip())
+        except ValueError:
+            logger.warning("Ignoring invalid concurrency budget entry: %s", raw)
+            continue
+        if pool and limit > 0:
+            limits[pool] = limit
+    return limits
+
+
+def _parse_rate_entries(entries: Iterable[Any]) -> dict[str, tuple[float, float]]:
+    rates: dict[str, tuple[float, float]] = {}
+    for raw in entries:
+        if not isinstance(raw, str) or "=" not in raw:
+            continue
+        pool, value = raw.rsplit("=", 1)
+        pool = pool.strip().strip("/")
+        rate_text, _, burst_text = value.partition(":")
+        try:
+            per_min = float(rate_text.strip())
+            burst = float(burst_text.strip()) if burst_text.strip() else max(1.0, per_min)
+        except ValueError:
+            logger.warning("Ignoring invalid provider start rate entry: %s", raw)
+            continue
+        if pool and per_min > 0 and burst >= 1:
+            rates[pool] = (per_min, burst)
+    return rates
+
+
+def _env_entries(key: str, default: Iterable[Any]) -> list[Any]:
+    raw = os.environ.get(key)
+    if raw is None:
+        return list(default)
+    return [item for item in raw.split(",") if item.strip()]
+
+
+@dataclass(frozen=True)
+class EngineBudgetPolicy:
+    limits: dict[str, int] = field(default_factory=dict)
+    start_rates: dict[str, tuple[float, float]] = field(default_factory=dict)
+    backoff_base_sec: float = 15.0
+    backoff_max_sec: float = 600.0
+
+    @classmethod
+    def from_config(cls) -> "EngineBudgetPolicy":
+        cfg = config.SYSTEM.CONCURRENCY
+        limits = _parse_limit_entries(_env_entries("SKILL_RUNNER_ENGINE_LIMITS", cfg.ENGINE_LIMITS))
+        limits.update(_parse_limit_entries(_env_entries("SKILL_RUNNER_PROVIDER_LIMITS", cfg.PROVIDER_LIMITS)))
+        limits.update(_parse_limit_entries(_env_entries("SKILL_RUNNER_MODEL_LIMITS", cfg.MODEL_LIMITS)))
+        start_rates = _parse_rate_entries(
+            _env_entries("SKILL_RUNNER_PROVIDER_START_RATES", cfg.PROVIDER_START_RATES)
+        )
+        return cls(
+            limits=limits,
+            start_rates=start_rates,
+            backoff_base_sec=max(0.0, float(cfg.RATE_LIMIT_BACKOFF_BASE_SEC)),
+            backoff_max_sec=max(0.0, float(cfg.RATE_LIMIT_BACKOFF_MAX_SEC)),
+        )
+
+
+@dataclass
+class _PoolState:
+    key: str
+    limit: int | None = None
+    effective_limit: int | None = None
+    in_use: int = 0
+    rate_per_min: float | None = None
+    burst: float = 0.0
+    tokens: float = 0.0
+    refilled_at: float = 0.0
+    rate_limit_streak: int = 0
+    backoff_until: float = 0.0
+
+    @property
+    def tier(self) -> str:
+        return _TIER_BY_DEPTH.get(self.key.count("/") + 1, POOL_TIER_MODEL)
+
+    def refill(self, now: float) -> None:
+        if self.rate_per_min is None:
+            return
+        elapsed = max(0.0, now - self.refilled_at)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate_per_min / 60.0)
+        self.refilled_at = now
+
+    def blocked_reason(self, now: float) -> str | None:
+        if self.backoff_until > now:
+            return "backoff"
+        if self.effective_limit is not None and self.in_use >= self.effective_limit:
+            return "saturated"
+        if self.rate_per_min is not None:
+            self.refill(now)
+            if self.tokens < 1.0:
+                return "start_rate"
+        return None
+
+    def ready_in(self, now: float) -> float | None:
+        """Seconds until a time-based block lifts; None when only a release can unblock it."""
+        waits: list[float] = []
+        if self.backoff_until > now:
+            waits.append(self.backoff_until - now)
+        if self.rate_per_min is not None and self.tokens < 1.0:
+            waits.append((1.0 - self.tokens) * 60.0 / self.rate_per_min)
+        if self.effective_limit is not None and self.in_use >= self.effective_limit:
+            return None
+        return max(waits) if waits else None
+
+
+class EngineBudgetManager:
+    """
+    Hierarchical run budgets nested under the global slot gate.
+
+    A run belongs to up to three pools: `engine`, `engine/provider` and
+    `engine/provider/model`. A run may start only when none of its pools is
+    saturated, out of start-rate tokens, or cooling down after a rate-limit
+    failure. Rate-limited attempts halve the pool's effective limit and back
+    off exponentially; clean successes grow the limit back one step at a time.
+    """
+
+    def __init__(
+        self,
+        policy: EngineBudgetPolicy | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._policy = policy
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pools: dict[str, _PoolState] = {}
+        self._leases: dict[str, list[str]] = {}
+        self._release_listeners: list[Callable[[], None]] = []
+
+    def _resolved_policy(self) -> EngineBudgetPolicy:
+        if self._policy is None:
+            self._policy = EngineBudgetPolicy.from_config()
+            logger.info(
+                "Engine budgets initialized: limits=%s start_rates=%s",
+                self._policy.limits,
+                self._policy.start_rates,
+            )
+        return self._policy
+
+    def _pool(self, key: str, now: float) -> _PoolState:
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+        policy = self._resolved_policy()
+        pool = _PoolState(key=key, refilled_at=now)
+        limit = policy.limits.get(key)
+        if limit is not None:
+            pool.limit = limit
+            pool.effective_limit = limit
+        rate = policy.start_rates.get(key)
+        if rate is not None:
+            pool.rate_per_min, pool.burst = rate
+            pool.tokens = pool.burst
+        self._pools[key] = pool
+        return pool
+
+    def _configured_keys(self) -> set[str]:
+        policy = self._resolved_policy()
+        return set(policy.limits) | set(policy.start_rates)
+
+    def add_release_listener(self, listener: Callable[[], None]) -> None:
+        if listener not in self._release_listeners:
+            self._release_listeners.append(listener)
+
+    def blocked_pools(self) -> set[str]:
+        now = self._clock()
+        with self._lock:
+            keys = self._configured_keys() | set(self._pools)
+            return {key for key in keys if self._pool(key, now).blocked_reason(now) is not None}
+
+    def next_ready_in(self) -> float | None:
+        now = self._clock()
+        with self._lock:
+            waits = [
+                wait
+                for pool in self._pools.values()
+                if pool.blocked_reason(now) is not None
+                for wait in [pool.ready_in(now)]
+                if wait is not None
+            ]
+        return min(waits) if waits else None
+
+    def try_acquire(
+        self,
+        run_id: str,
+        engine: str,
+        provider_id: str | None = None,
+        model: str | None = None,
+    ) -> bool:
+        keys = budget_pool_keys(engine, provider_id, model)
+        now = self._clock()
+        with self._lock:
+            if run_id in self._leases:
+                return True
+            pools = [self._pool(key, now) for key in keys]
+            if any(pool.blocked_reason(now) is not None for pool in pools):
+                return False
+            self._take(run_id, pools)
+        return True
+
+    def acquire_unchecked(
+        self,
+        run_id: str,
+        engine: str,
+        provider_id: str | None = None,
+        model: str | None = None,
+    ) -> None:
+        """Account a run that already holds a global slot (resume paths) without blocking it."""
+        keys = budget_pool_keys(engine, provider_id, model)
+        now = self._clock()
+        with self._lock:
+            if run_id in self._leases:
+                return
+            pools = [self._pool(key, now) for key in keys]
+            for pool in pools:
+                pool.refill(now)
+            self._take(run_id, pools)
+
+    def _take(self, run_id: str, pools: list[_PoolState]) -> None:
+        for pool in pools:
+            pool.in_use += 1
+            if pool.rate_per_min is not None:
+                pool.tokens = max(0.0, pool.tokens - 1.0)
+        self._leases[run_id] = [pool.key for pool in pools]
+
+    def release(self, run_id: str) -> None:
+        with self._lock:
+            keys = self._leases.pop(run_id, None)
+            if keys is None:
+                return
+            for key in keys:
+                pool = self._pools.get(key)
+                if pool is not None and pool.in_use > 0:
+                    pool.in_use -= 1
+        for listener in list(self._release_listeners):
+            listener()
+
+    def record_attempt(
+        self,
+        engine: str,
+        provider_id: str | None = None,
+        model: str | None = None,
+        *,
+        rate_limited: bool,
+        succeeded: bool = False,
+    ) -> None:
+        keys = budget_pool_keys(engine, provider_id, model)
+        if not keys:
+            return
+        policy = self._resolved_policy()
+        now = self._clock()
+        with self._lock:
+            if rate_limited:
+                # Upstream limits are per provider account; fall back to the engine pool.
+                pool = self._pool(keys[min(1, len(keys) - 1)], now)
+                pool.rate_limit_streak += 1
+                delay = min(
+                    policy.backoff_max_sec,
+                    policy.backoff_base_sec * (2 ** (pool.rate_limit_streak - 1)),
+                )
+                pool.backoff_until = max(pool.backoff_until, now + delay)
+                if pool.effective_limit is not None:
+                    pool.effective_limit = max(1, pool.effective_limit // 2)
+                logger.warning(
+                    "Engine budget backoff: pool=%s streak=%s delay=%.1fs effective_limit=%s",
+                    pool.key,
+                    pool.rate_limit_streak,
+                    delay,
+                    pool.effective_limit,
+                )
+                return
+            if not succeeded:
+                return
+            for key in keys:
+                pool = self._pools.get(key)
+                if pool is None:
+                    continue
+                pool.rate_limit_streak = 0
+                if pool.limit is not None and pool.effective_limit is not None:
+                    pool.effective_limit = min(pool.limit, pool.effective_limit + 1)
+
+    def state(self, queued_by_pool: Mapping[str, int] | None = None) -> list[dict[str, Any]]:
+        queued = dict(queued_by_pool or {})
+        now = self._clock()
+        with self._lock:
+            keys = self._configured_keys() | set(self._pools) | set(queued)
+            payload: list[dict[str, Any]] = []
+            for key in sorted(keys):
+                pool = self._pool(key, now)
+                blocked = pool.blocked_reason(now)
+                payload.append(
+                    {
+                        "pool": key,
+                        "tier": pool.tier,
+                        "limit": pool.limit,
+                        "effective_limit": pool.effective_limit,
+                        "running": pool.in_use,
+                        "queued": int(queued.get(key, 0)),
+                        "start_rate_per_min": pool.rate_per_min,
+                        "tokens": round(pool.tokens, 3) if pool.rate_per_min is not None else None,
+                        "rate_limit_streak": pool.rate_limit_streak,
+                        "backoff_remaining_sec": round(max(0.0, pool.backoff_until - now), 3),
+                        "blocked_reason": blocked,
+                    }
+                )
+        return payload
+
+    def reset_runtime_state(self) -> None:
+        with self._lock:
+            self._pools.clear()
+            self._leases.clear()
+
+
+engine_budget_manager = EngineBudgetManager()
@@ -3,11 +3,21 @@ from __future__ import annotations
 import importlib
 import json
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 
 PREVIEW_MAX_BYTES = 256 * 1024
+PREVIEW_WINDOW_DEFAULT_LINES = 200
+PREVIEW_WINDOW_MAX_LINES = 5000
+_WINDOW_READ_CHUNK_BYTES = 64 * 1024
+_LINE_INDEX_STRIDE_BYTES = 1024 * 1024
+_LINE_INDEX_MAX_FILES = 64
+# Windows further than this past the nearest indexed offset get no absolute line numbers.
+_LINE_INDEX_MAX_SCAN_BYTES = 32 * 1024 * 1024
 TEXT_DECODE_CANDIDATES = (
     "utf-8",
     "utf-8-sig",
@@ -58,11 +68,67 @@ _BLEACH_ATTRIBUTES: dict[str, list[str]] = {
 _BLEACH_PROTOCOLS = ["http", "https", "mailto"]
 
 
-def build_preview_payload(file_path: Path) -> dict[str, Any]:
+@dataclass(frozen=True)
+class PreviewWindow:
+    """Slice of a file to preview.
+
+    `head` / `tail` select the first / last `lines` lines; `range` selects
+    `length` bytes from `offset`, widened to whole lines. Every window is
+    additionally capped at `PREVIEW_MAX_BYTES`.
+    """
+
+    kind: Literal["head", "tail", "range"] = "head"
+    lines: int = PREVIEW_WINDOW_DEFAULT_LINES
+    offset: int = 0
+    length: int = PREVIEW_MAX_BYTES
+
+    def normalized(self) -> "PreviewWindow":
+        if self.kind not in {"head", "tail", "range"}:
+            raise ValueError("window must be one of: head, tail, range")
+        return PreviewWindow(
+            kind=self.kind,
+            lines=min(max(1, int(self.lines)), PREVIEW_WINDOW_MAX_LINES),
+            offset=max(0, int(self.offset)),
+            length=min(max(1, int(self.length)), PREVIEW_MAX_BYTES),
+        )
+
+    def cache_key(self) -> tuple[str, int, int, int]:
+        if self.kind == "range":
+            return (self.kind, 0, self.offset, self.length)
+        return (self.kind, self.lines, 0, 0)
+
+
+def build_preview_window(
+    kind: str | None,
+    *,
+    lines: int = PREVIEW_WINDOW_DEFAULT_LINES,
+    offset: int = 0,
+    length: int = PREVIEW_MAX_BYTES,
+) -> PreviewWindow | None:
+    """Translate preview query parameters into a window; `None` keeps the default preview."""
+    if kind is None or not kind.strip():
+        return None
+    normalized_kind = kind.strip().lower()
+    if normalized_kind not in {"head", "tail", "range"}:
+        raise ValueError("window must be one of: head, tail, range")
+    return PreviewWindow(
+        kind=normalized_kind,  # type: ignore[arg-type]
+        lines=lines,
+        offset=offset,
+        length=length,
+    ).normalized()
+
+
+def build_preview_payload(file_path: Path, *, window: PreviewWindow | None = None) -> dict[str, Any]:
     size = file_path.stat().st_size
-    if size > PREVIEW_MAX_BYTES:
+    if window is None and size <= PREVIEW_MAX_BYTES:
+        data = file_path.read_bytes()
+        return build_preview_payload_from_bytes(data=data, size=size, filename=file_path.name)
+    with file_path.open("rb") as fp:
+        sample = fp.read(4096)
+    if is_binary_blob(sample):
         return {
-            "mode": "too_large",
+            "mode": "too_large" if size > PREVIEW_MAX_BYTES else "binary",
             "content": None,
             "size": size,
             "meta": "无信息",
@@ -70,8 +136,173 @@ def build_preview_payload(file_path: Path) -> dict[str, Any]:
             "rendered_html": None,
             "json_pretty": None,
         }
-    data = file_path.read_bytes()
-    return build_preview_payload_from_bytes(data=data, size=size, filename=file_path.name)
+    resolved_window = (window or PreviewWindow()).normalized()
+    return build_windowed_preview_payload(file_path, size=size, window=resolved_window)
+
+
+def build_windowed_preview_payload(
+    file_path: Path,
+    *,
+    size: int,
+    window: PreviewWindow,
+) -> dict[str, Any]:
+    data, start, end = _read_window_bytes(file_path, size=size, window=window)
+    line_start = _line_index.line_number_at(file_path, start)
+    content, encoding = decode_text_blob(data)
+    detected_format = detect_text_format(filename=file_path.name, content=content)
+    if detected_format == "json" and (start > 0 or end < size):
+        # A partial JSON document cannot be parsed; show it as highlighted text.
+        detected_format = "text"
+    rendered_html: str | None = None
+    json_pretty: str | None = None
+    if detected_format == "markdown":
+        rendered_html = render_markdown_safe(content)
+    elif detected_format == "json":
+        try:
+            parsed = json.loads(content)
+            json_pretty = json.dumps(parsed, ensure_ascii=False, indent=2)
+            rendered_html = render_code_highlight(json_pretty, "json")
+        except (json.JSONDecodeError, TypeError, ValueError):
+            detected_format = "text"
+            rendered_html = render_code_highlight(content, "text", line_start=line_start or 1)
+    elif detected_format == "jsonl":
+        rendered_html = render_jsonl_highlight(content)
+    elif detected_format in {"yaml", "toml", "python", "javascript", "text"}:
+        rendered_html = render_code_highlight(content, detected_format, line_start=line_start or 1)
+    line_count = content.count("\n") + (0 if content.endswith("\n") or not content else 1)
+    if line_start is not None:
+        position = f"lines {line_start}-{line_start + max(0, line_count - 1)}"
+    else:
+        position = f"bytes {start}-{end}"
+    return {
+        "mode": "text",
+        "content": content,
+        "size": size,
+        "meta": f"{size} bytes, {encoding}, {position}",
+        "detected_format": detected_format,
+        "rendered_html": rendered_html,
+        "json_pretty": json_pretty,
+        "window": {
+            "kind": window.kind,
+            "byte_start": start,
+            "byte_end": end,
+            "line_start": line_start,
+            "line_count": line_count,
+            "truncated": start > 0 or end < size,
+        },
+    }
+
+
+def _read_window_bytes(file_path: Path, *, size: int, window: PreviewWindow) -> tuple[bytes, int, int]:
+    with file_path.open("rb") as fp:
+        if window.kind == "tail":
+            end = size
+            start = max(0, end - PREVIEW_MAX_BYTES)
+            fp.seek(start)
+            data = fp.read(end - start)
+            body = data[:-1] if data.endswith(b"\n") else data
+            cut = len(body)
+            for _ in range(window.lines):
+                cut = body.rfind(b"\n", 0, cut)
+                if cut < 0:
+                    break
+            if cut >= 0:
+                start += cut + 1
+                data = data[cut + 1 :]
+            elif start > 0:
+                first_newline = data.find(b"\n")
+                if first_newline >= 0 and first_newline + 1 < len(data):
+                    start += first_newline + 1
+                    data = data[first_newline + 1 :]
+            return data, start, end
+        start = min(window.offset, size) if window.kind == "range" else 0
+        if start > 0:
+            fp.seek(start - 1)
+            if fp.read(1) != b"\n":
+                # Widen to the beginning of the line containing `offset`.
+                start = _line_start_before(fp, start)
+        fp.seek(start)
+        budget = window.length if window.kind == "range" else PREVIEW_MAX_BYTES
+        data = fp.read(min(budget, PREVIEW_MAX_BYTES))
+        if window.kind == "head":
+            cut = -1
+            for _ in range(window.lines):
+                cut = data.find(b"\n", cut + 1)
+                if cut < 0:
+                    break
+            if cut >= 0:
+                data = data[: cut + 1]
+        end = start + len(data)
+        if end < size and not data.endswith(b"\n"):
+            last_newline = data.rfind(b"\n")
+            if last_newline >= 0:
+                data = data[: last_newline + 1]
+                end = start + len(data)
+        return data, start, end
+
+
+def _line_start_before(fp: Any, offset: int) -> int:
+    position = offset
+    lower_bound = max(0, offset - PREVIEW_MAX_BYTES)
+    while position > lower_bound:
+        step = min(_WINDOW_READ_CHUNK_BYTES, position - lower_bound)
+        position -= step
+        fp.seek(position)
+        chunk = fp.read(step)
+        newline_index = chunk.rfind(b"\n")
+        if newline_index >= 0:
+            return position + newline_index + 1
+    return lower_bound
+
+
+class _LineIndex:
+    """Sparse per-file-version index of newline counts at fixed byte strides.
+
+    Keyed by (path, inode, size, mtime_ns). Checkpoint `i` holds the number of
+    newlines before byte `i * _LINE_INDEX_STRIDE_BYTES`; a lookup counts from
+    the nearest checkpoint, extending the index as it goes, so repeated
+    windows into one file read at most one stride. A lookup that would scan
+    more than `_LINE_INDEX_MAX_SCAN_BYTES` returns None instead.
+    """
+
+    def __init__(self) -> None:
+        self._files: OrderedDict[tuple[str, int, int, int], list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def line_number_at(self, file_path: Path, offset: int) -> int | None:
+        if offset <= 0:
+            return 1
+        stat = file_path.stat()
+        key = (str(file_path), stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            checkpoints = list(self._files.get(key) or [0])
+        index = min(offset // _LINE_INDEX_STRIDE_BYTES, len(checkpoints) - 1)
+        position = index * _LINE_INDEX_STRIDE_BYTES
+        if offset - position > _LINE_INDEX_MAX_SCAN_BYTES:
+            return None
+        newlines = checkpoints[index]
+        with file_path.open("rb") as fp:
+            fp.seek(position)
+            while position < offset:
+                next_checkpoint = (position // _LINE_INDEX_STRIDE_BYTES + 1) * _LINE_INDEX_STRIDE_BYTES
+                chunk = fp.read(min(_WINDOW_READ_CHUNK_BYTES, offset - position, next_checkpoint - position))
+                if not chunk:
+                    break
+                newlines += chunk.count(b"\n")
+                position += len(chunk)
+                if position == next_checkpoint and position // _LINE_INDEX_STRIDE_BYTES == len(checkpoints):
+                    checkpoints.append(newlines)
+        with self._lock:
+            known = self._files.get(key)
+            if known is None or len(known) < len(checkpoints):
+                self._files[key] = checkpoints
+            self._files.move_to_end(key)
+            while len(self._files) > _LINE_INDEX_MAX_FILES:
+                self._files.popitem(last=False)
+        return newlines + 1
+
+
+_line_index = _LineIndex()
 
 
 def build_preview_payload_from_bytes(
@@ -180,7 +411,7 @@ def render_markdown_safe(content: str) -> str | None:
     return bleach_module.linkify(cleaned)
 
 
-def render_code_highlight(content: str, format_name: str) -> str | None:
+def render_code_highlight(content: str, format_name: str, *, line_start: int = 1) -> str | None:
     pygments_module = _import_optional("pygments")
     lexers_module = _import_optional("pygments.lexers")
     formatters_module = _import_optional("pygments.formatters")
@@ -204,6 +435,7 @@ def render_code_highlight(content: str, format_name: str) -> str | None:
             noclasses=True,
             linenos="table",
             lineanchors="L",
+            linenostart=max(1, int(line_start)),
             nowrap=False,
             style="default",
         )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .file_preview_renderer import PreviewWindow, build_preview_payload
+
+PREVIEW_CACHE_MAX_ENTRIES = 256
+PREVIEW_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_CacheKey = tuple[str, int, int, tuple[str, int, int, int] | None]
+
+
+def _payload_weight(payload: dict[str, Any]) -> int:
+    weight = 256
+    for key in ("content", "rendered_html", "json_pretty"):
+        value = payload.get(key)
+        if isinstance(value, str):
+            weight += len(value)
+    return weight
+
+
+class FilePreviewService:
+    """Cached, off-loop file preview rendering.
+
+    Rendered payloads are kept in an LRU keyed by (path, size, mtime_ns,
+    window), so a file that has not changed is highlighted once no matter how
+    many viewers request it. Rendering runs in a worker thread and identical
+    concurrent requests share one render.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = PREVIEW_CACHE_MAX_ENTRIES,
+        max_bytes: int = PREVIEW_CACHE_MAX_BYTES,
+    ) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._max_bytes = max(1, int(max_bytes))
+        self._entries: OrderedDict[_CacheKey, tuple[dict[str, Any], int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[_CacheKey, asyncio.Future[dict[str, Any]]] = {}
+
+    async def build_preview(self, file_path: Path, *, window: PreviewWindow | None = None) -> dict[str, Any]:
+        resolved_window = window.normalized() if window is not None else None
+        key = self._cache_key(file_path, resolved_window)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return dict(await asyncio.shield(pending))
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload = await asyncio.to_thread(build_preview_payload, file_path, window=resolved_window)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so followers-less failures do not log "never retrieved".
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._put(key, payload)
+        future.set_result(payload)
+        return dict(payload)
+
+    @staticmethod
+    def _cache_key(file_path: Path, window: PreviewWindow | None) -> _CacheKey:
+        stat = file_path.stat()
+        return (
+            str(file_path.resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+            window.cache_key() if window is not None else None,
+        )
+
+    def _get(self, key: _CacheKey) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry[0])
+
+    def _put(self, key: _CacheKey, payload: dict[str, Any]) -> None:
+        weight = _payload_weight(payload)
+        if weight > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (payload, weight)
+            self._total_bytes += weight
+            while self._entries and (
+                len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes
+            ):
+                _evicted_key, (_payload, evicted_weight) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_weight
+
+
+file_preview_service = FilePreviewService()
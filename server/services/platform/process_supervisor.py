@@ -7,7 +7,7 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from threading import RLock
-from typing import Any, Literal
+from typing import Any, Collection, Literal
 
 from server.config import config
 from server.services.platform.process_lease_store import ProcessLeaseStore, process_lease_store
@@ -42,10 +42,21 @@ class RuntimeProcessSupervisor:
         self._active_by_lease_id: dict[str, _ActiveProcessRef] = {}
         self._startup_orphan_reports: list[dict[str, Any]] = []
         self._sweep_task: asyncio.Task[None] | None = None
+        self._worker_id: str | None = None
 
     def _enabled(self) -> bool:
         return bool(config.SYSTEM.PROCESS_SUPERVISOR_ENABLED)
 
+    def set_worker_id(self, worker_id: str | None) -> None:
+        """Tag new leases with the owning server worker (multi-worker mode)."""
+        self._worker_id = worker_id
+
+    @staticmethod
+    def _lease_worker_id(lease: dict[str, Any]) -> str | None:
+        metadata = lease.get("metadata")
+        worker_id = metadata.get("worker_id") if isinstance(metadata, dict) else None
+        return worker_id if isinstance(worker_id, str) and worker_id else None
+
     def _new_lease_payload(
         self,
         *,
@@ -75,6 +86,8 @@ class RuntimeProcessSupervisor:
             "updated_at": now_iso,
             "status": "active",
         }
+        if self._worker_id:
+            metadata = {**(metadata or {}), "worker_id": self._worker_id}
         if metadata:
             payload["metadata"] = dict(metadata)
         return payload
@@ -211,17 +224,67 @@ class RuntimeProcessSupervisor:
         self.release(lease_id, reason=f"{reason}:{result.outcome}")
         return result
 
-    async def reap_orphan_leases_on_startup(self) -> list[dict[str, Any]]:
+    async def reap_orphan_leases_on_startup(
+        self,
+        *,
+        keep_worker_ids: Collection[str] = (),
+    ) -> list[dict[str, Any]]:
+        """Terminate processes of leases left active by a previous process.
+
+        Leases tagged with a worker in `keep_worker_ids` belong to a live peer
+        worker and are left alone.
+        """
+        if not self._enabled():
+            return []
+        reports = await self._reap_leases(
+            keep_worker_ids=keep_worker_ids,
+            require_worker_id=False,
+            reason="startup_orphan_reap",
+        )
+        with self._lock:
+            self._startup_orphan_reports = list(reports)
+        return reports
+
+    async def reap_dead_worker_leases(self, live_worker_ids: Collection[str]) -> list[dict[str, Any]]:
+        """Terminate processes leased by workers that are no longer in `live_worker_ids`."""
         if not self._enabled():
             return []
+        reports = await self._reap_leases(
+            keep_worker_ids=live_worker_ids,
+            require_worker_id=True,
+            reason="dead_worker_reap",
+        )
+        for report in reports:
+            logger.warning(
+                "Reaped process leased by dead worker: worker_id=%s run_id=%s pid=%s outcome=%s",
+                report.get("worker_id"),
+                report.get("run_id"),
+                report.get("pid"),
+                report.get("outcome"),
+            )
+        return reports
+
+    async def _reap_leases(
+        self,
+        *,
+        keep_worker_ids: Collection[str],
+        require_worker_id: bool,
+        reason: str,
+    ) -> list[dict[str, Any]]:
+        keep = set(keep_worker_ids)
+        if self._worker_id:
+            keep.add(self._worker_id)
         reports: list[dict[str, Any]] = []
         for lease in self._lease_store.list_active():
             lease_id = str(lease.get("lease_id") or "").strip()
             pid_raw = lease.get("pid")
             if not lease_id or not isinstance(pid_raw, int):
                 continue
+            worker_id = self._lease_worker_id(lease)
+            if worker_id in keep or (require_worker_id and worker_id is None):
+                continue
             result = await asyncio.to_thread(terminate_pid_tree, int(pid_raw))
-            self._lease_store.close(lease_id, reason=f"startup_orphan_reap:{result.outcome}")
+            self._lease_store.close(lease_id, reason=f"{reason}:{result.outcome}")
             report = {
                 "lease_id": lease_id,
                 "owner_kind": lease.get("owner_kind"),
@@ -231,14 +294,22 @@ class RuntimeProcessSupervisor:
                 "attempt_number": lease.get("attempt_number"),
                 "engine": lease.get("engine"),
                 "pid": pid_raw,
+                "worker_id": worker_id,
                 "outcome": result.outcome,
                 "detail": result.detail,
             }
             reports.append(report)
-        with self._lock:
-            self._startup_orphan_reports = list(reports)
         return reports
 
+    def list_active_leases(self, *, owner_kind: OwnerKind | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            refs = list(self._active_by_lease_id.values())
+        return [
+            dict(ref.lease)
+            for ref in refs
+            if owner_kind is None or ref.lease.get("owner_kind") == owner_kind
+        ]
+
     def consume_startup_orphan_reports(self) -> list[dict[str, Any]]:
         with self._lock:
             reports = list(self._startup_orphan_reports)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import base64
 import json
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from ...config import config
+from .system_log_index import SystemLogIndexStore, iter_lines_reverse
 
 _TEXT_LOG_RE = re.compile(
     r"^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+"
@@ -33,14 +35,36 @@ class ParsedLogRow:
     file_mtime: float
 
 
+@dataclass(frozen=True)
+class _ScanPosition:
+    """Resume point for a log scan: the newest unread byte of one file."""
+
+    file: str | None = None
+    inode: int | None = None
+    offset: int = 0
+    newlines: int = 0
+    matched: int = 0
+    skip: int = 0
+
+
 class SystemLogExplorerService:
-    """Read-only log query service for management System Console."""
+    """Read-only log query service for management System Console.
+
+    Log files are scanned newest-first and each file from its end, so a page
+    is served as soon as `limit` rows match. Rotated files get a sidecar index
+    (timestamp range and level counts) that lets filtered queries skip them
+    entirely. `next_cursor` is an opaque position token; legacy integer
+    cursors are still accepted as match offsets.
+    """
+
+    def __init__(self, index_store: SystemLogIndexStore | None = None) -> None:
+        self.index_store = index_store or SystemLogIndexStore()
 
     def query(
         self,
         *,
         source: str,
-        cursor: int,
+        cursor: int | str | None,
         limit: int,
         q: str | None,
         level: str | None,
@@ -55,19 +79,17 @@ class SystemLogExplorerService:
         query_keyword = q.strip().lower() if isinstance(q, str) and q.strip() else None
         from_dt = self._normalize_filter_dt(from_ts)
         to_dt = self._normalize_filter_dt(to_ts)
+        position = self._decode_cursor(cursor)
 
-        rows = self._load_rows(
+        page, next_position, total, total_exact = self._scan_page(
             source=normalized_source,
+            position=position,
+            limit=max(1, int(limit)),
             keyword=query_keyword,
             level=normalized_level,
             from_ts=from_dt,
             to_ts=to_dt,
         )
-        total = len(rows)
-        start = min(cursor, total)
-        end = min(start + limit, total)
-        page = rows[start:end]
-        next_cursor = end if end < total else None
         return {
             "source": normalized_source,
             "items": [
@@ -82,63 +104,181 @@ class SystemLogExplorerService:
                 }
                 for row in page
             ],
-            "next_cursor": next_cursor,
+            "next_cursor": self._encode_cursor(next_position) if next_position is not None else None,
             "total_matched": total,
+            "total_matched_exact": total_exact,
         }
 
-    def _load_rows(
+    def _scan_page(
         self,
         *,
         source: str,
+        position: _ScanPosition,
+        limit: int,
         keyword: str | None,
         level: str | None,
         from_ts: datetime | None,
         to_ts: datetime | None,
-    ) -> list[ParsedLogRow]:
+    ) -> tuple[list[ParsedLogRow], _ScanPosition | None, int, bool]:
         files = self._resolve_log_family(source)
-        rows: list[ParsedLogRow] = []
-        for path in files:
-            file_mtime = path.stat().st_mtime
+        basename = self._family_basename(source)
+        use_index = level is not None or from_ts is not None or to_ts is not None
+        file_offset = 0
+        if position.inode is not None:
+            file_offset = self._locate_cursor_file(files, position)
+            if file_offset is None:
+                return [], None, position.matched, True
+
+        page: list[ParsedLogRow] = []
+        matched = position.matched
+        skip_remaining = position.skip
+        next_position: _ScanPosition | None = None
+        for file_index in range(file_offset, len(files)):
+            path = files[file_index]
             try:
-                content = path.read_text(encoding="utf-8", errors="replace")
+                stat = path.stat()
+                resumed = file_index == file_offset and position.inode is not None
+                end_offset = min(int(position.offset), stat.st_size) if resumed else stat.st_size
+                if resumed:
+                    newlines_before_end = int(position.newlines)
+                elif path.name != basename:
+                    index = self.index_store.rotated_index(
+                        path,
+                        build_rows=lambda target, _source=source: self._iter_index_rows(target, _source),
+                    )
+                    if use_index and not index.may_match(level=level, from_ts=from_ts, to_ts=to_ts):
+                        continue
+                    newlines_before_end = index.newline_count
+                else:
+                    newlines_before_end = self.index_store.active_newline_count(path, size=end_offset)
+                for start_offset, line_no, raw_bytes in iter_lines_reverse(
+                    path,
+                    end_offset=end_offset,
+                    newlines_before_end=newlines_before_end,
+                ):
+                    raw = raw_bytes.decode("utf-8", errors="replace").rstrip("\r")
+                    if not raw:
+                        continue
+                    parsed = self._parse_row(
+                        raw=raw,
+                        source=source,
+                        file=path.name,
+                        line_no=line_no,
+                        file_mtime=stat.st_mtime,
+                    )
+                    if not self._row_matches(parsed, keyword=keyword, level=level, from_ts=from_ts, to_ts=to_ts):
+                        continue
+                    if skip_remaining > 0:
+                        skip_remaining -= 1
+                        matched += 1
+                        continue
+                    if len(page) >= limit:
+                        return page, next_position, matched, False
+                    page.append(parsed)
+                    matched += 1
+                    next_position = _ScanPosition(
+                        file=path.name,
+                        inode=stat.st_ino,
+                        offset=start_offset,
+                        newlines=line_no - 1,
+                        matched=matched,
+                    )
+            except OSError:
+                continue
+        return page, None, matched, True
+
+    @staticmethod
+    def _locate_cursor_file(files: list[Path], position: _ScanPosition) -> int | None:
+        # Match by inode only: after rotation the cursor's file name points at a
+        # different file, and its offset would be meaningless there.
+        for index, path in enumerate(files):
+            try:
+                if path.stat().st_ino == position.inode:
+                    return index
             except OSError:
                 continue
-            for line_no, raw_line in enumerate(content.splitlines(), start=1):
-                raw = raw_line.rstrip("\n")
+        return None
+
+    def _iter_index_rows(self, path: Path, source: str) -> Iterator[tuple[str | None, datetime | None]]:
+        file_mtime = path.stat().st_mtime
+        with path.open("r", encoding="utf-8", errors="replace") as fp:
+            for line_no, raw_line in enumerate(fp, start=1):
+                raw = raw_line.rstrip("\n").rstrip("\r")
                 if not raw:
                     continue
                 parsed = self._parse_row(raw=raw, source=source, file=path.name, line_no=line_no, file_mtime=file_mtime)
-                if level and parsed.level != level:
-                    continue
-                if keyword and keyword not in (parsed.message.lower() + "\n" + parsed.raw.lower()):
-                    continue
-                if from_ts is not None or to_ts is not None:
-                    if parsed.ts_dt is None:
-                        continue
-                    if from_ts is not None and parsed.ts_dt < from_ts:
-                        continue
-                    if to_ts is not None and parsed.ts_dt > to_ts:
-                        continue
-                rows.append(parsed)
-
-        rows.sort(
-            key=lambda row: (
-                1 if row.ts_dt is not None else 0,
-                row.ts_dt.timestamp() if row.ts_dt is not None else 0.0,
-                row.file_mtime,
-                row.line_no,
-            ),
-            reverse=True,
-        )
-        return rows
+                yield parsed.level, parsed.ts_dt
+
+    @staticmethod
+    def _row_matches(
+        parsed: ParsedLogRow,
+        *,
+        keyword: str | None,
+        level: str | None,
+        from_ts: datetime | None,
+        to_ts: datetime | None,
+    ) -> bool:
+        if level and parsed.level != level:
+            return False
+        if keyword and keyword not in (parsed.message.lower() + "\n" + parsed.raw.lower()):
+            return False
+        if from_ts is not None or to_ts is not None:
+            if parsed.ts_dt is None:
+                return False
+            if from_ts is not None and parsed.ts_dt < from_ts:
+                return False
+            if to_ts is not None and parsed.ts_dt > to_ts:
+                return False
+        return True
+
+    @staticmethod
+    def _decode_cursor(cursor: int | str | None) -> _ScanPosition:
+        if cursor is None:
+            return _ScanPosition()
+        if isinstance(cursor, int):
+            return _ScanPosition(skip=max(0, cursor))
+        text = cursor.strip()
+        if not text:
+            return _ScanPosition()
+        if text.isdigit():
+            return _ScanPosition(skip=int(text))
+        try:
+            padded = text + "=" * (-len(text) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+            return _ScanPosition(
+                file=str(payload["f"]),
+                inode=int(payload["i"]),
+                offset=max(0, int(payload["o"])),
+                newlines=max(0, int(payload["l"])),
+                matched=max(0, int(payload["n"])),
+            )
+        except (ValueError, KeyError, TypeError, UnicodeError, json.JSONDecodeError) as exc:
+            raise ValueError("cursor is invalid") from exc
+
+    @staticmethod
+    def _encode_cursor(position: _ScanPosition) -> str:
+        payload = {
+            "f": position.file,
+            "i": position.inode,
+            "o": position.offset,
+            "l": position.newlines,
+            "n": position.matched,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _family_basename(source: str) -> str:
+        if source == "system":
+            return str(config.SYSTEM.LOGGING.FILE_BASENAME).strip() or "skill_runner.log"
+        return "bootstrap.log"
 
     def _resolve_log_family(self, source: str) -> list[Path]:
+        basename = self._family_basename(source)
         if source == "system":
             log_dir = Path(str(config.SYSTEM.LOGGING.DIR)).resolve()
-            basename = str(config.SYSTEM.LOGGING.FILE_BASENAME).strip() or "skill_runner.log"
         else:
             log_dir = Path(str(config.SYSTEM.DATA_DIR)).resolve() / "logs"
-            basename = "bootstrap.log"
         if not log_dir.exists():
             return []
         files: list[Path] = []
@@ -148,7 +288,7 @@ class SystemLogExplorerService:
                 continue
             if path.name == basename or path.name.startswith(family_prefix):
                 files.append(path)
-        files.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        files.sort(key=lambda path: (path.stat().st_mtime, path.name == basename), reverse=True)
         return files
 
     def _parse_row(
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+LOG_INDEX_DIRNAME = ".log_index"
+LOG_INDEX_VERSION = 1
+REVERSE_READ_BLOCK_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class LogFileIndex:
+    """Summary of one rotated (immutable) log file used to skip whole files."""
+
+    name: str
+    size: int
+    mtime_ns: int
+    newline_count: int
+    ts_min: str | None = None
+    ts_max: str | None = None
+    level_counts: dict[str, int] = field(default_factory=dict)
+    row_count: int = 0
+    timed_row_count: int = 0
+
+    def may_match(
+        self,
+        *,
+        level: str | None,
+        from_ts: datetime | None,
+        to_ts: datetime | None,
+    ) -> bool:
+        if level and self.level_counts.get(level, 0) <= 0:
+            return False
+        if from_ts is None and to_ts is None:
+            return self.row_count > 0
+        if self.timed_row_count <= 0 or self.ts_min is None or self.ts_max is None:
+            return False
+        ts_min = datetime.fromisoformat(self.ts_min)
+        ts_max = datetime.fromisoformat(self.ts_max)
+        if from_ts is not None and ts_max < from_ts:
+            return False
+        if to_ts is not None and ts_min > to_ts:
+            return False
+        return True
+
+
+@dataclass
+class _ActiveFileLineCount:
+    inode: int
+    counted_bytes: int
+    newline_count: int
+
+
+def count_newlines(path: Path, *, start: int = 0, end: int | None = None) -> int:
+    total = 0
+    with path.open("rb") as fp:
+        fp.seek(start)
+        remaining = None if end is None else max(0, end - start)
+        while remaining is None or remaining > 0:
+            size = REVERSE_READ_BLOCK_BYTES if remaining is None else min(REVERSE_READ_BLOCK_BYTES, remaining)
+            chunk = fp.read(size)
+            if not chunk:
+                break
+            total += chunk.count(b"\n")
+            if remaining is not None:
+                remaining -= len(chunk)
+    return total
+
+
+def iter_lines_reverse(
+    path: Path,
+    *,
+    end_offset: int,
+    newlines_before_end: int,
+    block_size: int = REVERSE_READ_BLOCK_BYTES,
+) -> Iterator[tuple[int, int, bytes]]:
+    """Yield `(start_offset, line_no, line_bytes)` from `end_offset` backwards.
+
+    `newlines_before_end` is the number of newline bytes in `[0, end_offset)`
+    and is used to number lines without reading the head of the file.
+    """
+    with path.open("rb") as fp:
+        position = max(0, end_offset)
+        newlines_before = newlines_before_end
+        carry = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            fp.seek(position)
+            buffer = fp.read(step) + carry
+            cursor = len(buffer)
+            newline_index = buffer.rfind(b"\n", 0, cursor)
+            while newline_index >= 0:
+                yield position + newline_index + 1, newlines_before + 1, buffer[newline_index + 1 : cursor]
+                newlines_before -= 1
+                cursor = newline_index
+                newline_index = buffer.rfind(b"\n", 0, cursor)
+            carry = buffer[:cursor]
+        if end_offset > 0:
+            yield 0, newlines_before + 1, carry
+
+
+class SystemLogIndexStore:
+    """Sidecar index cache for rotated log files plus line counts for the active file."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rotated: dict[tuple[str, int, int], LogFileIndex] = {}
+        self._active: dict[str, _ActiveFileLineCount] = {}
+
+    def active_newline_count(self, path: Path, *, size: int) -> int:
+        stat = path.stat()
+        key = str(path)
+        with self._lock:
+            cached = self._active.get(key)
+        if cached is not None and cached.inode == stat.st_ino and cached.counted_bytes <= size:
+            extra = count_newlines(path, start=cached.counted_bytes, end=size)
+            total = cached.newline_count + extra
+        else:
+            total = count_newlines(path, end=size)
+        with self._lock:
+            self._active[key] = _ActiveFileLineCount(
+                inode=stat.st_ino,
+                counted_bytes=size,
+                newline_count=total,
+            )
+        return total
+
+    def rotated_index(
+        self,
+        path: Path,
+        *,
+        build_rows: Callable[[Path], Iterator[tuple[str | None, datetime | None]]],
+    ) -> LogFileIndex:
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._rotated.get(key)
+        if cached is not None:
+            return cached
+        index = self._read_sidecar(path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if index is None:
+            index = self._build_index(path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, build_rows=build_rows)
+            self._write_sidecar(path, index)
+        with self._lock:
+            self._rotated = {k: v for k, v in self._rotated.items() if k[0] != key[0]}
+            self._rotated[key] = index
+        return index
+
+    def _build_index(
+        self,
+        path: Path,
+        *,
+        size: int,
+        mtime_ns: int,
+        build_rows: Callable[[Path], Iterator[tuple[str | None, datetime | None]]],
+    ) -> LogFileIndex:
+        level_counts: dict[str, int] = {}
+        row_count = 0
+        timed_row_count = 0
+        ts_min: datetime | None = None
+        ts_max: datetime | None = None
+        for level, ts_dt in build_rows(path):
+            row_count += 1
+            if level:
+                level_counts[level] = level_counts.get(level, 0) + 1
+            if ts_dt is not None:
+                timed_row_count += 1
+                ts_min = ts_dt if ts_min is None or ts_dt < ts_min else ts_min
+                ts_max = ts_dt if ts_max is None or ts_dt > ts_max else ts_max
+        return LogFileIndex(
+            name=path.name,
+            size=size,
+            mtime_ns=mtime_ns,
+            newline_count=count_newlines(path, end=size),
+            ts_min=ts_min.isoformat() if ts_min is not None else None,
+            ts_max=ts_max.isoformat() if ts_max is not None else None,
+            level_counts=level_counts,
+            row_count=row_count,
+            timed_row_count=timed_row_count,
+        )
+
+    @staticmethod
+    def _sidecar_path(path: Path) -> Path:
+        return path.parent / LOG_INDEX_DIRNAME / f"{path.name}.json"
+
+    def _read_sidecar(self, path: Path, *, size: int, mtime_ns: int) -> LogFileIndex | None:
+        sidecar = self._sidecar_path(path)
+        try:
+            payload = json.loads(sidecar.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != LOG_INDEX_VERSION:
+            return None
+        payload.pop("version", None)
+        try:
+            index = LogFileIndex(**payload)
+        except TypeError:
+            return None
+        if index.size != size or index.mtime_ns != mtime_ns:
+            return None
+        return index
+
+    def _write_sidecar(self, path: Path, index: LogFileIndex) -> None:
+        sidecar = self._sidecar_path(path)
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = sidecar.with_suffix(f".tmp-{os.getpid()}")
+            tmp_path.write_text(
+                json.dumps({"version": LOG_INDEX_VERSION, **asdict(index)}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            tmp_path.replace(sidecar)
+            self._prune_sidecars(path.parent)
+        except OSError:
+            # Log dirs may be read-only; the in-memory index still applies.
+            logger.debug("failed to persist log index sidecar for %s", path, exc_info=True)
+
+    @staticmethod
+    def _prune_sidecars(log_dir: Path) -> None:
+        index_dir = log_dir / LOG_INDEX_DIRNAME
+        for sidecar in index_dir.glob("*.json"):
+            if not (log_dir / sidecar.name[: -len(".json")]).exists():
+                sidecar.unlink(missing_ok=True)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from server.config import config
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an uploaded payload exceeds the configured size limit."""
+
+
+class ZipLimitError(ValueError):
+    """Raised when a zip archive trips a zip-bomb limit or contains an unsafe entry."""
+
+
+@dataclass(frozen=True)
+class UploadLimits:
+    max_upload_bytes: int = 0
+    max_extracted_bytes: int = 0
+    max_members: int = 0
+    max_compression_ratio: float = 0.0
+    chunk_bytes: int = _COPY_CHUNK_BYTES
+
+    @classmethod
+    def from_config(cls) -> "UploadLimits":
+        return cls(
+            max_upload_bytes=max(0, int(config.SYSTEM.UPLOAD_MAX_BYTES)),
+            max_extracted_bytes=max(0, int(config.SYSTEM.UPLOAD_MAX_EXTRACTED_BYTES)),
+            max_members=max(0, int(config.SYSTEM.UPLOAD_MAX_ZIP_MEMBERS)),
+            max_compression_ratio=max(0.0, float(config.SYSTEM.UPLOAD_MAX_COMPRESSION_RATIO)),
+            chunk_bytes=max(4096, int(config.SYSTEM.UPLOAD_SPOOL_CHUNK_BYTES)),
+        )
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    path: Path
+    size: int
+    sha256: str
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+async def spool_upload(
+    upload: Any,
+    spool_dir: Path,
+    *,
+    max_bytes: int | None = None,
+    limits: UploadLimits | None = None,
+) -> SpooledUpload:
+    """
+    Copy an `UploadFile`-like object (`await read(n)`) to a temp file in `spool_dir`.
+
+    At most one chunk is held in memory; the SHA-256 is computed on the way.
+    The temp file is removed again if the payload exceeds `max_bytes`
+    (default: `UPLOAD_MAX_BYTES`, 0 disables the check).
+    """
+    effective = limits or UploadLimits.from_config()
+    limit = effective.max_upload_bytes if max_bytes is None else max(0, int(max_bytes))
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    fd, raw_path = tempfile.mkstemp(prefix=".upload-", suffix=".zip", dir=str(spool_dir))
+    path = Path(raw_path)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            while True:
+                chunk = await upload.read(effective.chunk_bytes)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if limit > 0 and size > limit:
+                    raise UploadTooLargeError(f"Upload exceeds size limit ({limit} bytes)")
+                hasher.update(chunk)
+                dst.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path=path, size=size, sha256=hasher.hexdigest())
+
+
+def validate_zip_entry_name(clean_name: str) -> None:
+    if clean_name.startswith("/") or clean_name.startswith("\\"):
+        raise ZipLimitError(f"Unsafe zip entry path: {clean_name}")
+    entry = Path(clean_name)
+    if entry.is_absolute() or any(part == ".." for part in entry.parts):
+        raise ZipLimitError(f"Unsafe zip entry path: {clean_name}")
+    if entry.parts and entry.parts[0].endswith(":"):
+        raise ZipLimitError(f"Unsafe zip entry path: {clean_name}")
+
+
+class ZipExtractionBudget:
+    """
+    Zip-bomb guard shared by every extraction of one archive.
+
+    Declared sizes are checked up front (`check_archive`), and the bytes
+    actually written are counted while copying, so a member whose header
+    lies about its size is still cut off at the limit.
+    """
+
+    def __init__(self, limits: UploadLimits | None = None) -> None:
+        self.limits = limits or UploadLimits.from_config()
+        self.extracted_bytes = 0
+
+    def check_archive(self, archive: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+        members = archive.infolist()
+        limits = self.limits
+        if limits.max_members > 0 and len(members) > limits.max_members:
+            raise ZipLimitError(f"Zip archive has too many entries ({len(members)} > {limits.max_members})")
+        declared_total = 0
+        for member in members:
+            declared_total += int(member.file_size)
+            if (
+                limits.max_compression_ratio > 0
+                and member.file_size > _COPY_CHUNK_BYTES
+                and member.file_size > limits.max_compression_ratio * max(1, member.compress_size)
+            ):
+                raise ZipLimitError(f"Zip entry compression ratio too high: {member.filename}")
+        if limits.max_extracted_bytes > 0 and declared_total > limits.max_extracted_bytes:
+            raise ZipLimitError(f"Zip archive expands beyond limit ({limits.max_extracted_bytes} bytes)")
+        return members
+
+    def copy_member(self, archive: zipfile.ZipFile, member: zipfile.ZipInfo, out_path: Path) -> None:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with archive.open(member, "r") as src, open(out_path, "wb") as dst:
+                self._copy(src, dst, member.filename)
+        except BaseException:
+            out_path.unlink(missing_ok=True)
+            raise
+
+    def _copy(self, src: BinaryIO, dst: BinaryIO, name: str) -> None:
+        limit = self.limits.max_extracted_bytes
+        chunk_bytes = self.limits.chunk_bytes
+        while True:
+            chunk = src.read(chunk_bytes)
+            if not chunk:
+                return
+            self.extracted_bytes += len(chunk)
+            if limit > 0 and self.extracted_bytes > limit:
+                raise ZipLimitError(f"Zip archive expands beyond limit ({limit} bytes) at {name}")
+            dst.write(chunk)
+
+
+def extract_zip_file(
+    zip_path: Path,
+    target_dir: Path,
+    *,
+    limits: UploadLimits | None = None,
+) -> list[str]:
+    """
+    Extract `zip_path` into `target_dir` member by member from disk.
+
+    Entries are path-checked and written in bounded chunks under a
+    `ZipExtractionBudget`; returns the POSIX paths of extracted files.
+    """
+    budget = ZipExtractionBudget(limits)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target_root = target_dir.resolve()
+    extracted: list[str] = []
+    try:
+        with zipfile.ZipFile(zip_path, "r") as archive:
+            for member in budget.check_archive(archive):
+                clean = member.filename.strip("/")
+                if not clean:
+                    continue
+                validate_zip_entry_name(clean)
+                out_path = (target_dir / clean).resolve()
+                if out_path != target_root and target_root not in out_path.parents:
+                    raise ZipLimitError(f"Unsafe zip entry path: {clean}")
+                if member.is_dir():
+                    out_path.mkdir(parents=True, exist_ok=True)
+                    continue
+                budget.copy_member(archive, member, out_path)
+                extracted.append(clean)
+    except zipfile.BadZipFile as exc:
+        raise ValueError("Invalid zip file") from exc
+    return extracted
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping
+
+logger = logging.getLogger(__name__)
+
+FrameHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_FRAME_LIMIT_BYTES = 16 * 1024 * 1024
+_CONNECT_TIMEOUT_SEC = 1.0
+_WRITE_TIMEOUT_SEC = 2.0
+
+
+class WorkerIpcRelay:
+    """
+    Best-effort frame relay between server worker processes on one host.
+
+    Each worker listens on its own Unix socket; frames are single-line JSON
+    objects. Outgoing frames go through a bounded queue drained by one
+    sender task that keeps a connection per peer, so `send`/`broadcast` are
+    cheap, non-blocking and safe to call from any thread. A frame that cannot
+    be delivered (peer gone, queue full) is dropped and counted: durable
+    state lives in the run store and audit files, the relay only shortens
+    the time until peers observe it.
+    """
+
+    def __init__(self, *, max_pending_frames: int = 10_000) -> None:
+        self._max_pending_frames = max(1, int(max_pending_frames))
+        self._socket_path: Path | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[tuple[str | None, bytes]] | None = None
+        self._sender_task: asyncio.Task[None] | None = None
+        self._handler: FrameHandler | None = None
+        self._peers: Dict[str, str] = {}
+        self._writers: Dict[str, asyncio.StreamWriter] = {}
+        self._sent = 0
+        self._received = 0
+        self._dropped = 0
+
+    @staticmethod
+    def supported() -> bool:
+        return os.name != "nt" and hasattr(asyncio, "start_unix_server")
+
+    @property
+    def socket_path(self) -> Path | None:
+        return self._socket_path
+
+    async def start(self, socket_path: Path, handler: FrameHandler) -> None:
+        if self._server is not None:
+            return
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        self._handler = handler
+        self._server = await asyncio.start_unix_server(
+            self._serve_connection,
+            path=str(socket_path),
+            limit=_FRAME_LIMIT_BYTES,
+        )
+        self._socket_path = socket_path
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self._max_pending_frames)
+        self._sender_task = self._loop.create_task(self._send_loop())
+
+    async def stop(self) -> None:
+        task = self._sender_task
+        self._sender_task = None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        server = self._server
+        self._server = None
+        if server is not None:
+            server.close()
+            with contextlib.suppress(OSError, RuntimeError):
+                await server.wait_closed()
+        for worker_id in list(self._writers):
+            await self._close_writer(worker_id)
+        if self._socket_path is not None:
+            with contextlib.suppress(OSError):
+                self._socket_path.unlink()
+        self._socket_path = None
+        self._queue = None
+        self._loop = None
+        self._peers = {}
+
+    def set_peers(self, peers: Mapping[str, str]) -> None:
+        """Replace the peer map (worker_id -> socket path)."""
+        self._peers = {worker_id: path for worker_id, path in peers.items() if path}
+
+    def has_peers(self) -> bool:
+        return bool(self._peers)
+
+    def send(self, worker_id: str, frame: Dict[str, Any]) -> bool:
+        if worker_id not in self._peers:
+            return False
+        return self._enqueue(worker_id, frame)
+
+    def broadcast(self, frame: Dict[str, Any]) -> bool:
+        if not self._peers:
+            return False
+        return self._enqueue(None, frame)
+
+    def stats(self) -> Dict[str, int]:
+        queue = self._queue
+        return {
+            "peers": len(self._peers),
+            "connected_peers": len(self._writers),
+            "pending_frames": queue.qsize() if queue is not None else 0,
+            "sent_frames": self._sent,
+            "received_frames": self._received,
+            "dropped_frames": self._dropped,
+        }
+
+    def _enqueue(self, target: str | None, frame: Dict[str, Any]) -> bool:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            data = (json.dumps(frame, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        except (TypeError, ValueError):
+            logger.warning("Worker relay frame is not JSON serializable: type=%s", frame.get("type"))
+            self._dropped += 1
+            return False
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._put((target, data))
+        else:
+            try:
+                loop.call_soon_threadsafe(self._put, (target, data))
+            except RuntimeError:
+                self._dropped += 1
+                return False
+        return True
+
+    def _put(self, item: tuple[str | None, bytes]) -> None:
+        queue = self._queue
+        if queue is None:
+            self._dropped += 1
+            return
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._dropped += 1
+
+    async def _send_loop(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            target, data = await queue.get()
+            targets = [target] if target is not None else list(self._peers)
+            for worker_id in targets:
+                if await self._deliver(worker_id, data):
+                    self._sent += 1
+                else:
+                    self._dropped += 1
+
+    async def _deliver(self, worker_id: str, data: bytes) -> bool:
+        try:
+            writer = await self._writer(worker_id)
+            if writer is None:
+                return False
+            writer.write(data)
+            await asyncio.wait_for(writer.drain(), timeout=_WRITE_TIMEOUT_SEC)
+            return True
+        except (OSError, asyncio.TimeoutError):
+            logger.debug("Worker relay delivery failed: peer=%s", worker_id, exc_info=True)
+            await self._close_writer(worker_id)
+            return False
+
+    async def _writer(self, worker_id: str) -> asyncio.StreamWriter | None:
+        writer = self._writers.get(worker_id)
+        if writer is not None and not writer.is_closing():
+            return writer
+        path = self._peers.get(worker_id)
+        if not path:
+            return None
+        _, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(path, limit=_FRAME_LIMIT_BYTES),
+            timeout=_CONNECT_TIMEOUT_SEC,
+        )
+        self._writers[worker_id] = writer
+        return writer
+
+    async def _close_writer(self, worker_id: str) -> None:
+        writer = self._writers.pop(worker_id, None)
+        if writer is None:
+            return
+        writer.close()
+        with contextlib.suppress(OSError, RuntimeError):
+            await writer.wait_closed()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                try:
+                    frame = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    logger.warning("Worker relay dropped an undecodable frame")
+                    continue
+                if not isinstance(frame, dict) or self._handler is None:
+                    continue
+                self._received += 1
+                try:
+                    await self._handler(frame)
+                except (OSError, RuntimeError, ValueError, TypeError, KeyError):
+                    logger.warning("Worker relay frame handler failed: type=%s", frame.get("type"), exc_info=True)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            logger.debug("Worker relay connection closed with error", exc_info=True)
+        finally:
+            writer.close()
+            with contextlib.suppress(OSError, RuntimeError):
+                await writer.wait_closed()
@@ -12,6 +12,7 @@ import yaml  # type: ignore
 
 from server.models import SkillManifest
 from server.services.engine_management.engine_policy import apply_engine_policy_to_manifest
+from server.services.platform.upload_spooling import ZipExtractionBudget
 from server.services.skill.skill_asset_resolver import resolve_schema_asset
 
 _packaging_version: Any = None
@@ -70,9 +71,10 @@ class SkillPackageValidator:
             shutil.rmtree(target_dir, ignore_errors=True)
         target_dir.mkdir(parents=True, exist_ok=True)
         target_root = target_dir.resolve()
+        budget = ZipExtractionBudget()
         try:
             with zipfile.ZipFile(package_path, "r") as zf:
-                for member in zf.infolist():
+                for member in budget.check_archive(zf):
                     clean = member.filename.strip("/")
                     if not clean or clean.startswith("__MACOSX/"):
                         continue
@@ -83,9 +85,7 @@ class SkillPackageValidator:
                     if member.is_dir():
                         out_path.mkdir(parents=True, exist_ok=True)
                         continue
-                    out_path.parent.mkdir(parents=True, exist_ok=True)
-                    with zf.open(member, "r") as src, open(out_path, "wb") as dst:
-                        dst.write(src.read())
+                    budget.copy_member(zf, member, out_path)
         except zipfile.BadZipFile as exc:
             raise ValueError("Invalid zip package") from exc
 
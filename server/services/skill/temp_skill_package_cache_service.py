@@ -34,12 +34,18 @@ class TempSkillPackageCacheService:
         self.validator = SkillPackageValidator()
 
     async def prepare_package(self, package_bytes: bytes, *, run_store_backend=None) -> CachedTempSkillPackage:
+        self._validate_package_size(len(package_bytes))
+        with tempfile.TemporaryDirectory() as tmp_dir_str:
+            package_path = Path(tmp_dir_str) / "skill_package.zip"
+            package_path.write_bytes(package_bytes)
+            return await self.prepare_package_from_path(package_path, run_store_backend=run_store_backend)
+
+    async def prepare_package_from_path(self, package_path: Path, *, run_store_backend=None) -> CachedTempSkillPackage:
+        """Validate and cache a package already spooled to disk; extraction streams member by member."""
         store = run_store_backend or run_store
-        self._validate_package_size(package_bytes)
+        self._validate_package_size(package_path.stat().st_size)
         with tempfile.TemporaryDirectory() as tmp_dir_str:
             tmp_dir = Path(tmp_dir_str)
-            package_path = tmp_dir / "skill_package.zip"
-            package_path.write_bytes(package_bytes)
             top_level = self.validator.inspect_zip_top_level_from_path(package_path)
             extract_root = tmp_dir / "extract"
             self.validator.extract_zip_safe(package_path, extract_root)
@@ -104,11 +110,11 @@ class TempSkillPackageCacheService:
             logger.info("Removed expired temp skill package cache entries=%s", removed)
         return removed
 
-    def _validate_package_size(self, package_bytes: bytes) -> None:
+    def _validate_package_size(self, size: int) -> None:
         max_bytes = int(config.SYSTEM.TEMP_SKILL_PACKAGE_MAX_BYTES)
-        if max_bytes > 0 and len(package_bytes) > max_bytes:
+        if max_bytes > 0 and size > max_bytes:
             raise ValueError(f"Skill package exceeds size limit ({max_bytes} bytes)")
-        if not package_bytes:
+        if size <= 0:
             raise ValueError("Uploaded skill package is empty")
 
     def _snapshot_dir(self, skill_package_hash: str) -> Path:
@@ -33,6 +33,7 @@ def _isolate_persistence_root(tmp_path):
     old_workspaces_dir = config.SYSTEM.WORKSPACES_DIR
     old_requests_dir = config.SYSTEM.REQUESTS_DIR
     old_tmp_uploads_dir = config.SYSTEM.TMP_UPLOADS_DIR
+    old_content_store_dir = config.SYSTEM.CONTENT_STORE_DIR
     old_temp_skill_package_cache_dir = config.SYSTEM.TEMP_SKILL_PACKAGE_CACHE_DIR
     old_runs_db = config.SYSTEM.RUNS_DB
     old_run_state_db = config.SYSTEM.RUN_STATE_DB
@@ -76,6 +77,7 @@ def _isolate_persistence_root(tmp_path):
     config.SYSTEM.WORKSPACES_DIR = str(tmp_path / "workspaces")
     config.SYSTEM.REQUESTS_DIR = str(tmp_path / "requests")
     config.SYSTEM.TMP_UPLOADS_DIR = str(test_data_dir / "tmp_uploads")
+    config.SYSTEM.CONTENT_STORE_DIR = str(test_data_dir / "cas")
     config.SYSTEM.TEMP_SKILL_PACKAGE_CACHE_DIR = str(test_data_dir / "temp_skill_package_cache")
     config.SYSTEM.RUNS_DB = str(tmp_path / "runs.db")
     config.SYSTEM.RUN_STATE_DB = str(tmp_path / "run_state.db")
@@ -120,6 +122,7 @@ def _isolate_persistence_root(tmp_path):
         config.SYSTEM.WORKSPACES_DIR = old_workspaces_dir
         config.SYSTEM.REQUESTS_DIR = old_requests_dir
         config.SYSTEM.TMP_UPLOADS_DIR = old_tmp_uploads_dir
+        config.SYSTEM.CONTENT_STORE_DIR = old_content_store_dir
         config.SYSTEM.TEMP_SKILL_PACKAGE_CACHE_DIR = old_temp_skill_package_cache_dir
         config.SYSTEM.RUNS_DB = old_runs_db
         config.SYSTEM.RUN_STATE_DB = old_run_state_db
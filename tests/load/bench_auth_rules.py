@@ -0,0 +1,217 @@
+"""
+Benchmark parser auth-rule evaluation on the auth detection sample corpus.
+
+Each sample of `tests/fixtures/auth_detection_samples` becomes a parser-style
+evidence dict (`combined_text`, `stdout_text`, ...). A negative set of healthy
+codex/claude streams from `fake_engine.py` models the common case of a run
+that needs no auth.
+Both sets are evaluated with:
+- `interpreted`: the previous evaluator (re-sort per call, `re.search` on
+  pattern strings, per-lookup evidence copies)
+- `compiled`: `detect_auth_signal_from_patterns` on the compiled rule sets
+
+The two must agree on every sample; the script exits non-zero otherwise and
+prints the per-rule hit counters collected by the compiled path.
+
+Run:
+    python tests/load/bench_auth_rules.py --rounds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Mapping
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import server.runtime.adapter  # noqa: E402,F401  (import order: adapter before auth_detection)
+from server.config_registry import keys  # noqa: E402
+from server.runtime.adapter.common import parser_auth_signal_matcher as matcher  # noqa: E402
+from server.runtime.adapter.common.profile_loader import (  # noqa: E402
+    load_adapter_profile,
+    load_legacy_readonly_adapter_profile,
+)
+from tests.load.fake_engine import Pacer, claude_records, codex_records  # noqa: E402
+from tests.unit.auth_detection_test_utils import load_manifest, load_sample  # noqa: E402
+
+
+def engine_rules(engine: str) -> tuple[dict[str, Any], ...]:
+    path = PROJECT_ROOT / "server" / "engines" / engine / "adapter" / "adapter_profile.json"
+    if engine in keys.ENGINE_KEYS:
+        return load_adapter_profile(engine, path).parser_auth_patterns.rules
+    return load_legacy_readonly_adapter_profile(engine, path).parser_auth_patterns.rules
+
+
+def build_evidence(engine: str, stdout: str, stderr: str) -> dict[str, Any]:
+    return {
+        "engine": engine,
+        "stdout_text": stdout,
+        "stderr_text": stderr,
+        "combined_text": "\n".join(part for part in (stdout, stderr) if part),
+        "parser_diagnostics": [],
+        "structured_types": [],
+        "extracted": {},
+    }
+
+
+def load_positive_cases() -> list[tuple[str, dict[str, Any]]]:
+    cases = []
+    for entry in load_manifest()["samples"]:
+        sample = load_sample(entry["engine"], entry["sample_id"])
+        stdout = sample["stdout"] + sample["pty_output"]
+        cases.append((entry["engine"], build_evidence(entry["engine"], stdout, sample["stderr"])))
+    return cases
+
+
+def load_negative_cases(records_per_run: int) -> list[tuple[str, dict[str, Any]]]:
+    final_payload = {"__SKILL_DONE__": True, "message": "done"}
+    final_text = json.dumps(final_payload)
+    no_pacing = Pacer(count=0, rate=0.0, duration=0.0)
+    streams = {
+        "codex": codex_records("session-1", records_per_run, final_text, no_pacing),
+        "claude": claude_records("session-1", records_per_run, final_text, final_payload, no_pacing),
+    }
+    cases = []
+    for engine, records in streams.items():
+        stdout = "\n".join(json.dumps(record) for record in records) + "\n"
+        cases.append((engine, build_evidence(engine, stdout, "")))
+    # opencode-family parsers see the same kind of NDJSON volume.
+    cases.append(("opencode", build_evidence("opencode", cases[0][1]["stdout_text"], "")))
+    return cases
+
+
+def interpreted_detect(
+    *,
+    engine: str,
+    rules: tuple[dict[str, Any], ...],
+    evidence: Mapping[str, Any],
+) -> tuple[str, str] | None:
+    """The evaluator before rule compilation, kept here as the baseline."""
+
+    def resolve(payload: dict[str, Any], field: str) -> Any:
+        current: Any = payload
+        for part in field.split("."):
+            if not isinstance(current, dict):
+                return None
+            current = current.get(part)
+        return current
+
+    def clause_matches(clause: dict[str, Any], payload: Mapping[str, Any]) -> bool:
+        field = clause.get("field")
+        if not isinstance(field, str) or not field:
+            return False
+        op, expected = clause.get("op"), clause.get("value")
+        actual = resolve(dict(payload), field)
+        if op == "eq":
+            return actual == expected
+        if op == "in":
+            return actual in expected if isinstance(expected, list) else False
+        if op == "regex":
+            if not isinstance(actual, str) or not isinstance(expected, str):
+                return False
+            return re.search(expected, actual, re.IGNORECASE | re.MULTILINE) is not None
+        if op == "contains":
+            if isinstance(actual, str) and isinstance(expected, str):
+                return expected.lower() in actual.lower()
+            return expected in actual if isinstance(actual, list) else False
+        if op == "gte":
+            try:
+                return actual is not None and expected is not None and float(actual) >= float(expected)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def rule_matches(rule: dict[str, Any], payload: Mapping[str, Any]) -> bool:
+        match = rule.get("match", {})
+        all_clauses, any_clauses = match.get("all", []), match.get("any", [])
+        if all_clauses and not all(clause_matches(dict(c), payload) for c in all_clauses):
+            return False
+        if any_clauses and not any(clause_matches(dict(c), payload) for c in any_clauses):
+            return False
+        return bool(all_clauses or any_clauses)
+
+    def ordered(items: tuple[dict[str, Any], ...]) -> list[dict[str, Any]]:
+        enabled = [rule for rule in items if rule.get("enabled", True)]
+        return sorted(enabled, key=lambda item: int(item.get("priority", 0)), reverse=True)
+
+    for rule in ordered(rules):
+        if rule_matches(rule, evidence):
+            return str(rule["id"]), "high"
+    fallback_evidence = {**dict(evidence), "engine": engine}
+    for rule in ordered(matcher._load_common_fallback_rules()):  # noqa: SLF001
+        if rule_matches(rule, fallback_evidence):
+            return str(rule["id"]), "low"
+    return None
+
+
+def compiled_detect(
+    *,
+    engine: str,
+    rules: tuple[dict[str, Any], ...],
+    evidence: Mapping[str, Any],
+) -> tuple[str, str] | None:
+    signal = matcher.detect_auth_signal_from_patterns(engine=engine, rules=rules, evidence=evidence)
+    if signal is None:
+        return None
+    return str(signal["matched_pattern_id"]), str(signal["confidence"])
+
+
+def time_cases(detect: Any, cases: list[tuple[str, dict[str, Any]]], rounds: int) -> float:
+    rules_by_engine = {engine: engine_rules(engine) for engine, _ in cases}
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for engine, evidence in cases:
+            detect(engine=engine, rules=rules_by_engine[engine], evidence=evidence)
+    return time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200, help="passes over each case set")
+    parser.add_argument("--records", type=int, default=200, help="progress records per healthy stream")
+    args = parser.parse_args(argv)
+
+    case_sets = {
+        "auth samples": load_positive_cases(),
+        "healthy runs": load_negative_cases(args.records),
+    }
+    mismatches = 0
+    for name, cases in case_sets.items():
+        for engine, evidence in cases:
+            rules = engine_rules(engine)
+            expected = interpreted_detect(engine=engine, rules=rules, evidence=evidence)
+            actual = compiled_detect(engine=engine, rules=rules, evidence=evidence)
+            if expected != actual:
+                mismatches += 1
+                print(f"MISMATCH [{name}] {engine}: interpreted={expected} compiled={actual}")
+
+    matcher.reset_auth_rule_hit_counts()
+    for name, cases in case_sets.items():
+        evaluations = len(cases) * args.rounds
+        interpreted = time_cases(interpreted_detect, cases, args.rounds)
+        compiled = time_cases(compiled_detect, cases, args.rounds)
+        print(
+            f"{name:<13} cases={len(cases):<3} evaluations={evaluations:<6} "
+            f"interpreted={interpreted / evaluations * 1e6:8.1f}us "
+            f"compiled={compiled / evaluations * 1e6:8.1f}us "
+            f"speedup={interpreted / max(compiled, 1e-9):5.2f}x"
+        )
+    print("rule hits:")
+    for engine, counts in sorted(matcher.auth_rule_hit_counts().items()):
+        for rule_id, hits in sorted(counts.items()):
+            print(f"  {engine:<9} {rule_id:<48} {hits}")
+    if mismatches:
+        print(f"{mismatches} mismatching case(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
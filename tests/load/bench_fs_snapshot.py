@@ -0,0 +1,114 @@
+"""
+Benchmark attempt-boundary filesystem snapshots on synthetic workspaces.
+
+Builds run dirs with `--files` files (default: 10k and 100k) and times:
+- `rglob`: the previous full walk that stats and hashes every file
+- `cold`: first `capture_filesystem_snapshot` (scandir walk, parallel hashing)
+- `warm`: the next capture with `--touch` files changed (hash reuse)
+
+Run:
+    python tests/load/bench_fs_snapshot.py --files 10000 --files 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from server.services.orchestration.run_filesystem_snapshot_service import (  # noqa: E402
+    RunFilesystemSnapshotService,
+)
+
+
+def build_workspace(run_dir: Path, *, files: int, file_bytes: int, fanout: int = 100) -> None:
+    old_ns = time.time_ns() - 3600 * 1_000_000_000
+    block = os.urandom(file_bytes)
+    for index in range(files):
+        path = run_dir / "uploads" / f"d{index // fanout:05d}" / f"f{index:06d}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(index.to_bytes(8, "little") + block)
+        os.utime(path, ns=(old_ns, old_ns))
+
+
+def rglob_snapshot(service: RunFilesystemSnapshotService, run_dir: Path) -> dict[str, dict]:
+    snapshot = {}
+    for path in run_dir.rglob("*"):
+        if not path.is_file():
+            continue
+        rel_path = path.relative_to(run_dir).as_posix()
+        if rel_path.startswith(service._ignored_prefixes) or rel_path in service._ignored_files:  # noqa: SLF001
+            continue
+        hasher = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(8192), b""):
+                hasher.update(chunk)
+        snapshot[rel_path] = {
+            "size": path.stat().st_size,
+            "mtime": path.stat().st_mtime,
+            "sha256": hasher.hexdigest(),
+        }
+    return snapshot
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def bench(files: int, *, file_bytes: int, touch: int, workers: int, root: Path) -> dict[str, float]:
+    run_dir = root / f"run-{files}"
+    build_workspace(run_dir, files=files, file_bytes=file_bytes)
+    service = RunFilesystemSnapshotService(hash_workers=workers)
+
+    reference, rglob_sec = _timed(lambda: rglob_snapshot(service, run_dir))
+    cold, cold_sec = _timed(lambda: service.capture_filesystem_snapshot(run_dir))
+    if cold != reference:
+        raise AssertionError("snapshot mismatch between rglob and scandir captures")
+
+    for index in range(min(touch, files)):
+        path = run_dir / "uploads" / f"d{index // 100:05d}" / f"f{index:06d}.bin"
+        path.write_bytes(b"touched" + path.read_bytes())
+    warm, warm_sec = _timed(lambda: service.capture_filesystem_snapshot(run_dir))
+    diff = service.diff_filesystem_snapshot(cold, warm)
+    if len(diff["modified"]) != min(touch, files):
+        raise AssertionError(f"unexpected diff: {len(diff['modified'])} modified")
+    shutil.rmtree(run_dir, ignore_errors=True)
+    return {"rglob_sec": rglob_sec, "cold_sec": cold_sec, "warm_sec": warm_sec}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, action="append", help="Files per workspace (repeatable)")
+    parser.add_argument("--file-bytes", type=int, default=4096)
+    parser.add_argument("--touch", type=int, default=100, help="Files modified between captures")
+    parser.add_argument("--workers", type=int, default=4, help="Hash thread pool size")
+    args = parser.parse_args(argv)
+    sizes = args.files or [10_000, 100_000]
+    root = Path(tempfile.mkdtemp(prefix="fs-snapshot-bench-"))
+    try:
+        print(f"{'files':>8} {'rglob s':>9} {'cold s':>9} {'warm s':>9} {'speedup':>8}")
+        for files in sizes:
+            result = bench(files, file_bytes=args.file_bytes, touch=args.touch, workers=args.workers, root=root)
+            speedup = result["rglob_sec"] / max(result["warm_sec"], 1e-9)
+            print(
+                f"{files:>8} {result['rglob_sec']:>9.3f} {result['cold_sec']:>9.3f} "
+                f"{result['warm_sec']:>9.3f} {speedup:>7.1f}x"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""
+Benchmark run listing queries on a synthetic run store.
+
+Seeds `--runs` requests (default 100k) directly into a temporary `runs.db`
+created by `RunStore`, then times:
+- `offset`: `list_requests_with_runs_page` at the first and a deep page
+- `keyset`: `list_requests_with_runs_keyset` at the same depth, reached by
+  following `next_cursor`
+- filtered keyset pages (status + engine, model, date range)
+- free-text search through the FTS5 trigram index
+
+`--plans` prints `EXPLAIN QUERY PLAN` for the filtered and search queries.
+
+Run:
+    python tests/load/bench_run_listing.py --runs 100000 --page-size 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from server.services.orchestration.run_store import RunStore  # noqa: E402
+from server.services.orchestration.run_store_request_store import (  # noqa: E402
+    RunListFilters,
+    encode_run_list_cursor,
+)
+
+ENGINES = ("codex", "gemini", "claude", "opencode")
+MODELS = ("gpt-5", "gemini-2.5-pro", "sonnet", "")
+STATUSES = ("succeeded",) * 7 + ("failed", "failed", "canceled")
+ERRORS = ("AUTH_REQUIRED 401 Unauthorized", "TIMEOUT engine idle", "SCHEMA_VALIDATION_FAILED missing field")
+
+
+def seed(db_path: Path, runs: int) -> None:
+    rng = random.Random(7)
+    started = datetime(2026, 1, 1)
+    request_rows = []
+    run_rows = []
+    search_rows = []
+    for index in range(runs):
+        request_id = f"req-{index:08d}"
+        run_id = f"run-{index:08d}"
+        created_at = (started + timedelta(seconds=index * 30)).isoformat()
+        engine = rng.choice(ENGINES)
+        model = rng.choice(MODELS)
+        status = rng.choice(STATUSES)
+        skill_id = f"skill-{rng.randrange(40):02d}"
+        request_rows.append(
+            (
+                request_id,
+                skill_id,
+                engine,
+                "{}",
+                "{}",
+                json.dumps({"model": model} if model else {}),
+                "{}",
+                run_id,
+                model,
+                created_at,
+            )
+        )
+        run_rows.append((run_id, status, "", "", created_at))
+        error = rng.choice(ERRORS) if status == "failed" else ""
+        final = "" if status != "succeeded" else f"Summarised {rng.randrange(500)} papers for {skill_id}"
+        search_rows.append((error, final, request_id))
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO requests (
+                request_id, skill_id, engine, input_json, parameter_json, engine_options_json,
+                runtime_options_json, run_id, model, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            request_rows,
+        )
+        conn.executemany(
+            "INSERT INTO runs (run_id, status, result_path, artifacts_manifest_path, created_at) VALUES (?, ?, ?, ?, ?)",
+            run_rows,
+        )
+        conn.executemany(
+            "UPDATE run_search_documents SET error_summary = ?, final_message = ? WHERE request_id = ?",
+            search_rows,
+        )
+        conn.execute("ANALYZE")
+
+
+async def timed(label: str, rounds: int, call: Callable[[], Awaitable[Any]]) -> Any:
+    result = await call()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = await call()
+    elapsed = (time.perf_counter() - started) / rounds
+    rows = result.get("rows") if isinstance(result, dict) else result
+    print(f"{label:<44} {elapsed * 1000:9.2f} ms  rows={len(rows)}")
+    return result
+
+
+def print_plan(db_path: Path, store: RunStore, filters: RunListFilters, label: str) -> None:
+    where_sql, params = store._request_store._run_list_where(filters)  # noqa: SLF001
+    sql = (
+        "SELECT req.request_id FROM requests req LEFT JOIN runs run ON req.run_id = run.run_id "
+        f"WHERE {where_sql} ORDER BY req.created_at DESC, req.request_id DESC LIMIT 50"
+    )
+    with sqlite3.connect(db_path) as conn:
+        print(f"plan [{label}]")
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+            print(f"  {row[-1]}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory(prefix="bench-run-listing-") as tmp:
+        db_path = Path(tmp) / "runs.db"
+        store = RunStore(db_path=db_path)
+        await store.count_requests_with_runs()
+        seed_started = time.perf_counter()
+        seed(db_path, args.runs)
+        print(f"seeded {args.runs} runs in {time.perf_counter() - seed_started:.1f}s")
+
+        page_size = args.page_size
+        deep_page = max(1, int(args.runs * args.depth) // page_size)
+        deep_rows = await store.list_requests_with_runs_page(page=deep_page, page_size=page_size)
+        deep_anchor = await store.list_requests_with_runs_page(page=deep_page - 1, page_size=page_size)
+        last = deep_anchor[-1] if deep_anchor else None
+        deep_cursor = (
+            encode_run_list_cursor(last["request_created_at"], last["request_id"]) if last is not None else None
+        )
+
+        rounds = args.rounds
+        await timed("offset page 1", rounds, lambda: store.list_requests_with_runs_page(page=1, page_size=page_size))
+        await timed(
+            f"offset page {deep_page}",
+            rounds,
+            lambda: store.list_requests_with_runs_page(page=deep_page, page_size=page_size),
+        )
+        await timed("keyset first page", rounds, lambda: store.list_requests_with_runs_keyset(limit=page_size))
+        keyset_deep = await timed(
+            f"keyset page {deep_page} (cursor)",
+            rounds,
+            lambda: store.list_requests_with_runs_keyset(limit=page_size, cursor=deep_cursor),
+        )
+        same = [row["request_id"] for row in keyset_deep["rows"]] == [row["request_id"] for row in deep_rows]
+        print(f"deep keyset page matches offset page: {same}")
+
+        cases = {
+            "failed codex runs": RunListFilters(statuses=("failed",), engine="codex"),
+            "model=gpt-5": RunListFilters(model="gpt-5"),
+            "skill-07, one week": RunListFilters(
+                skill_id="skill-07",
+                created_from=datetime(2026, 1, 8),
+                created_to=datetime(2026, 1, 15),
+            ),
+            "search 'unauthorized'": RunListFilters(text="unauthorized"),
+            "search 'skill-07 papers'": RunListFilters(text="skill-07 papers"),
+        }
+        for label, filters in cases.items():
+            await timed(
+                f"keyset {label}",
+                rounds,
+                lambda f=filters: store.list_requests_with_runs_keyset(limit=page_size, filters=f),
+            )
+        for label, filters in cases.items():
+            started = time.perf_counter()
+            total = await store.count_requests_with_runs_filtered(filters)
+            print(f"count {label:<38} {(time.perf_counter() - started) * 1000:9.2f} ms  total={total}")
+        if args.plans:
+            for label, filters in cases.items():
+                print_plan(db_path, store, filters, label)
+        from server.services.platform.sqlite_db_handle import sqlite_db_handle_registry
+
+        await sqlite_db_handle_registry.close_all()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--depth", type=float, default=0.9, help="deep page position as a fraction of all runs")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--plans", action="store_true", help="print EXPLAIN QUERY PLAN for filtered queries")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
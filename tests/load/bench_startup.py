@@ -0,0 +1,138 @@
+"""
+Measure server cold start: import time and time-to-first-200.
+
+- `import`: median wall time of `import server.main` in a fresh interpreter
+  over `--rounds` runs, plus the slowest `server.*` modules reported by
+  `python -X importtime` (cumulative, `--top` entries)
+- `ready`: time from spawning `uvicorn server.main:app` (isolated runtime
+  laid out by `run_load_tests.prepare_runtime_root`) until `GET /` first
+  answers 200, i.e. the lifespan critical path has finished
+
+`--import-budget-ms` / `--ready-budget-ms` turn the numbers into a gate: the
+process exits non-zero when a median exceeds its budget.
+
+Run:
+    python tests/load/bench_startup.py --rounds 5 --import-budget-ms 2500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.load.run_load_tests import (  # noqa: E402
+    _free_port,
+    prepare_runtime_root,
+    start_server,
+    stop_server,
+)
+
+_IMPORT_SNIPPET = "import time; t = time.perf_counter(); import server.main; print((time.perf_counter() - t) * 1000)"
+
+
+def measure_import_ms(env: dict[str, str]) -> float:
+    completed = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET],
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict[str, str], top: int) -> list[tuple[int, int, str]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server.main"],
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows: list[tuple[int, int, str]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|", 2))
+        if not self_us.isdigit():
+            continue
+        if name.startswith("server"):
+            rows.append((int(cumulative_us), int(self_us), name))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def measure_ready_ms(env: dict[str, str], work_dir: Path, timeout_sec: float) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    proc = start_server(env, port=port, log_path=work_dir / f"server-{port}.log")
+    try:
+        deadline = time.monotonic() + timeout_sec
+        with httpx.Client(timeout=1.0) as client:
+            while time.monotonic() < deadline:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"Server exited early with code {proc.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                        return (time.perf_counter() - started) * 1000
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.02)
+        raise RuntimeError(f"Server did not answer 200 within {timeout_sec}s")
+    finally:
+        stop_server(proc)
+
+
+def _check_budget(label: str, value_ms: float, budget_ms: float | None) -> bool:
+    if budget_ms is None:
+        return True
+    ok = value_ms <= budget_ms
+    print(f"budget {label:<8} {value_ms:9.1f} ms <= {budget_ms:.1f} ms: {'ok' if ok else 'EXCEEDED'}")
+    return ok
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest server.* imports to list")
+    parser.add_argument("--skip-ready", action="store_true", help="only measure import time")
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    parser.add_argument("--import-budget-ms", type=float, default=None)
+    parser.add_argument("--ready-budget-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as tmp:
+        work_dir = Path(tmp)
+        env = prepare_runtime_root(work_dir, engine_env={})
+
+        import_samples = [measure_import_ms(env) for _ in range(max(1, args.rounds))]
+        import_ms = statistics.median(import_samples)
+        print(f"import server.main   median {import_ms:9.1f} ms  samples={[round(v) for v in import_samples]}")
+        print("slowest server.* imports (cumulative / self, ms):")
+        for cumulative_us, self_us, name in slowest_imports(env, args.top):
+            print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+        ok = _check_budget("import", import_ms, args.import_budget_ms)
+        if not args.skip_ready:
+            ready_samples = [measure_ready_ms(env, work_dir, args.ready_timeout) for _ in range(max(1, args.rounds))]
+            ready_ms = statistics.median(ready_samples)
+            print(f"time to first 200    median {ready_ms:9.1f} ms  samples={[round(v) for v in ready_samples]}")
+            ok = _check_budget("ready", ready_ms, args.ready_budget_ms) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
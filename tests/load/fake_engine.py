@@ -0,0 +1,293 @@
+"""
+Offline stand-in for the codex / gemini / claude CLIs used by the load harness.
+
+The harness installs one shim per engine into the managed npm prefix
+(`<prefix>/bin/<engine>`) that execs this script with `--engine <name>`, so
+the server resolves and launches it exactly like the real CLI. Each turn
+writes the engine's native stdout protocol:
+
+- codex: `--json` NDJSON (`thread.started`, `turn.started`,
+  `item.completed` command_execution/agent_message, `turn.completed`)
+- claude: `--output-format stream-json` (`system/init`, `assistant`
+  thinking blocks, `result` with `structured_output`)
+- gemini: progress text followed by the JSON envelope
+  (`session_id`, `response`, `stats`)
+
+Progress records carry `fake-emit@<unix_ts>` so the load generator can
+measure engine-to-client event delivery lag. Behaviour is tuned through
+environment variables inherited from the server process:
+
+- `SKILL_RUNNER_FAKE_ENGINE_EVENTS`: progress records per turn (default 20)
+- `SKILL_RUNNER_FAKE_ENGINE_EVENTS_PER_SEC`: output rate, 0 = unpaced (default 50)
+- `SKILL_RUNNER_FAKE_ENGINE_DURATION_SEC`: spread the progress records over
+  this many seconds instead (overrides the rate)
+- `SKILL_RUNNER_FAKE_ENGINE_PENDING_TURNS`: for prompts of skills whose id
+  contains `interactive`, answer with a pending `__SKILL_DONE__ = false`
+  payload for this many turns before finishing (default 2)
+- `SKILL_RUNNER_FAKE_ENGINE_FIXTURE`: replay the captured stdout of a
+  `tests/fixtures/protocol_golden` fixture instead of synthesizing records
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+GOLDEN_ROOT = PROJECT_ROOT / "tests" / "fixtures" / "protocol_golden"
+
+SUPPORTED_ENGINES = ("codex", "gemini", "claude")
+EMIT_MARKER = "fake-emit@"
+STATE_FILE_NAME = ".fake-engine-state.json"
+RESUME_PROBE_SESSION = "probe-session"
+
+EVENTS_ENV = "SKILL_RUNNER_FAKE_ENGINE_EVENTS"
+EVENTS_PER_SEC_ENV = "SKILL_RUNNER_FAKE_ENGINE_EVENTS_PER_SEC"
+DURATION_ENV = "SKILL_RUNNER_FAKE_ENGINE_DURATION_SEC"
+PENDING_TURNS_ENV = "SKILL_RUNNER_FAKE_ENGINE_PENDING_TURNS"
+FIXTURE_ENV = "SKILL_RUNNER_FAKE_ENGINE_FIXTURE"
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name, "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+class Pacer:
+    """Sleep between records so `count` records take `duration` seconds or run at `rate`/s."""
+
+    def __init__(self, *, count: int, rate: float, duration: float) -> None:
+        if duration > 0 and count > 0:
+            self.interval = duration / count
+        elif rate > 0:
+            self.interval = 1.0 / rate
+        else:
+            self.interval = 0.0
+        self._next = time.monotonic()
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        self._next += self.interval
+        delay = self._next - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def parse_invocation(engine: str, argv: list[str]) -> tuple[str | None, str]:
+    """Return `(resume_session_id, prompt)` for the engine's start/resume argv."""
+    args = list(argv)
+    resume_id: str | None = None
+    if engine == "codex":
+        if args and args[0] == "exec":
+            args = args[1:]
+        if "resume" in args:
+            index = args.index("resume")
+            tail = args[index + 1:]
+            positional = [item for item in tail if not item.startswith("-")]
+            if len(positional) >= 2:
+                resume_id = positional[-2]
+    elif "--resume" in args:
+        index = args.index("--resume")
+        if index + 1 < len(args):
+            resume_id = args[index + 1]
+    prompt = args[-1] if args and not args[-1].startswith("-") else ""
+    return resume_id, prompt
+
+
+def build_final_payload(*, turn: int, pending_turns: int, interactive: bool) -> dict[str, Any]:
+    if interactive and turn <= pending_turns:
+        return {
+            "__SKILL_DONE__": False,
+            "message": f"fake engine question {turn}/{pending_turns}",
+            "ui_hints": {"kind": "open_text", "prompt": f"Reply to continue (turn {turn})"},
+        }
+    return {"__SKILL_DONE__": True, "message": "fake engine done", "turns": turn}
+
+
+def _progress_text(index: int, total: int) -> str:
+    return f"fake engine progress {index}/{total} {EMIT_MARKER}{time.time():.6f}"
+
+
+def codex_records(session_id: str, total: int, final_text: str, pacer: Pacer) -> Iterator[dict[str, Any]]:
+    yield {"type": "thread.started", "thread_id": session_id}
+    yield {"type": "turn.started"}
+    for index in range(1, total + 1):
+        pacer.wait()
+        text = _progress_text(index, total)
+        yield {
+            "type": "item.completed",
+            "item": {
+                "id": f"item_{index}",
+                "type": "command_execution",
+                "command": f"fake-step {index}",
+                "aggregated_output": text,
+                "exit_code": 0,
+                "status": "completed",
+            },
+        }
+    yield {
+        "type": "item.completed",
+        "item": {"id": f"item_{total + 1}", "type": "agent_message", "text": final_text},
+    }
+    yield {
+        "type": "turn.completed",
+        "usage": {"input_tokens": 128, "cached_input_tokens": 0, "output_tokens": 16 * (total + 1)},
+    }
+
+
+def claude_records(
+    session_id: str,
+    total: int,
+    final_text: str,
+    final_payload: dict[str, Any],
+    pacer: Pacer,
+) -> Iterator[dict[str, Any]]:
+    yield {"type": "system", "subtype": "init", "session_id": session_id, "model": "fake-claude"}
+    for index in range(1, total + 1):
+        pacer.wait()
+        yield {
+            "type": "assistant",
+            "session_id": session_id,
+            "message": {
+                "id": f"msg_{index}",
+                "role": "assistant",
+                "content": [{"type": "thinking", "thinking": _progress_text(index, total)}],
+            },
+        }
+    yield {
+        "type": "assistant",
+        "session_id": session_id,
+        "message": {"id": f"msg_{total + 1}", "role": "assistant", "content": [{"type": "text", "text": final_text}]},
+    }
+    yield {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "session_id": session_id,
+        "result": final_text,
+        "structured_output": final_payload,
+        "num_turns": 1,
+    }
+
+
+def gemini_lines(session_id: str, total: int, final_text: str, pacer: Pacer) -> Iterator[str]:
+    for index in range(1, total + 1):
+        pacer.wait()
+        yield _progress_text(index, total)
+    yield json.dumps(
+        {"session_id": session_id, "response": final_text, "stats": {"models": {}}},
+        ensure_ascii=False,
+    )
+
+
+def resolve_fixture_stdout(fixture_id: str, *, root: Path = GOLDEN_ROOT) -> Path:
+    manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+    for entry in manifest.get("fixtures", []):
+        if entry.get("fixture_id") != fixture_id:
+            continue
+        fixture_path = root / str(entry["path"])
+        fixture = json.loads(fixture_path.read_text(encoding="utf-8"))
+        stdout_name = str((fixture.get("inputs") or {}).get("stdout_file") or "stdout.log")
+        stdout_path = fixture_path.parent / stdout_name
+        if not stdout_path.is_file():
+            raise FileNotFoundError(f"Fixture {fixture_id} has no captured stdout at {stdout_path}")
+        return stdout_path
+    raise KeyError(f"Unknown protocol_golden fixture: {fixture_id}")
+
+
+def _load_state(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _writer(stream: Any) -> Callable[[str], None]:
+    def _write(line: str) -> None:
+        stream.write(line + "\n")
+        stream.flush()
+
+    return _write
+
+
+def run_turn(engine: str, argv: list[str], *, cwd: Path, write: Callable[[str], None]) -> int:
+    resume_id, prompt = parse_invocation(engine, argv)
+    total = _env_int(EVENTS_ENV, 20)
+    pacer = Pacer(
+        count=total,
+        rate=_env_float(EVENTS_PER_SEC_ENV, 50.0),
+        duration=_env_float(DURATION_ENV, 0.0),
+    )
+
+    fixture_id = os.environ.get(FIXTURE_ENV, "").strip()
+    if fixture_id:
+        for line in resolve_fixture_stdout(fixture_id).read_text(encoding="utf-8").splitlines():
+            pacer.wait()
+            write(line)
+        return 0
+
+    state_path = cwd / STATE_FILE_NAME
+    state = _load_state(state_path)
+    session_id = resume_id or str(state.get("session_id") or "") or str(uuid.uuid4())
+    turn = int(state.get("turn") or 0) + 1 if resume_id else 1
+    # Resumed turns only carry the user's reply, so remember the mode from the first prompt.
+    interactive = bool(state.get("interactive")) if resume_id else "interactive" in prompt
+    state_path.write_text(
+        json.dumps({"session_id": session_id, "turn": turn, "interactive": interactive}),
+        encoding="utf-8",
+    )
+
+    payload = build_final_payload(
+        turn=turn,
+        pending_turns=_env_int(PENDING_TURNS_ENV, 2),
+        interactive=interactive,
+    )
+    final_text = json.dumps(payload, ensure_ascii=False)
+    if engine == "codex":
+        for record in codex_records(session_id, total, final_text, pacer):
+            write(json.dumps(record, ensure_ascii=False))
+    elif engine == "claude":
+        for record in claude_records(session_id, total, final_text, payload, pacer):
+            write(json.dumps(record, ensure_ascii=False))
+    else:
+        for line in gemini_lines(session_id, total, final_text, pacer):
+            write(line)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fake engine CLI for the load harness", add_help=False)
+    parser.add_argument("--engine", required=True, choices=SUPPORTED_ENGINES)
+    known, rest = parser.parse_known_args(argv)
+    engine = known.engine
+    if "--version" in rest or "-v" in rest:
+        print(f"{engine}-fake 0.0.0")
+        return 0
+    if "--help" in rest or "-h" in rest or RESUME_PROBE_SESSION in rest:
+        # Capability probes (`--resume probe-session ...`) only need a clean exit.
+        print(f"usage: {engine} [--resume <session>] [options] <prompt>")
+        return 0
+    return run_turn(engine, rest, cwd=Path.cwd(), write=_writer(sys.stdout))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+"""Latency, event-lag and RSS bookkeeping for the REST load harness."""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+try:
+    import psutil  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - psutil is optional
+    psutil = None
+
+EMIT_PATTERN = re.compile(r"fake-emit@(\d+(?:\.\d+)?)")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample list."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: dict[int, int] = field(default_factory=dict)
+
+    def summary(self, elapsed_sec: float) -> dict[str, Any]:
+        count = len(self.latencies)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "req_per_sec": round(count / elapsed_sec, 2) if elapsed_sec > 0 else 0.0,
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 2),
+            "max_ms": round(max(self.latencies, default=0.0) * 1000, 2),
+            "status_counts": {str(key): value for key, value in sorted(self.status_counts.items())},
+        }
+
+
+class LoadRecorder:
+    """Collects per-endpoint latencies, SSE delivery lag and scenario counters."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.event_lags: list[float] = []
+        self.counters: dict[str, int] = {}
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+
+    def record(self, endpoint: str, elapsed_sec: float, status_code: int | None) -> None:
+        stats = self.endpoints.setdefault(endpoint, EndpointStats())
+        stats.latencies.append(elapsed_sec)
+        if status_code is None:
+            stats.errors += 1
+            return
+        stats.status_counts[status_code] = stats.status_counts.get(status_code, 0) + 1
+        if status_code >= 400:
+            stats.errors += 1
+
+    def record_event_payload(self, raw_data: str, received_at: float) -> None:
+        """Record delivery lag for every `fake-emit@<ts>` marker carried by an SSE frame."""
+        for match in EMIT_PATTERN.finditer(raw_data):
+            self.event_lags.append(max(0.0, received_at - float(match.group(1))))
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+
+    @property
+    def elapsed_sec(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 1e-9)
+
+    def summary(self) -> dict[str, Any]:
+        elapsed = self.elapsed_sec
+        total = sum(len(stats.latencies) for stats in self.endpoints.values())
+        return {
+            "elapsed_sec": round(elapsed, 3),
+            "total_requests": total,
+            "req_per_sec": round(total / elapsed, 2),
+            "endpoints": {name: stats.summary(elapsed) for name, stats in sorted(self.endpoints.items())},
+            "event_lag_ms": {
+                "count": len(self.event_lags),
+                "p50": round(percentile(self.event_lags, 50) * 1000, 2),
+                "p95": round(percentile(self.event_lags, 95) * 1000, 2),
+                "p99": round(percentile(self.event_lags, 99) * 1000, 2),
+                "max": round(max(self.event_lags, default=0.0) * 1000, 2),
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+def read_rss_bytes(pid: int) -> int | None:
+    if psutil is not None:
+        try:
+            return int(psutil.Process(pid).memory_info().rss)
+        except (psutil.Error, OSError):
+            return None
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text(encoding="utf-8").splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class RssSampler:
+    """Background thread sampling the server's resident set size."""
+
+    def __init__(self, pid: int, *, interval_sec: float = 0.5) -> None:
+        self.pid = pid
+        self.interval_sec = interval_sec
+        self.samples: list[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            rss = read_rss_bytes(self.pid)
+            if rss is not None:
+                self.samples.append(rss)
+            self._stop.wait(self.interval_sec)
+
+    def summary(self) -> dict[str, Any]:
+        if not self.samples:
+            return {"available": False}
+        mib = 1024 * 1024
+        return {
+            "available": True,
+            "samples": len(self.samples),
+            "start_mib": round(self.samples[0] / mib, 1),
+            "peak_mib": round(max(self.samples) / mib, 1),
+            "end_mib": round(self.samples[-1] / mib, 1),
+        }
+
+
+def format_report(scenarios: dict[str, dict[str, Any]], rss: dict[str, Any]) -> str:
+    lines: list[str] = []
+    for name, summary in scenarios.items():
+        lines.append(
+            f"== {name}: {summary['total_requests']} requests in {summary['elapsed_sec']}s "
+            f"({summary['req_per_sec']} req/s)"
+        )
+        lines.append(f"{'endpoint':<44} {'count':>6} {'err':>4} {'req/s':>8} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9}")
+        for endpoint, stats in summary["endpoints"].items():
+            lines.append(
+                f"{endpoint:<44} {stats['count']:>6} {stats['errors']:>4} {stats['req_per_sec']:>8} "
+                f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}"
+            )
+        lag = summary["event_lag_ms"]
+        if lag["count"]:
+            lines.append(
+                f"event delivery lag: n={lag['count']} p50={lag['p50']}ms p95={lag['p95']}ms "
+                f"p99={lag['p99']}ms max={lag['max']}ms"
+            )
+        if summary["counters"]:
+            lines.append("counters: " + ", ".join(f"{key}={value}" for key, value in summary["counters"].items()))
+        lines.append("")
+    if rss.get("available"):
+        lines.append(
+            f"server RSS: start={rss['start_mib']}MiB peak={rss['peak_mib']}MiB end={rss['end_mib']}MiB "
+            f"({rss['samples']} samples)"
+        )
+    else:
+        lines.append("server RSS: unavailable")
+    return "\n".join(lines)
+
+
+def write_json_report(path: Path, scenarios: dict[str, dict[str, Any]], rss: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"scenarios": scenarios, "server_rss": rss}, indent=2), encoding="utf-8")
@@ -0,0 +1,531 @@
+"""
+REST load harness: drive a real `server.main:app` process backed by the fake engine CLI.
+
+The harness builds an isolated runtime root (data dir, skills dir, agent
+cache with fake `codex` / `gemini` / `claude` shims), starts uvicorn on a
+local port, runs the selected scenarios with an async HTTP client and
+prints req/s, p50/p95/p99 per endpoint, SSE event delivery lag and the
+server's RSS. No network access or real engine is needed.
+
+Scenarios:
+- `sse`: create_run -> upload -> `/events` SSE until the stream ends -> result
+- `cache`: warm one run, then a storm of identical creates served from cache
+- `interactive`: create_run -> SSE -> pending -> reply, repeated until done
+- `upload`: create_run -> large input zip upload -> SSE -> result
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from server.config_registry import keys  # noqa: E402
+from tests.load import fake_engine  # noqa: E402
+from tests.load.load_report import (  # noqa: E402
+    LoadRecorder,
+    RssSampler,
+    format_report,
+    write_json_report,
+)
+
+SCENARIOS = ("sse", "cache", "interactive", "upload")
+# gemini is a legacy read-only engine key; its fake CLI only serves fixture replays.
+RUNNABLE_ENGINES = tuple(engine for engine in fake_engine.SUPPORTED_ENGINES if engine in keys.ENGINE_KEYS)
+TERMINAL_STATUSES = {"succeeded", "failed", "canceled"}
+AUTO_SKILL_ID = "loadtest-auto"
+INTERACTIVE_SKILL_ID = "loadtest-interactive"
+UPLOAD_SKILL_ID = "loadtest-upload"
+
+_OUTPUT_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {"message": {"type": "string"}, "turns": {"type": "integer"}},
+    "required": ["message"],
+}
+_PARAMETER_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {"seed": {"type": "integer"}},
+    "required": [],
+}
+_EMPTY_INPUT_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {},
+    "additionalProperties": False,
+}
+_FILE_INPUT_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {"payload": {"type": "string", "description": "Bulk input file for upload load."}},
+    "required": ["payload"],
+}
+
+
+def _write_skill(skills_dir: Path, skill_id: str, *, modes: list[str], input_schema: dict[str, Any]) -> None:
+    skill_dir = skills_dir / skill_id
+    assets = skill_dir / "assets"
+    assets.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(
+        f"---\nname: {skill_id}\ndescription: Load harness skill answered by the fake engine.\n---\n\n"
+        f"# {skill_id}\n\nReturn the JSON object produced by the fake engine.\n",
+        encoding="utf-8",
+    )
+    runner = {
+        "id": skill_id,
+        "version": "1.0.0",
+        "name": skill_id,
+        "description": "Load harness skill answered by the fake engine.",
+        "execution_modes": modes,
+        "entrypoint": {},
+        "schemas": {
+            "input": "assets/input.schema.json",
+            "parameter": "assets/parameter.schema.json",
+            "output": "assets/output.schema.json",
+        },
+    }
+    (assets / "runner.json").write_text(json.dumps(runner, indent=2), encoding="utf-8")
+    (assets / "input.schema.json").write_text(json.dumps(input_schema, indent=2), encoding="utf-8")
+    (assets / "parameter.schema.json").write_text(json.dumps(_PARAMETER_SCHEMA, indent=2), encoding="utf-8")
+    (assets / "output.schema.json").write_text(json.dumps(_OUTPUT_SCHEMA, indent=2), encoding="utf-8")
+
+
+def _install_engine_shims(bin_dir: Path) -> None:
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    script = Path(fake_engine.__file__).resolve()
+    for engine in fake_engine.SUPPORTED_ENGINES:
+        shim = bin_dir / engine
+        shim.write_text(
+            f'#!/bin/sh\nexec "{sys.executable}" "{script}" --engine {engine} "$@"\n',
+            encoding="utf-8",
+        )
+        shim.chmod(0o755)
+
+
+def prepare_runtime_root(root: Path, *, engine_env: dict[str, str]) -> dict[str, str]:
+    """Lay out an isolated runtime under `root` and return the server environment."""
+    data_dir = root / "data"
+    skills_dir = root / "skills"
+    agent_cache = root / "agent-cache"
+    npm_prefix = agent_cache / "npm"
+    for path in (data_dir, skills_dir, agent_cache):
+        path.mkdir(parents=True, exist_ok=True)
+    _install_engine_shims(npm_prefix / "bin")
+    _write_skill(skills_dir, AUTO_SKILL_ID, modes=["auto"], input_schema=_EMPTY_INPUT_SCHEMA)
+    _write_skill(skills_dir, INTERACTIVE_SKILL_ID, modes=["interactive"], input_schema=_EMPTY_INPUT_SCHEMA)
+    _write_skill(skills_dir, UPLOAD_SKILL_ID, modes=["auto"], input_schema=_FILE_INPUT_SCHEMA)
+
+    env = dict(os.environ)
+    env.update(
+        {
+            "SKILL_RUNNER_DATA_DIR": str(data_dir),
+            "SKILL_RUNNER_SKILLS_DIR": str(skills_dir),
+            "SKILL_RUNNER_AGENT_CACHE_DIR": str(agent_cache),
+            "SKILL_RUNNER_AGENT_HOME": str(agent_cache / "agent-home"),
+            "SKILL_RUNNER_NPM_PREFIX": str(npm_prefix),
+            "SKILL_RUNNER_RUNTIME_MODE": "local",
+            "ENGINE_MODELS_CATALOG_STARTUP_PROBE": "false",
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH", "")])),
+        }
+    )
+    env.update(engine_env)
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def start_server(env: dict[str, str], *, port: int, log_path: Path) -> subprocess.Popen[bytes]:
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "wb") as log_handle:
+        return subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "server.main:app", "--host", "127.0.0.1", "--port", str(port)],
+            cwd=str(PROJECT_ROOT),
+            env=env,
+            stdout=log_handle,
+            stderr=subprocess.STDOUT,
+        )
+
+
+def wait_server_ready(base_url: str, proc: subprocess.Popen[bytes], timeout_sec: float) -> None:
+    deadline = time.monotonic() + timeout_sec
+    with httpx.Client(timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Server exited early with code {proc.returncode}")
+            try:
+                if client.get(f"{base_url}/").status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.25)
+    raise RuntimeError(f"Server did not become ready within {timeout_sec}s: {base_url}")
+
+
+def stop_server(proc: subprocess.Popen[bytes]) -> None:
+    if proc.poll() is not None:
+        return
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait(timeout=5)
+
+
+def build_input_zip(files: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+class LoadClient:
+    """Thin async REST client that records the latency of every call."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: LoadRecorder, *, run_timeout_sec: float) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.run_timeout_sec = run_timeout_sec
+
+    async def call(self, label: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(label, time.perf_counter() - started, None)
+            raise
+        self.recorder.record(label, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def create_run(self, skill_id: str, engine: str, *, parameter: dict[str, Any], runtime_options: dict[str, Any]) -> dict[str, Any]:
+        response = await self.call(
+            "POST /v1/jobs",
+            "POST",
+            "/v1/jobs",
+            json={"skill_id": skill_id, "engine": engine, "parameter": parameter, "runtime_options": runtime_options},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def upload(self, request_id: str, zip_bytes: bytes) -> dict[str, Any]:
+        response = await self.call(
+            "POST /v1/jobs/{id}/upload",
+            "POST",
+            f"/v1/jobs/{request_id}/upload",
+            files={"file": ("inputs.zip", zip_bytes, "application/zip")},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def follow_events(self, request_id: str, cursor: int) -> int:
+        """Consume `/events` until the server closes it; return the last seen `seq`."""
+        started = time.perf_counter()
+        first_frame_at: float | None = None
+        status_code: int | None = None
+        try:
+            async with self.client.stream(
+                "GET",
+                f"/v1/jobs/{request_id}/events",
+                params={"cursor": cursor},
+                timeout=httpx.Timeout(self.run_timeout_sec, connect=10.0),
+            ) as response:
+                status_code = response.status_code
+                event_name = ""
+                async for line in response.aiter_lines():
+                    if first_frame_at is None:
+                        first_frame_at = time.perf_counter()
+                    if line.startswith("event:"):
+                        event_name = line[len("event:"):].strip()
+                        continue
+                    if not line.startswith("data:"):
+                        continue
+                    raw = line[len("data:"):].strip()
+                    if event_name != "chat_event":
+                        continue
+                    self.recorder.record_event_payload(raw, time.time())
+                    self.recorder.count("sse_chat_events")
+                    try:
+                        seq = json.loads(raw).get("seq")
+                    except (json.JSONDecodeError, AttributeError):
+                        seq = None
+                    if isinstance(seq, int):
+                        cursor = max(cursor, seq)
+        except httpx.HTTPError:
+            self.recorder.record("GET /v1/jobs/{id}/events (first frame)", time.perf_counter() - started, None)
+            raise
+        self.recorder.record(
+            "GET /v1/jobs/{id}/events (first frame)",
+            (first_frame_at or time.perf_counter()) - started,
+            status_code,
+        )
+        self.recorder.record("GET /v1/jobs/{id}/events (stream)", time.perf_counter() - started, status_code)
+        return cursor
+
+    async def status(self, request_id: str) -> dict[str, Any]:
+        response = await self.call("GET /v1/jobs/{id}", "GET", f"/v1/jobs/{request_id}")
+        response.raise_for_status()
+        return response.json()
+
+    async def wait_settled(self, request_id: str) -> dict[str, Any]:
+        """Poll status until the run is waiting for the user or terminal."""
+        deadline = time.monotonic() + self.run_timeout_sec
+        while True:
+            payload = await self.status(request_id)
+            if payload.get("status") in TERMINAL_STATUSES | {"waiting_user", "waiting_auth"}:
+                return payload
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Run {request_id} did not settle within {self.run_timeout_sec}s")
+            await asyncio.sleep(0.2)
+
+    async def result(self, request_id: str) -> dict[str, Any]:
+        response = await self.call("GET /v1/jobs/{id}/result", "GET", f"/v1/jobs/{request_id}/result")
+        response.raise_for_status()
+        return response.json()
+
+    async def reply(self, request_id: str) -> None:
+        pending_response = await self.call(
+            "GET /v1/jobs/{id}/interaction/pending",
+            "GET",
+            f"/v1/jobs/{request_id}/interaction/pending",
+        )
+        pending_response.raise_for_status()
+        pending = pending_response.json().get("pending")
+        if not isinstance(pending, dict):
+            raise RuntimeError(f"Run {request_id} is waiting_user without a pending interaction")
+        response = await self.call(
+            "POST /v1/jobs/{id}/interaction/reply",
+            "POST",
+            f"/v1/jobs/{request_id}/interaction/reply",
+            json={"interaction_id": pending["interaction_id"], "response": {"text": "continue"}},
+        )
+        response.raise_for_status()
+
+    async def drive_run(self, request_id: str) -> str:
+        """Follow events, answer pending interactions and fetch the result; return the final status."""
+        cursor = 0
+        while True:
+            cursor = await self.follow_events(request_id, cursor)
+            payload = await self.wait_settled(request_id)
+            status = str(payload.get("status"))
+            if status == "waiting_user":
+                await self.reply(request_id)
+                self.recorder.count("replies")
+                continue
+            if status in TERMINAL_STATUSES:
+                await self.result(request_id)
+            self.recorder.count(f"runs_{status}")
+            return status
+
+
+async def _run_pool(iterations: int, concurrency: int, job: Callable[[int], Awaitable[None]], recorder: LoadRecorder) -> None:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(iterations):
+        queue.put_nowait(index)
+
+    async def worker() -> None:
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await job(index)
+            except (httpx.HTTPError, RuntimeError, TimeoutError, ValueError) as exc:
+                recorder.count(f"failures_{type(exc).__name__}")
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+
+def _no_cache_options(**extra: Any) -> dict[str, Any]:
+    return {"no_cache": True, **extra}
+
+
+async def scenario_sse(load: LoadClient, args: argparse.Namespace) -> None:
+    async def job(index: int) -> None:
+        created = await load.create_run(AUTO_SKILL_ID, args.engine, parameter={"seed": index}, runtime_options=_no_cache_options())
+        request_id = created["request_id"]
+        await load.upload(request_id, build_input_zip({}))
+        await load.drive_run(request_id)
+
+    await _run_pool(args.iterations, args.concurrency, job, load.recorder)
+
+
+async def scenario_cache(load: LoadClient, args: argparse.Namespace) -> None:
+    parameter = {"seed": random.randint(1, 1_000_000)}
+    warm = await load.create_run(AUTO_SKILL_ID, args.engine, parameter=parameter, runtime_options={})
+    upload = await load.upload(warm["request_id"], build_input_zip({}))
+    if not upload.get("cache_hit"):
+        await load.drive_run(warm["request_id"])
+
+    async def job(_index: int) -> None:
+        created = await load.create_run(AUTO_SKILL_ID, args.engine, parameter=parameter, runtime_options={})
+        uploaded = await load.upload(created["request_id"], build_input_zip({}))
+        hit = bool(created.get("cache_hit") or uploaded.get("cache_hit"))
+        load.recorder.count("cache_hits" if hit else "cache_misses")
+        if hit:
+            await load.result(created["request_id"])
+        else:
+            await load.drive_run(created["request_id"])
+
+    await _run_pool(args.iterations, args.concurrency, job, load.recorder)
+
+
+async def scenario_interactive(load: LoadClient, args: argparse.Namespace) -> None:
+    async def job(index: int) -> None:
+        created = await load.create_run(
+            INTERACTIVE_SKILL_ID,
+            args.engine,
+            parameter={"seed": index},
+            runtime_options=_no_cache_options(execution_mode="interactive"),
+        )
+        request_id = created["request_id"]
+        await load.upload(request_id, build_input_zip({}))
+        await load.drive_run(request_id)
+
+    await _run_pool(args.iterations, args.concurrency, job, load.recorder)
+
+
+async def scenario_upload(load: LoadClient, args: argparse.Namespace) -> None:
+    size = max(1, int(args.upload_mib * 1024 * 1024))
+    payload = os.urandom(size)
+    zip_bytes = build_input_zip({"payload": payload})
+
+    async def job(index: int) -> None:
+        created = await load.create_run(UPLOAD_SKILL_ID, args.engine, parameter={"seed": index}, runtime_options=_no_cache_options())
+        request_id = created["request_id"]
+        await load.upload(request_id, zip_bytes)
+        load.recorder.count("uploaded_bytes", len(zip_bytes))
+        await load.drive_run(request_id)
+
+    await _run_pool(args.iterations, args.concurrency, job, load.recorder)
+
+
+SCENARIO_RUNNERS: dict[str, Callable[[LoadClient, argparse.Namespace], Awaitable[None]]] = {
+    "sse": scenario_sse,
+    "cache": scenario_cache,
+    "interactive": scenario_interactive,
+    "upload": scenario_upload,
+}
+
+
+async def run_scenarios(base_url: str, args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    limits = httpx.Limits(max_connections=args.concurrency * 2 + 8, max_keepalive_connections=args.concurrency * 2)
+    results: dict[str, dict[str, Any]] = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        for name in args.scenario:
+            recorder = LoadRecorder()
+            load = LoadClient(client, recorder, run_timeout_sec=args.run_timeout)
+            await SCENARIO_RUNNERS[name](load, args)
+            recorder.finish()
+            results[name] = recorder.summary()
+    return results
+
+
+def _engine_env(args: argparse.Namespace) -> dict[str, str]:
+    env = {
+        fake_engine.EVENTS_ENV: str(args.engine_events),
+        fake_engine.EVENTS_PER_SEC_ENV: str(args.engine_rate),
+        fake_engine.PENDING_TURNS_ENV: str(args.pending_turns),
+    }
+    if args.engine_duration is not None:
+        env[fake_engine.DURATION_ENV] = str(args.engine_duration)
+    if args.fixture:
+        env[fake_engine.FIXTURE_ENV] = args.fixture
+    return env
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Skill Runner REST load harness (fake engine, offline)")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("-e", "--engine", default="codex", choices=RUNNABLE_ENGINES)
+    parser.add_argument("-n", "--iterations", type=int, default=20, help="Runs per scenario")
+    parser.add_argument("-c", "--concurrency", type=int, default=5, help="Concurrent clients per scenario")
+    parser.add_argument("--engine-events", type=int, default=20, help="Fake engine progress records per turn")
+    parser.add_argument("--engine-rate", type=float, default=50.0, help="Fake engine records/sec (0 = unpaced)")
+    parser.add_argument("--engine-duration", type=float, default=None, help="Spread records over this many seconds")
+    parser.add_argument("--pending-turns", type=int, default=2, help="Pending turns before the interactive skill finishes")
+    parser.add_argument("--fixture", default="", help="Replay this protocol_golden fixture's captured stdout")
+    parser.add_argument("--upload-mib", type=float, default=8.0, help="Input payload size for the upload scenario")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--run-timeout", type=float, default=300.0)
+    parser.add_argument("--base-url", default="", help="Target an already running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, default=0, help="PID to sample RSS from with --base-url")
+    parser.add_argument("--work-dir", default="", help="Runtime root to use (default: fresh temp dir)")
+    parser.add_argument("--keep-work-dir", action="store_true")
+    parser.add_argument("--json-out", default="", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+    args.scenario = args.scenario or list(SCENARIOS)
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="skill-runner-load-"))
+    proc: subprocess.Popen[bytes] | None = None
+    sampler: RssSampler | None = None
+    try:
+        if args.base_url:
+            base_url = args.base_url.rstrip("/")
+            if args.server_pid:
+                sampler = RssSampler(args.server_pid)
+        else:
+            env = prepare_runtime_root(work_dir, engine_env=_engine_env(args))
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            proc = start_server(env, port=port, log_path=work_dir / "server.log")
+            wait_server_ready(base_url, proc, timeout_sec=90)
+            sampler = RssSampler(proc.pid)
+        if sampler is not None:
+            sampler.start()
+        results = asyncio.run(run_scenarios(base_url, args))
+        if sampler is not None:
+            sampler.stop()
+        rss = sampler.summary() if sampler is not None else {"available": False}
+        print(format_report(results, rss))
+        if args.json_out:
+            write_json_report(Path(args.json_out), results, rss)
+        failures = sum(
+            value
+            for summary in results.values()
+            for key, value in summary["counters"].items()
+            if key.startswith("failures_")
+        )
+        return 1 if failures else 0
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        if proc is not None:
+            stop_server(proc)
+        if not args.work_dir and not args.keep_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        elif proc is not None:
+            print(f"server log: {work_dir / 'server.log'}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,8 @@
+#!/bin/bash
+# run_load_tests.sh - Start an isolated server backed by the fake engine CLI and run REST load scenarios.
+
+SCRIPT_DIR="$(CDPATH= cd -- "$(dirname -- "$0")" && pwd)"
+PROJECT_ROOT="$(CDPATH= cd -- "${SCRIPT_DIR}/../.." && pwd)"
+
+echo "Executing: uv run --extra dev python tests/load/run_load_tests.py $@"
+cd "$PROJECT_ROOT" && exec uv run --extra dev python tests/load/run_load_tests.py "$@"
@@ -0,0 +1,205 @@
+import asyncio
+import os
+
+import pytest
+
+from server.services.platform import adaptive_concurrency_controller as acc_module
+from server.services.platform.adaptive_concurrency_controller import (
+    AdaptiveConcurrencyController,
+    AdaptivePolicy,
+    ProcessTreeSampler,
+    RunUsageSample,
+    SystemCapacity,
+)
+from server.services.platform.concurrency_manager import ConcurrencyManager, _ResizableSlotGate
+
+
+def _policy(**overrides):
+    values = {
+        "min_concurrent": 1,
+        "hard_cap": 8,
+        "cpu_factor": 1.0,
+        "mem_reserve_mb": 512,
+        "fd_reserve": 64,
+        "pid_reserve": 16,
+        "estimated_mem_per_run_mb": 1024,
+        "estimated_fd_per_run": 64,
+        "estimated_pid_per_run": 1,
+    }
+    values.update(overrides)
+    return AdaptivePolicy(**values)
+
+
+def _samples(count, *, rss_mb, cpu_cores=0.1):
+    return [
+        RunUsageSample(
+            lease_id=f"lease-{idx}",
+            rss_mb=rss_mb,
+            cpu_cores=cpu_cores,
+            fd_count=20,
+            process_count=2,
+        )
+        for idx in range(count)
+    ]
+
+
+def _capacity(mem_available_mb, *, cpu_count=8, load_per_cpu=None):
+    return SystemCapacity(
+        cpu_count=cpu_count,
+        mem_available_mb=mem_available_mb,
+        fd_soft_limit=4096,
+        pid_soft_limit=4096,
+        load_per_cpu=load_per_cpu,
+    )
+
+
+def test_simulation_grows_stepwise_to_hard_cap_under_light_load():
+    controller = AdaptiveConcurrencyController(_policy())
+    limit = 1
+    applied = []
+    for _tick in range(12):
+        # Light runs: 100MB each with 16GB free, so only the hard cap binds.
+        running = limit
+        decision = controller.decide(
+            current_limit=limit,
+            running=running,
+            samples=_samples(running, rss_mb=100),
+            capacity=_capacity(16 * 1024),
+        )
+        limit = decision.applied_limit
+        applied.append(limit)
+
+    assert applied[:4] == [2, 3, 4, 5]
+    assert limit == 8
+    last = controller.decisions()[-1]
+    assert last["reason"] == "hold:bound_by_hard_cap"
+    assert last["per_run"]["rss_mb"] == pytest.approx(100.0)
+
+
+def test_simulation_shrinks_immediately_under_memory_pressure():
+    controller = AdaptiveConcurrencyController(_policy())
+    limit = 8
+    decision = controller.decide(
+        current_limit=limit,
+        running=6,
+        samples=_samples(6, rss_mb=2048),
+        capacity=_capacity(1024),
+    )
+    # 512MB headroom cannot fit another 2GB run, so only the six running remain.
+    assert decision.applied_limit == 6
+    assert decision.reason == "bound_by_mem"
+
+    for _tick in range(5):
+        decision = controller.decide(
+            current_limit=decision.applied_limit,
+            running=6,
+            samples=_samples(6, rss_mb=2048),
+            capacity=_capacity(1024),
+        )
+    assert decision.applied_limit == 6
+
+
+def test_overloaded_host_shrinks_below_running_but_not_min():
+    controller = AdaptiveConcurrencyController(_policy(min_concurrent=2))
+    decision = controller.decide(
+        current_limit=4,
+        running=4,
+        samples=_samples(4, rss_mb=100),
+        capacity=_capacity(16 * 1024, load_per_cpu=3.0),
+    )
+    assert decision.applied_limit == 3
+    assert decision.reason == "host_overloaded"
+
+    decision = controller.decide(
+        current_limit=2,
+        running=2,
+        samples=_samples(2, rss_mb=100),
+        capacity=_capacity(16 * 1024, load_per_cpu=3.0),
+    )
+    assert decision.applied_limit == 2
+
+
+def test_no_limit_increase_before_samples_exist():
+    controller = AdaptiveConcurrencyController(_policy(hard_cap=64))
+    assert controller.per_run_estimates["cpu_cores"] == 1.0
+    for _tick in range(3):
+        decision = controller.decide(current_limit=2, running=0, samples=[], capacity=_capacity(64 * 1024))
+        assert decision.applied_limit == 2
+        assert decision.reason == "hold:awaiting_samples"
+    # The static one-core-per-run estimate still caps the target at cpu_count * cpu_factor.
+    assert decision.limits["cpu"] == 8
+
+    decision = controller.decide(
+        current_limit=2,
+        running=2,
+        samples=_samples(2, rss_mb=100),
+        capacity=_capacity(64 * 1024),
+    )
+    assert decision.applied_limit == 3
+
+
+def test_decision_history_is_bounded():
+    controller = AdaptiveConcurrencyController(_policy(), history_size=3)
+    for _tick in range(5):
+        controller.decide(current_limit=1, running=0, samples=[], capacity=_capacity(16 * 1024))
+    assert len(controller.decisions()) == 3
+
+
+def test_proc_sampler_reads_current_process_tree(monkeypatch):
+    if not os.path.isdir("/proc/self"):
+        pytest.skip("/proc is not available")
+    monkeypatch.setattr(acc_module, "psutil", None)
+    sampler = ProcessTreeSampler()
+    samples = sampler.sample([{"lease_id": "self", "pid": os.getpid(), "engine": "codex"}])
+    assert len(samples) == 1
+    assert samples[0].rss_mb > 0
+    assert samples[0].fd_count > 0
+    assert samples[0].process_count >= 1
+    assert samples[0].engine == "codex"
+    assert sampler.sample([]) == []
+
+
+@pytest.mark.asyncio
+async def test_slot_gate_resize_admits_and_defers_waiters():
+    gate = _ResizableSlotGate(1)
+    await gate.acquire()
+    waiter = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    gate.resize(2)
+    await asyncio.sleep(0)
+    assert waiter.done()
+
+    gate.resize(1)
+    gate.release()
+    third = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    # One slot is still held and the limit is now 1.
+    assert not third.done()
+    gate.release()
+    await asyncio.wait_for(third, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_manager_adaptive_tick_resizes_slots(monkeypatch):
+    monkeypatch.setenv("SKILL_RUNNER_ADAPTIVE_CONCURRENCY_ENABLED", "true")
+    manager = ConcurrencyManager()
+    monkeypatch.setattr(manager, "_compute_max_concurrency", lambda policy: 1)
+    monkeypatch.setattr(manager, "_system_capacity", lambda: _capacity(64 * 1024, cpu_count=64))
+    manager.start()
+    assert manager._max_concurrent == 1
+
+    payload = manager.adaptive_tick(leases=[])
+    assert payload is not None
+    assert payload["applied_limit"] == 1
+    assert payload["reason"] == "hold:awaiting_samples"
+
+    monkeypatch.setattr(manager._sampler, "sample", lambda _leases: _samples(1, rss_mb=100))
+    payload = manager.adaptive_tick(leases=[])
+    assert payload is not None
+    assert payload["applied_limit"] == 2
+    assert manager._max_concurrent == 2
+    state = manager.adaptive_state()
+    assert state["adaptive_enabled"] is True
+    assert state["decisions"][-1]["previous_limit"] == 1
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import signal
+from types import SimpleNamespace
+
+import pytest
+
+from server.services.engine_management.engine_adapter_registry import engine_adapter_registry
+from server.services.orchestration import attempt_parser_executor as executor_module
+from server.services.orchestration.attempt_parser_executor import AttemptParserExecutor
+
+_CODEX_STDOUT = (
+    '{"type":"thread.started","thread_id":"thread-1"}\n'
+    '{"type":"turn.started"}\n'
+    '{"type":"item.completed","item":{"id":"i1","type":"reasoning","text":"thinking"}}\n'
+    '{"type":"item.completed","item":{"id":"i2","type":"agent_message","text":"héllo from the executor"}}\n'
+    '{"type":"turn.completed","usage":{"input_tokens":3,"output_tokens":5}}\n'
+    '{"type":"item.completed","item":{"type":"agent_message","text":"unterminated"}}'
+)
+
+
+async def _wait_for_process(executor: AttemptParserExecutor, *, other_than: int | None = None) -> int:
+    for _ in range(200):
+        processes = executor.stats()["processes"]
+        if processes and processes[0]["alive"] and processes[0]["pid"] != other_than:
+            return processes[0]["pid"]
+        await asyncio.sleep(0.05)
+    raise AssertionError("attempt parser process did not start")
+
+
+def _chunks(text: str, size: int) -> list[tuple[str, int, int]]:
+    chunks: list[tuple[str, int, int]] = []
+    offset = 0
+    for start in range(0, len(text), size):
+        piece = text[start : start + size]
+        length = len(piece.encode("utf-8"))
+        chunks.append((piece, offset, offset + length))
+        offset += length
+    return chunks
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(
+        executor_module,
+        "config",
+        SimpleNamespace(SYSTEM=SimpleNamespace(ATTEMPT_PARSER_EXECUTOR_ENABLED=True, ATTEMPT_PARSER_PROCESSES=1)),
+    )
+    return AttemptParserExecutor()
+
+
+@pytest.mark.asyncio
+async def test_executor_session_emissions_match_in_process_session(executor):
+    parser = engine_adapter_registry.require("codex").stream_parser
+    try:
+        executor.start()
+        remote = executor.open_session(engine="codex", stream_parser=parser)
+        local = parser.start_live_session()
+        assert remote is not None
+        for text, byte_from, byte_to in _chunks(_CODEX_STDOUT, 37):
+            kwargs = dict(stream="stdout", text=text, byte_from=byte_from, byte_to=byte_to)
+            assert await remote.feed(**kwargs) == local.feed(**kwargs)
+        finished = await remote.finish(exit_code=0, failure_reason=None)
+        assert finished == local.finish(exit_code=0, failure_reason=None)
+        assert any(item.get("kind") == "assistant_message" for item in finished)
+        assert remote.runtime_parse_result() == local.runtime_parse_result()
+        assert remote.runtime_parse_result() == parser.parse_runtime_stream(
+            stdout_raw=_CODEX_STDOUT.encode("utf-8"),
+            stderr_raw=b"",
+        )
+
+        # Parsers the registry cannot rebuild in the executor stay in-process.
+        assert executor.open_session(engine="codex", stream_parser=object()) is None
+        assert executor.open_session(engine="unknown", stream_parser=parser) is None
+        assert executor.stats()["opened_sessions"] == 1
+    finally:
+        await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_executor_session_falls_back_in_process_when_the_process_dies(executor):
+    parser = engine_adapter_registry.require("codex").stream_parser
+    lines = _CODEX_STDOUT.splitlines(keepends=True)
+    try:
+        executor.start()
+        session = executor.open_session(engine="codex", stream_parser=parser)
+        assert session is not None
+        first_pid = executor.stats()["processes"][0]["pid"]
+        await session.feed(stream="stdout", text=lines[0], byte_from=0, byte_to=len(lines[0]))
+
+        os.kill(first_pid, signal.SIGKILL)
+        byte_from = len(lines[0])
+        for line in lines[1:4]:
+            byte_to = byte_from + len(line.encode("utf-8"))
+            emissions = await session.feed(stream="stdout", text=line, byte_from=byte_from, byte_to=byte_to)
+            byte_from = byte_to
+        assert any(item.get("kind") == "assistant_message" for item in emissions)
+        assert executor.stats()["fallbacks"] == 1
+        await session.finish(exit_code=0, failure_reason=None)
+        # The in-process remainder did not see the whole attempt.
+        assert session.runtime_parse_result() is None
+
+        # The next attempt parses in-process while a fresh process spawns in the background.
+        assert executor.open_session(engine="codex", stream_parser=parser) is None
+        await _wait_for_process(executor, other_than=first_pid)
+        assert executor.open_session(engine="codex", stream_parser=parser) is not None
+        assert executor.stats()["respawns"] == 1
+    finally:
+        await executor.stop()
+
+
+def test_executor_is_not_used_when_disabled(monkeypatch):
+    monkeypatch.setattr(
+        executor_module,
+        "config",
+        SimpleNamespace(SYSTEM=SimpleNamespace(ATTEMPT_PARSER_EXECUTOR_ENABLED=False, ATTEMPT_PARSER_PROCESSES=2)),
+    )
+    executor = AttemptParserExecutor()
+    parser = engine_adapter_registry.require("codex").stream_parser
+
+    assert executor.open_session(engine="codex", stream_parser=parser) is None
+    assert executor.stats()["processes"] == []
+
+
+@pytest.mark.asyncio
+async def test_first_session_parses_in_process_until_the_executor_has_started(executor):
+    parser = engine_adapter_registry.require("codex").stream_parser
+    try:
+        assert executor.open_session(engine="codex", stream_parser=parser) is None
+        await _wait_for_process(executor)
+        assert executor.open_session(engine="codex", stream_parser=parser) is not None
+        assert executor.stats()["respawns"] == 0
+    finally:
+        await executor.stop()
+
+
+def test_parser_errors_are_re_raised_with_their_builtin_type():
+    def _round_trip(exc: BaseException) -> Exception:
+        return executor_module._rebuild_reply_error((executor_module._reply_error_type(exc), str(exc)))
+
+    assert type(_round_trip(KeyError("kind"))) is KeyError
+    assert type(_round_trip(json.JSONDecodeError("bad", "{", 0))) is ValueError
+    assert type(_round_trip(UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte"))) is UnicodeError
+    assert type(_round_trip(ZeroDivisionError("x"))) is RuntimeError
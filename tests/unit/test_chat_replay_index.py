@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+from server.runtime.chat_replay.chat_index import (
+    CHAT_REPLAY_FILE_NAME,
+    CHAT_REPLAY_INDEX_FILE_NAME,
+    append_chat_rows_sync,
+    last_chat_seq_sync,
+    read_chat_rows_sync,
+    write_chat_rows_sync,
+)
+
+
+def _rows(start: int, stop: int) -> list[dict]:
+    return [{"seq": seq, "run_id": "run-1", "text": f"message {seq} ✓"} for seq in range(start, stop)]
+
+
+def _jsonl(rows: list[dict]) -> str:
+    return "".join(f"{json.dumps(row, ensure_ascii=False)}\n" for row in rows)
+
+
+def test_chat_index_range_reads_seek_past_earlier_rows(tmp_path: Path) -> None:
+    data_path = tmp_path / CHAT_REPLAY_FILE_NAME
+    for start in range(1, 200, 20):
+        append_chat_rows_sync(data_path, _jsonl(_rows(start, start + 20)))
+
+    assert (tmp_path / CHAT_REPLAY_INDEX_FILE_NAME).stat().st_size == 200 * 16
+    assert [row["seq"] for row in read_chat_rows_sync(tmp_path, from_seq=150, to_seq=153)] == [150, 151, 152, 153]
+    assert len(read_chat_rows_sync(tmp_path)) == 200
+    assert read_chat_rows_sync(tmp_path, from_seq=201) == []
+    assert last_chat_seq_sync(tmp_path) == 200
+    assert read_chat_rows_sync(tmp_path / "missing") is None
+    assert last_chat_seq_sync(tmp_path / "missing") == 0
+
+
+def test_chat_index_tolerates_lagging_and_stale_index(tmp_path: Path) -> None:
+    data_path = tmp_path / CHAT_REPLAY_FILE_NAME
+    index_path = tmp_path / CHAT_REPLAY_INDEX_FILE_NAME
+    append_chat_rows_sync(data_path, _jsonl(_rows(1, 11)))
+    # Rows appended without index records (e.g. a crash between the two writes).
+    with data_path.open("a", encoding="utf-8") as fp:
+        fp.write(_jsonl(_rows(11, 16)))
+
+    assert [row["seq"] for row in read_chat_rows_sync(tmp_path, from_seq=13)] == [13, 14, 15]
+    assert last_chat_seq_sync(tmp_path) == 15
+
+    # A replaced data file with a leftover index falls back to a forward scan.
+    data_path.write_text(_jsonl([{"seq": seq, "text": "x" * 40} for seq in range(1, 4)]), encoding="utf-8")
+    assert [row["seq"] for row in read_chat_rows_sync(tmp_path, from_seq=2)] == [2, 3]
+    assert last_chat_seq_sync(tmp_path) == 3
+
+    # A new data file resets the index instead of appending to a stale one.
+    data_path.unlink()
+    append_chat_rows_sync(data_path, _jsonl(_rows(1, 3)))
+    assert index_path.stat().st_size == 2 * 16
+
+    write_chat_rows_sync(tmp_path, _rows(1, 6))
+    assert [row["seq"] for row in read_chat_rows_sync(tmp_path, from_seq=4)] == [4, 5]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+from server.runtime.workspace_layout import RunWorkspaceLayout
+from server.services.orchestration.run_bundle_service import RunBundleService
+from server.services.orchestration.run_content_store_service import RunContentStoreService
+from server.services.orchestration.run_filesystem_snapshot_service import RunFilesystemSnapshotService
+from server.services.platform.content_addressed_store import ContentAddressedStore
+
+
+def _store(tmp_path: Path) -> ContentAddressedStore:
+    return ContentAddressedStore(root=tmp_path / "cas", enabled=True, min_file_bytes=1)
+
+
+def _write(path: Path, payload: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(payload)
+    return path
+
+
+def test_identical_files_across_runs_share_one_object(tmp_path: Path):
+    store = _store(tmp_path)
+    payload = b"shared-input" * 100
+    first = _write(tmp_path / "ws-1" / "uploads" / "input.txt", payload)
+    second = _write(tmp_path / "ws-2" / "uploads" / "input.txt", payload)
+
+    first_totals = store.ingest_tree(tmp_path / "ws-1")
+    second_totals = store.ingest_tree(tmp_path / "ws-2")
+
+    digest = hashlib.sha256(payload).hexdigest()
+    object_path = store.object_path(digest)
+    assert first_totals == {"files": 1, "linked": 1, "saved_bytes": 0}
+    assert second_totals == {"files": 1, "linked": 1, "saved_bytes": len(payload)}
+    assert os.path.samefile(first, object_path)
+    assert os.path.samefile(second, object_path)
+    assert second.read_bytes() == payload
+
+    usage = store.usage()
+    assert usage["objects"] == 1
+    assert usage["physical_bytes"] == len(payload)
+    assert usage["logical_bytes"] == 2 * len(payload)
+    assert usage["saved_bytes"] == len(payload)
+
+
+def test_known_digest_is_reused_only_when_stat_matches(tmp_path: Path):
+    store = _store(tmp_path)
+    path = _write(tmp_path / "ws" / "artifacts" / "out.bin", b"abc")
+    stat = path.stat()
+    bogus = "0" * 64
+
+    store.ingest_tree(
+        tmp_path / "ws",
+        known_digests={"artifacts/out.bin": {"sha256": bogus, "size": stat.st_size + 1}},
+    )
+
+    assert os.path.samefile(path, store.object_path(hashlib.sha256(b"abc").hexdigest()))
+    assert not store.object_path(bogus).exists()
+
+
+def test_garbage_collection_removes_objects_without_workspace_links(tmp_path: Path):
+    store = _store(tmp_path)
+    kept = _write(tmp_path / "ws-1" / "uploads" / "a.txt", b"keep")
+    dropped = _write(tmp_path / "ws-2" / "uploads" / "b.txt", b"drop")
+    store.ingest_tree(tmp_path / "ws-1")
+    store.ingest_tree(tmp_path / "ws-2")
+
+    dropped.unlink()
+    removed = store.collect_garbage()
+
+    assert removed == {"objects": 1, "bytes": 4}
+    assert store.object_path(hashlib.sha256(b"keep").hexdigest()).exists()
+    assert kept.read_bytes() == b"keep"
+
+
+def test_detach_tree_gives_reused_workspace_private_copies(tmp_path: Path):
+    store = _store(tmp_path)
+    payload = b"same"
+    first = _write(tmp_path / "ws-1" / "uploads" / "x.txt", payload)
+    second = _write(tmp_path / "ws-2" / "uploads" / "x.txt", payload)
+    store.ingest_tree(tmp_path / "ws-1")
+    store.ingest_tree(tmp_path / "ws-2")
+
+    assert store.detach_tree(tmp_path / "ws-2") == 1
+    second.write_bytes(b"changed")
+
+    assert first.read_bytes() == payload
+    assert store.object_path(hashlib.sha256(payload).hexdigest()).read_bytes() == payload
+
+
+def test_disabled_store_and_small_files_are_left_alone(tmp_path: Path):
+    path = _write(tmp_path / "ws" / "uploads" / "tiny.txt", b"x")
+
+    disabled = ContentAddressedStore(root=tmp_path / "cas", enabled=False, min_file_bytes=1)
+    small_skipped = ContentAddressedStore(root=tmp_path / "cas", enabled=True, min_file_bytes=16)
+
+    assert disabled.ingest_tree(tmp_path / "ws")["files"] == 0
+    assert small_skipped.ingest_tree(tmp_path / "ws")["files"] == 0
+    assert path.stat().st_nlink == 1
+
+
+def test_known_digest_requires_exact_mtime_and_inode(tmp_path: Path):
+    store = _store(tmp_path)
+    path = _write(tmp_path / "ws" / "artifacts" / "out.bin", b"abc")
+    stat = path.stat()
+    bogus = "1" * 64
+
+    # Size alone is not enough to trust a digest.
+    store.ingest_tree(tmp_path / "ws", known_digests={"artifacts/out.bin": {"sha256": bogus, "size": stat.st_size}})
+    assert os.path.samefile(path, store.object_path(hashlib.sha256(b"abc").hexdigest()))
+
+    other = _write(tmp_path / "ws-2" / "artifacts" / "out.bin", b"xyz")
+    other_stat = other.stat()
+    store.ingest_tree(
+        tmp_path / "ws-2",
+        known_digests={
+            "artifacts/out.bin": {
+                "sha256": bogus,
+                "size": other_stat.st_size,
+                "mtime_ns": other_stat.st_mtime_ns,
+                "inode": other_stat.st_ino,
+            }
+        },
+    )
+    # The digest is trusted for the lookup, but an object is only stored if its bytes match it.
+    assert not store.object_path(bogus).exists()
+    assert other.stat().st_nlink == 1
+
+
+def test_objects_are_private_read_only_copies(tmp_path: Path):
+    store = _store(tmp_path)
+    payload = b"result" * 50
+    first = _write(tmp_path / "ws-1" / "result" / "result.json", payload)
+    first_inode = first.stat().st_ino
+    store.ingest_tree(tmp_path / "ws-1")
+
+    object_path = store.object_path(hashlib.sha256(payload).hexdigest())
+    assert object_path.stat().st_ino != first_inode
+    assert stat.S_IMODE(object_path.stat().st_mode) == 0o444
+    assert os.path.samefile(first, object_path)
+
+    second = _write(tmp_path / "ws-2" / "result" / "result.json", payload)
+    store.ingest_tree(tmp_path / "ws-2")
+    assert store.detach_tree(tmp_path / "ws-2") == 1
+    assert stat.S_IMODE(second.stat().st_mode) & stat.S_IWUSR
+    second.write_bytes(b"rewritten")
+    assert object_path.read_bytes() == payload
+
+
+def test_corrupt_object_is_replaced_before_linking_a_duplicate(tmp_path: Path):
+    store = _store(tmp_path)
+    payload = b"artifact" * 50
+    digest = hashlib.sha256(payload).hexdigest()
+    _write(tmp_path / "ws-1" / "artifacts" / "a.bin", payload)
+    store.ingest_tree(tmp_path / "ws-1")
+    corrupt = store.object_path(digest)
+    os.chmod(corrupt, 0o644)
+    corrupt.write_bytes(b"X" * len(payload))
+
+    second = _write(tmp_path / "ws-2" / "artifacts" / "a.bin", payload)
+    totals = store.ingest_tree(tmp_path / "ws-2")
+
+    assert totals["saved_bytes"] == 0
+    assert second.read_bytes() == payload
+    assert store.object_path(digest).read_bytes() == payload
+
+
+@pytest.mark.asyncio
+async def test_same_size_rewrite_after_bundling_gets_a_new_digest(tmp_path: Path):
+    run_dir = tmp_path / "run"
+    layout = RunWorkspaceLayout(workspace_id="run", workspace_dir=run_dir, namespace="demo-skill.1")
+    artifact = _write(run_dir / "artifacts" / "out.json", b'{"value": 1}')
+    _write(layout.result_path, b'{"status":"success","artifacts":["artifacts/out.json"]}')
+    past_ns = time.time_ns() - 60_000_000_000
+    os.utime(artifact, ns=(past_ns, past_ns))
+    snapshot_service = RunFilesystemSnapshotService()
+    snapshot_service.capture_filesystem_snapshot(run_dir)
+    RunBundleService().build_run_bundle(run_dir, debug=False, layout=layout)
+
+    # Edited in place after bundling: same size, new content.
+    artifact.write_bytes(b'{"value": 2}')
+    os.utime(artifact, ns=(past_ns + 1_000, past_ns + 1_000))
+    known = snapshot_service.known_file_digests(run_dir)
+    assert known["artifacts/out.json"]["sha256"] == hashlib.sha256(b'{"value": 1}').hexdigest()
+
+    store = _store(tmp_path)
+    await RunContentStoreService(store=store).ingest_succeeded_run(
+        run_id="run",
+        run_dir=run_dir,
+        layout=layout,
+        engine_name="codex",
+        skill_id="demo-skill",
+        known_digests=known,
+    )
+
+    assert os.path.samefile(artifact, store.object_path(hashlib.sha256(b'{"value": 2}').hexdigest()))
+    assert not store.object_path(hashlib.sha256(b'{"value": 1}').hexdigest()).exists()
@@ -2,6 +2,8 @@ from pathlib import Path
 
 from e2e_client.config import (
     BACKEND_BASE_URL_ENV,
+    BACKEND_HTTP2_ENV,
+    BACKEND_MAX_CONNECTIONS_ENV,
     FIXTURES_SKILLS_DIR_ENV,
     PORT_ENV,
     load_settings,
@@ -35,3 +37,20 @@ def test_e2e_client_backend_and_fixtures_env(monkeypatch, tmp_path: Path):
     settings = load_settings()
     assert settings.backend_base_url == "http://127.0.0.1:8999"
     assert settings.fixtures_skills_dir == tmp_path / "fixture_skills"
+
+
+def test_e2e_client_backend_pool_env(monkeypatch):
+    monkeypatch.delenv(BACKEND_MAX_CONNECTIONS_ENV, raising=False)
+    monkeypatch.delenv(BACKEND_HTTP2_ENV, raising=False)
+    settings = load_settings()
+    assert settings.backend_max_connections == 100
+    assert settings.backend_http2 is True
+
+    monkeypatch.setenv(BACKEND_MAX_CONNECTIONS_ENV, "8")
+    monkeypatch.setenv(BACKEND_HTTP2_ENV, "false")
+    settings = load_settings()
+    assert settings.backend_max_connections == 8
+    assert settings.backend_http2 is False
+
+    monkeypatch.setenv(BACKEND_MAX_CONNECTIONS_ENV, "-1")
+    assert load_settings().backend_max_connections == 100
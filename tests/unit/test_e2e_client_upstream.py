@@ -0,0 +1,210 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from e2e_client.backend import BackendApiError, HttpBackendClient
+from e2e_client.config import load_settings
+from e2e_client.upstream import BackendHttpPool, SseFanout
+
+
+def _frame(event: str, payload: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+
+
+def _frames(chunks: list[bytes]) -> list[tuple[str, dict]]:
+    parsed = []
+    for chunk in b"".join(chunks).split(b"\n\n"):
+        if not chunk.strip():
+            continue
+        lines = chunk.decode("utf-8").splitlines()
+        parsed.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return parsed
+
+
+class _ScriptedUpstream:
+    """Upstream stream that emits frames as the test releases them."""
+
+    def __init__(self) -> None:
+        self.opened: list[int] = []
+        self.frames: asyncio.Queue = asyncio.Queue()
+
+    async def open(self, cursor: int):
+        self.opened.append(cursor)
+        yield _frame("snapshot", {"status": "running", "cursor": cursor})
+        while True:
+            frame = await self.frames.get()
+            if frame is None:
+                return
+            yield frame
+
+
+async def _collect(iterator, count: int) -> list[bytes]:
+    received = []
+    async for chunk in iterator:
+        received.append(chunk)
+        if len(received) >= count:
+            break
+    return received
+
+
+async def _drain(iterator) -> list[bytes]:
+    return [chunk async for chunk in iterator]
+
+
+@pytest.mark.asyncio
+async def test_viewers_of_one_run_share_upstream_with_cursor_replay():
+    fanout = SseFanout(replay_limit=10)
+    upstream = _ScriptedUpstream()
+
+    first = fanout.subscribe("run-1/chat", cursor=0, opener=upstream.open)
+    first_task = asyncio.create_task(_drain(first))
+    await asyncio.sleep(0)
+    for seq in (1, 2, 3):
+        upstream.frames.put_nowait(_frame("chat_event", {"seq": seq}))
+    await asyncio.sleep(0.01)
+
+    late = fanout.subscribe("run-1/chat", cursor=2, opener=upstream.open)
+    late_task = asyncio.create_task(_drain(late))
+    await asyncio.sleep(0.01)
+    upstream.frames.put_nowait(_frame("chat_event", {"seq": 4}))
+    upstream.frames.put_nowait(None)
+
+    first_frames = _frames(await asyncio.wait_for(first_task, timeout=2))
+    late_frames = _frames(await asyncio.wait_for(late_task, timeout=2))
+
+    assert upstream.opened == [0]
+    assert [payload.get("seq") for _event, payload in first_frames] == [None, 1, 2, 3, 4]
+    assert late_frames[0] == ("snapshot", {"status": "running", "cursor": 2})
+    assert [payload["seq"] for _event, payload in late_frames[1:]] == [3, 4]
+    assert fanout.active_streams() == {}
+
+
+@pytest.mark.asyncio
+async def test_viewer_behind_replay_window_gets_private_upstream():
+    fanout = SseFanout(replay_limit=2)
+    upstream = _ScriptedUpstream()
+    shared = fanout.subscribe("run-2/chat", cursor=0, opener=upstream.open)
+    shared_task = asyncio.create_task(_drain(shared))
+    await asyncio.sleep(0)
+    for seq in (1, 2, 3, 4):
+        upstream.frames.put_nowait(_frame("chat_event", {"seq": seq}))
+    await asyncio.sleep(0.01)
+
+    behind = fanout.subscribe("run-2/chat", cursor=1, opener=upstream.open)
+    snapshot = await asyncio.wait_for(_collect(behind, 1), timeout=2)
+    await behind.aclose()
+
+    assert upstream.opened == [0, 1]
+    assert _frames(snapshot)[0][1]["cursor"] == 1
+    upstream.frames.put_nowait(None)
+    await asyncio.wait_for(shared_task, timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_upstream_error_reaches_every_viewer():
+    fanout = SseFanout()
+
+    async def failing_open(cursor: int):
+        _ = cursor
+        await asyncio.sleep(0.01)
+        raise BackendApiError(503, "backend_unreachable")
+        yield b""
+
+    viewers = [asyncio.create_task(_drain(fanout.subscribe("run-3/events", cursor=0, opener=failing_open)))]
+    await asyncio.sleep(0)
+    viewers.append(asyncio.create_task(_drain(fanout.subscribe("run-3/events", cursor=0, opener=failing_open))))
+
+    results = await asyncio.gather(*viewers, return_exceptions=True)
+
+    assert all(isinstance(result, BackendApiError) and result.status_code == 503 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_http_backend_client_reuses_pooled_client():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(200, json={"ok": True})
+
+    pool = BackendHttpPool(transport=httpx.MockTransport(handler))
+    client = HttpBackendClient("http://backend.test", http_pool=pool, sse_fanout=SseFanout())
+    try:
+        await client.list_skills()
+        first_client = pool.client()
+        await client.get_run_state("req-1")
+
+        assert pool.client() is first_client
+        assert seen == ["/v1/management/skills", "/v1/jobs/req-1"]
+    finally:
+        await pool.aclose()
+    assert first_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_backend_http_pool_closes_clients_replaced_by_configure():
+    pool = BackendHttpPool(transport=httpx.MockTransport(lambda _request: httpx.Response(200)))
+    old_client = pool.client()
+    pool.configure(load_settings())
+    new_client = pool.client()
+
+    assert new_client is not old_client
+    # In-flight requests may still hold the replaced client until shutdown.
+    assert not old_client.is_closed
+    await pool.aclose()
+    assert old_client.is_closed
+    assert new_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_late_viewer_gets_snapshot_refreshed_after_newer_events():
+    fanout = SseFanout(replay_limit=10)
+    upstream = _ScriptedUpstream()
+    refreshes: list[int] = []
+
+    async def _refresh() -> dict:
+        refreshes.append(1)
+        return {"status": "waiting_user", "pending_interaction_id": 7}
+
+    first = fanout.subscribe("run-4/chat", cursor=0, opener=upstream.open, refresh_snapshot=_refresh)
+    first_task = asyncio.create_task(_drain(first))
+    await asyncio.sleep(0)
+    upstream.frames.put_nowait(_frame("chat_event", {"seq": 1}))
+    await asyncio.sleep(0.01)
+
+    late = fanout.subscribe("run-4/chat", cursor=1, opener=upstream.open, refresh_snapshot=_refresh)
+    snapshot = await asyncio.wait_for(_collect(late, 1), timeout=2)
+    await late.aclose()
+    upstream.frames.put_nowait(None)
+    await asyncio.wait_for(first_task, timeout=2)
+
+    assert refreshes == [1]
+    assert _frames(snapshot)[0] == (
+        "snapshot",
+        {"status": "waiting_user", "cursor": 1, "pending_interaction_id": 7},
+    )
+
+
+@pytest.mark.asyncio
+async def test_viewer_arriving_while_stream_closes_opens_a_new_stream():
+    fanout = SseFanout(replay_limit=10)
+    upstream = _ScriptedUpstream()
+
+    first = fanout.subscribe("run-5/chat", cursor=0, opener=upstream.open)
+    await asyncio.wait_for(_collect(first, 1), timeout=2)
+    await first.aclose()
+    closing = fanout._streams["run-5/chat"]
+    assert closing.closing and not closing.done
+    assert not closing.covers(0)
+
+    second = fanout.subscribe("run-5/chat", cursor=0, opener=upstream.open)
+    snapshot = await asyncio.wait_for(_collect(second, 1), timeout=2)
+
+    assert upstream.opened == [0, 0]
+    assert _frames(snapshot)[0][0] == "snapshot"
+    assert fanout.active_streams() == {"run-5/chat": 1}
+    await second.aclose()
+    await asyncio.sleep(0.01)
+    assert fanout.active_streams() == {}
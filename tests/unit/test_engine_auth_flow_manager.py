@@ -214,6 +214,22 @@ def _install_fake_session_start(monkeypatch, manager: EngineAuthFlowManager) ->
     )
 
 
+def test_engine_auth_flow_manager_resolves_flows_on_first_access(tmp_path: Path):
+    profile = _FakeProfile(tmp_path)
+    manager = EngineAuthFlowManager(
+        agent_manager=_FakeCliManager(profile, _write_script(tmp_path / "fake-codex", "exit 0")),
+        interaction_gate=EngineInteractionGate(),
+        trust_manager=_TrustSpy(),
+    )
+    assert not hasattr(manager, "_gemini_oauth_proxy_flow")
+    assert manager._auth_runtime is None
+
+    flow = manager._codex_oauth_proxy_flow
+    assert manager._auth_runtime is not None
+    assert manager._codex_oauth_proxy_flow is flow
+    assert manager._engine_auth_handlers["codex"] is not None
+
+
 def test_engine_auth_flow_manager_codex_oauth_proxy_uses_protocol_flow(tmp_path: Path, monkeypatch):
     previous = _set_engine_auth_log_persistence(False)
     command_path = _write_script(tmp_path / "fake-codex", "exit 0")
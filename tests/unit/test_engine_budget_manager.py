@@ -0,0 +1,97 @@
+from server.runtime.protocol.engine_error_governance import has_rate_limit_signal
+from server.services.platform.engine_budget_manager import (
+    EngineBudgetManager,
+    EngineBudgetPolicy,
+    budget_pool_keys,
+    budget_target_from_options,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _manager(**policy_kwargs):
+    clock = _Clock()
+    return EngineBudgetManager(EngineBudgetPolicy(**policy_kwargs), clock=clock), clock
+
+
+def test_pool_keys_are_hierarchical():
+    assert budget_pool_keys("codex") == ["codex"]
+    assert budget_pool_keys("opencode", "openai", "gpt-5") == [
+        "opencode",
+        "opencode/openai",
+        "opencode/openai/gpt-5",
+    ]
+    assert budget_pool_keys("opencode", None, "gpt-5") == ["opencode"]
+    assert budget_target_from_options({"provider_id": "google", "model": "gemini-2.5-pro"}) == (
+        "google",
+        "gemini-2.5-pro",
+    )
+
+
+def test_saturated_engine_pool_does_not_block_other_engines():
+    manager, _clock = _manager(limits={"gemini": 1, "opencode/openai": 1})
+
+    assert manager.try_acquire("run-1", "gemini", "google", "gemini-2.5-pro") is True
+    assert manager.try_acquire("run-2", "gemini", "google", "gemini-2.5-pro") is False
+    assert manager.try_acquire("run-3", "codex") is True
+    assert manager.try_acquire("run-4", "opencode", "openai", "gpt-5") is True
+    assert manager.try_acquire("run-5", "opencode", "anthropic", "claude") is True
+    assert manager.blocked_pools() == {"gemini", "opencode/openai"}
+
+    manager.release("run-1")
+    assert "gemini" not in manager.blocked_pools()
+    assert manager.try_acquire("run-2", "gemini", "google", "gemini-2.5-pro") is True
+
+
+def test_provider_start_rate_token_bucket_refills_over_time():
+    manager, clock = _manager(start_rates={"gemini/google": (6.0, 2.0)})
+
+    assert manager.try_acquire("run-1", "gemini", "google") is True
+    assert manager.try_acquire("run-2", "gemini", "google") is True
+    assert manager.try_acquire("run-3", "gemini", "google") is False
+    assert manager.next_ready_in() == 10.0
+
+    clock.now += 10.0
+    assert manager.try_acquire("run-3", "gemini", "google") is True
+
+
+def test_rate_limited_attempts_back_off_and_recover_limit():
+    manager, clock = _manager(
+        limits={"gemini/google": 4},
+        backoff_base_sec=10.0,
+        backoff_max_sec=25.0,
+    )
+
+    manager.record_attempt("gemini", "google", rate_limited=True)
+    pool = {item["pool"]: item for item in manager.state()}["gemini/google"]
+    assert pool["effective_limit"] == 2
+    assert pool["blocked_reason"] == "backoff"
+    assert manager.try_acquire("run-1", "gemini", "google") is False
+
+    manager.record_attempt("gemini", "google", rate_limited=True)
+    assert manager.next_ready_in() == 20.0
+    clock.now += 20.0
+    manager.record_attempt("gemini", "google", rate_limited=True)
+    assert manager.next_ready_in() == 25.0
+
+    clock.now += 25.0
+    assert manager.try_acquire("run-1", "gemini", "google") is True
+    manager.record_attempt("gemini", "google", rate_limited=False, succeeded=True)
+    pool = {item["pool"]: item for item in manager.state({"gemini/google": 3})}["gemini/google"]
+    assert pool["effective_limit"] == 2
+    assert pool["rate_limit_streak"] == 0
+    assert pool["running"] == 1
+    assert pool["queued"] == 3
+
+
+def test_has_rate_limit_signal_reads_diagnostics_and_stderr_tail():
+    assert has_rate_limit_signal({"diagnostic_events": [{"pattern_kind": "engine_rate_limit_hint"}]})
+    assert has_rate_limit_signal(None, "GaxiosError: status: 429 RESOURCE_EXHAUSTED")
+    assert has_rate_limit_signal(None, "error code=429")
+    assert not has_rate_limit_signal({"diagnostic_events": [{"pattern_kind": "engine_auth_hint"}]}, "ok")
@@ -158,3 +158,78 @@ def test_build_preview_payload_from_bytes_markdown_sanitized(monkeypatch: pytest
     assert isinstance(preview["rendered_html"], str)
     assert "<script>" not in preview["rendered_html"]
     assert "<h1>Heading</h1>" in preview["rendered_html"]
+
+
+def _write_numbered_lines(path, count: int, *, width: int = 0) -> None:  # type: ignore[no-untyped-def]
+    path.write_text("".join(f"line {index}{'.' * width}\n" for index in range(1, count + 1)), encoding="utf-8")
+
+
+def test_build_preview_payload_large_text_defaults_to_head_window(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    target = tmp_path / "big.log"
+    _write_numbered_lines(target, 20_000, width=20)
+    assert target.stat().st_size > renderer.PREVIEW_MAX_BYTES
+
+    preview = renderer.build_preview_payload(target)
+
+    assert preview["mode"] == "text"
+    assert preview["window"]["kind"] == "head"
+    assert preview["window"]["line_start"] == 1
+    assert preview["window"]["line_count"] == renderer.PREVIEW_WINDOW_DEFAULT_LINES
+    assert preview["window"]["truncated"] is True
+    assert preview["content"].startswith("line 1.")
+    assert preview["content"].endswith(f"line {renderer.PREVIEW_WINDOW_DEFAULT_LINES}{'.' * 20}\n")
+
+
+def test_build_preview_payload_tail_and_range_windows_align_to_lines(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    target = tmp_path / "events.jsonl"
+    target.write_text("".join(f'{{"seq":{index}}}\n' for index in range(1, 1001)), encoding="utf-8")
+
+    tail = renderer.build_preview_payload(target, window=renderer.PreviewWindow(kind="tail", lines=3))
+    assert tail["detected_format"] == "jsonl"
+    assert tail["content"] == '{"seq":998}\n{"seq":999}\n{"seq":1000}\n'
+    assert tail["window"]["line_start"] == 998
+    assert tail["window"]["byte_end"] == target.stat().st_size
+
+    line_width = len('{"seq":100}\n')
+    offset = target.read_bytes().index(b'{"seq":100}') + 3
+    ranged = renderer.build_preview_payload(
+        target,
+        window=renderer.PreviewWindow(kind="range", offset=offset, length=line_width * 2),
+    )
+    assert ranged["content"].splitlines()[0] == '{"seq":100}'
+    assert ranged["window"]["line_start"] == 100
+    assert all(line.startswith('{"seq":') for line in ranged["content"].splitlines())
+
+
+
+def test_windowed_line_numbers_come_from_a_sparse_index(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(renderer, "_LINE_INDEX_STRIDE_BYTES", 1024)
+    monkeypatch.setattr(renderer, "_LINE_INDEX_MAX_SCAN_BYTES", 8 * 1024)
+    monkeypatch.setattr(renderer, "_line_index", renderer._LineIndex())
+    target = tmp_path / "big.log"
+    _write_numbered_lines(target, 5000)
+    data = target.read_bytes()
+
+    # Windows past the scan budget from the nearest checkpoint get no absolute numbers.
+    for line, expected in ((4000, None), (600, 600), (4990, None)):
+        offset = data.index(f"line {line}\n".encode("utf-8"))
+        preview = renderer.build_preview_payload(
+            target,
+            window=renderer.PreviewWindow(kind="range", offset=offset, length=64),
+        )
+        assert preview["window"]["line_start"] == expected
+        if expected is None:
+            assert f"bytes {offset}-" in preview["meta"]
+
+    # Walking forward extends the index, after which distant windows are numbered.
+    for line in range(500, 5000, 500):
+        offset = data.index(f"line {line}\n".encode("utf-8"))
+        assert renderer._line_index.line_number_at(target, offset) == line
+    tail = renderer.build_preview_payload(target, window=renderer.PreviewWindow(kind="tail", lines=2))
+    assert tail["window"]["line_start"] == 4999
+
+def test_build_preview_window_validates_kind() -> None:
+    assert renderer.build_preview_window(None) is None
+    assert renderer.build_preview_window("TAIL", lines=10**9).lines == renderer.PREVIEW_WINDOW_MAX_LINES
+    with pytest.raises(ValueError, match="window must be one of"):
+        renderer.build_preview_window("middle")
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from server.services.platform import file_preview_service as preview_module
+from server.services.platform.file_preview_renderer import PreviewWindow
+from server.services.platform.file_preview_service import FilePreviewService
+
+
+def _counting_renderer(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    calls: list[Path] = []
+    original = preview_module.build_preview_payload
+
+    def _render(file_path: Path, *, window: PreviewWindow | None = None):  # type: ignore[no-untyped-def]
+        calls.append(file_path)
+        return original(file_path, window=window)
+
+    monkeypatch.setattr(preview_module, "build_preview_payload", _render)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_build_preview_caches_until_size_or_mtime_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _counting_renderer(monkeypatch)
+    target = tmp_path / "result.json"
+    target.write_text('{"ok": true}', encoding="utf-8")
+    service = FilePreviewService()
+
+    first = await service.build_preview(target)
+    second = await service.build_preview(target)
+    assert first == second
+    assert len(calls) == 1
+
+    target.write_text('{"ok": false}', encoding="utf-8")
+    stat = target.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    third = await service.build_preview(target)
+    assert '"ok": false' in (third["json_pretty"] or "")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_build_preview_coalesces_concurrent_requests(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _counting_renderer(monkeypatch)
+    target = tmp_path / "notes.md"
+    target.write_text("# Title\n\nbody\n", encoding="utf-8")
+    service = FilePreviewService()
+
+    results = await asyncio.gather(*(service.build_preview(target) for _ in range(8)))
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_build_preview_evicts_least_recently_used(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _counting_renderer(monkeypatch)
+    service = FilePreviewService(max_entries=2)
+    paths = []
+    for name in ("a.txt", "b.txt", "c.txt"):
+        path = tmp_path / name
+        path.write_text(name, encoding="utf-8")
+        paths.append(path)
+        await service.build_preview(path)
+
+    await service.build_preview(paths[2])
+    assert len(calls) == 3
+    await service.build_preview(paths[0])
+    assert calls == [*paths, paths[0]]
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+fastapi = pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+from fastapi import HTTPException, Response
+
+from server.main import app
+from server.models import InteractionPendingResponse, RunResultResponse, RunStatus
+from server.routers import jobs as jobs_router
+from server.services.orchestration.run_store import RunStore
+
+
+async def _request(method: str, path: str, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        return await client.request(method, path, **kwargs)
+
+
+def _state(status: str) -> dict:
+    return {
+        "request_id": "req-1",
+        "run_id": "run-1",
+        "status": status,
+        "current_attempt": 1,
+        "pending": {},
+        "resume": {},
+        "runtime": {},
+        "warnings": [],
+        "updated_at": "2026-04-16T00:00:00",
+    }
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    run_store = RunStore(db_path=tmp_path / "runs.db")
+    monkeypatch.setattr(jobs_router, "run_store", run_store)
+    return run_store
+
+
+def _patch_pending_from_state(monkeypatch, store: RunStore) -> None:
+    async def _get_pending(*, request_id: str, run_store_backend):
+        state = await store.get_run_state(request_id)
+        return InteractionPendingResponse(request_id=request_id, status=RunStatus(state["status"]))
+
+    monkeypatch.setattr(jobs_router.run_interaction_service, "get_pending", _get_pending)
+
+
+@pytest.mark.asyncio
+async def test_pending_read_returns_etag_and_304_when_unchanged(monkeypatch, store):
+    await store.set_run_state("req-1", _state(RunStatus.RUNNING.value))
+    _patch_pending_from_state(monkeypatch, store)
+
+    first = await _request("GET", "/v1/jobs/req-1/interaction/pending")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    unchanged = await _request("GET", "/v1/jobs/req-1/interaction/pending", headers={"If-None-Match": f"W/{etag}"})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == etag
+    assert unchanged.content == b""
+
+    await store.set_run_state("req-1", _state(RunStatus.WAITING_USER.value))
+    changed = await _request("GET", "/v1/jobs/req-1/interaction/pending", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["status"] == RunStatus.WAITING_USER.value
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_long_poll_returns_as_soon_as_run_state_changes(monkeypatch, store):
+    await store.set_run_state("req-1", _state(RunStatus.RUNNING.value))
+    _patch_pending_from_state(monkeypatch, store)
+    etag = (await _request("GET", "/v1/jobs/req-1/interaction/pending")).headers["etag"]
+
+    async def _change_later():
+        await asyncio.sleep(0.05)
+        await store.set_run_state("req-1", _state(RunStatus.WAITING_USER.value))
+
+    writer = asyncio.create_task(_change_later())
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    response = await _request(
+        "GET",
+        "/v1/jobs/req-1/interaction/pending",
+        params={"wait_for_change": 30},
+        headers={"If-None-Match": etag},
+    )
+    await writer
+
+    assert response.status_code == 200
+    assert response.json()["status"] == RunStatus.WAITING_USER.value
+    assert loop.time() - started < 5
+
+    timed_out = await _request(
+        "GET",
+        "/v1/jobs/req-1/interaction/pending",
+        params={"wait_for_change": 0.05},
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert timed_out.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_result_long_poll_waits_out_not_ready(monkeypatch, store):
+    await store.set_run_state("req-1", _state(RunStatus.RUNNING.value))
+
+    async def _get_result(*, request_id: str):
+        state = await store.get_run_state(request_id)
+        if state["status"] != RunStatus.SUCCEEDED.value:
+            raise HTTPException(status_code=409, detail="terminal result not ready")
+        return RunResultResponse(request_id=request_id, result={"status": "success"})
+
+    monkeypatch.setattr(jobs_router.run_read_facade, "get_result", _get_result)
+
+    not_ready = await _request("GET", "/v1/jobs/req-1/result", params={"wait_for_change": 0.05})
+    assert not_ready.status_code == 409
+
+    async def _finish_later():
+        await asyncio.sleep(0.05)
+        await store.set_run_state("req-1", _state(RunStatus.SUCCEEDED.value))
+
+    writer = asyncio.create_task(_finish_later())
+    response = await _request("GET", "/v1/jobs/req-1/result", params={"wait_for_change": 30})
+    await writer
+    assert response.status_code == 200
+    assert response.json()["result"] == {"status": "success"}
+
+    # Direct (non-HTTP) callers still get the model back.
+    direct = await jobs_router.get_run_result("req-1", Response())
+    assert isinstance(direct, RunResultResponse)
+    assert (await _request("GET", "/v1/jobs/req-1/result", params={"wait_for_change": 61})).status_code == 422
@@ -7,7 +7,7 @@ import pytest
 
 fastapi = pytest.importorskip("fastapi")
 httpx = pytest.importorskip("httpx")
-from fastapi import BackgroundTasks, HTTPException, UploadFile
+from fastapi import BackgroundTasks, HTTPException, Response, UploadFile
 
 from server.config import config
 from server.main import app
@@ -160,7 +160,7 @@ async def test_get_interaction_pending_returns_pending(monkeypatch, temp_config_
         },
     )
 
-    response = await jobs_router.get_interaction_pending(request_id)
+    response = await jobs_router.get_interaction_pending(request_id, Response())
     assert response.status == RunStatus.WAITING_USER
     assert response.pending is not None
     assert response.pending.interaction_id == 1
@@ -416,7 +416,7 @@ async def test_get_run_status_exposes_waiting_user_pending_fields(monkeypatch, t
         },
     )
 
-    response = await jobs_router.get_run_status(request_id)
+    response = await jobs_router.get_run_status(request_id, Response())
     assert response.status == RunStatus.WAITING_USER
     assert response.pending_interaction_id == 11
     assert response.interaction_count == 1
@@ -443,7 +443,7 @@ async def test_get_run_status_waiting_auth_uses_persisted_audit_directory(
         reconcile,
     )
 
-    response = await jobs_router.get_run_status(request_id)
+    response = await jobs_router.get_run_status(request_id, Response())
 
     assert response.status == RunStatus.WAITING_AUTH
     reconcile.assert_awaited_once_with(request_id=request_id)
@@ -468,7 +468,7 @@ async def test_get_run_status_exposes_interactive_auto_reply_fields(monkeypatch,
     assert run_id is not None
 
     await _write_status(store, request_id, run_id, RunStatus.WAITING_USER)
-    response = await jobs_router.get_run_status(request_id)
+    response = await jobs_router.get_run_status(request_id, Response())
     assert response.status == RunStatus.WAITING_USER
     assert response.interactive_auto_reply is True
     assert response.interactive_reply_timeout_sec == 5
@@ -815,7 +815,7 @@ async def test_interaction_endpoints_require_interactive_mode(monkeypatch, temp_
     )
     request_id = response.request_id
 
-    pending = await jobs_router.get_interaction_pending(request_id)
+    pending = await jobs_router.get_interaction_pending(request_id, Response())
     assert pending.status == RunStatus.QUEUED
     assert pending.effective_execution_mode == ExecutionMode.AUTO
     assert pending.pending is None
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tests.load import fake_engine
+from tests.load.load_report import LoadRecorder, percentile
+
+
+def _turn(engine: str, argv: list[str], cwd: Path) -> list[str]:
+    cwd.mkdir(parents=True, exist_ok=True)
+    lines: list[str] = []
+    fake_engine.run_turn(engine, argv, cwd=cwd, write=lines.append)
+    return lines
+
+
+@pytest.fixture(autouse=True)
+def _fast_engine(monkeypatch):
+    monkeypatch.setenv(fake_engine.EVENTS_ENV, "3")
+    monkeypatch.setenv(fake_engine.EVENTS_PER_SEC_ENV, "0")
+    monkeypatch.setenv(fake_engine.PENDING_TURNS_ENV, "1")
+    monkeypatch.delenv(fake_engine.FIXTURE_ENV, raising=False)
+
+
+def test_fake_codex_speaks_ndjson_and_resumes_interactive_session(tmp_path: Path):
+    start = [json.loads(line) for line in _turn("codex", ["exec", "--json", "-p", "skill-runner", "$loadtest-interactive"], tmp_path)]
+    thread_id = start[0]["thread_id"]
+    assert [row["type"] for row in start] == [
+        "thread.started",
+        "turn.started",
+        "item.completed",
+        "item.completed",
+        "item.completed",
+        "item.completed",
+        "turn.completed",
+    ]
+    assert fake_engine.EMIT_MARKER in start[2]["item"]["aggregated_output"]
+    assert json.loads(start[-2]["item"]["text"])["__SKILL_DONE__"] is False
+
+    resumed = [json.loads(line) for line in _turn("codex", ["exec", "--json", "resume", thread_id, "continue"], tmp_path)]
+    assert resumed[0]["thread_id"] == thread_id
+    assert json.loads(resumed[-2]["item"]["text"]) == {"__SKILL_DONE__": True, "message": "fake engine done", "turns": 2}
+
+
+def test_fake_claude_and_gemini_emit_final_payloads(tmp_path: Path):
+    claude = [json.loads(line) for line in _turn("claude", ["-p", "--output-format", "stream-json", "$loadtest-auto"], tmp_path / "c")]
+    assert claude[0]["subtype"] == "init"
+    assert claude[-1]["type"] == "result"
+    assert claude[-1]["structured_output"]["__SKILL_DONE__"] is True
+
+    gemini = _turn("gemini", ["--resume", "sess-1", "--yolo", "reply"], tmp_path / "g")
+    envelope = json.loads(gemini[-1])
+    assert envelope["session_id"] == "sess-1"
+    assert json.loads(envelope["response"])["__SKILL_DONE__"] is True
+
+
+def test_recorder_reports_percentiles_and_event_lag():
+    recorder = LoadRecorder()
+    for ms in range(1, 101):
+        recorder.record("GET /v1/jobs/{id}", ms / 1000, 200)
+    recorder.record("GET /v1/jobs/{id}", 0.5, 503)
+    recorder.record_event_payload('{"text": "fake-emit@100.000000 and fake-emit@100.5"}', received_at=101.0)
+    recorder.finish()
+
+    summary = recorder.summary()
+    endpoint = summary["endpoints"]["GET /v1/jobs/{id}"]
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert endpoint["count"] == 101
+    assert endpoint["errors"] == 1
+    assert endpoint["p50_ms"] == 51.0
+    assert endpoint["status_counts"] == {"200": 100, "503": 1}
+    assert summary["event_lag_ms"]["count"] == 2
+    assert summary["event_lag_ms"]["max"] == 1000.0
@@ -911,9 +911,114 @@ async def test_management_run_protocol_rebuild_route(monkeypatch, tmp_path: Path
     assert payload["attempts"][0]["source"] == "io_chunks"
 
 
+@pytest.mark.asyncio
+async def test_management_protocol_reindex_routes(monkeypatch, tmp_path: Path):
+    from server.services.orchestration.run_protocol_reindex_service import (
+        ProtocolReindexBusyError,
+        RunProtocolReindexService,
+    )
+
+    service = RunProtocolReindexService(root_dir=tmp_path)
+    job_dir = service.job_dir("job-1")
+    job_dir.mkdir(parents=True)
+    (job_dir / "job.json").write_text(
+        json.dumps({"job_id": "job-1", "status": "running", "total": 2, "done": 1, "succeeded": 1}),
+        encoding="utf-8",
+    )
+    (job_dir / "progress.jsonl").write_text(
+        json.dumps({"request_id": "req-a", "success": True}) + "\n",
+        encoding="utf-8",
+    )
+    start_job = AsyncMock(return_value="job-1")
+    monkeypatch.setattr(service, "start_job", start_job)
+    monkeypatch.setattr("server.routers.management.run_protocol_reindex_service", service)
+
+    response = await _request(
+        "POST",
+        "/v1/management/protocol/reindex",
+        json={"engines": ["codex"], "workers": 2, "dry_run": True},
+    )
+    assert response.status_code == 200
+    assert response.json()["job_id"] == "job-1"
+    options = start_job.await_args.args[0]
+    assert options.engines == ("codex",)
+    assert options.workers == 2
+    assert options.dry_run is True
+
+    response = await _request("GET", "/v1/management/protocol/reindex/job-1")
+    assert response.status_code == 200
+    assert response.json()["done"] == 1
+    assert response.json()["recent_results"] == [{"request_id": "req-a", "success": True}]
+
+    response = await _request("GET", "/v1/management/protocol/reindex/missing")
+    assert response.status_code == 404
+    response = await _request("POST", "/v1/management/protocol/reindex/job-1/cancel")
+    assert response.status_code == 409
+
+    start_job.side_effect = ProtocolReindexBusyError("busy")
+    response = await _request("POST", "/v1/management/protocol/reindex", json={})
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_management_runs_list_uses_keyset_cursor_and_filters(monkeypatch):
+    row = {
+        "request_id": "req-1",
+        "run_id": "run-1",
+        "status": "failed",
+        "engine": "codex",
+        "model": "gpt-5",
+        "skill_id": "demo",
+        "updated_at": "2026-02-16T00:00:00",
+    }
+    list_keyset = AsyncMock(
+        return_value={"runs": [row], "page_size": 10, "total": 1, "total_pages": 1, "next_cursor": "next-1"}
+    )
+    list_paginated = AsyncMock(return_value={"runs": [], "page": 3, "page_size": 10, "total": 0, "total_pages": 0})
+    monkeypatch.setattr("server.routers.management.run_observability_service.list_runs_keyset", list_keyset)
+    monkeypatch.setattr("server.routers.management.run_observability_service.list_runs_paginated", list_paginated)
+
+    response = await _request(
+        "GET",
+        "/v1/management/runs",
+        params={
+            "page_size": 10,
+            "status": ["failed", "canceled"],
+            "engine": "codex",
+            "created_from": "2026-02-01T00:00:00",
+            "q": "unauthorized",
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["next_cursor"] == "next-1"
+    assert [run["request_id"] for run in body["runs"]] == ["req-1"]
+    filters = list_keyset.await_args.kwargs["filters"]
+    assert filters.statuses == ("failed", "canceled")
+    assert filters.engine == "codex"
+    assert filters.text == "unauthorized"
+    assert filters.created_from.isoformat() == "2026-02-01T00:00:00"
+
+    response = await _request("GET", "/v1/management/runs", params={"page": 2, "cursor": "next-1"})
+    assert response.status_code == 200
+    assert list_keyset.await_args.kwargs == {"limit": 20, "cursor": "next-1", "filters": None}
+
+    # Unfiltered numbered pages keep the offset listing.
+    response = await _request("GET", "/v1/management/runs", params={"page": 3, "page_size": 10})
+    assert response.status_code == 200
+    list_paginated.assert_awaited_once_with(page=3, page_size=10)
+
+    response = await _request("GET", "/v1/management/runs", params={"page": 2, "engine": "codex"})
+    assert response.status_code == 400
+
+    list_keyset.side_effect = ValueError("Invalid run list cursor")
+    response = await _request("GET", "/v1/management/runs", params={"cursor": "bogus"})
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_management_run_pending_reply_cancel_delegate_to_jobs(monkeypatch):
-    async def _pending(_request_id: str):
+    async def _pending(_request_id: str, _response):  # noqa: ANN001
         return InteractionPendingResponse(
             request_id="req-3",
             status=RunStatus.WAITING_USER,
@@ -1189,8 +1294,9 @@ async def test_management_query_system_logs(monkeypatch):
                     "line_no": 12,
                 }
             ],
-            "next_cursor": 1,
+            "next_cursor": "eyJmIjoic2tpbGxfcnVubmVyLmxvZyJ9",
             "total_matched": 2,
+            "total_matched_exact": False,
         }
 
     monkeypatch.setattr("server.routers.management.system_log_explorer_service.query", _query)
@@ -1204,7 +1310,10 @@ async def test_management_query_system_logs(monkeypatch):
     assert payload["source"] == "system"
     assert payload["total_matched"] == 2
     assert payload["items"][0]["line_no"] == 12
+    assert payload["next_cursor"] == "eyJmIjoic2tpbGxfcnVubmVyLmxvZyJ9"
+    assert payload["total_matched_exact"] is False
     assert captured["level"] == "ERROR"
+    assert captured["cursor"] == "0"
 
 
 @pytest.mark.asyncio
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -24,3 +26,78 @@ def test_append_orchestrator_event_schema_violation_raises_runtime_error(tmp_pat
             type_name="lifecycle.run.started",
             data={"status": "queued"},
         )
+
+
+def _append_diagnostic(service: RunAuditService, *, run_dir: Path, audit_dir: Path, code: str) -> None:
+    service.append_orchestrator_event(
+        run_dir=run_dir,
+        audit_dir=audit_dir,
+        run_id=run_dir.name,
+        attempt_number=1,
+        category="diagnostic",
+        type_name="diagnostic.warning",
+        data={"code": code},
+        engine_name="codex",
+    )
+
+
+def _read_event_seqs(audit_dir: Path) -> list[int]:
+    lines = (audit_dir / "orchestrator_events.1.jsonl").read_text(encoding="utf-8").splitlines()
+    return [json.loads(line)["seq"] for line in lines if line.strip()]
+
+
+def test_append_orchestrator_event_allocates_seq_without_rescanning(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    run_dir = tmp_path / "run-seq-alloc"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    audit_dir = make_layout(run_dir, namespace="seq-alloc.1").audit_dir
+    service = RunAuditService()
+    _append_diagnostic(service, run_dir=run_dir, audit_dir=audit_dir, code="FIRST")
+
+    def _fail_scan(_path: Path) -> int:
+        raise AssertionError("full journal scan should not run on the warm path")
+
+    monkeypatch.setattr(service, "_scan_orchestrator_event_seq", _fail_scan)
+    for index in range(5):
+        _append_diagnostic(service, run_dir=run_dir, audit_dir=audit_dir, code=f"NEXT_{index}")
+
+    assert _read_event_seqs(audit_dir) == [1, 2, 3, 4, 5, 6]
+    assert service.next_orchestrator_event_seq(audit_dir / "orchestrator_events.1.jsonl") == 7
+
+
+def test_append_orchestrator_event_resumes_from_tail_after_foreign_write(tmp_path: Path):
+    run_dir = tmp_path / "run-seq-tail"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    audit_dir = make_layout(run_dir, namespace="seq-tail.1").audit_dir
+    service = RunAuditService()
+    _append_diagnostic(service, run_dir=run_dir, audit_dir=audit_dir, code="FIRST")
+    with (audit_dir / "orchestrator_events.1.jsonl").open("a", encoding="utf-8") as fp:
+        fp.write(json.dumps({"seq": 41, "type": "diagnostic.warning"}) + "\n\n")
+
+    _append_diagnostic(service, run_dir=run_dir, audit_dir=audit_dir, code="AFTER_FOREIGN")
+    RunAuditService().append_orchestrator_event(
+        run_dir=run_dir,
+        audit_dir=audit_dir,
+        run_id=run_dir.name,
+        attempt_number=1,
+        category="diagnostic",
+        type_name="diagnostic.warning",
+        data={"code": "OTHER_INSTANCE"},
+        engine_name="codex",
+    )
+
+    assert _read_event_seqs(audit_dir) == [1, 41, 42, 43]
+
+
+def test_append_orchestrator_event_concurrent_writers_get_unique_seq(tmp_path: Path):
+    run_dir = tmp_path / "run-seq-threads"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    audit_dir = make_layout(run_dir, namespace="seq-threads.1").audit_dir
+    services = [RunAuditService(), RunAuditService()]
+
+    def _worker(index: int) -> None:
+        _append_diagnostic(services[index % 2], run_dir=run_dir, audit_dir=audit_dir, code=f"T{index}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_worker, range(40)))
+
+    assert sorted(_read_event_seqs(audit_dir)) == list(range(1, 41))
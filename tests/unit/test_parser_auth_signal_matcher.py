@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+import server.runtime.adapter  # noqa: F401
+from server.runtime.adapter.common import parser_auth_signal_matcher as matcher
+from tests.load.bench_auth_rules import engine_rules, interpreted_detect, load_positive_cases
+
+
+def _rule(rule_id: str, priority: int, **match) -> dict:
+    return {"id": rule_id, "enabled": True, "priority": priority, "match": match}
+
+
+def _regex(value: str, field: str = "combined_text") -> dict:
+    return {"field": field, "op": "regex", "value": value}
+
+
+@pytest.fixture(autouse=True)
+def _reset_hits():
+    matcher.reset_auth_rule_hit_counts()
+    yield
+    matcher.reset_auth_rule_hit_counts()
+
+
+def test_compiled_rules_agree_with_interpreted_evaluator_on_auth_corpus() -> None:
+    matched = 0
+    for engine, evidence in load_positive_cases():
+        rules = engine_rules(engine)
+        signal = matcher.detect_auth_signal_from_patterns(engine=engine, rules=rules, evidence=evidence)
+        expected = interpreted_detect(engine=engine, rules=rules, evidence=evidence)
+        actual = None if signal is None else (signal["matched_pattern_id"], signal["confidence"])
+        assert actual == expected
+        matched += actual is not None
+    assert matched > 0
+
+
+def test_compiled_rules_are_reused_for_the_same_rule_tuple() -> None:
+    rules = (_rule("tuple_rule", 10, all=[_regex("login\\s+required")]),)
+    first = matcher.compile_auth_rules("codex", rules)
+    assert matcher.compile_auth_rules("CODEX", rules) is first
+    assert matcher.compile_auth_rules("codex", list(rules)) is not first
+
+
+def test_any_regex_clauses_merge_and_prefilter_stays_case_exact() -> None:
+    rules = (
+        _rule(
+            "merged_any",
+            50,
+            any=[_regex("api\\s*key\\s+invalid"), _regex("\\b(401|403)\\b"), {"field": "engine", "op": "eq", "value": "x"}],
+        ),
+    )
+    compiled = matcher.compile_auth_rules("codex", rules)
+    assert len(compiled.rules[0].any_clauses) == 2
+
+    def _hit(text: str) -> bool:
+        evidence = {"engine": "codex", "combined_text": text, "extracted": {}}
+        return matcher.detect_auth_signal_from_patterns(engine="codex", rules=rules, evidence=evidence) is not None
+
+    assert _hit("HTTP 403 Forbidden")
+    assert _hit("API  KEY invalid")
+    # U+0130 / U+212A match `i` / `k` under IGNORECASE; the literal prefilter must not hide them.
+    assert _hit("apİ Key invalid")
+    assert not _hit("status 4031, api key valid")
+
+
+def test_rule_hit_counters_track_engine_and_fallback_matches() -> None:
+    rules = (
+        _rule("codex_low", 10, all=[_regex("token\\s+revoked")]),
+        _rule("codex_high", 900, all=[_regex("401\\s+Unauthorized"), {"field": "engine", "op": "eq", "value": "codex"}]),
+    )
+    for text in ("401 Unauthorized token revoked", "401 unauthorized", "authentication is required"):
+        matcher.detect_auth_signal_from_patterns(
+            engine="codex",
+            rules=rules,
+            evidence={"engine": "codex", "combined_text": text, "extracted": {}},
+        )
+
+    assert matcher.auth_rule_hit_counts() == {
+        "codex": {"codex_high": 2, "generic_auth_required_text_fallback": 1},
+    }
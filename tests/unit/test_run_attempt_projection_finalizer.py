@@ -51,7 +51,7 @@ class _RunStoreRecorder:
     ) -> None:
         self.status_updates.append((run_id, status, result_path))
 
-    async def record_cache_entry(self, cache_key: str, run_id: str) -> None:
+    async def record_cache_entry(self, cache_key: str, run_id: str, *, size_bytes: int = 0) -> None:
         self.cache_entries.append((cache_key, run_id))
 
     async def record_temp_cache_entry(self, cache_key: str, run_id: str) -> None:
@@ -0,0 +1,178 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from server.models import RunStatus
+from server.services.orchestration.run_dispatch_queue import RunDispatchQueue
+from server.services.orchestration.run_store import RunStore
+from server.services.platform.engine_budget_manager import EngineBudgetManager, EngineBudgetPolicy
+
+
+class _FakeConcurrency:
+    def __init__(self, slots: int) -> None:
+        self._semaphore = asyncio.Semaphore(slots)
+        self.queued_sync: list[int] = []
+
+    async def acquire_slot(self) -> None:
+        await self._semaphore.acquire()
+
+    async def release_slot(self) -> None:
+        self._semaphore.release()
+
+    def sync_queued(self, count: int) -> None:
+        self.queued_sync.append(count)
+
+
+async def _enqueue(
+    store: RunStore,
+    run_id: str,
+    *,
+    skill_id: str = "demo",
+    priority: str = "normal",
+    client: str = "",
+    engine: str = "codex",
+    provider_id: str | None = None,
+) -> None:
+    await store.create_run(run_id, None, RunStatus.QUEUED.value)
+    await store.enqueue_dispatch(
+        run_id=run_id,
+        request_id=f"req-{run_id}",
+        skill_id=skill_id,
+        engine=engine,
+        options={"marker": run_id},
+        priority=priority,
+        client_key=client,
+        provider_id=provider_id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_order_is_priority_then_fifo(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _enqueue(store, "low-1", priority="low")
+    await _enqueue(store, "normal-1")
+    await _enqueue(store, "high-1", priority="high")
+    await _enqueue(store, "normal-2")
+
+    claimed = [(await store.claim_next_dispatch("w"))["run_id"] for _ in range(4)]
+
+    assert claimed == ["high-1", "normal-1", "normal-2", "low-1"]
+    assert await store.claim_next_dispatch("w") is None
+    assert await store.count_queued_dispatches() == 0
+
+
+@pytest.mark.asyncio
+async def test_claim_prefers_skill_and_client_with_fewer_running(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _enqueue(store, "a-1", skill_id="skill-a", client="client-1")
+    await _enqueue(store, "a-2", skill_id="skill-a", client="client-1")
+    await _enqueue(store, "a-3", skill_id="skill-a", client="client-1")
+    await _enqueue(store, "b-1", skill_id="skill-b", client="client-2")
+
+    first = await store.claim_next_dispatch("w")
+    second = await store.claim_next_dispatch("w")
+
+    # skill-a/client-1 already holds a claim, so the later skill-b run goes next.
+    assert first["run_id"] == "a-1"
+    assert second["run_id"] == "b-1"
+    assert second["options"] == {"marker": "b-1"}
+
+
+@pytest.mark.asyncio
+async def test_requeue_claimed_restores_entries_after_restart(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _enqueue(store, "run-1")
+    await store.claim_next_dispatch("old-process")
+
+    reopened = RunStore(db_path=tmp_path / "runs.db")
+    assert await reopened.requeue_claimed_dispatches() == 1
+    entry = await reopened.get_dispatch_queue_entry("run-1")
+    assert entry is not None
+    assert entry["state"] == "queued"
+    assert entry["worker_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_respects_slots_and_skips_non_queued_runs(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _enqueue(store, "run-1")
+    await _enqueue(store, "run-2")
+    await _enqueue(store, "run-canceled")
+    await store.update_run_status("run-canceled", RunStatus.CANCELED.value)
+    await _enqueue(store, "run-3")
+
+    concurrency = _FakeConcurrency(slots=2)
+    started: list[str] = []
+    gate = asyncio.Event()
+
+    async def fake_run_job(**kwargs):
+        assert kwargs["slot_preacquired"] is True
+        started.append(kwargs["run_id"])
+        await gate.wait()
+        await concurrency.release_slot()
+
+    queue = RunDispatchQueue(run_store_backend=store, concurrency_backend=concurrency)
+    await queue.start(fake_run_job)
+    for _ in range(50):
+        if len(started) == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert started == ["run-1", "run-2"]
+    assert await store.count_queued_dispatches() == 2
+
+    gate.set()
+    for _ in range(100):
+        if await store.list_dispatch_queue() == []:
+            break
+        await asyncio.sleep(0.01)
+    await queue.stop()
+
+    assert started == ["run-1", "run-2", "run-3"]
+    assert await store.list_dispatch_queue() == []
+    assert concurrency.queued_sync[-1] == 0
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_blocked_budget_pools(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _enqueue(store, "gemini-1", engine="gemini", provider_id="google", priority="high")
+    await _enqueue(store, "codex-1")
+
+    entry = await store.claim_next_dispatch("w", blocked_pools={"gemini/google"})
+
+    assert entry is not None
+    assert entry["run_id"] == "codex-1"
+    assert await store.count_queued_dispatches_by_pool() == {"gemini": 1, "gemini/google": 1}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_does_not_let_saturated_engine_starve_others(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _enqueue(store, "gemini-1", engine="gemini")
+    await _enqueue(store, "gemini-2", engine="gemini")
+    await _enqueue(store, "codex-1")
+
+    concurrency = _FakeConcurrency(slots=3)
+    budgets = EngineBudgetManager(EngineBudgetPolicy(limits={"gemini": 1}))
+    started: list[str] = []
+    gate = asyncio.Event()
+
+    async def fake_run_job(**kwargs):
+        started.append(kwargs["run_id"])
+        await gate.wait()
+
+    queue = RunDispatchQueue(
+        run_store_backend=store,
+        concurrency_backend=concurrency,
+        budget_backend=budgets,
+    )
+    queue._run_job = fake_run_job
+    assert await queue.dispatch_available() == 2
+    await asyncio.sleep(0)
+
+    assert started == ["gemini-1", "codex-1"]
+    entry = await store.get_dispatch_queue_entry("gemini-2")
+    assert entry is not None and entry["state"] == "queued"
+    gate.set()
+    await asyncio.gather(*list(queue._run_tasks))
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from server.services.orchestration.run_filesystem_snapshot_service import (
+    RunFilesystemSnapshotService,
+)
+
+_OLD_NS = time.time_ns() - 3600 * 1_000_000_000
+
+
+def _write(path: Path, content: str, *, old: bool = True) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    if old:
+        os.utime(path, ns=(_OLD_NS, _OLD_NS))
+
+
+def _rglob_snapshot(service: RunFilesystemSnapshotService, run_dir: Path) -> dict[str, dict]:
+    """Previous full-walk implementation, kept as the reference for equivalence checks."""
+    snapshot = {}
+    for path in run_dir.rglob("*"):
+        if not path.is_file():
+            continue
+        rel_path = path.relative_to(run_dir).as_posix()
+        if rel_path.startswith(service._ignored_prefixes) or rel_path in service._ignored_files:
+            continue
+        snapshot[rel_path] = {
+            "size": path.stat().st_size,
+            "mtime": path.stat().st_mtime,
+            "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+        }
+    return snapshot
+
+
+def _build_tree(run_dir: Path) -> None:
+    for index in range(30):
+        _write(run_dir / "uploads" / f"d{index % 4}" / f"f{index}.txt", f"payload-{index}")
+    _write(run_dir / "result" / "result.json", "{}")
+    _write(run_dir / ".audit" / "meta.1.json", "{}")
+    _write(run_dir / ".codex" / "config.toml", "x")
+    _write(run_dir / "uploads" / ".interaction-replies" / "r" / "file", "secret")
+    (run_dir / "linked.txt").symlink_to(run_dir / "result" / "result.json")
+    (run_dir / "linked-dir").symlink_to(run_dir / "uploads", target_is_directory=True)
+
+
+def test_incremental_snapshot_matches_full_walk_and_diff(tmp_path: Path):
+    run_dir = tmp_path / "run"
+    _build_tree(run_dir)
+    service = RunFilesystemSnapshotService(hash_workers=4)
+
+    before = service.capture_filesystem_snapshot(run_dir)
+    assert before == _rglob_snapshot(service, run_dir)
+
+    _write(run_dir / "uploads" / "d0" / "f0.txt", "changed-0", old=False)
+    _write(run_dir / "artifacts" / "new.txt", "new", old=False)
+    (run_dir / "uploads" / "d1" / "f1.txt").unlink()
+    after = service.capture_filesystem_snapshot(run_dir)
+
+    assert after == _rglob_snapshot(service, run_dir)
+    assert service.diff_filesystem_snapshot(before, after) == {
+        "created": ["artifacts/new.txt"],
+        "modified": ["uploads/d0/f0.txt"],
+        "deleted": ["uploads/d1/f1.txt"],
+    }
+
+
+def test_unchanged_files_reuse_previous_hash(tmp_path: Path, monkeypatch):
+    run_dir = tmp_path / "run"
+    _build_tree(run_dir)
+    service = RunFilesystemSnapshotService(hash_workers=2)
+    service.capture_filesystem_snapshot(run_dir)
+    first_pass_hashed = service.files_hashed
+
+    hashed_paths: list[str] = []
+    original = service._hash_one
+
+    def _tracking_hash(path: str) -> str | None:
+        hashed_paths.append(Path(path).relative_to(run_dir).as_posix())
+        return original(path)
+
+    monkeypatch.setattr(service, "_hash_one", _tracking_hash)
+    _write(run_dir / "uploads" / "d2" / "f2.txt", "payload-X", old=True)
+    os.utime(run_dir / "uploads" / "d2" / "f2.txt", ns=(_OLD_NS + 1, _OLD_NS + 1))
+    snapshot = service.capture_filesystem_snapshot(run_dir)
+
+    assert first_pass_hashed == 32
+    assert hashed_paths == ["uploads/d2/f2.txt"]
+    assert service.files_reused == 31
+    assert snapshot["uploads/d2/f2.txt"]["sha256"] == hashlib.sha256(b"payload-X").hexdigest()
+
+
+def test_recently_modified_files_are_always_rehashed(tmp_path: Path):
+    run_dir = tmp_path / "run"
+    target = run_dir / "out.txt"
+    _write(target, "aaaa", old=False)
+    service = RunFilesystemSnapshotService(hash_workers=1)
+    first = service.capture_filesystem_snapshot(run_dir)
+
+    stat = target.stat()
+    target.write_text("bbbb", encoding="utf-8")
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    second = service.capture_filesystem_snapshot(run_dir)
+
+    assert first["out.txt"]["size"] == second["out.txt"]["size"]
+    assert service.diff_filesystem_snapshot(first, second)["modified"] == ["out.txt"]
+
+
+def test_fingerprint_cache_is_bounded_by_total_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(
+        "server.services.orchestration.run_filesystem_snapshot_service._MAX_CACHED_FILES",
+        3,
+    )
+    service = RunFilesystemSnapshotService()
+    first = tmp_path / "run-1"
+    second = tmp_path / "run-2"
+    for run_dir in (first, second):
+        _write(run_dir / "a.txt", "a")
+        _write(run_dir / "b.txt", "b")
+
+    service.capture_filesystem_snapshot(first)
+    service.capture_filesystem_snapshot(second)
+
+    assert service.known_file_digests(first) == {}
+    assert set(service.known_file_digests(second)) == {"a.txt", "b.txt"}
+    service.forget_run_dir(second)
+    assert service.known_file_digests(second) == {}
+    assert service._cached_files == 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import shutil
 import subprocess
 from pathlib import Path
 
@@ -8,7 +9,7 @@ import pytest
 from server.services.orchestration.run_folder_git_initializer import RunFolderGitInitializer
 
 
-def test_ensure_git_repo_initializes_when_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_ensure_git_repo_subprocess_mode_initializes_when_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     run_dir = tmp_path / "run-a"
     run_dir.mkdir(parents=True)
     commands: list[list[str]] = []
@@ -22,7 +23,7 @@ def test_ensure_git_repo_initializes_when_missing(tmp_path: Path, monkeypatch: p
         return subprocess.CompletedProcess(command, 0, "", "")
 
     monkeypatch.setattr("server.services.platform.subprocess_text.subprocess.run", _fake_run)
-    initializer = RunFolderGitInitializer()
+    initializer = RunFolderGitInitializer(native=False)
 
     created = initializer.ensure_git_repo(run_dir)
 
@@ -43,7 +44,7 @@ def test_ensure_git_repo_is_idempotent_when_git_dir_exists(tmp_path: Path) -> No
     assert created is False
 
 
-def test_ensure_git_repo_raises_on_git_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_ensure_git_repo_subprocess_mode_raises_on_git_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     run_dir = tmp_path / "run-c"
     run_dir.mkdir(parents=True)
 
@@ -51,7 +52,54 @@ def test_ensure_git_repo_raises_on_git_failure(tmp_path: Path, monkeypatch: pyte
         return subprocess.CompletedProcess(command, 1, "", "git init failed")
 
     monkeypatch.setattr("server.services.platform.subprocess_text.subprocess.run", _fake_run)
-    initializer = RunFolderGitInitializer()
+    initializer = RunFolderGitInitializer(native=False)
 
     with pytest.raises(RuntimeError, match="git init failed"):
         initializer.ensure_git_repo(run_dir)
+
+
+def _tree_snapshot(git_dir: Path) -> dict[str, str | None]:
+    snapshot: dict[str, str | None] = {}
+    for path in sorted(git_dir.rglob("*")):
+        relative = path.relative_to(git_dir).as_posix()
+        snapshot[relative] = path.read_text(encoding="utf-8") if path.is_file() else None
+    return snapshot
+
+
+def test_ensure_git_repo_native_mode_does_not_spawn_git(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    run_dir = tmp_path / "run-d"
+
+    def _fail_run(command, **kwargs):  # type: ignore[no-untyped-def]
+        raise AssertionError(f"unexpected subprocess: {command}")
+
+    monkeypatch.setattr("server.services.platform.subprocess_text.subprocess.run", _fail_run)
+    initializer = RunFolderGitInitializer()
+
+    assert initializer.ensure_git_repo(run_dir) is True
+    assert initializer.ensure_git_repo(run_dir) is False
+    assert (run_dir / ".git" / "HEAD").read_text(encoding="utf-8") == "ref: refs/heads/master\n"
+    assert [path.name for path in run_dir.iterdir()] == [".git"]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git executable is required")
+def test_ensure_git_repo_native_mode_matches_git_init(tmp_path: Path) -> None:
+    native_dir = tmp_path / "native"
+    reference_dir = tmp_path / "reference"
+    reference_dir.mkdir()
+    subprocess.run(
+        ["git", "-c", "init.defaultBranch=master", "init", "-q", "--template=", str(reference_dir)],
+        check=True,
+    )
+
+    RunFolderGitInitializer().ensure_git_repo(native_dir)
+
+    assert _tree_snapshot(native_dir / ".git") == _tree_snapshot(reference_dir / ".git")
+    (native_dir / "result.json").write_text("{}", encoding="utf-8")
+    status = subprocess.run(
+        ["git", "status", "--porcelain=v1", "--branch"],
+        cwd=native_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert status.stdout.splitlines() == ["## No commits yet on master", "?? result.json"]
@@ -1,9 +1,15 @@
 import json
+import os
+import threading
+import time
 from pathlib import Path
 
 import tomlkit
 
 from server.engines.claude.adapter.state_paths import active_claude_state_path
+from server.engines.codex.adapter.trust_folder_strategy import CodexTrustFolderStrategy
+from server.engines.common.trust_registry import TrustFolderStrategyRegistry
+from server.engines.gemini.adapter.trust_folder_strategy import GeminiTrustFolderStrategy
 from server.services.engine_management.runtime_profile import reset_runtime_profile_cache
 from server.services.orchestration.run_folder_trust_manager import RunFolderTrustManager
 
@@ -165,3 +171,75 @@ def test_claude_register_repairs_malformed_file(tmp_path):
     payload = json.loads(claude_path.read_text(encoding="utf-8"))
     assert payload["projects"][str(run_dir.resolve())]["hasTrustDialogAccepted"] is True
     assert claude_path.with_name(".claude.json.bak").exists()
+
+
+def test_concurrent_codex_registrations_share_one_rewrite(tmp_path):
+    runs_root = tmp_path / "runs"
+    codex_path = tmp_path / "codex" / "config.toml"
+    strategy = CodexTrustFolderStrategy(codex_path, runs_root)
+    document = strategy._document
+    run_keys = [str((runs_root / f"run-{index}").resolve()) for index in range(5)]
+
+    with document._flush_lock:
+        workers = [threading.Thread(target=strategy.register, args=(key,)) for key in run_keys]
+        for worker in workers:
+            worker.start()
+        deadline = time.monotonic() + 5
+        while document.stats.operations < len(run_keys) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    for worker in workers:
+        worker.join(timeout=5)
+
+    projects = _load_toml(codex_path)["projects"]
+    assert set(run_keys) <= set(projects.keys())
+    assert document.stats.flushes == 1
+    assert document.stats.writes == 1
+
+
+def test_trust_document_is_reparsed_only_after_external_change(tmp_path):
+    runs_root = tmp_path / "runs"
+    codex_path = tmp_path / "codex" / "config.toml"
+    strategy = CodexTrustFolderStrategy(codex_path, runs_root)
+    first = str((runs_root / "run-1").resolve())
+    second = str((runs_root / "run-2").resolve())
+
+    strategy.register(first)
+    strategy.register(first)
+    strategy.remove(first)
+    assert strategy._document.stats.parses == 1
+    assert strategy._document.stats.writes == 2
+
+    codex_path.write_text('model = "external"\n', encoding="utf-8")
+    stat = codex_path.stat()
+    os.utime(codex_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    strategy.register(second)
+
+    doc = _load_toml(codex_path)
+    assert strategy._document.stats.parses == 2
+    assert doc["model"] == "external"
+    assert doc["projects"][second]["trust_level"] == "trusted"
+
+
+def test_parent_trust_replaces_per_run_entries_for_inheriting_engines(tmp_path):
+    runs_root = tmp_path / "runs"
+    run_dir = runs_root / "run-g"
+    run_dir.mkdir(parents=True)
+    gemini_path = tmp_path / "gemini" / "trustedFolders.json"
+    codex_path = tmp_path / "codex" / "config.toml"
+    manager = RunFolderTrustManager(codex_config_path=codex_path, runs_root=runs_root)
+    manager._registry = TrustFolderStrategyRegistry(
+        _strategies={
+            "gemini": GeminiTrustFolderStrategy(gemini_path, runs_root),
+            "codex": CodexTrustFolderStrategy(codex_path, runs_root),
+        },
+        _noop=manager._registry._noop,
+    )
+
+    manager.bootstrap_parent_trust(runs_root)
+    manager.register_run_folder("gemini", run_dir)
+    manager.register_run_folder("codex", run_dir)
+
+    payload = json.loads(gemini_path.read_text(encoding="utf-8"))
+    assert payload == {str(runs_root.resolve()): "TRUST_FOLDER"}
+    projects = _load_toml(codex_path)["projects"]
+    assert str(run_dir.resolve()) in projects
@@ -0,0 +1,168 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from server.models import RunStatus
+from server.services.orchestration.run_inflight_coalescer import (
+    COALESCED_FOLLOWER_CANCELED_CODE,
+    RunInflightCoalescer,
+)
+from server.services.orchestration.run_state_service import run_state_service
+from server.services.orchestration.run_store import RunStore
+
+
+async def _create_request(store: RunStore, request_id: str, *, skill_source: str = "installed") -> None:
+    await store.create_request(
+        request_id=request_id,
+        skill_id="demo",
+        engine="codex",
+        parameter={},
+        engine_options={},
+        runtime_options={},
+        skill_source=skill_source,
+    )
+
+
+async def _create_leader(
+    store: RunStore,
+    tmp_path: Path,
+    *,
+    run_id: str = "run-1",
+    cache_key: str = "key-1",
+    enqueue: bool = True,
+) -> None:
+    await _create_request(store, "req-leader")
+    await store.create_run(run_id, cache_key, RunStatus.QUEUED.value)
+    await store.bind_request_run_id("req-leader", run_id)
+    await run_state_service.write_non_terminal_projection(
+        run_dir=tmp_path,
+        request_id="req-leader",
+        run_id=run_id,
+        status=RunStatus.QUEUED,
+        run_store_backend=store,
+    )
+    if enqueue:
+        await store.enqueue_dispatch(
+            run_id=run_id,
+            request_id="req-leader",
+            skill_id="demo",
+            engine="codex",
+            options={},
+            cache_key=cache_key,
+        )
+
+
+@pytest.mark.asyncio
+async def test_follower_binds_to_queued_run_and_mirrors_leader_state(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    coalescer = RunInflightCoalescer(run_store_backend=store)
+    await _create_leader(store, tmp_path)
+    await _create_request(store, "req-follower")
+
+    status = await coalescer.bind_follower(
+        request_id="req-follower",
+        cache_key="key-1",
+        skill_source="installed",
+    )
+
+    assert status == RunStatus.QUEUED
+    follower_record = await store.get_request("req-follower")
+    assert follower_record["run_id"] == "run-1"
+    assert (await store.get_request_by_run_id("run-1"))["request_id"] == "req-leader"
+
+    await run_state_service.write_non_terminal_projection(
+        run_dir=tmp_path,
+        request_id="req-leader",
+        run_id="run-1",
+        status=RunStatus.SUCCEEDED,
+        run_store_backend=store,
+    )
+
+    follower_state = await store.get_run_state("req-follower")
+    assert follower_state["status"] == RunStatus.SUCCEEDED.value
+    assert follower_state["request_id"] == "req-follower"
+    assert follower_state["run_id"] == "run-1"
+
+
+@pytest.mark.asyncio
+async def test_run_without_dispatch_entry_is_not_coalesced(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    coalescer = RunInflightCoalescer(run_store_backend=store)
+    await _create_leader(store, tmp_path, enqueue=False)
+    await _create_request(store, "req-follower")
+
+    status = await coalescer.bind_follower(
+        request_id="req-follower",
+        cache_key="key-1",
+        skill_source="installed",
+    )
+
+    assert status is None
+    assert await store.get_request_follower("req-follower") is None
+
+
+@pytest.mark.asyncio
+async def test_follower_with_different_skill_source_is_not_coalesced(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    coalescer = RunInflightCoalescer(run_store_backend=store)
+    await _create_leader(store, tmp_path)
+    await _create_request(store, "req-follower", skill_source="temp_upload")
+
+    status = await coalescer.bind_follower(
+        request_id="req-follower",
+        cache_key="key-1",
+        skill_source="temp_upload",
+    )
+
+    assert status is None
+
+
+@pytest.mark.asyncio
+async def test_detached_follower_is_canceled_and_stops_mirroring(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    coalescer = RunInflightCoalescer(run_store_backend=store)
+    await _create_leader(store, tmp_path)
+    await _create_request(store, "req-follower")
+    await coalescer.bind_follower(request_id="req-follower", cache_key="key-1", skill_source="installed")
+
+    assert await coalescer.detach_follower(request_id="req-follower") is True
+    assert await coalescer.detach_follower(request_id="req-follower") is False
+
+    follower_state = await store.get_run_state("req-follower")
+    assert follower_state["status"] == RunStatus.CANCELED.value
+    assert follower_state["error"]["code"] == COALESCED_FOLLOWER_CANCELED_CODE
+    assert (await store.get_run("run-1"))["status"] == RunStatus.QUEUED.value
+
+    await run_state_service.write_non_terminal_projection(
+        run_dir=tmp_path,
+        request_id="req-leader",
+        run_id="run-1",
+        status=RunStatus.RUNNING,
+        run_store_backend=store,
+    )
+    assert (await store.get_run_state("req-follower"))["status"] == RunStatus.CANCELED.value
+
+
+@pytest.mark.asyncio
+async def test_reserve_serializes_same_cache_key():
+    coalescer = RunInflightCoalescer()
+    order: list[str] = []
+
+    first = await coalescer.reserve("key-1")
+
+    async def _second() -> None:
+        reservation = await coalescer.reserve("key-1")
+        order.append("second")
+        reservation.release()
+
+    task = asyncio.create_task(_second())
+    other = await coalescer.reserve("key-2")
+    await asyncio.sleep(0)
+    order.append("first")
+    first.release()
+    other.release()
+    await task
+
+    assert order == ["first", "second"]
+    assert coalescer._locks == {}
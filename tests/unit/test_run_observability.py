@@ -1947,6 +1947,126 @@ async def test_rebuild_protocol_history_prefers_io_chunks_and_creates_backup(mon
     assert (backup_dir / "fcmp_events.1.jsonl").exists()
 
 
+@pytest.mark.asyncio
+async def test_rebuild_protocol_history_dry_run_skips_backup(monkeypatch, tmp_path: Path) -> None:
+    run_dir = tmp_path / "run-rebuild-dry"
+    audit_dir = _audit_dir(run_dir)
+    _patch_request_bound(
+        monkeypatch,
+        run_dir=run_dir,
+        request_id="req-rebuild-dry",
+        run_id="logical-rebuild-dry",
+        status="succeeded",
+        engine="unknown",
+    )
+    (audit_dir / "meta.1.json").write_text(json.dumps({"engine": "unknown"}), encoding="utf-8")
+    (audit_dir / "events.1.jsonl").write_text('{"legacy":"old"}\n', encoding="utf-8")
+    diff = {"changed": True, "streams": {}, "metrics_changed": False}
+    service = RunObservabilityService()
+    strict_replay_mock = AsyncMock(
+        return_value={"success": True, "written": False, "reason": "DRY_RUN", "source": "io_chunks", "diff": diff}
+    )
+    monkeypatch.setattr(service, "_strict_replay_attempt", strict_replay_mock)
+
+    payload = await service.rebuild_protocol_history(run_dir=run_dir, request_id="req-rebuild-dry", dry_run=True)
+
+    assert payload["dry_run"] is True
+    assert payload["backup_dir"] is None
+    assert payload["attempts"][0]["diff"] == diff
+    assert strict_replay_mock.await_args.kwargs["dry_run"] is True
+    assert not (audit_dir / "rebuild_backups").exists()
+    assert (audit_dir / "events.1.jsonl").read_text(encoding="utf-8") == '{"legacy":"old"}\n'
+
+
+
+@pytest.mark.asyncio
+async def test_rebuild_protocol_history_regenerates_persisted_chat_index(monkeypatch, tmp_path: Path) -> None:
+    run_dir = tmp_path / "run-rebuild-chat"
+    audit_dir = _audit_dir(run_dir)
+    fcmp_path = audit_dir / "fcmp_events.1.jsonl"
+
+    def _write_fcmp(text: str) -> None:
+        write_jsonl(
+            fcmp_path,
+            [
+                make_fcmp_event(
+                    run_id=run_dir.name,
+                    seq=1,
+                    engine="codex",
+                    type_name="assistant.message.final",
+                    data={"message_id": "m-1", "text": text},
+                    attempt_number=1,
+                ).model_dump(mode="json")
+            ],
+        )
+
+    _write_fcmp("stale reply")
+    _patch_protocol_defaults(
+        monkeypatch,
+        run_dir=run_dir,
+        request_id="req-rebuild-chat",
+        run_id=run_dir.name,
+        status="succeeded",
+    )
+    service = RunObservabilityService()
+    before = await service.list_chat_history(run_dir=run_dir, request_id="req-rebuild-chat")
+    assert "stale reply" in json.dumps(before)
+    assert (audit_dir / "chat_replay.jsonl").exists()
+
+    async def _strict_replay(**_kwargs):
+        _write_fcmp("rebuilt reply")
+        return {"success": True, "written": True, "reason": "OK", "source": "io_chunks"}
+
+    monkeypatch.setattr(service, "_strict_replay_attempt", _strict_replay)
+    payload = await service.rebuild_protocol_history(run_dir=run_dir, request_id="req-rebuild-chat")
+
+    after = await service.list_chat_history(run_dir=run_dir, request_id="req-rebuild-chat")
+    assert "rebuilt reply" in json.dumps(after)
+    assert "stale reply" not in json.dumps(after)
+    assert (Path(payload["backup_dir"]) / "chat_replay.jsonl").exists()
+
+def test_protocol_replay_diff_ignores_sequence_fields(tmp_path: Path) -> None:
+    paths = {
+        "events": tmp_path / "events.1.jsonl",
+        "fcmp": tmp_path / "fcmp_events.1.jsonl",
+        "diagnostics": tmp_path / "parser_diagnostics.1.jsonl",
+        "metrics": tmp_path / "protocol_metrics.1.json",
+    }
+    paths["events"].write_text(
+        '{"seq": 7, "type": "a"}\n{"seq": 8, "type": "b"}\n',
+        encoding="utf-8",
+    )
+    paths["fcmp"].write_text('{"seq": 3, "meta": {"local_seq": 1}, "type": "x"}\n', encoding="utf-8")
+    paths["metrics"].write_text('{"events": 2}', encoding="utf-8")
+    service = RunObservabilityService()
+
+    same = service._protocol_replay_diff(
+        paths=paths,
+        rasp_rows=[{"seq": 1, "type": "a"}, {"seq": 2, "type": "b"}],
+        fcmp_rows=[{"seq": 1, "meta": {"local_seq": 9}, "type": "x"}],
+        diagnostics_rows=[],
+        metrics_payload={"events": 2},
+    )
+    assert same["changed"] is False
+
+    changed = service._protocol_replay_diff(
+        paths=paths,
+        rasp_rows=[{"seq": 1, "type": "a"}, {"seq": 2, "type": "c"}, {"seq": 3, "type": "d"}],
+        fcmp_rows=[{"seq": 1, "meta": {"local_seq": 1}, "type": "x"}],
+        diagnostics_rows=[],
+        metrics_payload={"events": 3},
+    )
+    assert changed["changed"] is True
+    assert changed["metrics_changed"] is True
+    assert changed["streams"]["events"] == {
+        "stored": 2,
+        "rebuilt": 3,
+        "changed_rows": 2,
+        "first_changed_index": 1,
+    }
+    assert changed["streams"]["fcmp"]["changed_rows"] == 0
+
+
 def test_load_io_chunks_for_strict_replay_uses_incremental_utf8_decoding(tmp_path: Path) -> None:
     io_chunks_path = tmp_path / "io_chunks.1.jsonl"
     payload_parts = [b"prefix-\xff-", b"\xe7", b"\x9a\x84-suffix\n"]
@@ -2128,3 +2248,40 @@ async def test_list_timeline_history_reuses_cache_when_audit_signature_unchanged
     assert calls["count"] == 3
     assert first["events"] == second["events"]
     assert second["source"] == "cached"
+
+
+@pytest.mark.asyncio
+async def test_chat_history_backfills_terminal_runs_once(monkeypatch, tmp_path: Path) -> None:
+    run_dir = tmp_path / "run-chat-backfill"
+    audit_dir = _audit_dir(run_dir)
+    write_jsonl(
+        audit_dir / "fcmp_events.1.jsonl",
+        [
+            make_fcmp_event(
+                run_id=run_dir.name,
+                seq=seq,
+                engine="codex",
+                type_name="assistant.message.final",
+                data={"message_id": f"m-{seq}", "text": f"reply {seq}"},
+                attempt_number=1,
+            ).model_dump(mode="json")
+            for seq in range(1, 4)
+        ],
+    )
+    _patch_protocol_defaults(
+        monkeypatch,
+        run_dir=run_dir,
+        request_id="req-chat-backfill",
+        run_id=run_dir.name,
+        status="succeeded",
+    )
+    service = RunObservabilityService()
+
+    derived = await service.list_chat_history(run_dir=run_dir, request_id="req-chat-backfill")
+    assert [row["seq"] for row in derived] == [1, 2, 3]
+    assert (audit_dir / "chat_replay.jsonl").exists()
+    assert (audit_dir / "chat_replay.idx").stat().st_size == 3 * 16
+
+    monkeypatch.setattr(service, "_derive_chat_history_from_fcmp_audit", AsyncMock(side_effect=AssertionError))
+    tail = await service.list_chat_history(run_dir=run_dir, request_id="req-chat-backfill", from_seq=2)
+    assert tail == derived[1:]
@@ -0,0 +1,217 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from server.services.orchestration import run_protocol_reindex_service as reindex_module
+from server.services.orchestration.run_protocol_reindex_service import (
+    PROGRESS_FILE_NAME,
+    ProtocolReindexBusyError,
+    ProtocolReindexOptions,
+    ProtocolReindexValidationError,
+    RunProtocolReindexService,
+)
+
+
+def _options(**overrides) -> ProtocolReindexOptions:
+    values = {"workers": 0, "max_runs_per_sec": 0.0, "worker_nice": 0}
+    values.update(overrides)
+    return ProtocolReindexOptions(**values)
+
+
+def _patch_runs(monkeypatch, outcomes: dict[str, bool]) -> list[str]:
+    calls: list[str] = []
+
+    async def _fake_reindex(request_id: str, *, dry_run: bool):
+        calls.append(request_id)
+        success = outcomes[request_id]
+        result = reindex_module._run_result(
+            request_id,
+            run_id=f"run-{request_id}",
+            success=success,
+            reason="OK" if success else "STRICT_REPLAY_FAILED",
+        )
+        if dry_run:
+            result["changed"] = request_id.endswith("changed")
+            result["diff"] = {}
+        return result
+
+    monkeypatch.setattr(reindex_module, "reindex_single_run", _fake_reindex)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_select_request_ids_pages_terminal_runs_and_filters_engine(monkeypatch, tmp_path: Path):
+    rows = [
+        {"request_id": "r1", "run_status": "succeeded", "engine": "codex"},
+        {"request_id": "r2", "run_status": "running", "engine": "codex"},
+        {"request_id": "r3", "run_status": "failed", "engine": "gemini"},
+        {"request_id": "r4", "run_status": "canceled", "engine": "codex"},
+        {"request_id": "r5", "run_status": "succeeded", "engine": "gemini"},
+    ]
+    seen_filters = []
+
+    async def _list_keyset(*, limit, cursor=None, filters=None):
+        seen_filters.append(filters)
+        matching = [
+            row
+            for row in rows
+            if row["run_status"] in filters.statuses and filters.engine in (None, row["engine"])
+        ]
+        offset = int(cursor or 0)
+        page = matching[offset : offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(matching) else None
+        return {"rows": page, "next_cursor": next_cursor}
+
+    monkeypatch.setattr(reindex_module.run_store, "list_requests_with_runs_keyset", _list_keyset)
+    monkeypatch.setattr(reindex_module, "_SELECT_PAGE_SIZE", 1)
+    service = RunProtocolReindexService(root_dir=tmp_path)
+
+    assert await service.select_request_ids(_options(engines=("codex",))) == ["r1", "r4"]
+    assert {f.engine for f in seen_filters} == {"codex"}
+    assert "running" not in seen_filters[0].statuses
+    seen_filters.clear()
+    assert await service.select_request_ids(_options(limit=2)) == ["r1", "r3"]
+    # The walk stops as soon as the limit is reached instead of paging every run.
+    assert len(seen_filters) == 2
+    assert await service.select_request_ids(_options(request_ids=("x", "y", "x"))) == ["x", "y"]
+
+
+@pytest.mark.asyncio
+async def test_run_job_records_progress_and_resumes_only_unfinished_runs(monkeypatch, tmp_path: Path):
+    outcomes = {"a": True, "b": False, "c": True}
+    calls = _patch_runs(monkeypatch, outcomes)
+    service = RunProtocolReindexService(root_dir=tmp_path)
+    seen: list[str] = []
+
+    state = await service.run_job(
+        _options(request_ids=("a", "b", "c")),
+        job_id="job-1",
+        on_progress=lambda result, _state: seen.append(result["request_id"]),
+    )
+
+    assert state["status"] == "failed"
+    assert (state["total"], state["done"], state["succeeded"], state["failed"]) == (3, 3, 2, 1)
+    assert seen == ["a", "b", "c"]
+    assert [row["request_id"] for row in service.read_progress("job-1")] == ["a", "b", "c"]
+    assert service.get_job("job-1")["status"] == "failed"
+
+    # Resuming keeps the original targets and replays only the failed run.
+    outcomes["b"] = True
+    calls.clear()
+    state = await service.run_job(_options(request_ids=("ignored",)), job_id="job-1")
+
+    assert calls == ["b"]
+    assert state["status"] == "succeeded"
+    assert state["resumed_from"] == 2
+    assert (state["total"], state["succeeded"], state["failed"]) == (3, 3, 0)
+
+
+@pytest.mark.asyncio
+async def test_read_progress_tolerates_torn_last_line(tmp_path: Path):
+    service = RunProtocolReindexService(root_dir=tmp_path)
+    job_dir = service.job_dir("job-torn")
+    job_dir.mkdir(parents=True)
+    (job_dir / PROGRESS_FILE_NAME).write_text(
+        json.dumps({"request_id": "a", "success": True}) + '\n{"request_id": "b", "succ',
+        encoding="utf-8",
+    )
+
+    assert [row["request_id"] for row in service.read_progress("job-torn")] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_counts_changed_runs(monkeypatch, tmp_path: Path):
+    _patch_runs(monkeypatch, {"same": True, "is-changed": True})
+    service = RunProtocolReindexService(root_dir=tmp_path)
+
+    state = await service.run_job(_options(request_ids=("same", "is-changed"), dry_run=True), job_id="job-dry")
+
+    assert state["status"] == "succeeded"
+    assert state["changed"] == 1
+    assert state["options"]["dry_run"] is True
+
+
+@pytest.mark.asyncio
+async def test_second_job_is_busy_and_cancel_stops_running_job(monkeypatch, tmp_path: Path):
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def _slow_reindex(request_id: str, *, dry_run: bool):
+        started.set()
+        await release.wait()
+        return reindex_module._run_result(request_id, success=True, reason="OK")
+
+    monkeypatch.setattr(reindex_module, "reindex_single_run", _slow_reindex)
+    service = RunProtocolReindexService(root_dir=tmp_path)
+    task = asyncio.create_task(service.run_job(_options(request_ids=("a", "b", "c")), job_id="job-busy"))
+    await started.wait()
+
+    with pytest.raises(ProtocolReindexBusyError):
+        await service.run_job(_options(request_ids=("z",)), job_id="job-other")
+    assert service.request_cancel("job-other") is False
+    assert service.request_cancel("job-busy") is True
+    release.set()
+    state = await task
+
+    assert state["status"] == "canceled"
+    assert state["done"] == 1
+    assert service.request_cancel("job-busy") is False
+
+
+@pytest.mark.asyncio
+async def test_running_job_blocks_other_workers_sharing_the_job_root(monkeypatch, tmp_path: Path):
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def _slow_reindex(request_id: str, *, dry_run: bool):
+        started.set()
+        await release.wait()
+        return reindex_module._run_result(request_id, success=True, reason="OK")
+
+    monkeypatch.setattr(reindex_module, "reindex_single_run", _slow_reindex)
+    first = RunProtocolReindexService(root_dir=tmp_path)
+    other_worker = RunProtocolReindexService(root_dir=tmp_path)
+    task = asyncio.create_task(first.run_job(_options(request_ids=("a",)), job_id="job-first"))
+    await started.wait()
+
+    with pytest.raises(ProtocolReindexBusyError, match="job-first"):
+        await other_worker.run_job(_options(request_ids=("z",)), job_id="job-other")
+    release.set()
+    await task
+
+    _patch_runs(monkeypatch, {"z": True})
+    state = await other_worker.run_job(_options(request_ids=("z",)), job_id="job-other")
+    assert state["status"] == "succeeded"
+
+
+@pytest.mark.asyncio
+async def test_job_ids_and_background_workers_are_validated(tmp_path: Path):
+    service = RunProtocolReindexService(root_dir=tmp_path)
+
+    with pytest.raises(ProtocolReindexValidationError):
+        service.job_dir("../escape")
+    with pytest.raises(ProtocolReindexValidationError):
+        await service.start_job(_options(request_ids=("a",)))
+
+
+@pytest.mark.asyncio
+async def test_start_job_keeps_a_reference_to_its_background_task(monkeypatch, tmp_path: Path):
+    service = RunProtocolReindexService(root_dir=tmp_path)
+    release = asyncio.Event()
+    ran: list[str] = []
+
+    async def _fake_run_claimed(job_id: str) -> None:
+        await release.wait()
+        ran.append(job_id)
+
+    monkeypatch.setattr(service, "_run_claimed", _fake_run_claimed)
+    job_id = await service.start_job(_options(request_ids=("a",), workers=1), job_id="job-bg")
+
+    assert len(service._job_tasks) == 1
+    release.set()
+    await asyncio.gather(*service._job_tasks)
+    await asyncio.sleep(0)
+    assert ran == [job_id]
+    assert not service._job_tasks
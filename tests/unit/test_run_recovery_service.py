@@ -127,6 +127,36 @@ async def test_redrive_resume_ticket_existing_run_dir_schedules_resume_once(tmp_
     )
 
 
+@pytest.mark.asyncio
+async def test_recover_queued_run_preserves_durable_dispatch_queue_entry():
+    backend = SimpleNamespace(
+        get_resume_ticket=AsyncMock(return_value=None),
+        set_recovery_info=AsyncMock(),
+    )
+    mark_restart_reconciled_failed = AsyncMock()
+
+    service = RunRecoveryService()
+    await service.recover_single_incomplete_run(
+        record={
+            "request_id": "req-1",
+            "run_id": "run-1",
+            "run_status": RunStatus.QUEUED.value,
+            "engine": "codex",
+            "dispatch_queue_state": "claimed",
+        },
+        run_store_backend=backend,
+        is_valid_session_handle=lambda _handle: False,
+        mark_restart_reconciled_failed=mark_restart_reconciled_failed,
+    )
+
+    mark_restart_reconciled_failed.assert_not_awaited()
+    backend.set_recovery_info.assert_awaited_once_with(
+        "run-1",
+        recovery_state="recovered_waiting",
+        recovery_reason="dispatch_queue_preserved",
+    )
+
+
 @pytest.mark.asyncio
 async def test_redrive_resume_ticket_missing_run_dir_reconciles_failed(tmp_path: Path):
     run_dir = tmp_path / "missing-run-1"
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from server.config import config
+from server.models import RunStatus
+from server.services.orchestration.run_result_cache_service import (
+    RunResultCachePolicy,
+    RunResultCacheService,
+)
+from server.services.orchestration.run_store import RunStore
+
+
+async def _create_cached_run(
+    service: RunResultCacheService,
+    store: RunStore,
+    run_id: str,
+    *,
+    size: int,
+    workspace_dir: Path | None = None,
+) -> Path:
+    run_dir = workspace_dir or Path(config.SYSTEM.WORKSPACES_DIR) / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / f"{run_id}.bin").write_bytes(b"x" * size)
+    await store.create_run(run_id, f"key-{run_id}", RunStatus.SUCCEEDED.value, workspace_dir=str(run_dir))
+    await service.record_entry(cache_key=f"key-{run_id}", run_id=run_id, run_dir=run_dir)
+    return run_dir
+
+
+async def _set_last_hit(store: RunStore, cache_key: str, when: datetime) -> None:
+    async with store._cache_database.connect() as conn:
+        await conn.execute(
+            "UPDATE cache_entries SET last_hit_at = ? WHERE cache_key = ?",
+            (when.isoformat(), cache_key),
+        )
+        await conn.commit()
+
+
+@pytest.mark.asyncio
+async def test_record_entry_tracks_size_and_hits(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    service = RunResultCacheService(run_store_backend=store, policy=RunResultCachePolicy())
+    await _create_cached_run(service, store, "run-1", size=300)
+
+    assert await service.lookup("key-run-1", "installed") == "run-1"
+    await service.record_hit("key-run-1")
+    assert await service.lookup("key-missing", "installed") is None
+
+    entries = await store.list_cache_entries_lru()
+    assert entries[0]["size_bytes"] == 300
+    assert entries[0]["hit_count"] == 1
+    state = await service.state()
+    assert state["entries"] == 1
+    assert state["total_bytes"] == 300
+    assert (state["hits"], state["misses"], state["stale"]) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_stale_lookup_drops_entry(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    service = RunResultCacheService(run_store_backend=store, policy=RunResultCachePolicy())
+    await store.record_cache_entry("key-gone", "run-gone")
+
+    await service.record_stale("key-gone")
+
+    assert await store.get_cached_run("key-gone") is None
+    assert (await service.state())["stale"] == 1
+
+
+@pytest.mark.asyncio
+async def test_enforce_limits_evicts_least_recently_hit_and_reclaims_run(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    service = RunResultCacheService(
+        run_store_backend=store,
+        policy=RunResultCachePolicy(max_bytes=250),
+    )
+    old_dir = await _create_cached_run(service, store, "run-old", size=100)
+    mid_dir = await _create_cached_run(service, store, "run-mid", size=100)
+    new_dir = await _create_cached_run(service, store, "run-new", size=100)
+    now = datetime.utcnow()
+    await _set_last_hit(store, "key-run-old", now - timedelta(minutes=5))
+    await _set_last_hit(store, "key-run-mid", now - timedelta(minutes=10))
+    await _set_last_hit(store, "key-run-new", now)
+
+    result = await service.enforce_limits()
+
+    assert result == {"entries": 1, "runs": 1, "bytes": 100}
+    assert await store.get_cached_run("key-run-mid") is None
+    assert await store.get_run("run-mid") is None
+    assert not mid_dir.exists()
+    assert old_dir.exists() and new_dir.exists()
+    assert (await service.state())["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_evicting_an_entry_leaves_the_same_key_in_the_other_cache(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    service = RunResultCacheService(run_store_backend=store, policy=RunResultCachePolicy(ttl_hours=1))
+    await _create_cached_run(service, store, "run-a", size=10)
+    await store.record_temp_cache_entry("key-run-a", "run-a")
+    await _set_last_hit(store, "key-run-a", datetime.utcnow() - timedelta(hours=2))
+
+    result = await service.enforce_limits()
+
+    assert result["entries"] == 1
+    assert await store.get_cached_run("key-run-a") is None
+    assert await store.get_temp_cached_run("key-run-a") == "run-a"
+
+
+@pytest.mark.asyncio
+async def test_enforce_limits_drops_expired_entries_but_keeps_shared_workspace(tmp_path: Path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    service = RunResultCacheService(
+        run_store_backend=store,
+        policy=RunResultCachePolicy(ttl_hours=1),
+    )
+    shared_dir = Path(config.SYSTEM.WORKSPACES_DIR) / "shared"
+    await _create_cached_run(service, store, "run-a", size=10, workspace_dir=shared_dir)
+    await store.create_run("run-b", None, RunStatus.SUCCEEDED.value, workspace_dir=str(shared_dir))
+    await _set_last_hit(store, "key-run-a", datetime.utcnow() - timedelta(hours=2))
+
+    result = await service.enforce_limits()
+
+    assert result["entries"] == 1
+    assert await store.get_run("run-a") is None
+    assert shared_dir.exists()
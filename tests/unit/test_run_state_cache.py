@@ -0,0 +1,135 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from server.models import RunStatus
+from server.services.orchestration.run_state_cache import RunStateCache
+from server.services.orchestration.run_store import RunStore
+
+
+def _state(status: str, *, request_id: str = "req-1", run_id: str = "run-1") -> dict:
+    return {
+        "request_id": request_id,
+        "run_id": run_id,
+        "status": status,
+        "current_attempt": 1,
+        "pending": {},
+        "resume": {},
+        "runtime": {},
+        "warnings": [],
+        "updated_at": "2026-04-16T00:00:00",
+    }
+
+
+def test_run_state_cache_is_bounded_lru_and_returns_copies():
+    cache = RunStateCache(max_entries=2)
+    cache.put("a", {"status": "queued"})
+    cache.put("b", {"status": "queued"})
+    assert cache.get("a") == {"status": "queued"}
+    cache.put("c", {"status": "running"})
+
+    assert cache.get("b") is None
+    assert cache.version("b") == 0
+    copy = cache.get("a")
+    copy["status"] = "mutated"
+    assert cache.get("a") == {"status": "queued"}
+    # A cold-miss fill never clobbers a fresher write-through entry.
+    cache.prime("c", {"status": "stale"}, since=cache.change_token())
+    assert cache.get("c") == {"status": "running"}
+
+    # Nor does one whose database read started before the entry was evicted.
+    since = cache.change_token()
+    cache.evict("c")
+    cache.prime("c", {"status": "stale"}, since=since)
+    assert cache.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_run_state_cache_wakes_waiters_on_change():
+    cache = RunStateCache()
+    version = cache.put("req-1", {"status": "queued"})
+
+    assert await cache.wait_for_change("req-1", since=version, timeout=0.01) == version
+    waiter = asyncio.create_task(cache.wait_for_change("req-1", since=version, timeout=5.0))
+    await asyncio.sleep(0)
+    new_version = cache.put("req-1", {"status": "running"})
+
+    assert await asyncio.wait_for(waiter, timeout=1.0) == new_version
+    assert await cache.wait_for_change("req-1", since=version, timeout=5.0) == new_version
+    assert cache.stats()["waiting_requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_run_store_serves_run_state_from_cache_and_invalidates(tmp_path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await store.set_run_state("req-1", _state(RunStatus.RUNNING.value))
+    state_db = tmp_path / "run_state.db"
+
+    # Reads are served from memory once written: an out-of-band DB edit is not observed.
+    with sqlite3.connect(state_db) as conn:
+        conn.execute("DELETE FROM request_run_state")
+    assert (await store.get_run_state("req-1"))["status"] == RunStatus.RUNNING.value
+    projection = await store.get_current_projection("req-1")
+    assert projection is not None and projection["status"] == RunStatus.RUNNING.value
+
+    await store.clear_run_state("req-1")
+    assert await store.run_state_version("req-1") == 0
+    assert await store.get_run_state("req-1") is None
+
+    # A cold miss reads SQLite once and primes the cache.
+    fresh = RunStore(db_path=tmp_path / "runs.db")
+    await store.set_run_state("req-2", _state(RunStatus.WAITING_USER.value, request_id="req-2"))
+    assert (await fresh.get_run_state("req-2"))["status"] == RunStatus.WAITING_USER.value
+    assert (await fresh.run_state_cache_stats())["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_store_warm_loads_only_active_run_states(tmp_path):
+    writer = RunStore(db_path=tmp_path / "runs.db")
+    await writer.set_run_state("req-active", _state(RunStatus.WAITING_AUTH.value, request_id="req-active"))
+    await writer.set_run_state(
+        "req-done",
+        _state(RunStatus.SUCCEEDED.value, request_id="req-done", run_id="run-2"),
+    )
+
+    restarted = RunStore(db_path=tmp_path / "runs.db")
+    assert await restarted.warm_run_state_cache() == 1
+    assert await restarted.run_state_version("req-active") > 0
+    assert await restarted.run_state_version("req-done") == 0
+
+    waiter = asyncio.create_task(
+        restarted.wait_for_run_state_change(
+            "req-active",
+            since=await restarted.run_state_version("req-active"),
+            timeout=5.0,
+        )
+    )
+    await asyncio.sleep(0)
+    await restarted.set_run_state("req-active", _state(RunStatus.RUNNING.value, request_id="req-active"))
+    assert await asyncio.wait_for(waiter, timeout=1.0) == await restarted.run_state_version("req-active")
+
+    await restarted.clear_all()
+    assert (await restarted.run_state_cache_stats())["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_run_store_warm_up_skips_states_cleared_during_the_read(tmp_path):
+    writer = RunStore(db_path=tmp_path / "runs.db")
+    await writer.set_run_state("req-active", _state(RunStatus.RUNNING.value, request_id="req-active"))
+    await writer.set_run_state("req-other", _state(RunStatus.QUEUED.value, request_id="req-other", run_id="run-2"))
+
+    restarted = RunStore(db_path=tmp_path / "runs.db")
+    list_active = restarted._projection_state_store.list_active_run_states
+
+    async def _list_then_clear(limit):
+        states = await list_active(limit)
+        # The run finishes between the warm-up read and the cache fill.
+        await restarted.clear_run_state("req-active")
+        return states
+
+    restarted._projection_state_store.list_active_run_states = _list_then_clear
+    assert await restarted.warm_run_state_cache() == 2
+
+    assert await restarted.get_run_state("req-active") is None
+    assert (await restarted.get_run_state("req-other"))["status"] == RunStatus.QUEUED.value
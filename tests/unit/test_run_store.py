@@ -139,3 +139,170 @@ async def test_get_pending_interaction_ignores_invalid_legacy_payload(tmp_path):
         )
         await conn.commit()
     assert await store.get_pending_interaction("req-legacy") is None
+
+
+async def _seed_listed_run(
+    store: RunStore,
+    request_id: str,
+    *,
+    created_at: str,
+    status: str = "succeeded",
+    skill_id: str = "skill",
+    engine: str = "codex",
+    engine_options: dict | None = None,
+) -> None:
+    await store.create_request(
+        request_id=request_id,
+        skill_id=skill_id,
+        engine=engine,
+        parameter={},
+        engine_options=engine_options or {},
+        runtime_options={},
+    )
+    await store.create_run(f"run-{request_id}", None, status)
+    await store.update_request_run_id(request_id, f"run-{request_id}")
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("UPDATE requests SET created_at = ? WHERE request_id = ?", (created_at, request_id))
+
+
+@pytest.mark.asyncio
+async def test_keyset_listing_visits_every_run_once_in_created_order(tmp_path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    # Equal timestamps are ordered by request_id.
+    stamps = ["2026-03-01T00:00:00", "2026-03-02T00:00:00", "2026-03-02T00:00:00", "2026-03-03T00:00:00.5"]
+    for index, stamp in enumerate(stamps * 2):
+        await _seed_listed_run(store, f"req-{index}", created_at=stamp)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = await store.list_requests_with_runs_keyset(limit=3, cursor=cursor)
+        seen.extend(row["request_id"] for row in page["rows"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = [
+        row["request_id"]
+        for row in sorted(
+            await store.list_requests_with_runs_page(page=1, page_size=100),
+            key=lambda row: (row["request_created_at"], row["request_id"]),
+            reverse=True,
+        )
+    ]
+    assert seen == expected
+    assert len(set(seen)) == 8
+    with pytest.raises(ValueError):
+        await store.list_requests_with_runs_keyset(limit=3, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_offset_pages_continue_the_keyset_first_page(tmp_path):
+    store = RunStore(db_path=tmp_path / "runs.db")
+    for index in range(6):
+        await _seed_listed_run(store, f"req-{index}", created_at="2026-03-02T00:00:00")
+
+    first = await store.list_requests_with_runs_keyset(limit=2)
+    seen = [row["request_id"] for row in first["rows"]]
+    for page in (2, 3):
+        seen.extend(
+            row["request_id"] for row in await store.list_requests_with_runs_page(page=page, page_size=2)
+        )
+
+    assert seen == [f"req-{index}" for index in reversed(range(6))]
+
+
+@pytest.mark.asyncio
+async def test_keyset_listing_filters_status_engine_model_and_dates(tmp_path):
+    from datetime import datetime, timezone
+
+    from server.services.orchestration.run_store_request_store import RunListFilters
+
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _seed_listed_run(store, "a", created_at="2026-03-01T10:00:00", status="failed", engine_options={"model": "gpt-5"})
+    await _seed_listed_run(store, "b", created_at="2026-03-02T10:00:00", status="failed", engine="gemini")
+    await _seed_listed_run(store, "c", created_at="2026-03-03T10:00:00", status="succeeded", engine_options={"model_id": "gpt-5"})
+    await store.update_request_engine_options("b", {"model": "gemini-pro"})
+
+    async def _ids(**kwargs) -> list[str]:
+        filters = RunListFilters(**kwargs)
+        page = await store.list_requests_with_runs_keyset(limit=10, filters=filters)
+        assert await store.count_requests_with_runs_filtered(filters) == len(page["rows"])
+        return [row["request_id"] for row in page["rows"]]
+
+    assert await _ids(statuses=("failed",)) == ["b", "a"]
+    assert await _ids(statuses=("failed",), engine="codex") == ["a"]
+    assert await _ids(model="gpt-5") == ["c", "a"]
+    assert await _ids(model="gemini-pro") == ["b"]
+    assert await _ids(
+        created_from=datetime(2026, 3, 2, tzinfo=timezone.utc),
+        created_to=datetime(2026, 3, 3),
+    ) == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_keyset_listing_text_search_covers_skill_error_and_final_message(tmp_path):
+    from server.services.orchestration.run_store_request_store import RunListFilters
+
+    store = RunStore(db_path=tmp_path / "runs.db")
+    await _seed_listed_run(store, "req-lit", created_at="2026-03-01T00:00:00", skill_id="literature-digest")
+    await _seed_listed_run(store, "req-err", created_at="2026-03-02T00:00:00", status="failed")
+    await _seed_listed_run(store, "req-msg", created_at="2026-03-03T00:00:00")
+    await store.update_run_search_text("req-err", error_summary="AUTH_REQUIRED 401 Unauthorized: token expired")
+    await store.update_run_search_text("req-msg", final_message="已生成文献摘要 50%_done")
+
+    async def _search(text: str) -> list[str]:
+        page = await store.list_requests_with_runs_keyset(limit=10, filters=RunListFilters(text=text))
+        return [row["request_id"] for row in page["rows"]]
+
+    assert store._database.run_search_fts_enabled is True
+    assert await _search("digest") == ["req-lit"]
+    assert await _search("unauthorized TOKEN") == ["req-err"]
+    assert await _search("文献摘要") == ["req-msg"]
+    # Terms shorter than a trigram and LIKE wildcards fall back to escaped LIKE.
+    assert await _search("50%_") == ["req-msg"]
+    assert await _search("%") == ["req-msg"]
+    assert await _search("req-lit") == ["req-lit"]
+    assert await _search("token missing") == []
+
+    await store.update_run_search_text("req-err", error_summary="")
+    assert await _search("unauthorized") == []
+    await store.delete_run_records("run-req-lit")
+    assert await _search("digest") == []
+
+
+@pytest.mark.asyncio
+async def test_run_store_backfills_model_and_search_documents_for_legacy_requests(tmp_path):
+    from server.services.orchestration.run_store_request_store import RunListFilters
+
+    db_path = tmp_path / "runs.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE requests (
+                request_id TEXT PRIMARY KEY, skill_id TEXT NOT NULL, engine TEXT NOT NULL,
+                parameter_json TEXT NOT NULL, engine_options_json TEXT NOT NULL,
+                runtime_options_json TEXT NOT NULL, run_id TEXT, status TEXT, created_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE runs (
+                run_id TEXT PRIMARY KEY, cache_key TEXT, status TEXT, result_path TEXT,
+                artifacts_manifest_path TEXT, created_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO requests VALUES ('old-1', 'legacy-skill', 'codex', '{}', '{\"model\": \"o3\"}', '{}', 'run-old', 'created', '2025-01-01T00:00:00')"
+        )
+        conn.execute("INSERT INTO runs VALUES ('run-old', NULL, 'succeeded', '', '', '2025-01-01T00:00:00')")
+
+    store = RunStore(db_path=db_path)
+    page = await store.list_requests_with_runs_keyset(
+        limit=10,
+        filters=RunListFilters(model="o3", text="legacy"),
+    )
+
+    assert [row["request_id"] for row in page["rows"]] == ["old-1"]
@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock
 import pytest
 
 fastapi = pytest.importorskip("fastapi")
-from fastapi import BackgroundTasks, UploadFile, HTTPException
+from fastapi import BackgroundTasks, UploadFile, HTTPException, Response
 
 from server.config import config
 from server.models import RequestSkillSource, RunCreateRequest, RunStatus, SkillManifest
@@ -204,6 +204,15 @@ def _patch_run_store(monkeypatch: pytest.MonkeyPatch, store: RunStore) -> None:
     monkeypatch.setattr("server.runtime.observability.run_source_adapter.run_store", store)
 
 
+async def _dispatched_options(store: RunStore, request_id: str) -> dict[str, Any]:
+    request_record = await store.get_request(request_id)
+    assert request_record is not None
+    entry = await store.get_dispatch_queue_entry(request_record["run_id"])
+    assert entry is not None
+    assert entry["state"] == "queued"
+    return entry["options"]
+
+
 def _manifest_hash_for_content(tmp_path: Path, filename: str, content: str) -> str:
     uploads_dir = tmp_path / "uploads"
     uploads_dir.mkdir()
@@ -326,7 +335,7 @@ async def _assert_cached_request_routes(
     assert state["status"] == RunStatus.SUCCEEDED.value
     assert projection["status"] == RunStatus.SUCCEEDED.value
 
-    result_response = await jobs_router.get_run_result(request_id)
+    result_response = await jobs_router.get_run_result(request_id, Response())
     assert result_response.request_id == request_id
     assert result_response.result["data"] == {"ok": True}
 
@@ -460,7 +469,7 @@ async def test_create_run_cache_hit_without_input(monkeypatch, temp_config_dirs)
 
     assert response.cache_hit is True
     assert response.status == RunStatus.SUCCEEDED
-    assert background_tasks.tasks == []
+    assert await store.count_queued_dispatches() == 0
 
     await _assert_cached_request_routes(
         store,
@@ -510,7 +519,7 @@ async def test_create_run_stale_cache_entry_falls_back_to_cache_miss(monkeypatch
 
     assert response.cache_hit is False
     assert response.status == RunStatus.QUEUED
-    assert len(background_tasks.tasks) == 1
+    await _dispatched_options(store, response.request_id)
 
     request_record = await store.get_request(response.request_id)
     assert request_record is not None
@@ -571,7 +580,7 @@ async def test_create_run_cache_miss_without_input(monkeypatch, temp_config_dirs
 
     assert response.cache_hit is False
     assert response.status == RunStatus.QUEUED
-    assert len(background_tasks.tasks) == 1
+    await _dispatched_options(store, response.request_id)
 
     request_record = await store.get_request(response.request_id)
     assert request_record is not None
@@ -584,6 +593,50 @@ async def test_create_run_cache_miss_without_input(monkeypatch, temp_config_dirs
     assert Path(str(request_record["workspace_dir"])).exists()
 
 
+@pytest.mark.asyncio
+async def test_create_run_clamps_high_dispatch_priority_from_public_callers(monkeypatch, temp_config_dirs):
+    store = RunStore(db_path=Path(config.SYSTEM.RUNS_DB))
+    monkeypatch.setattr(jobs_router, "run_store", store)
+
+    skill = _create_skill(temp_config_dirs, "demo-skill", with_input_schema=False)
+    _patch_skill_registry(monkeypatch, skill)
+    monkeypatch.setattr(
+        jobs_router.model_registry,
+        "validate_model",
+        lambda engine, model: {"model": model}
+    )
+
+    response = await jobs_router.create_run(
+        RunCreateRequest(
+            skill_id=skill.id,
+            engine="codex",
+            parameter={"a": 1},
+            model="gpt-5.4-mini",
+            client_metadata={"dispatch_priority": "high"},
+        ),
+        BackgroundTasks(),
+    )
+
+    request_record = await store.get_request(response.request_id)
+    assert request_record is not None
+    assert request_record["client_metadata"]["dispatch_priority"] == "normal"
+
+
+def test_dispatch_priority_high_is_kept_for_ui_basic_auth_callers(monkeypatch):
+    monkeypatch.setattr(jobs_router, "is_ui_basic_auth_enabled", lambda: True)
+    monkeypatch.setattr(jobs_router, "verify_ui_basic_auth_header", lambda header: header == "Basic ok")
+
+    assert jobs_router._clamp_dispatch_priority(
+        {"dispatch_priority": "high"}, authorization="Basic ok"
+    ) == {"dispatch_priority": "high"}
+    assert jobs_router._clamp_dispatch_priority(
+        {"dispatch_priority": "high"}, authorization="Basic bad"
+    ) == {"dispatch_priority": "normal"}
+    assert jobs_router._clamp_dispatch_priority(
+        {"dispatch_priority": "low"}, authorization=None
+    ) == {"dispatch_priority": "low"}
+
+
 @pytest.mark.asyncio
 async def test_create_run_runtime_env_is_redacted_and_not_in_cache_key(monkeypatch, temp_config_dirs):
     store = RunStore(db_path=Path(config.SYSTEM.RUNS_DB))
@@ -811,7 +864,7 @@ async def test_create_run_reuses_succeeded_request_workspace(monkeypatch, temp_c
 
     assert response.cache_hit is False
     assert response.status == RunStatus.QUEUED
-    assert len(background_tasks.tasks) == 1
+    await _dispatched_options(store, response.request_id)
 
     request_record = await store.get_request(response.request_id)
     assert request_record is not None
@@ -909,7 +962,7 @@ async def test_create_run_materializes_workspace_file_binding_without_upload(mon
     )
 
     assert response.status == RunStatus.QUEUED
-    assert len(background_tasks.tasks) == 1
+    await _dispatched_options(store, response.request_id)
     request_record = await store.get_request(response.request_id)
     assert request_record is not None
     assert request_record["request_upload_mode"] == "uploaded"
@@ -1215,9 +1268,8 @@ async def test_create_run_applies_skill_runtime_default_options(monkeypatch, tem
         background_tasks,
     )
     assert response.cache_hit is False
-    assert len(background_tasks.tasks) == 1
-    task = background_tasks.tasks[0]
-    assert task.kwargs["options"]["hard_timeout_seconds"] == 45
+    options = await _dispatched_options(store, response.request_id)
+    assert options["hard_timeout_seconds"] == 45
 
     request_record = await store.get_request(response.request_id)
     assert request_record is not None
@@ -1255,8 +1307,8 @@ async def test_create_run_request_runtime_options_override_skill_defaults(monkey
         background_tasks,
     )
     assert response.cache_hit is False
-    task = background_tasks.tasks[0]
-    assert task.kwargs["options"]["hard_timeout_seconds"] == 9
+    options = await _dispatched_options(store, response.request_id)
+    assert options["hard_timeout_seconds"] == 9
 
     request_record = await store.get_request(response.request_id)
     assert request_record is not None
@@ -1294,8 +1346,8 @@ async def test_create_run_invalid_skill_runtime_defaults_emit_warning_payload(mo
         background_tasks,
     )
     assert response.cache_hit is False
-    task = background_tasks.tasks[0]
-    warning_payloads = task.kwargs["options"]["__runtime_option_warnings"]
+    options = await _dispatched_options(store, response.request_id)
+    warning_payloads = options["__runtime_option_warnings"]
     assert isinstance(warning_payloads, list)
     assert warning_payloads
     assert warning_payloads[0]["code"] == "SKILL_RUNTIME_DEFAULT_OPTION_IGNORED"
@@ -1327,7 +1379,7 @@ async def test_create_run_with_input_schema_requires_upload(monkeypatch, temp_co
 
     assert response.cache_hit is False
     assert response.status is None
-    assert background_tasks.tasks == []
+    assert await store.count_queued_dispatches() == 0
 
 
 @pytest.mark.asyncio
@@ -1357,7 +1409,7 @@ async def test_create_run_with_inline_only_input_starts_immediately(monkeypatch,
 
     assert response.cache_hit is False
     assert response.status == RunStatus.QUEUED
-    assert len(background_tasks.tasks) == 1
+    await _dispatched_options(store, response.request_id)
 
 
 @pytest.mark.asyncio
@@ -1616,7 +1668,7 @@ async def test_upload_file_cache_miss(monkeypatch, temp_config_dirs):
     )
 
     assert upload_response.cache_hit is False
-    assert len(upload_tasks.tasks) == 1
+    await _dispatched_options(store, create_response.request_id)
     request_record = await store.get_request(create_response.request_id)
     assert request_record is not None
     run_id = request_record["run_id"]
@@ -1705,7 +1757,7 @@ async def test_upload_temp_skill_creates_run_without_installed_registry_lookup(m
     )
 
     assert upload_response.cache_hit is False
-    assert len(upload_tasks.tasks) == 1
+    await _dispatched_options(store, create_response.request_id)
     request_record = await store.get_request(create_response.request_id)
     assert request_record is not None
     assert request_record["skill_source"] == "temp_upload"
@@ -1758,8 +1810,8 @@ async def test_upload_temp_skill_applies_runtime_default_options(monkeypatch, te
     assert request_record is not None
     assert "hard_timeout_seconds" not in request_record["runtime_options"]
     assert request_record["effective_runtime_options"]["hard_timeout_seconds"] == 66
-    task = upload_tasks.tasks[0]
-    assert task.kwargs["options"]["hard_timeout_seconds"] == 66
+    options = await _dispatched_options(store, create_response.request_id)
+    assert options["hard_timeout_seconds"] == 66
 
 
 @pytest.mark.asyncio
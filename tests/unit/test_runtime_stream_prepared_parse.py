@@ -0,0 +1,185 @@
+from pathlib import Path
+
+import pytest
+
+from server.runtime.observability.fcmp_live_journal import fcmp_live_journal
+from server.runtime.observability.rasp_live_journal import rasp_live_journal
+from server.runtime.protocol.live_publish import (
+    FcmpEventPublisher,
+    LiveRuntimeEmitterImpl,
+    RaspEventPublisher,
+)
+from server.runtime.protocol.parse_utils import (
+    RuntimeStreamLineCollector,
+    collect_json_parse_errors,
+    stream_lines_with_offsets,
+    strip_runtime_script_envelope,
+)
+from server.services.engine_management.engine_adapter_registry import engine_adapter_registry
+from tests.common.protocol_golden_fixture_loader import list_fixture_ids, load_fixture
+from tests.common.workspace_layout_helpers import make_layout
+
+_ENVELOPE_HEAD = 'Script started on 2026-01-01 00:00:00+00:00 [COMMAND="agent run"]\r\n'
+_ENVELOPE_TAIL = '\r\nScript done on 2026-01-01 00:00:09+00:00 [COMMAND_EXIT_CODE="0"]\n'
+
+_TRANSCRIPTS = {
+    "codex": (
+        '{"type":"thread.started","thread_id":"thread-1"}\n'
+        '{"type":"turn.started"}\n'
+        "not json at all\n"
+        '{"type":"item.completed","item":{"id":"i1","type":"reasoning","text":"thinking"}}\r\n'
+        '{"type":"item.completed","item":{"id":"i2","type":"agent_message","text":"héllo ✓"}}\n'
+        "\n"
+        '{"type":"turn.completed","usage":{"input_tokens":3,"output_tokens":5}}\n'
+        '{"type":"item.completed","item":{"type":"agent_message","text":"unterminated"}}'
+    ),
+    "claude": (
+        '{"type":"system","subtype":"init","session_id":"session-claude"}\n'
+        '{"type":"assistant","message":{"content":[{"type":"thinking","thinking":"draft plan"},{"type":"text","text":"héllo"}]}}\r\n'
+        '{"type":"assistant","message":{"content":[{"name":"Bash","input":{"command":"pwd"},"id":"toolu_pwd","type":"tool_use"}]}}\n'
+        "{broken\n"
+        '{"type":"user","message":{"content":[{"type":"tool_result","tool_use_id":"toolu_pwd","content":"/tmp/run","is_error":false}]}}\n'
+        '{"type":"result","subtype":"success","session_id":"session-claude","result":"{\\"ok\\": true}"}\n'
+    ),
+    "qwen": (
+        '{"type":"system","subtype":"init","session_id":"session-qwen"}\n'
+        '{"type":"assistant","message":{"id":"msg-think","content":[{"type":"thinking","thinking":"draft plan"}]}}\n'
+        '{"type":"assistant","message":{"id":"msg-bash","content":[{"type":"tool_use","id":"toolu_bash","name":"run_shell_command","input":{"command":"pwd"}}]}}\r\n'
+        '{"type":"user","message":{"content":[{"type":"tool_result","tool_use_id":"toolu_bash","content":"/tmp/run","is_error":false}]}}\n'
+        "[warn] partial\n"
+        '{"type":"assistant","message":{"id":"msg-final","content":[{"type":"text","text":"{\\"ok\\": true}"}]}}\n'
+        '{"type":"result","subtype":"success","session_id":"session-qwen","result":"{\\"ok\\": true}"}'
+    ),
+    "opencode": (
+        '{"type":"step_start","sessionID":"session-family","part":{"type":"step-start"}}\n'
+        '{"type":"reasoning","sessionID":"session-family","part":{"type":"reasoning","id":"r1","text":"draft plan"}}\n'
+        '{"type":"tool_use","part":{"id":"p1","type":"tool","tool":"bash","state":{"status":"completed","input":{"command":"echo hi"},"output":"hi"}}}\r\n'
+        "oops {\n"
+        '{"type":"text","sessionID":"session-family","part":{"type":"text","text":"final ánswer"}}\n'
+    ),
+}
+_TRANSCRIPTS["kilo"] = _TRANSCRIPTS["opencode"]
+
+
+def _chunks(text: str, size: int) -> list[tuple[str, int, int]]:
+    chunks: list[tuple[str, int, int]] = []
+    offset = 0
+    for start in range(0, len(text), size):
+        piece = text[start : start + size]
+        length = len(piece.encode("utf-8"))
+        chunks.append((piece, offset, offset + length))
+        offset += length
+    return chunks
+
+
+def _captured_run_cases() -> list[tuple[str, str, str, str]]:
+    cases: list[tuple[str, str, str, str]] = []
+    for fixture_id in list_fixture_ids():
+        try:
+            fixture = load_fixture(fixture_id)
+        except RuntimeError:
+            continue
+        if fixture.get("source") != "captured_run" or fixture.get("layer") != "protocol_core":
+            continue
+        for attempt in fixture.get("attempts", []):
+            cases.append(
+                (
+                    str(fixture.get("engine")),
+                    str(attempt.get("stdout") or ""),
+                    str(attempt.get("stderr") or ""),
+                    str(attempt.get("pty_output") or ""),
+                )
+            )
+    return cases
+
+
+def _session_parse(engine: str, *, stdout: str, stderr: str, pty: str, size: int):
+    parser = engine_adapter_registry.require(engine).stream_parser
+    session = parser.start_live_session()
+    for stream, text in (("stderr", stderr), ("stdout", stdout), ("pty", pty)):
+        for piece, byte_from, byte_to in _chunks(text, size):
+            session.feed(stream=stream, text=piece, byte_from=byte_from, byte_to=byte_to)
+    session.finish(exit_code=0, failure_reason=None)
+    expected = parser.parse_runtime_stream(
+        stdout_raw=stdout.encode("utf-8"),
+        stderr_raw=stderr.encode("utf-8"),
+        pty_raw=pty.encode("utf-8"),
+    )
+    return session.runtime_parse_result(), expected
+
+
+@pytest.mark.parametrize("engine", sorted(_TRANSCRIPTS))
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 1 << 20])
+def test_session_parse_result_matches_whole_output_parse(engine: str, size: int) -> None:
+    transcript = _TRANSCRIPTS[engine]
+    parsed, expected = _session_parse(engine, stdout=transcript, stderr="warn: slow\n", pty="", size=size)
+    assert parsed is not None
+    assert parsed == expected
+
+    enveloped = f"{_ENVELOPE_HEAD}{transcript}{_ENVELOPE_TAIL}"
+    parsed, expected = _session_parse(engine, stdout="", stderr="", pty=enveloped, size=size)
+    assert parsed == expected
+
+
+@pytest.mark.parametrize("size", [1, 5, 1 << 20])
+def test_session_parse_result_matches_captured_run_fixtures(size: int) -> None:
+    cases = [case for case in _captured_run_cases() if engine_adapter_registry.get(case[0]) is not None]
+    assert cases
+    for engine, stdout, stderr, pty in cases:
+        parsed, expected = _session_parse(engine, stdout=stdout, stderr=stderr, pty=pty, size=size)
+        if parsed is None:
+            # Engines whose sessions do not accumulate an attempt-end parse.
+            continue
+        assert parsed == expected, engine
+
+
+@pytest.mark.parametrize("size", [1, 3, 1 << 20])
+def test_line_collector_matches_batch_line_functions(size: int) -> None:
+    raw = f"{_ENVELOPE_HEAD}{_TRANSCRIPTS['codex']}\r\n\r{_ENVELOPE_TAIL}".encode("utf-8")
+    collector = RuntimeStreamLineCollector("pty")
+    for start in range(0, len(raw), size):
+        collector.feed(raw[start : start + size])
+    collected = collector.finish()
+
+    records, error_rows = collect_json_parse_errors(
+        strip_runtime_script_envelope(stream_lines_with_offsets("pty", raw))
+    )
+    assert collected.raw == raw
+    assert collected.records == records
+    assert list(collected.error_rows) == error_rows
+
+
+class _NoopMirrorWriter:
+    def enqueue(self, *, run_dir: Path, attempt_number: int, row: dict) -> None:
+        _ = run_dir, attempt_number, row
+
+
+@pytest.mark.asyncio
+async def test_emitter_hands_out_session_parse_only_when_it_covers_the_output(tmp_path: Path) -> None:
+    run_id = "run-prepared-parse"
+    run_dir = tmp_path / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    fcmp_live_journal.clear(run_id)
+    rasp_live_journal.clear(run_id)
+    parser = engine_adapter_registry.require("codex").stream_parser
+    emitter = LiveRuntimeEmitterImpl(
+        run_id=run_id,
+        run_dir=run_dir,
+        engine="codex",
+        attempt_number=1,
+        stream_parser=parser,
+        fcmp_publisher=FcmpEventPublisher(mirror_writer=_NoopMirrorWriter()),
+        rasp_publisher=RaspEventPublisher(mirror_writer=_NoopMirrorWriter()),
+        audit_dir=make_layout(run_dir, namespace="demo.1").audit_dir,
+    )
+    stdout = _TRANSCRIPTS["codex"]
+    for piece, byte_from, byte_to in _chunks(stdout, 11):
+        await emitter.on_stream_chunk(stream="stdout", text=piece, byte_from=byte_from, byte_to=byte_to)
+    assert emitter.runtime_parse_result(raw_stdout=stdout, raw_stderr="") is None
+
+    await emitter.on_process_exit(exit_code=0, failure_reason=None)
+    parsed = emitter.runtime_parse_result(raw_stdout=stdout, raw_stderr="")
+    assert parsed == parser.parse_runtime_stream(stdout_raw=stdout.encode("utf-8"), stderr_raw=b"")
+    # Output the session never saw means the caller must parse it itself.
+    assert emitter.runtime_parse_result(raw_stdout=stdout + "\n", raw_stderr="") is None
+    assert emitter.runtime_parse_result(raw_stdout=stdout, raw_stderr="late\n") is None
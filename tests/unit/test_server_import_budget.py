@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from server.services.engine_management.engine_adapter_registry import EngineAdapterRegistry
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+_LAZY_MODULES = (
+    "server.services.engine_management.engine_auth_bootstrap",
+    "server.engines.claude.adapter.execution_adapter",
+    "server.engines.codex.adapter.execution_adapter",
+    "server.engines.codex.auth",
+    "server.engines.claude.auth",
+)
+
+
+def test_importing_server_main_keeps_engine_adapters_and_auth_bootstrap_lazy() -> None:
+    code = (
+        "import json, sys; import server.main; "
+        f"print(json.dumps([name for name in {list(_LAZY_MODULES)!r} if name in sys.modules]))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(PROJECT_ROOT),
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    )
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+
+def test_engine_adapter_registry_builds_adapters_on_first_lookup(monkeypatch) -> None:
+    calls: list[str] = []
+    registry = EngineAdapterRegistry()
+    monkeypatch.setattr(registry, "_build_adapters", lambda: calls.append("build") or {"codex": object()})
+
+    assert calls == []
+    assert registry.get("codex") is not None
+    assert registry.get("unknown") is None
+    assert calls == ["build"]
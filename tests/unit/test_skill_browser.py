@@ -59,8 +59,14 @@ def test_build_preview_payload_text_binary_and_size(tmp_path: Path):
     large_file = tmp_path / "l.txt"
     large_file.write_text("x" * (PREVIEW_MAX_BYTES + 1), encoding="utf-8")
     large_preview = build_preview_payload(large_file)
-    assert large_preview["mode"] == "too_large"
+    assert large_preview["mode"] == "text"
     assert large_preview["detected_format"] == "text"
+    assert large_preview["window"]["truncated"] is True
+    assert large_preview["window"]["byte_end"] == PREVIEW_MAX_BYTES
+
+    large_binary = tmp_path / "l.bin"
+    large_binary.write_bytes(b"\x00" * (PREVIEW_MAX_BYTES + 1))
+    assert build_preview_payload(large_binary)["mode"] == "too_large"
 
 
 def test_build_preview_payload_gb18030_markdown_is_text(tmp_path: Path):
@@ -0,0 +1,36 @@
+import sqlite3
+
+import pytest
+
+from server import main as server_main
+from server.services.engine_management.engine_status_cache_service import engine_status_cache_service
+from server.services.orchestration.attempt_parser_executor import attempt_parser_executor
+from server.services.orchestration.run_store import run_store
+from server.services.skill.skill_package_identity_service import skill_package_identity_service
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_step_does_not_skip_the_remaining_steps(monkeypatch, caplog):
+    calls: list[str] = []
+
+    async def _failing_warm_up() -> int:
+        calls.append("run_state_cache")
+        raise sqlite3.OperationalError("database is locked")
+
+    async def _refresh_engines() -> None:
+        calls.append("engine_status")
+
+    async def _refresh_skills() -> None:
+        calls.append("skill_packages")
+        raise LookupError("skill-x")
+
+    monkeypatch.setattr(run_store, "warm_run_state_cache", _failing_warm_up)
+    monkeypatch.setattr(engine_status_cache_service, "refresh_all", _refresh_engines)
+    monkeypatch.setattr(skill_package_identity_service, "refresh_all", _refresh_skills)
+    monkeypatch.setattr(attempt_parser_executor, "start", lambda: calls.append("parser_executor"))
+
+    await server_main._run_startup_background_path()
+
+    assert calls == ["run_state_cache", "engine_status", "skill_packages", "parser_executor"]
+    assert "Run state cache warm-up failed" in caplog.text
+    assert "Skill package hash warm-up failed" in caplog.text
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from types import SimpleNamespace
@@ -7,6 +9,7 @@ from types import SimpleNamespace
 import pytest
 
 from server.services.platform.system_log_explorer_service import SystemLogExplorerService
+from server.services.platform.system_log_index import iter_lines_reverse
 
 
 def _mock_config(tmp_path: Path) -> SimpleNamespace:
@@ -101,3 +104,173 @@ def test_query_logs_rejects_unknown_source():
             from_ts=None,
             to_ts=None,
         )
+
+
+def _write_system_logs(logs_dir: Path) -> None:
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    rotated = logs_dir / "skill_runner.log.2026-03-06"
+    rotated.write_text(
+        "\n".join(
+            [
+                "2026-03-06 10:00:00 INFO server.test: old start",
+                "2026-03-06 10:00:01 WARNING server.test: old warning",
+                "2026-03-06 10:00:02 INFO server.test: old done",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    os.utime(rotated, (1_000_000, 1_000_000))
+    (logs_dir / "skill_runner.log").write_text(
+        "\n".join(
+            [
+                "2026-03-07 09:00:00 INFO server.test: new start",
+                "",
+                "2026-03-07 09:00:01 ERROR server.test: new failure",
+                "2026-03-07 09:00:02 INFO server.test: new done",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def test_query_logs_pages_tail_first_with_opaque_cursor(monkeypatch, tmp_path: Path):
+    _write_system_logs(tmp_path / "logs")
+    monkeypatch.setattr(
+        "server.services.platform.system_log_explorer_service.config",
+        _mock_config(tmp_path),
+    )
+    service = SystemLogExplorerService()
+
+    messages: list[str] = []
+    line_refs: list[tuple[str, int]] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        payload = service.query(
+            source="system", cursor=cursor, limit=2, q=None, level=None, from_ts=None, to_ts=None
+        )
+        pages += 1
+        messages.extend(item["message"] for item in payload["items"])
+        line_refs.extend((item["file"], item["line_no"]) for item in payload["items"])
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            assert payload["total_matched"] == 6
+            assert payload["total_matched_exact"] is True
+            break
+        assert payload["total_matched_exact"] is False
+
+    assert pages == 3
+    assert messages == ["new done", "new failure", "new start", "old done", "old warning", "old start"]
+    assert line_refs[:3] == [("skill_runner.log", 4), ("skill_runner.log", 3), ("skill_runner.log", 1)]
+    legacy = service.query(source="system", cursor=4, limit=10, q=None, level=None, from_ts=None, to_ts=None)
+    assert [item["message"] for item in legacy["items"]] == ["old warning", "old start"]
+
+
+def test_query_logs_cursor_ignores_rows_appended_after_first_page(monkeypatch, tmp_path: Path):
+    logs_dir = tmp_path / "logs"
+    _write_system_logs(logs_dir)
+    monkeypatch.setattr(
+        "server.services.platform.system_log_explorer_service.config",
+        _mock_config(tmp_path),
+    )
+    service = SystemLogExplorerService()
+    first = service.query(source="system", cursor=None, limit=2, q=None, level=None, from_ts=None, to_ts=None)
+    with (logs_dir / "skill_runner.log").open("a", encoding="utf-8") as fp:
+        fp.write("2026-03-07 09:00:03 INFO server.test: appended later\n")
+
+    second = service.query(
+        source="system", cursor=first["next_cursor"], limit=2, q=None, level=None, from_ts=None, to_ts=None
+    )
+
+    assert [item["message"] for item in second["items"]] == ["new start", "old done"]
+
+
+def test_query_logs_skips_rotated_files_via_sidecar_index(monkeypatch, tmp_path: Path):
+    logs_dir = tmp_path / "logs"
+    _write_system_logs(logs_dir)
+    monkeypatch.setattr(
+        "server.services.platform.system_log_explorer_service.config",
+        _mock_config(tmp_path),
+    )
+    service = SystemLogExplorerService()
+    payload = service.query(source="system", cursor=None, limit=10, q=None, level="ERROR", from_ts=None, to_ts=None)
+    assert [item["message"] for item in payload["items"]] == ["new failure"]
+
+    sidecar = logs_dir / ".log_index" / "skill_runner.log.2026-03-06.json"
+    index_payload = json.loads(sidecar.read_text(encoding="utf-8"))
+    assert index_payload["level_counts"] == {"INFO": 2, "WARNING": 1}
+    assert index_payload["ts_max"] == "2026-03-06T10:00:02+00:00"
+
+    def _fail_reverse_read(path, **kwargs):  # type: ignore[no-untyped-def]
+        if path.name != "skill_runner.log":
+            raise AssertionError(f"rotated file should be skipped: {path.name}")
+        return iter_lines_reverse(path, **kwargs)
+
+    monkeypatch.setattr(
+        "server.services.platform.system_log_explorer_service.iter_lines_reverse",
+        _fail_reverse_read,
+    )
+    fresh = SystemLogExplorerService()
+    payload = fresh.query(
+        source="system",
+        cursor=None,
+        limit=10,
+        q=None,
+        level=None,
+        from_ts=datetime(2026, 3, 7, 0, 0, 0, tzinfo=timezone.utc),
+        to_ts=None,
+    )
+    assert [item["message"] for item in payload["items"]] == ["new done", "new failure", "new start"]
+    assert [item["file"] for item in fresh.query(
+        source="system", cursor=None, limit=10, q=None, level="ERROR", from_ts=None, to_ts=None
+    )["items"]] == ["skill_runner.log"]
+
+
+def test_query_logs_numbers_rotated_lines_from_the_sidecar_index(monkeypatch, tmp_path: Path):
+    _write_system_logs(tmp_path / "logs")
+    monkeypatch.setattr(
+        "server.services.platform.system_log_explorer_service.config",
+        _mock_config(tmp_path),
+    )
+    service = SystemLogExplorerService()
+    active_newline_count = service.index_store.active_newline_count
+
+    def _active_only(path, **kwargs):  # type: ignore[no-untyped-def]
+        if path.name != "skill_runner.log":
+            raise AssertionError(f"rotated file should use its index: {path.name}")
+        return active_newline_count(path, **kwargs)
+
+    monkeypatch.setattr(service.index_store, "active_newline_count", _active_only)
+    payload = service.query(source="system", cursor=None, limit=10, q=None, level=None, from_ts=None, to_ts=None)
+
+    assert [(item["file"], item["line_no"]) for item in payload["items"]][3:] == [
+        ("skill_runner.log.2026-03-06", 3),
+        ("skill_runner.log.2026-03-06", 2),
+        ("skill_runner.log.2026-03-06", 1),
+    ]
+
+
+def test_query_logs_cursor_ends_when_its_file_was_replaced(monkeypatch, tmp_path: Path):
+    logs_dir = tmp_path / "logs"
+    _write_system_logs(logs_dir)
+    monkeypatch.setattr(
+        "server.services.platform.system_log_explorer_service.config",
+        _mock_config(tmp_path),
+    )
+    service = SystemLogExplorerService()
+    first = service.query(source="system", cursor=None, limit=4, q=None, level=None, from_ts=None, to_ts=None)
+    assert first["items"][-1]["file"] == "skill_runner.log.2026-03-06"
+
+    rotated = logs_dir / "skill_runner.log.2026-03-06"
+    replacement = logs_dir / "replacement.tmp"
+    replacement.write_text("2026-03-06 11:00:00 INFO server.test: other file\n" * 3, encoding="utf-8")
+    os.replace(replacement, rotated)
+
+    second = service.query(
+        source="system", cursor=first["next_cursor"], limit=4, q=None, level=None, from_ts=None, to_ts=None
+    )
+
+    assert second["items"] == []
+    assert second["next_cursor"] is None
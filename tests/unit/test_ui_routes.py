@@ -573,7 +573,8 @@ async def test_ui_skill_preview_binary_and_large_and_invalid_path(monkeypatch, t
 
     large_res = await _request("GET", "/ui/skills/demo-ui-skill/view?path=assets/large.txt")
     assert large_res.status_code == 200
-    assert "文件过大不可预览" in large_res.text
+    assert "文件过大不可预览" not in large_res.text
+    assert "部分预览" in large_res.text or "Partial preview" in large_res.text
 
     bad_path_res = await _request("GET", "/ui/skills/demo-ui-skill/view?path=../../etc/passwd")
     assert bad_path_res.status_code == 400
@@ -1585,6 +1586,35 @@ async def test_ui_runs_page_and_table(monkeypatch):
     assert "/ui/runs/req-1" in table_res.text
 
 
+@pytest.mark.asyncio
+async def test_ui_runs_table_passes_filters_and_cursor(monkeypatch):
+    monkeypatch.setattr("server.services.ui.ui_auth.validate_ui_basic_auth_config", lambda: None)
+    monkeypatch.setattr("server.services.ui.ui_auth.is_ui_basic_auth_enabled", lambda: False)
+    calls: list[dict] = []
+
+    def _list_runs(**kwargs):
+        calls.append(kwargs)
+        return {"runs": [], "page": kwargs["page"], "page_size": 20, "total": 0, "total_pages": 0, "next_cursor": "c2"}
+
+    monkeypatch.setattr("server.routers.ui.management_router.list_management_runs", _list_runs)
+
+    response = await _request(
+        "GET",
+        "/ui/management/runs/table",
+        params={"cursor": "c1", "page": 2, "q": " auth ", "status": "failed", "created_to": "2026-02-01"},
+    )
+    assert response.status_code == 200
+    assert calls[-1]["cursor"] == "c1"
+    assert calls[-1]["status"] == ["failed"]
+    assert calls[-1]["q"] == "auth"
+    assert calls[-1]["created_to"] == datetime(2026, 2, 2)
+    assert "cursor=c2" in response.text
+    assert "q=auth&amp;status=failed&amp;created_to=2026-02-01" in response.text
+
+    response = await _request("GET", "/ui/management/runs/table", params={"created_from": "yesterday"})
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_ui_run_detail_preview_and_logs(monkeypatch):
     monkeypatch.setattr("server.services.ui.ui_auth.validate_ui_basic_auth_config", lambda: None)
@@ -1796,7 +1826,11 @@ def test_ui_runs_templates_preserve_current_page_during_auto_refresh() -> None:
     assert 'hx-swap="outerHTML"' in page_template
 
     assert 'id="runs-table-container"' in table_template
-    assert 'hx-get="/ui/management/runs/table?page={{ page }}&page_size={{ page_size }}"' in table_template
+    assert (
+        'hx-get="/ui/management/runs/table?page={{ page }}&page_size={{ page_size }}'
+        '{% if cursor %}&cursor={{ cursor | urlencode }}{% endif %}'
+        '{% if filter_query %}&{{ filter_query }}{% endif %}"'
+    ) in table_template
     assert 'hx-trigger="every 5s"' in table_template
     assert table_template.count('hx-swap="outerHTML"') >= 3
 
@@ -0,0 +1,112 @@
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from server.services.platform.upload_spooling import (
+    UploadLimits,
+    UploadTooLargeError,
+    ZipLimitError,
+    extract_zip_file,
+    spool_upload,
+)
+
+_CHUNK = 256 * 1024
+
+
+class _DiskUpload:
+    """Minimal `UploadFile` stand-in that reads from disk like Starlette's spooled file."""
+
+    def __init__(self, path: Path) -> None:
+        self._handle = open(path, "rb")
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._handle.read(size)
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def _limits(**overrides) -> UploadLimits:
+    values = {
+        "max_upload_bytes": 0,
+        "max_extracted_bytes": 0,
+        "max_members": 0,
+        "max_compression_ratio": 0.0,
+        "chunk_bytes": _CHUNK,
+    }
+    values.update(overrides)
+    return UploadLimits(**values)
+
+
+def _write_large_zip(path: Path, *, member_bytes: int) -> None:
+    block = bytes(range(256)) * (_CHUNK // 256)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        with archive.open("data/big.bin", "w", force_zip64=True) as dst:
+            written = 0
+            while written < member_bytes:
+                dst.write(block)
+                written += len(block)
+        archive.writestr("data/small.txt", "hello")
+
+
+@pytest.mark.asyncio
+async def test_spool_and_extract_stay_under_memory_ceiling(tmp_path: Path):
+    payload_bytes = 48 * 1024 * 1024
+    source = tmp_path / "upload.zip"
+    _write_large_zip(source, member_bytes=payload_bytes)
+    upload = _DiskUpload(source)
+    limits = _limits()
+
+    tracemalloc.start()
+    try:
+        spooled = await spool_upload(upload, tmp_path / "spool", limits=limits)
+        extracted = extract_zip_file(spooled.path, tmp_path / "out", limits=limits)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        upload.close()
+
+    assert spooled.size == source.stat().st_size
+    assert sorted(extracted) == ["data/big.bin", "data/small.txt"]
+    assert (tmp_path / "out" / "data" / "big.bin").stat().st_size == payload_bytes
+    assert peak < 8 * _CHUNK
+
+
+@pytest.mark.asyncio
+async def test_spool_rejects_oversized_upload_and_removes_temp_file(tmp_path: Path):
+    source = tmp_path / "upload.zip"
+    source.write_bytes(b"x" * (3 * _CHUNK))
+    upload = _DiskUpload(source)
+    try:
+        with pytest.raises(UploadTooLargeError):
+            await spool_upload(upload, tmp_path / "spool", limits=_limits(max_upload_bytes=_CHUNK))
+    finally:
+        upload.close()
+
+    assert list((tmp_path / "spool").iterdir()) == []
+
+
+def test_extract_rejects_zip_bombs_and_unsafe_entries(tmp_path: Path):
+    bomb = tmp_path / "bomb.zip"
+    with zipfile.ZipFile(bomb, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("zeros.bin", b"\0" * (8 * 1024 * 1024))
+    with pytest.raises(ZipLimitError, match="compression ratio"):
+        extract_zip_file(bomb, tmp_path / "out-ratio", limits=_limits(max_compression_ratio=100))
+    with pytest.raises(ZipLimitError, match="expands beyond"):
+        extract_zip_file(bomb, tmp_path / "out-size", limits=_limits(max_extracted_bytes=1024 * 1024))
+
+    many = tmp_path / "many.zip"
+    with zipfile.ZipFile(many, "w") as archive:
+        for index in range(5):
+            archive.writestr(f"f{index}.txt", "x")
+    with pytest.raises(ZipLimitError, match="too many entries"):
+        extract_zip_file(many, tmp_path / "out-many", limits=_limits(max_members=4))
+
+    unsafe = tmp_path / "unsafe.zip"
+    with zipfile.ZipFile(unsafe, "w") as archive:
+        archive.writestr("../escape.txt", "x")
+    with pytest.raises(ZipLimitError, match="Unsafe zip entry"):
+        extract_zip_file(unsafe, tmp_path / "out-unsafe", limits=_limits())
+    assert not (tmp_path / "escape.txt").exists()
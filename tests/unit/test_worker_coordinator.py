@@ -0,0 +1,268 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from server.models import RunStatus
+from server.services.orchestration import worker_coordinator as worker_coordinator_module
+from server.services.orchestration.run_store import RunStore
+from server.services.orchestration.worker_coordinator import WorkerCoordinator
+from server.services.platform.worker_ipc_relay import WorkerIpcRelay
+
+_unix_only = pytest.mark.skipif(not WorkerIpcRelay.supported(), reason="requires Unix domain sockets")
+
+
+def _iso(offset_sec: float = 0.0) -> str:
+    return (datetime.utcnow() + timedelta(seconds=offset_sec)).isoformat()
+
+
+async def _enqueue(store: RunStore, run_id: str) -> None:
+    await store.create_run(run_id, None, RunStatus.QUEUED.value)
+    await store.enqueue_dispatch(
+        run_id=run_id,
+        request_id=f"req-{run_id}",
+        skill_id="demo",
+        engine="codex",
+        options={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_registry_reports_peers_and_hands_orphaned_runs_out_once(tmp_path: Path):
+    first = RunStore(db_path=tmp_path / "runs.db")
+    second = RunStore(db_path=tmp_path / "runs.db")
+    register = dict(pid=1, hostname="host", ipc_path=None, live_since=_iso(-30))
+
+    assert await first.register_worker(worker_id="w-a", **register) == 0
+    assert await second.register_worker(worker_id="w-b", **register) == 1
+    await first.acquire_run_worker_lease("run-a", "w-a")
+    await second.acquire_run_worker_lease("run-b", "w-b")
+
+    lease = await second.get_run_worker_lease("run-a", live_since=_iso(-30))
+    assert lease["worker_id"] == "w-a" and lease["worker_live"] is True
+    assert await first.take_orphaned_run_worker_leases(live_since=_iso(-30)) == []
+
+    # w-a stops heartbeating: its run is handed to exactly one sweeper.
+    assert sorted(await second.expire_workers(live_since=_iso(1))) == ["w-a", "w-b"]
+    await second.register_worker(worker_id="w-b", **register)
+    taken = [
+        *await first.take_orphaned_run_worker_leases(live_since=_iso(-30)),
+        *await second.take_orphaned_run_worker_leases(live_since=_iso(-30)),
+    ]
+    assert taken == ["run-a"]
+    assert [lease["run_id"] for lease in await first.list_live_run_worker_leases(live_since=_iso(-30))] == ["run-b"]
+    assert await second.release_run_worker_lease("run-b", "w-a") is False
+    assert await second.release_run_worker_lease("run-b", "w-b") is True
+
+
+@pytest.mark.asyncio
+async def test_shared_dispatch_claims_respect_global_limit_and_live_owners(tmp_path: Path):
+    first = RunStore(db_path=tmp_path / "runs.db")
+    second = RunStore(db_path=tmp_path / "runs.db")
+    for run_id in ("run-1", "run-2", "run-3"):
+        await _enqueue(first, run_id)
+    await first.register_worker(worker_id="w-live", pid=1, hostname="h", ipc_path=None, live_since=_iso(-30))
+
+    assert (await first.claim_next_dispatch("w-live", max_claimed=2))["run_id"] == "run-1"
+    assert (await second.claim_next_dispatch("w-dead", max_claimed=2))["run_id"] == "run-2"
+    # Both workers see the same global slot count.
+    assert await first.claim_next_dispatch("w-live", max_claimed=2) is None
+    assert await second.claim_next_dispatch("w-dead", max_claimed=2) is None
+
+    # Only the claim of the worker without a live heartbeat row returns to the queue.
+    assert await second.requeue_claimed_dispatches(live_since=_iso(-30)) == 1
+    assert (await first.get_dispatch_queue_entry("run-1"))["state"] == "claimed"
+    assert (await first.get_dispatch_queue_entry("run-2"))["state"] == "queued"
+    assert (await second.claim_next_dispatch("w-live", max_claimed=2))["run_id"] == "run-2"
+
+
+@_unix_only
+@pytest.mark.asyncio
+async def test_worker_relay_delivers_frames_to_peers(tmp_path: Path):
+    received: list[dict] = []
+    delivered = asyncio.Event()
+
+    async def _handler(frame: dict) -> None:
+        received.append(frame)
+        if len(received) == 2:
+            delivered.set()
+
+    async def _ignore(_frame: dict) -> None:
+        return None
+
+    sender = WorkerIpcRelay()
+    receiver = WorkerIpcRelay()
+    await receiver.start(tmp_path / "b.sock", _handler)
+    await sender.start(tmp_path / "a.sock", _ignore)
+    try:
+        assert sender.broadcast({"type": "noop"}) is False
+        sender.set_peers({"b": str(tmp_path / "b.sock")})
+        assert sender.send("b", {"type": "journal", "row": {"seq": 1, "text": "héllo"}})
+        # Enqueued from another thread, as audit writer threads do.
+        assert await asyncio.to_thread(sender.broadcast, {"type": "dispatch"})
+        await asyncio.wait_for(delivered.wait(), timeout=5.0)
+    finally:
+        await sender.stop()
+        await receiver.stop()
+
+    assert received == [{"type": "journal", "row": {"seq": 1, "text": "héllo"}}, {"type": "dispatch"}]
+    assert sender.stats()["sent_frames"] == 2
+    assert not (tmp_path / "b.sock").exists()
+
+
+@_unix_only
+@pytest.mark.asyncio
+async def test_coordinators_route_cancel_and_relay_state_changes(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(
+        worker_coordinator_module,
+        "config",
+        SimpleNamespace(
+            SYSTEM=SimpleNamespace(
+                WORKERS=2,
+                WORKER_LEASE_TTL_SEC=30,
+                WORKER_HEARTBEAT_INTERVAL_SEC=60,
+                WORKER_IPC_DIR=str(tmp_path / "ipc"),
+            )
+        ),
+    )
+    owner_store = RunStore(db_path=tmp_path / "runs.db")
+    peer_store = RunStore(db_path=tmp_path / "runs.db")
+    owner = WorkerCoordinator(run_store_backend=owner_store)
+    peer = WorkerCoordinator(run_store_backend=peer_store)
+    canceled = asyncio.Event()
+    canceled_runs: list[tuple[str, str]] = []
+
+    async def _cancel(run_id: str, engine: str) -> bool:
+        canceled_runs.append((run_id, engine))
+        canceled.set()
+        return True
+
+    async def _no_cancel(_run_id: str, _engine: str) -> bool:
+        return False
+
+    async def _lost(_run_ids: list[str]) -> None:
+        return None
+
+    assert await owner.start(on_cancel=_cancel, on_runs_lost=_lost, on_dispatch_wakeup=lambda: None) is True
+    assert await peer.start(on_cancel=_no_cancel, on_runs_lost=_lost, on_dispatch_wakeup=lambda: None) is False
+    try:
+        await owner.heartbeat_once()
+        await owner.acquire_run("run-1")
+        assert await peer.live_peer_run_ids() == {"run-1"}
+        assert await owner.live_peer_run_ids() == set()
+
+        assert await peer.route_cancel("run-1", "codex") is True
+        await asyncio.wait_for(canceled.wait(), timeout=5.0)
+        assert canceled_runs == [("run-1", "codex")]
+        assert await peer.route_cancel("run-unknown", "codex") is False
+
+        # A state write on the owner evicts the peer's cached copy and wakes its waiters.
+        state = {
+            "request_id": "req-1",
+            "run_id": "run-1",
+            "status": RunStatus.QUEUED.value,
+            "current_attempt": 1,
+            "pending": {},
+            "resume": {},
+            "runtime": {},
+            "warnings": [],
+            "updated_at": "2026-04-16T00:00:00",
+        }
+        await owner_store.set_run_state("req-1", state)
+        assert (await peer_store.get_run_state("req-1"))["status"] == RunStatus.QUEUED.value
+        version = await peer_store.run_state_version("req-1")
+        await owner_store.set_run_state("req-1", {**state, "status": RunStatus.RUNNING.value})
+        await peer_store.wait_for_run_state_change("req-1", since=version, timeout=5.0)
+        assert (await peer_store.get_run_state("req-1"))["status"] == RunStatus.RUNNING.value
+    finally:
+        await peer.stop()
+        await owner.stop()
+
+
+class _NoRelay(WorkerIpcRelay):
+    @staticmethod
+    def supported() -> bool:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_peers_read_fresh_run_state_without_a_relay(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(
+        worker_coordinator_module,
+        "config",
+        SimpleNamespace(SYSTEM=SimpleNamespace(WORKERS=2, WORKER_LEASE_TTL_SEC=30, WORKER_HEARTBEAT_INTERVAL_SEC=60)),
+    )
+    owner_store = RunStore(db_path=tmp_path / "runs.db")
+    peer_store = RunStore(db_path=tmp_path / "runs.db")
+    owner = WorkerCoordinator(run_store_backend=owner_store, relay=_NoRelay())
+    peer = WorkerCoordinator(run_store_backend=peer_store, relay=_NoRelay())
+
+    async def _handler(*_args) -> None:
+        return None
+
+    for coordinator in (owner, peer):
+        await coordinator.start(on_cancel=_handler, on_runs_lost=_handler, on_dispatch_wakeup=lambda: None)
+    try:
+        state = {
+            "request_id": "req-1",
+            "run_id": "run-1",
+            "status": RunStatus.RUNNING.value,
+            "current_attempt": 1,
+            "pending": {},
+            "resume": {},
+            "runtime": {},
+            "warnings": [],
+            "updated_at": "2026-04-16T00:00:00",
+        }
+        await owner_store.set_run_state("req-1", state)
+        assert (await peer_store.get_run_state("req-1"))["status"] == RunStatus.RUNNING.value
+        version = await peer_store.run_state_version("req-1")
+
+        # No relay frame reaches the peer, yet it never serves the old state.
+        await owner_store.set_run_state("req-1", {**state, "status": RunStatus.SUCCEEDED.value})
+        assert (await peer_store.get_run_state("req-1"))["status"] == RunStatus.SUCCEEDED.value
+        assert await peer_store.run_state_version("req-1") != version
+    finally:
+        await peer.stop()
+        await owner.stop()
+
+    # Back in single-worker mode the cache serves reads again.
+    await owner_store.set_run_state("req-1", state)
+    assert (await owner_store.get_run_state("req-1"))["status"] == RunStatus.RUNNING.value
+
+
+@pytest.mark.asyncio
+async def test_sweep_renews_stalled_local_workers_and_reclaims_dead_ones(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(
+        worker_coordinator_module,
+        "config",
+        SimpleNamespace(SYSTEM=SimpleNamespace(WORKERS=2, WORKER_LEASE_TTL_SEC=1, WORKER_HEARTBEAT_INTERVAL_SEC=60)),
+    )
+    store = RunStore(db_path=tmp_path / "runs.db")
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    register = dict(hostname=socket.gethostname(), ipc_path=None, live_since=_iso(-30))
+    await store.register_worker(worker_id="w-stalled", pid=os.getpid(), **register)
+    await store.register_worker(worker_id="w-dead", pid=dead.pid, **register)
+    await store.acquire_run_worker_lease("run-stalled", "w-stalled")
+    await store.acquire_run_worker_lease("run-dead", "w-dead")
+    lost: list[str] = []
+
+    async def _lost(run_ids: list[str]) -> None:
+        lost.extend(run_ids)
+
+    sweeper = WorkerCoordinator(run_store_backend=store, relay=_NoRelay())
+    sweeper._on_runs_lost = _lost
+    await asyncio.sleep(1.2)
+    await sweeper.heartbeat_once()
+
+    # The stalled worker (its process is alive) keeps its run; the dead one's run is reclaimed.
+    assert lost == ["run-dead"]
+    lease = await store.get_run_worker_lease("run-stalled", live_since=sweeper.live_since())
+    assert lease["worker_id"] == "w-stalled" and lease["worker_live"] is True